@@ -56,6 +56,7 @@ from ..core.exceptions import (
     QueryExecutionError,
     EndpointError,
 )
+from ..core.sparql_lexer import analyze_sparql
 from ..core.types import QueryResult, QueryStatus, EndpointInfo, SchemaInfo
 from ..discovery.capabilities import CapabilitiesDetector
 from ..execution.executor import QueryExecutor
@@ -584,9 +585,10 @@ class QueryOptimizer:
             List of optimization suggestions
         """
         suggestions = []
+        analysis = analyze_sparql(query)
 
         # Check for SELECT * (can be slow)
-        if "SELECT *" in query.upper():
+        if analysis.select_star:
             suggestions.append({
                 'type': 'performance',
                 'severity': 'warning',
@@ -595,7 +597,7 @@ class QueryOptimizer:
             })
 
         # Check for missing LIMIT
-        if "LIMIT" not in query.upper():
+        if analysis.limit is None:
             suggestions.append({
                 'type': 'performance',
                 'severity': 'warning',
@@ -604,7 +606,7 @@ class QueryOptimizer:
             })
 
         # Check for OPTIONAL without FILTER
-        if "OPTIONAL" in query.upper() and query.count("OPTIONAL") > 2:
+        if analysis.count('OPTIONAL') > 2:
             suggestions.append({
                 'type': 'performance',
                 'severity': 'info',
@@ -613,7 +615,7 @@ class QueryOptimizer:
             })
 
         # Check for REGEX in FILTER
-        if "REGEX" in query.upper():
+        if analysis.count('REGEX'):
             suggestions.append({
                 'type': 'performance',
                 'severity': 'info',
@@ -622,7 +624,7 @@ class QueryOptimizer:
             })
 
         # Check for DISTINCT (can be expensive)
-        if "DISTINCT" in query.upper():
+        if analysis.count('DISTINCT'):
             suggestions.append({
                 'type': 'performance',
                 'severity': 'info',
@@ -24,6 +24,7 @@ from ..core.exceptions import (
     EndpointError,
 )
 from ..discovery.capabilities import CapabilitiesDetector
+from ..discovery.snapshots import DEFAULT_SNAPSHOT_DIR, SnapshotStore
 from ..execution.validator import QueryValidator
 from ..execution.executor import QueryExecutor, execute_query_with_validation
 from ..query.schema_tools import create_schema_tools
@@ -633,6 +634,23 @@ def query(
     is_flag=True,
     help='Include all discovered namespaces in output (not truncated)'
 )
+@click.option(
+    '--refresh',
+    is_flag=True,
+    help='Re-run every discovery task instead of reusing unchanged results'
+)
+@click.option(
+    '--no-snapshot',
+    is_flag=True,
+    help='Neither reuse nor save the persisted discovery snapshot'
+)
+@click.option(
+    '--snapshot-dir',
+    type=click.Path(file_okay=False),
+    default=DEFAULT_SNAPSHOT_DIR,
+    show_default=True,
+    help='Directory of persisted discovery snapshots'
+)
 @click.pass_context
 def discover(
     ctx,
@@ -645,7 +663,10 @@ def discover(
     max_samples: int,
     analyze_schema: bool,
     quiet: bool,
-    verbose_namespaces: bool
+    verbose_namespaces: bool,
+    refresh: bool,
+    no_snapshot: bool,
+    snapshot_dir: str
 ):
     """
     Discover capabilities and metadata of a SPARQL endpoint.
@@ -659,7 +680,9 @@ def discover(
     - Class and property schema (with --analyze-schema)
 
     Uses progressive timeout strategy by default to handle large endpoints
-    like Wikidata gracefully.
+    like Wikidata gracefully. Results are saved as a snapshot per endpoint;
+    later runs check cheap change signals and only repeat the discovery
+    tasks whose inputs changed.
 
     \b
     Examples:
@@ -677,6 +700,9 @@ def discover(
         # Deep schema analysis (slow)
         uv run sparql-agent discover https://sparql.uniprot.org/sparql \\
             --analyze-schema --timeout 120
+
+        # Ignore the saved snapshot and re-run every task
+        uv run sparql-agent discover https://sparql.uniprot.org/sparql --refresh
     """
     verbose = ctx.obj['verbose'] and not quiet
 
@@ -706,7 +732,8 @@ def discover(
             timeout=timeout,
             fast_mode=fast,
             progressive_timeout=not no_progressive_timeout,
-            max_samples=max_samples
+            max_samples=max_samples,
+            snapshot_store=None if no_snapshot else SnapshotStore(snapshot_dir)
         )
 
         # Progress callback for verbose mode (suppressed if quiet)
@@ -716,7 +743,8 @@ def discover(
 
         # Run discovery
         capabilities = detector.detect_all_capabilities(
-            progress_callback=progress_callback if verbose and not quiet else None
+            progress_callback=progress_callback if verbose and not quiet else None,
+            refresh=refresh
         )
 
         # Restore original logging levels
@@ -807,6 +835,10 @@ def discover(
                         lines.append(f"  Timed out: {', '.join(metadata['timed_out_queries'])}")
                     if metadata.get('failed_queries'):
                         lines.append(f"  Failed: {', '.join(metadata['failed_queries'])}")
+                if metadata.get('reused_tasks'):
+                    lines.append(f"\nReused from snapshot: {', '.join(metadata['reused_tasks'])}")
+                    if metadata.get('changed_signals'):
+                        lines.append(f"  Changed signals: {', '.join(metadata['changed_signals'])}")
 
             output_text = "\n".join(lines)
 
@@ -82,6 +82,12 @@ from .exceptions import (
     ValidationError,
 )
 
+# Import lookup indexes
+from .ontology_index import ClassHierarchy, LabelIndex, PropertyGraph
+
+# Import query tokenizer
+from .sparql_lexer import QueryAnalysis, analyze_sparql, tokenize_sparql
+
 # Import all types
 from .types import (
     EndpointInfo,
@@ -119,6 +125,14 @@ __all__ = [
     "LLMResponse",
     "GeneratedQuery",
     "FormattedResult",
+    # Lookup indexes
+    "LabelIndex",
+    "ClassHierarchy",
+    "PropertyGraph",
+    # Query tokenizer
+    "QueryAnalysis",
+    "analyze_sparql",
+    "tokenize_sparql",
     # Exceptions - Base
     "SPARQLAgentError",
     # Exceptions - Endpoint
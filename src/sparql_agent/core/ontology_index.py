@@ -0,0 +1,652 @@
+"""
+Label and hierarchy indexes for ontology lookups.
+
+Ontologies such as GO or ChEBI have tens of thousands of classes, and label
+lookups used to lowercase and scan every label on each call. ``LabelIndex``
+is built once from ``(uri, labels)`` pairs and answers:
+
+- exact, case-insensitive label lookups from a hash map
+- prefix lookups from a sorted label array (binary search)
+- word lookups from an inverted index of whitespace-separated label words
+- substring lookups in both directions (labels occurring in a text, and
+  labels containing a text) without a full scan
+- mention lookups: labels occurring in a text or sharing a word with it
+- fuzzy lookups combining the above, matching what a linear scan with
+  exact, substring and word-overlap tests would return
+
+Results are returned in insertion order, so replacing a scan over an ordered
+dict with an index lookup does not change which match comes first.
+
+``ClassHierarchy`` is built once from the ``subClassOf`` edges and answers
+children, descendant, ancestor and sibling queries in time proportional to the
+result, plus memoized "is-a" subsumption checks.
+
+``PropertyGraph`` indexes properties as ``domain -> (property, range)`` edges
+for shortest-path and bounded k-shortest-path search between classes.
+
+``VersionedDict`` is a dict that takes a new, process-wide unique version on
+every mutation, so an index built from it can tell whether it is stale.
+
+Example:
+    >>> index = LabelIndex([("http://ex.org/Protein", ["Protein", "polypeptide"])])
+    >>> index.exact("protein")
+    ['http://ex.org/Protein']
+    >>> [uri for uri, label in index.labels_in_text("find human proteins")]
+    ['http://ex.org/Protein']
+"""
+
+import bisect
+import itertools
+from collections import deque
+from typing import Dict, FrozenSet, Iterable, List, Optional, Sequence, Set, Tuple
+
+# Versions of all VersionedDicts, so a replaced dict never reuses a version
+_versions = itertools.count()
+
+
+class VersionedDict(dict):
+    """
+    A dict whose ``version`` changes whenever entries are added, removed or
+    replaced.
+
+    Editing a value in place (e.g. appending to a label list) does not
+    change the version.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.version = next(_versions)
+
+    def _touch(self):
+        self.version = next(_versions)
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self._touch()
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self._touch()
+
+    def __ior__(self, other):
+        result = super().__ior__(other)
+        self._touch()
+        return result
+
+    def clear(self):
+        super().clear()
+        self._touch()
+
+    def pop(self, *args):
+        value = super().pop(*args)
+        self._touch()
+        return value
+
+    def popitem(self):
+        item = super().popitem()
+        self._touch()
+        return item
+
+    def setdefault(self, key, default=None):
+        value = super().setdefault(key, default)
+        self._touch()
+        return value
+
+    def update(self, *args, **kwargs):
+        super().update(*args, **kwargs)
+        self._touch()
+
+    def __reduce__(self):
+        return (type(self), (dict(self),))
+
+
+class LabelIndex:
+    """
+    Case-insensitive index over the labels of ontology terms.
+
+    Entries are ``(uri, label)`` pairs; a term with several labels has several
+    entries. The index is immutable: build a new one when the terms change.
+    """
+
+    def __init__(self, terms: Iterable[Tuple[str, Sequence[str]]]):
+        """
+        Build the index.
+
+        Args:
+            terms: ``(uri, labels)`` pairs in the order results should follow
+        """
+        # (uri, label) per entry, in insertion order
+        self._entries: List[Tuple[str, str]] = []
+        self._by_label: Dict[str, List[int]] = {}
+        self._by_word: Dict[str, List[int]] = {}
+        self._max_label_length = 0
+
+        for uri, labels in terms:
+            for label in labels:
+                entry_id = len(self._entries)
+                self._entries.append((uri, label))
+
+                key = label.lower()
+                self._by_label.setdefault(key, []).append(entry_id)
+                self._max_label_length = max(self._max_label_length, len(key))
+                for word in set(key.split()):
+                    self._by_word.setdefault(word, []).append(entry_id)
+
+        self._sorted_labels = sorted(self._by_label)
+        self._sorted_words = sorted(self._by_word)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def uris(self) -> List[str]:
+        """Indexed URIs in insertion order, without duplicates."""
+        return list(dict.fromkeys(uri for uri, _ in self._entries))
+
+    def exact(self, label: str) -> List[str]:
+        """
+        Find terms with a label, ignoring case.
+
+        Args:
+            label: Label to look up
+
+        Returns:
+            Matching URIs in insertion order
+        """
+        return self._uris(self._by_label.get(label.lower(), ()))
+
+    def exact_entries(self, label: str) -> List[Tuple[str, str]]:
+        """
+        Find entries with a label, ignoring case.
+
+        Args:
+            label: Label to look up
+
+        Returns:
+            ``(uri, label)`` entries in insertion order, with the original case
+        """
+        return [self._entries[i] for i in self._by_label.get(label.lower(), ())]
+
+    def prefix(self, prefix: str, limit: int = 0) -> List[str]:
+        """
+        Find terms with a label starting with a prefix, ignoring case.
+
+        Args:
+            prefix: Label prefix
+            limit: Maximum number of URIs (0 for no limit)
+
+        Returns:
+            Matching URIs in insertion order
+        """
+        entry_ids: List[int] = []
+        for key in self._keys_with_prefix(self._sorted_labels, prefix.lower()):
+            entry_ids.extend(self._by_label[key])
+        uris = self._uris(entry_ids)
+        return uris[:limit] if limit else uris
+
+    def with_word(self, word: str) -> List[Tuple[str, str]]:
+        """
+        Find entries whose label contains a word, ignoring case.
+
+        Args:
+            word: Whitespace-free word
+
+        Returns:
+            ``(uri, label)`` entries in insertion order
+        """
+        return [self._entries[i] for i in self._by_word.get(word.lower(), ())]
+
+    def labels_in_text(self, text: str) -> List[Tuple[str, str]]:
+        """
+        Find entries whose label occurs in a text, ignoring case.
+
+        Only substrings of the text up to the longest label are looked up, so
+        the cost depends on the text length, not on the number of labels.
+
+        Args:
+            text: Text to search, e.g. a user question
+
+        Returns:
+            ``(uri, label)`` entries in insertion order
+        """
+        return self._as_entries(self._ids_in_text(text.lower()))
+
+    def labels_containing(self, text: str) -> List[Tuple[str, str]]:
+        """
+        Find entries whose label contains a text, ignoring case.
+
+        Candidates come from the word index: a middle word of the text must be
+        a label word, the last word of a two-word text must start a label word,
+        and a single word must occur within a label word.
+
+        Args:
+            text: Text to look for
+
+        Returns:
+            ``(uri, label)`` entries in insertion order
+        """
+        return self._as_entries(self._ids_containing(text.lower()))
+
+    def mentions(self, text: str) -> List[Tuple[str, str]]:
+        """
+        Find entries mentioned in a text, ignoring case.
+
+        A label is mentioned if it occurs in the text or shares a
+        whitespace-separated word with it.
+
+        Args:
+            text: Text to search, e.g. a user question
+
+        Returns:
+            ``(uri, label)`` entries in insertion order
+        """
+        text = text.lower()
+        entry_ids = self._ids_in_text(text)
+        for word in set(text.split()):
+            entry_ids.update(self._by_word.get(word, ()))
+        return self._as_entries(entry_ids)
+
+    def fuzzy(self, text: str, threshold: float = 0.8) -> List[Tuple[str, str]]:
+        """
+        Find entries whose label loosely matches a text, ignoring case.
+
+        A label matches if it equals the text, either contains the other, or
+        their word sets overlap by at least ``threshold`` (shared words over
+        the larger word count).
+
+        Args:
+            text: Text to match
+            threshold: Minimum word overlap ratio
+
+        Returns:
+            ``(uri, label)`` entries in insertion order
+        """
+        text = text.lower()
+        entry_ids = set(self._by_label.get(text, ()))
+        entry_ids |= self._ids_in_text(text)
+        entry_ids |= self._ids_containing(text)
+
+        # Word overlap: only labels sharing a word can reach the threshold
+        words = set(text.split())
+        overlaps: Dict[int, int] = {}
+        for word in words:
+            for entry_id in self._by_word.get(word, ()):
+                overlaps[entry_id] = overlaps.get(entry_id, 0) + 1
+        for entry_id, shared in overlaps.items():
+            label_words = set(self._entries[entry_id][1].lower().split())
+            if shared / max(len(words), len(label_words)) >= threshold:
+                entry_ids.add(entry_id)
+
+        return self._as_entries(entry_ids)
+
+    def get_statistics(self) -> Dict[str, int]:
+        """Get index sizes."""
+        return {
+            "entries": len(self._entries),
+            "distinct_labels": len(self._by_label),
+            "distinct_words": len(self._by_word),
+        }
+
+    def _ids_in_text(self, text: str) -> Set[int]:
+        """Ids of entries whose lowercase label is a substring of ``text``."""
+        max_length = min(self._max_label_length, len(text))
+        entry_ids: Set[int] = set()
+        for start in range(len(text)):
+            for end in range(start + 1, min(start + max_length, len(text)) + 1):
+                ids = self._by_label.get(text[start:end])
+                if ids:
+                    entry_ids.update(ids)
+        return entry_ids
+
+    def _ids_containing(self, text: str) -> Set[int]:
+        """Ids of entries whose lowercase label contains ``text``."""
+        words = text.split()
+        if len(words) >= 3:
+            candidates = set(self._by_word.get(words[1], ()))
+        elif len(words) == 2:
+            candidates = set()
+            for word in self._keys_with_prefix(self._sorted_words, words[1]):
+                candidates.update(self._by_word[word])
+        elif words:
+            candidates = set()
+            for word in self._sorted_words:
+                if words[0] in word:
+                    candidates.update(self._by_word[word])
+        else:
+            # Empty or whitespace-only text
+            candidates = set(range(len(self._entries)))
+
+        return {i for i in candidates if text in self._entries[i][1].lower()}
+
+    def _as_entries(self, entry_ids: Iterable[int]) -> List[Tuple[str, str]]:
+        """Map entry ids to entries in insertion order."""
+        return [self._entries[i] for i in sorted(entry_ids)]
+
+    def _uris(self, entry_ids: Iterable[int]) -> List[str]:
+        """Map entry ids to unique URIs in insertion order."""
+        return list(dict.fromkeys(self._entries[i][0] for i in sorted(entry_ids)))
+
+    @staticmethod
+    def _keys_with_prefix(keys: List[str], prefix: str) -> List[str]:
+        """Slice of a sorted key list starting with a prefix."""
+        start = bisect.bisect_left(keys, prefix)
+        end = start
+        while end < len(keys) and keys[end].startswith(prefix):
+            end += 1
+        return keys[start:end]
+
+
+class ClassHierarchy:
+    """
+    Index of the ``subClassOf`` hierarchy of an ontology.
+
+    Parent and child adjacency maps are built once; traversals only visit the
+    classes they return. Cycles, which malformed ontologies sometimes contain,
+    are tolerated. The index is immutable: build a new one when the classes
+    change.
+    """
+
+    def __init__(self, parents: Iterable[Tuple[str, Sequence[str]]]):
+        """
+        Build the index.
+
+        Args:
+            parents: ``(class_uri, parent_uris)`` pairs in the order results
+                should follow
+        """
+        self._parents: Dict[str, List[str]] = {}
+        self._children: Dict[str, List[str]] = {}
+
+        for uri, parent_uris in parents:
+            self._parents[uri] = list(dict.fromkeys(parent_uris))
+            for parent in self._parents[uri]:
+                self._children.setdefault(parent, []).append(uri)
+
+        self._order: List[str] = []
+        self._ancestor_sets: Dict[str, FrozenSet[str]] = {}
+
+    def __contains__(self, uri: str) -> bool:
+        return uri in self._parents
+
+    def __len__(self) -> int:
+        return len(self._parents)
+
+    def parents(self, uri: str) -> List[str]:
+        """Direct superclasses of a class."""
+        return list(self._parents.get(uri, ()))
+
+    def children(self, uri: str) -> List[str]:
+        """Direct subclasses of a class."""
+        return list(self._children.get(uri, ()))
+
+    def descendants(self, uri: str) -> List[str]:
+        """All subclasses of a class, nearest first."""
+        return self._traverse(uri, self._children)
+
+    def ancestors(self, uri: str) -> List[str]:
+        """All superclasses of a class, nearest first."""
+        return self._traverse(uri, self._parents)
+
+    def siblings(self, uri: str) -> List[str]:
+        """Classes sharing a direct superclass with a class."""
+        siblings: Dict[str, None] = {}
+        for parent in self._parents.get(uri, ()):
+            for child in self._children.get(parent, ()):
+                if child != uri:
+                    siblings[child] = None
+        return list(siblings)
+
+    def roots(self) -> List[str]:
+        """Classes without a superclass in the hierarchy."""
+        return [
+            uri for uri, parent_uris in self._parents.items()
+            if not any(parent in self._parents for parent in parent_uris)
+        ]
+
+    def is_subclass_of(self, uri: str, ancestor: str) -> bool:
+        """
+        Check subsumption: whether a class is (a subclass of) another class.
+
+        The relation is reflexive. The ancestor set of each queried class is
+        computed once and memoized, so repeated checks are O(1).
+
+        Args:
+            uri: Candidate subclass
+            ancestor: Candidate superclass
+
+        Returns:
+            True if ``uri`` equals ``ancestor`` or is one of its descendants
+        """
+        if uri == ancestor:
+            return True
+        ancestors = self._ancestor_sets.get(uri)
+        if ancestors is None:
+            ancestors = frozenset(self.ancestors(uri))
+            self._ancestor_sets[uri] = ancestors
+        return ancestor in ancestors
+
+    def topological_order(self) -> List[str]:
+        """
+        Classes ordered so that superclasses come before their subclasses.
+
+        Classes on a cycle are appended at the end in insertion order.
+        """
+        if not self._order:
+            in_degree = {
+                uri: sum(1 for parent in parents if parent in self._parents)
+                for uri, parents in self._parents.items()
+            }
+            queue = deque(uri for uri, degree in in_degree.items() if degree == 0)
+            order: List[str] = []
+            while queue:
+                uri = queue.popleft()
+                order.append(uri)
+                for child in self._children.get(uri, ()):
+                    in_degree[child] -= 1
+                    if in_degree[child] == 0:
+                        queue.append(child)
+
+            if len(order) < len(self._parents):
+                placed = set(order)
+                order.extend(uri for uri in self._parents if uri not in placed)
+            self._order = order
+        return list(self._order)
+
+    def _traverse(self, uri: str, edges: Dict[str, List[str]]) -> List[str]:
+        """Breadth-first traversal excluding the start class."""
+        seen = {uri}
+        result: List[str] = []
+        queue = deque(edges.get(uri, ()))
+        while queue:
+            node = queue.popleft()
+            if node in seen:
+                continue
+            seen.add(node)
+            result.append(node)
+            queue.extend(edges.get(node, ()))
+        return result
+
+
+class PropertyGraph:
+    """
+    Adjacency index of properties between classes.
+
+    Every property contributes an edge from each of its domain classes to each
+    of its range classes. Outgoing edges keep property order, so searches
+    return paths in the same order as a scan over the properties dict.
+    """
+
+    def __init__(self, properties: Iterable[Tuple[str, Sequence[str], Sequence[str]]]):
+        """
+        Build the index.
+
+        Args:
+            properties: ``(property_uri, domain_uris, range_uris)`` triples
+        """
+        self._out: Dict[str, List[Tuple[str, str]]] = {}
+        self._in: Dict[str, List[Tuple[str, str]]] = {}
+        self._edge_count = 0
+
+        for prop_uri, domains, ranges in properties:
+            for domain in domains:
+                for range_uri in ranges:
+                    self._out.setdefault(domain, []).append((prop_uri, range_uri))
+                    self._in.setdefault(range_uri, []).append((prop_uri, domain))
+                    self._edge_count += 1
+
+    def __len__(self) -> int:
+        return self._edge_count
+
+    def outgoing(self, class_uri: str) -> List[Tuple[str, str]]:
+        """``(property, range class)`` edges leaving a class."""
+        return list(self._out.get(class_uri, ()))
+
+    def incoming(self, class_uri: str) -> List[Tuple[str, str]]:
+        """``(property, domain class)`` edges entering a class."""
+        return list(self._in.get(class_uri, ()))
+
+    def related(self, class_uri: str) -> Set[str]:
+        """Classes connected to a class by one property in either direction."""
+        related = {range_uri for _, range_uri in self._out.get(class_uri, ())}
+        related.update(domain for _, domain in self._in.get(class_uri, ()))
+        return related
+
+    def shortest_path(self, source: str, target: str, max_hops: int) -> Optional[List[str]]:
+        """
+        Find one shortest property path with a bidirectional BFS.
+
+        The smaller frontier is expanded first, so the search visits about
+        the square root of the classes a one-sided BFS would.
+
+        Args:
+            source: Start class
+            target: End class
+            max_hops: Maximum number of properties
+
+        Returns:
+            Property URIs along the path, or None if there is no path
+        """
+        if source == target:
+            paths = self.shortest_paths(source, target, max_hops, k=1)
+            return paths[0] if paths else None
+
+        # class -> (previous class, property) on each side
+        forward: Dict[str, Optional[Tuple[str, str]]] = {source: None}
+        backward: Dict[str, Optional[Tuple[str, str]]] = {target: None}
+        forward_frontier, backward_frontier = [source], [target]
+        hops = 0
+
+        while forward_frontier and backward_frontier and hops < max_hops:
+            hops += 1
+            expand_forward = len(forward_frontier) <= len(backward_frontier)
+            if expand_forward:
+                frontier, seen, other, edges = forward_frontier, forward, backward, self._out
+            else:
+                frontier, seen, other, edges = backward_frontier, backward, forward, self._in
+
+            next_frontier: List[str] = []
+            for node in frontier:
+                for prop_uri, neighbor in edges.get(node, ()):
+                    if neighbor in seen:
+                        continue
+                    seen[neighbor] = (node, prop_uri)
+                    if neighbor in other:
+                        return self._join(forward, backward, neighbor)
+                    next_frontier.append(neighbor)
+
+            if expand_forward:
+                forward_frontier = next_frontier
+            else:
+                backward_frontier = next_frontier
+
+        return None
+
+    def shortest_paths(
+        self,
+        source: str,
+        target: str,
+        max_hops: int,
+        k: Optional[int] = None,
+    ) -> List[List[str]]:
+        """
+        Find the k shortest simple property paths between two classes.
+
+        A backward BFS from the target bounds how far each class is from it;
+        the forward search then only extends partial paths that can still
+        reach the target within ``max_hops``. Paths stop at the first arrival
+        at the target and do not visit a class twice.
+
+        Args:
+            source: Start class
+            target: End class (may equal ``source`` for cycles)
+            max_hops: Maximum number of properties per path
+            k: Maximum number of paths (None for all)
+
+        Returns:
+            Property URI lists, shortest first
+        """
+        if max_hops < 1 or (k is not None and k < 1):
+            return []
+
+        distance = self._distances_to(target, max_hops - 1)
+        paths: List[List[str]] = []
+        layer: List[Tuple[str, List[str], FrozenSet[str]]] = [
+            (source, [], frozenset((source,)))
+        ]
+
+        for hops in range(1, max_hops + 1):
+            next_layer: List[Tuple[str, List[str], FrozenSet[str]]] = []
+            for node, props, on_path in layer:
+                for prop_uri, neighbor in self._out.get(node, ()):
+                    if neighbor == target:
+                        paths.append(props + [prop_uri])
+                        if k is not None and len(paths) >= k:
+                            return paths
+                        continue
+                    if neighbor in on_path:
+                        continue
+                    remaining = distance.get(neighbor)
+                    if remaining is None or hops + remaining > max_hops:
+                        continue
+                    next_layer.append((neighbor, props + [prop_uri], on_path | {neighbor}))
+            layer = next_layer
+            if not layer:
+                break
+
+        return paths
+
+    def _distances_to(self, target: str, max_depth: int) -> Dict[str, int]:
+        """Hop distance to ``target`` for classes at most ``max_depth`` away."""
+        distance = {target: 0}
+        frontier = [target]
+        for depth in range(1, max_depth + 1):
+            next_frontier = []
+            for node in frontier:
+                for _, previous in self._in.get(node, ()):
+                    if previous not in distance:
+                        distance[previous] = depth
+                        next_frontier.append(previous)
+            if not next_frontier:
+                break
+            frontier = next_frontier
+        return distance
+
+    @staticmethod
+    def _join(
+        forward: Dict[str, Optional[Tuple[str, str]]],
+        backward: Dict[str, Optional[Tuple[str, str]]],
+        meeting: str,
+    ) -> List[str]:
+        """Join the two search trees at their meeting class into a path."""
+        head: List[str] = []
+        node = meeting
+        while forward[node] is not None:
+            node, prop_uri = forward[node]
+            head.append(prop_uri)
+        head.reverse()
+
+        node = meeting
+        while backward[node] is not None:
+            node, prop_uri = backward[node]
+            head.append(prop_uri)
+        return head
@@ -0,0 +1,522 @@
+"""
+Single-pass SPARQL tokenizer and lightweight query analysis.
+
+Validators and optimizers used to re-scan query text with their own regular
+expressions - one for prefixes, one for variables, one for IRIs, one per
+keyword - so a query was scanned ten or more times per request, and every scan
+was fooled by keywords, prefixed names or brackets inside strings and IRIs.
+
+``tokenize_sparql`` lexes a query once, in linear time, skipping whitespace
+and comments. ``analyze_sparql`` walks the tokens once and collects what the
+checks need: prefix declarations and usage, variables, IRIs, literals, triple
+patterns, SERVICE endpoints, solution modifiers and keyword counts. Analyses
+are memoized, so the validator, complexity scoring and optimizers all share
+the same result for a query.
+
+This is not a parser: it does not reject invalid queries and only recovers
+the structure it can see without a grammar.
+
+Example:
+    >>> analysis = analyze_sparql("SELECT ?s WHERE { ?s a ?type } LIMIT 10")
+    >>> analysis.select_variables, analysis.limit
+    (('s',), 10)
+    >>> analysis.triple_patterns[0]
+    TriplePattern(subject='?s', predicate='a', object='?type', optional=False)
+"""
+
+import re
+from collections import Counter
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterator, List, NamedTuple, Optional, Tuple
+
+
+class Token(NamedTuple):
+    """A lexical token: its kind, source text and start offset."""
+
+    kind: str
+    value: str
+    start: int
+
+
+class TriplePattern(NamedTuple):
+    """A triple pattern as source text; property paths are kept in the predicate."""
+
+    subject: str
+    predicate: str
+    object: str
+    optional: bool
+
+
+class LiteralTerm(NamedTuple):
+    """A string literal with its language tag or datatype."""
+
+    value: str
+    lang: Optional[str]
+    datatype: Optional[str]
+    start: int
+
+
+# Token kinds
+STRING = 'string'
+IRI = 'iri'
+BAD_IRI = 'bad_iri'  # a URL in angle brackets with characters IRIREF excludes
+PNAME = 'pname'
+VAR = 'var'
+BNODE = 'bnode'
+LANG = 'lang'
+NUMBER = 'number'
+WORD = 'word'
+PUNCT = 'punct'
+QUOTE = 'quote'  # a quote that starts no terminated string
+OTHER = 'other'
+
+_TOKEN = re.compile(
+    r'''
+      (?P<space>\s+)
+    | (?P<comment>\#[^\n]*)
+    | (?P<string>"""(?:[^"\\]|\\.|"(?!""))*"""
+               | \'\'\'(?:[^'\\]|\\.|'(?!''))*\'\'\'
+               | "(?:[^"\\\n]|\\.)*"
+               | '(?:[^'\\\n]|\\.)*')
+    | (?P<iri><[^<>"{}|^`\\\x00-\x20]*>)
+    | (?P<bad_iri><[A-Za-z][\w+.\-]*://[^<>"{}\n]*>)
+    | (?P<var>[?$]\w+)
+    | (?P<bnode>_:[\w\-]+(?:\.[\w\-]+)*)
+    | (?P<pname>(?:[A-Za-z][\w\-]*(?:\.[\w\-]+)*)?:(?:[\w\-%]+(?:\.[\w\-%]+)*)?)
+    | (?P<lang>@\w+(?:-\w+)*)
+    | (?P<number>\d+\.\d+(?:[eE][+-]?\d+)?|\d+(?:[eE][+-]?\d+)?)
+    | (?P<word>[A-Za-z_]\w*)
+    | (?P<punct>\^\^|&&|\|\||!=|<=|>=|[{}()\[\].,;*+/|^!=<>?\-])
+    | (?P<quote>["'])
+    | (?P<other>\S)
+    ''',
+    re.VERBOSE,
+)
+
+QUERY_FORMS = frozenset({
+    'SELECT', 'CONSTRUCT', 'ASK', 'DESCRIBE',
+    # SPARQL 1.1 Update
+    'INSERT', 'DELETE', 'LOAD', 'CLEAR', 'CREATE', 'DROP', 'COPY', 'MOVE', 'ADD',
+})
+
+AGGREGATES = frozenset({'COUNT', 'SUM', 'AVG', 'MIN', 'MAX', 'GROUP_CONCAT', 'SAMPLE'})
+
+# Keywords ending an ORDER BY / GROUP BY clause
+_CLAUSE_END = frozenset({'LIMIT', 'OFFSET', 'ORDER', 'GROUP', 'HAVING', 'VALUES'})
+
+# Solution modifiers of a subquery, whose arguments are not triple terms
+_MODIFIERS = frozenset({'LIMIT', 'OFFSET', 'ORDER', 'GROUP', 'HAVING'})
+
+# Keywords introducing a group whose first term is not part of a triple
+_NAMED_GROUPS = frozenset({'GRAPH', 'SERVICE', 'VALUES'})
+
+_TERM_KINDS = frozenset({VAR, IRI, BAD_IRI, PNAME, BNODE, NUMBER, STRING})
+
+
+def tokenize_sparql(query: str) -> Iterator[Token]:
+    """
+    Lex a SPARQL query, skipping whitespace and comments.
+
+    ``iri`` tokens follow SPARQL's IRIREF and never contain whitespace, so
+    ``?x <ex:max && ?m>`` is a comparison. A URL such as
+    ``<http://example.org/a b>`` that contains characters IRIREF excludes is
+    returned as one ``bad_iri`` token, so validators can report it.
+
+    Args:
+        query: SPARQL query text
+
+    Yields:
+        Tokens in source order
+    """
+    for match in _TOKEN.finditer(query):
+        kind = match.lastgroup
+        if kind != 'space' and kind != 'comment':
+            yield Token(kind, match.group(), match.start())
+
+
+@dataclass(frozen=True)
+class QueryAnalysis:
+    """
+    What a single pass over a query's tokens recovered.
+
+    Analyses are cached and shared between callers, so the dictionaries must
+    not be modified.
+
+    Attributes:
+        tokens: All tokens, in source order
+        query_forms: Query forms (SELECT, ASK, INSERT, ...) including subqueries
+        prefixes: Declared prefix -> namespace IRI
+        duplicate_prefixes: Prefixes declared more than once, per repeat
+        used_prefixes: Prefixes used by prefixed names, in order of first use
+        variables: Variable name (without ? or $) -> number of occurrences
+        select_variables: Plain variables projected by the outer SELECT
+        select_aliases: Variables bound by ``(expression AS ?var)`` in the outer SELECT
+        select_star: Whether the outer query is SELECT *
+        distinct: Whether the outer query is SELECT DISTINCT
+        where_variables: Variables occurring in the outer WHERE group
+        iris: IRI tokens (malformed ones included), angle brackets included
+        literals: String literals with language tag or datatype
+        triple_patterns: Triple patterns of graph patterns (not CONSTRUCT templates)
+        services: SERVICE endpoints (IRIs or variables)
+        limit: Outer LIMIT, or None
+        offset: Outer OFFSET, or None
+        order_by: Variables of the outer ORDER BY, or None without one
+        group_by: Variables of the outer GROUP BY, or None without one
+        keyword_counts: Upper-cased keyword -> occurrences, plus ``NOT EXISTS``
+        filter_positions: Source offsets of FILTER keywords
+        regex_filters: REGEX calls inside FILTER expressions
+        subqueries: Nested SELECT queries
+        path_operators: Property path operators used in predicates
+        unterminated_quotes: Offsets of quotes that start no terminated string
+    """
+
+    tokens: Tuple[Token, ...]
+    query_forms: Tuple[str, ...]
+    prefixes: Dict[str, str]
+    duplicate_prefixes: Tuple[str, ...]
+    used_prefixes: Tuple[str, ...]
+    variables: Dict[str, int]
+    select_variables: Tuple[str, ...]
+    select_aliases: Tuple[str, ...]
+    select_star: bool
+    distinct: bool
+    where_variables: FrozenSet[str]
+    iris: Tuple[Token, ...]
+    literals: Tuple[LiteralTerm, ...]
+    triple_patterns: Tuple[TriplePattern, ...]
+    services: Tuple[str, ...]
+    limit: Optional[int]
+    offset: Optional[int]
+    order_by: Optional[Tuple[str, ...]]
+    group_by: Optional[Tuple[str, ...]]
+    keyword_counts: Dict[str, int]
+    filter_positions: Tuple[int, ...]
+    regex_filters: int
+    subqueries: int
+    path_operators: FrozenSet[str]
+    unterminated_quotes: Tuple[int, ...]
+
+    def count(self, keyword: str) -> int:
+        """Number of occurrences of a keyword (case-insensitive)."""
+        return self.keyword_counts.get(keyword.upper(), 0)
+
+
+class _Block(NamedTuple):
+    """A brace-delimited group being walked."""
+
+    optional: bool
+    collect: bool
+    where: bool
+    paren_depth: int
+
+
+@lru_cache(maxsize=256)
+def analyze_sparql(query: str) -> QueryAnalysis:
+    """
+    Tokenize and analyze a query in a single pass.
+
+    Results are memoized per query text.
+
+    Args:
+        query: SPARQL query text
+
+    Returns:
+        Query analysis
+    """
+    tokens = tuple(tokenize_sparql(query))
+
+    query_forms: List[str] = []
+    prefixes: Dict[str, str] = {}
+    duplicate_prefixes: List[str] = []
+    used_prefixes: Dict[str, None] = {}
+    variables: Counter = Counter()
+    keyword_counts: Counter = Counter()
+    iris: List[Token] = []
+    literals: List[LiteralTerm] = []
+    services: List[str] = []
+    filter_positions: List[int] = []
+    unterminated_quotes: List[int] = []
+
+    select_variables: List[str] = []
+    select_aliases: List[str] = []
+    select_star = False
+    distinct = False
+    where_variables = set()
+    limit: Optional[int] = None
+    offset: Optional[int] = None
+    clauses: Dict[str, List[str]] = {}
+
+    triples: List[TriplePattern] = []
+    path_operators = set()
+    regex_filters = 0
+    subqueries = 0
+
+    # Walk state
+    blocks = [_Block(optional=False, collect=False, where=False, paren_depth=0)]
+    paren_depth = 0
+    bracket_depth = 0
+    in_select = False  # in the projection of the outer SELECT
+    seen_where = False  # WHERE keyword at the outer level
+    construct_template = False  # next outer '{' is a CONSTRUCT template
+    clause: Optional[str] = None  # outer ORDER BY / GROUP BY being read
+    pending_optional = False
+    pending_values = False
+    skip_terms = False  # until the next brace
+    filter_depth: Optional[int] = None  # paren depth of the FILTER being read
+    filter_entered = False
+    declaration = -1  # index of the prefixed name in a PREFIX declaration
+
+    current: List[str] = []  # terms of the triple being read
+    joiner = ''  # path operator waiting for its right-hand predicate
+    inverse = False
+    literal_pending = False  # last term was a literal, it may get a lang/datatype
+    datatype_pending = False
+
+    def add_term(text: str):
+        nonlocal joiner, inverse
+        if joiner and len(current) == 2:
+            current[1] += joiner + text
+            joiner = ''
+            return
+        joiner = ''
+        if inverse:
+            text = '^' + text
+            inverse = False
+        if len(current) == 3:
+            current.clear()
+        current.append(text)
+        if len(current) == 3:
+            triples.append(TriplePattern(current[0], current[1], current[2], blocks[-1].optional))
+
+    def extend_last_term(suffix: str):
+        if current:
+            current[-1] += suffix
+            if len(current) == 3:
+                triples[-1] = triples[-1]._replace(object=current[2])
+
+    for index, token in enumerate(tokens):
+        kind, value = token.kind, token.value
+        depth = len(blocks) - 1
+        collecting = (
+            depth > 0 and blocks[-1].collect and paren_depth == 0
+            and bracket_depth == 0 and not skip_terms
+        )
+
+        # Flat inventory
+        if kind == VAR:
+            name = value[1:]
+            variables[name] += 1
+            if blocks[-1].where:
+                where_variables.add(name)
+            if in_select:
+                if index and tokens[index - 1].kind == WORD and tokens[index - 1].value.upper() == 'AS':
+                    select_aliases.append(name)
+                elif paren_depth == 0:
+                    select_variables.append(name)
+            if clause is not None:
+                clauses[clause].append(name)
+        elif kind == PNAME:
+            if index != declaration:
+                used_prefixes.setdefault(value.split(':', 1)[0], None)
+        elif kind in (IRI, BAD_IRI):
+            iris.append(token)
+        elif kind == STRING:
+            literals.append(LiteralTerm(value, None, None, token.start))
+        elif kind == QUOTE:
+            unterminated_quotes.append(token.start)
+
+        # A language tag or datatype belongs to the literal before it
+        if literal_pending and kind == LANG:
+            literals[-1] = literals[-1]._replace(lang=value[1:])
+            if collecting:
+                extend_last_term(value)
+            literal_pending = False
+            continue
+        if literal_pending and value == '^^':
+            if collecting:
+                extend_last_term(value)
+            literal_pending, datatype_pending = False, True
+            continue
+        if datatype_pending:
+            datatype_pending = False
+            if kind in (IRI, PNAME):
+                literals[-1] = literals[-1]._replace(datatype=value)
+                if collecting:
+                    extend_last_term(value)
+                continue
+        literal_pending = kind == STRING
+
+        if kind == WORD:
+            keyword = value.upper()
+            keyword_counts[keyword] += 1
+            previous = tokens[index - 1] if index else None
+
+            if keyword in QUERY_FORMS:
+                query_forms.append(keyword)
+            if keyword == 'EXISTS' and previous is not None and previous.value.upper() == 'NOT':
+                keyword_counts['NOT EXISTS'] += 1
+            if keyword == 'REGEX' and filter_depth is not None:
+                regex_filters += 1
+
+            if keyword == 'PREFIX' and index + 2 < len(tokens):
+                name_token, iri_token = tokens[index + 1], tokens[index + 2]
+                if name_token.kind == PNAME and name_token.value.endswith(':') and iri_token.kind == IRI:
+                    name = name_token.value[:-1]
+                    if name in prefixes:
+                        duplicate_prefixes.append(name)
+                    prefixes[name] = iri_token.value[1:-1]
+                    declaration = index + 1
+            elif keyword == 'FILTER':
+                filter_positions.append(token.start)
+                filter_depth, filter_entered = paren_depth, False
+            elif keyword == 'OPTIONAL':
+                pending_optional = True
+            elif keyword == 'VALUES':
+                pending_values = True
+            elif keyword == 'SERVICE':
+                following = tokens[index + 1:index + 3]
+                if following and following[0].kind == WORD and following[0].value.upper() == 'SILENT':
+                    following = following[1:]
+                if following and following[0].kind in (IRI, VAR, PNAME):
+                    services.append(following[0].value)
+
+            if depth == 0:
+                if keyword == 'SELECT' and len(query_forms) == 1:
+                    in_select = True
+                elif keyword == 'CONSTRUCT':
+                    construct_template = True
+                elif in_select and keyword in ('DISTINCT', 'REDUCED'):
+                    distinct = distinct or keyword == 'DISTINCT'
+                elif keyword in ('WHERE', 'FROM'):
+                    in_select = False
+                    if keyword == 'WHERE':
+                        seen_where = True
+                        construct_template = False
+                elif keyword in ('LIMIT', 'OFFSET'):
+                    following = tokens[index + 1] if index + 1 < len(tokens) else None
+                    if following is not None and following.kind == NUMBER and following.value.isdigit():
+                        if keyword == 'LIMIT':
+                            limit = int(following.value)
+                        else:
+                            offset = int(following.value)
+
+                if keyword in _CLAUSE_END:
+                    clause = None
+                if keyword == 'BY' and previous is not None and previous.value.upper() in ('ORDER', 'GROUP'):
+                    clause = previous.value.upper()
+                    clauses[clause] = []
+            else:
+                if keyword == 'SELECT':
+                    if previous is not None and previous.value == '{':
+                        subqueries += 1
+                    skip_terms = True
+                elif keyword in _MODIFIERS or keyword in _NAMED_GROUPS:
+                    skip_terms = True
+
+            if collecting:
+                if value == 'a' or keyword in ('TRUE', 'FALSE'):
+                    add_term(value)
+                else:
+                    current.clear()
+                    joiner, inverse = '', False
+            continue
+
+        if kind == PUNCT:
+            if value == '{':
+                parent = blocks[-1]
+                if depth == 0:
+                    where = not pending_values and (seen_where or not construct_template)
+                    collect = where
+                    construct_template = False
+                    in_select = False
+                    clause = None
+                else:
+                    where = parent.where
+                    collect = parent.collect and not pending_values
+                blocks.append(_Block(
+                    optional=parent.optional or pending_optional,
+                    collect=collect,
+                    where=where,
+                    paren_depth=paren_depth,
+                ))
+                paren_depth = 0
+                pending_optional = pending_values = skip_terms = False
+                filter_depth = None
+                current.clear()
+                joiner, inverse = '', False
+            elif value == '}':
+                if len(blocks) > 1:
+                    paren_depth = blocks.pop().paren_depth
+                skip_terms = False
+                filter_depth = None
+                current.clear()
+                joiner, inverse = '', False
+            elif value == '(':
+                paren_depth += 1
+                if filter_depth is not None:
+                    filter_entered = True
+            elif value == ')':
+                paren_depth = max(paren_depth - 1, 0)
+                if filter_depth is not None and filter_entered and paren_depth <= filter_depth:
+                    filter_depth = None
+            elif value == '[':
+                if collecting:
+                    add_term('[]')
+                bracket_depth += 1
+            elif value == ']':
+                bracket_depth = max(bracket_depth - 1, 0)
+            elif value == '*' and in_select and paren_depth == 0:
+                select_star = True
+            elif collecting:
+                if value == '.':
+                    current.clear()
+                    joiner, inverse = '', False
+                elif value == ';':
+                    del current[1:]
+                elif value == ',':
+                    del current[2:]
+                elif value in ('/', '|') and len(current) == 2:
+                    joiner = value
+                    path_operators.add(value)
+                elif value == '^':
+                    path_operators.add(value)
+                    if joiner:
+                        joiner += '^'
+                    elif len(current) == 1:
+                        inverse = True
+                elif value in ('*', '+', '?') and len(current) == 2 and not joiner:
+                    current[1] += value
+                    path_operators.add(value)
+            continue
+
+        if collecting and kind in _TERM_KINDS:
+            add_term(value)
+
+    return QueryAnalysis(
+        tokens=tokens,
+        query_forms=tuple(query_forms),
+        prefixes=prefixes,
+        duplicate_prefixes=tuple(duplicate_prefixes),
+        used_prefixes=tuple(used_prefixes),
+        variables=dict(variables),
+        select_variables=tuple(select_variables),
+        select_aliases=tuple(select_aliases),
+        select_star=select_star,
+        distinct=distinct,
+        where_variables=frozenset(where_variables),
+        iris=tuple(iris),
+        literals=tuple(literals),
+        triple_patterns=tuple(triples),
+        services=tuple(services),
+        limit=limit,
+        offset=offset,
+        order_by=tuple(clauses['ORDER']) if 'ORDER' in clauses else None,
+        group_by=tuple(clauses['GROUP']) if 'GROUP' in clauses else None,
+        keyword_counts=dict(keyword_counts),
+        filter_positions=tuple(filter_positions),
+        regex_filters=regex_filters,
+        subqueries=subqueries,
+        path_operators=frozenset(path_operators),
+        unterminated_quotes=tuple(unterminated_quotes),
+    )
@@ -0,0 +1,307 @@
+"""
+Tests for ontology label and hierarchy indexes.
+
+Tests cover:
+- Exact, prefix, word and substring lookups of LabelIndex
+- Agreement of fuzzy and mention lookups with a linear scan
+- ClassHierarchy traversals, subsumption and topological order
+- PropertyGraph shortest and k-shortest path search
+- Lazy rebuilding of the OntologyInfo indexes
+"""
+
+import random
+
+import pytest
+
+from sparql_agent.core.ontology_index import ClassHierarchy, LabelIndex, PropertyGraph
+from sparql_agent.core.types import OntologyInfo, OWLClass, OWLProperty
+
+
+TERMS = [
+    ("ex:Protein", ["Protein", "polypeptide"]),
+    ("ex:Kinase", ["protein kinase"]),
+    ("ex:Gene", ["Gene"]),
+    ("ex:Activity", ["kinase activity", "catalytic activity"]),
+    ("ex:Protein2", ["protein"]),
+]
+
+
+def scan_fuzzy(text, terms, threshold=0.8):
+    """Reference implementation: the scan used before the index."""
+    text = text.lower()
+    matches = []
+    for uri, labels in terms:
+        for label in labels:
+            label = label.lower()
+            words1, words2 = set(text.split()), set(label.split())
+            if text == label or text in label or label in text:
+                matches.append(uri)
+            elif words1 and words2:
+                if len(words1 & words2) / max(len(words1), len(words2)) >= threshold:
+                    matches.append(uri)
+    return matches
+
+
+def scan_mentions(text, terms):
+    """Reference implementation of mention matching."""
+    text = text.lower()
+    words = text.split()
+    return [
+        (uri, label) for uri, labels in terms for label in labels
+        if label.lower() in text or any(word in label.lower().split() for word in words)
+    ]
+
+
+class TestLabelIndex:
+    """Tests for LabelIndex lookups."""
+
+    @pytest.fixture
+    def index(self):
+        return LabelIndex(TERMS)
+
+    def test_exact_ignores_case_and_keeps_order(self, index):
+        assert index.exact("PROTEIN") == ["ex:Protein", "ex:Protein2"]
+        assert index.exact("missing") == []
+
+    def test_prefix(self, index):
+        assert index.prefix("prot") == ["ex:Protein", "ex:Kinase", "ex:Protein2"]
+        assert index.prefix("prot", limit=1) == ["ex:Protein"]
+        assert index.prefix("kinase ") == ["ex:Activity"]
+
+    def test_labels_in_text(self, index):
+        uris = [uri for uri, _ in index.labels_in_text("Which genes encode a protein kinase?")]
+        assert uris == ["ex:Protein", "ex:Kinase", "ex:Gene", "ex:Protein2"]
+
+    def test_labels_containing(self, index):
+        assert [uri for uri, _ in index.labels_containing("activ")] == ["ex:Activity", "ex:Activity"]
+        assert [uri for uri, _ in index.labels_containing("kinase act")] == ["ex:Activity"]
+        assert index.labels_containing("in kin") == [("ex:Kinase", "protein kinase")]
+
+    @pytest.mark.parametrize("text", [
+        "protein", "kinase", "in k", "activity kinase", "catalytic", "gene x",
+        "polypeptide chain", "a protein kinase activity", "", "zzz",
+    ])
+    def test_fuzzy_matches_scan(self, index, text):
+        assert [uri for uri, _ in index.fuzzy(text)] == scan_fuzzy(text, TERMS)
+
+    def test_mentions_match_scan_on_random_labels(self):
+        rng = random.Random(7)
+        vocabulary = ["alpha", "beta", "gamma", "kinase", "binding", "cell", "ion"]
+        terms = [
+            (f"ex:C{i}", [" ".join(rng.sample(vocabulary, rng.randint(1, 3)))])
+            for i in range(200)
+        ]
+        index = LabelIndex(terms)
+
+        for _ in range(50):
+            text = " ".join(rng.sample(vocabulary, rng.randint(1, 4)))
+            assert index.mentions(text) == scan_mentions(text, terms)
+            assert [uri for uri, _ in index.fuzzy(text)] == scan_fuzzy(text, terms)
+
+
+class TestClassHierarchy:
+    """Tests for ClassHierarchy."""
+
+    @pytest.fixture
+    def hierarchy(self):
+        # Thing > Agent > {Person, Organization}; Employee is-a Person and Agent
+        return ClassHierarchy([
+            ("ex:Thing", []),
+            ("ex:Agent", ["ex:Thing"]),
+            ("ex:Person", ["ex:Agent"]),
+            ("ex:Organization", ["ex:Agent"]),
+            ("ex:Employee", ["ex:Person", "ex:Agent", "ext:Worker"]),
+        ])
+
+    def test_adjacency(self, hierarchy):
+        assert hierarchy.children("ex:Agent") == ["ex:Person", "ex:Organization", "ex:Employee"]
+        assert hierarchy.parents("ex:Employee") == ["ex:Person", "ex:Agent", "ext:Worker"]
+        assert hierarchy.children("ex:Employee") == []
+
+    def test_descendants_and_ancestors(self, hierarchy):
+        assert hierarchy.descendants("ex:Thing") == [
+            "ex:Agent", "ex:Person", "ex:Organization", "ex:Employee",
+        ]
+        assert hierarchy.ancestors("ex:Employee") == [
+            "ex:Person", "ex:Agent", "ext:Worker", "ex:Thing",
+        ]
+        assert hierarchy.ancestors("ex:Unknown") == []
+
+    def test_siblings(self, hierarchy):
+        assert hierarchy.siblings("ex:Person") == ["ex:Organization", "ex:Employee"]
+        assert hierarchy.siblings("ex:Thing") == []
+
+    def test_is_subclass_of(self, hierarchy):
+        assert hierarchy.is_subclass_of("ex:Employee", "ex:Thing")
+        assert hierarchy.is_subclass_of("ex:Employee", "ext:Worker")
+        assert hierarchy.is_subclass_of("ex:Person", "ex:Person")
+        assert not hierarchy.is_subclass_of("ex:Thing", "ex:Person")
+        assert not hierarchy.is_subclass_of("ex:Organization", "ex:Person")
+
+    def test_topological_order_and_roots(self, hierarchy):
+        order = hierarchy.topological_order()
+        position = {uri: i for i, uri in enumerate(order)}
+        assert len(order) == 5
+        assert position["ex:Thing"] < position["ex:Agent"] < position["ex:Person"] < position["ex:Employee"]
+        assert hierarchy.roots() == ["ex:Thing"]
+
+    def test_cycles_terminate(self):
+        hierarchy = ClassHierarchy([("ex:A", ["ex:B"]), ("ex:B", ["ex:A"])])
+        assert hierarchy.descendants("ex:A") == ["ex:B"]
+        assert hierarchy.ancestors("ex:A") == ["ex:B"]
+        assert sorted(hierarchy.topological_order()) == ["ex:A", "ex:B"]
+
+    def test_deep_hierarchy(self):
+        """A 20k-class chain is traversed without recursion limits."""
+        uris = [f"ex:C{i}" for i in range(20000)]
+        hierarchy = ClassHierarchy(
+            (uri, [uris[i - 1]] if i else []) for i, uri in enumerate(uris)
+        )
+        assert len(hierarchy.descendants("ex:C0")) == 19999
+        assert hierarchy.is_subclass_of("ex:C19999", "ex:C0")
+
+
+class TestPropertyGraph:
+    """Tests for PropertyGraph path search."""
+
+    @pytest.fixture
+    def graph(self):
+        # Gene -encodes-> Protein -partOf-> Complex; Gene -memberOf-> Pathway -has-> Complex
+        return PropertyGraph([
+            ("ex:encodes", ["ex:Gene"], ["ex:Protein"]),
+            ("ex:partOf", ["ex:Protein"], ["ex:Complex"]),
+            ("ex:memberOf", ["ex:Gene"], ["ex:Pathway"]),
+            ("ex:has", ["ex:Pathway"], ["ex:Complex"]),
+            ("ex:assembles", ["ex:Complex"], ["ex:Gene"]),
+            ("ex:name", ["ex:Gene", "ex:Protein"], ["xsd:string"]),
+        ])
+
+    def test_adjacency(self, graph):
+        assert graph.outgoing("ex:Gene") == [
+            ("ex:encodes", "ex:Protein"), ("ex:memberOf", "ex:Pathway"), ("ex:name", "xsd:string"),
+        ]
+        assert graph.incoming("ex:Complex") == [("ex:partOf", "ex:Protein"), ("ex:has", "ex:Pathway")]
+        assert graph.related("ex:Protein") == {"ex:Complex", "xsd:string", "ex:Gene"}
+        assert len(graph) == 7
+
+    def test_shortest_path(self, graph):
+        assert graph.shortest_path("ex:Gene", "ex:Protein", 3) == ["ex:encodes"]
+        assert graph.shortest_path("ex:Gene", "ex:Complex", 3) in (
+            ["ex:encodes", "ex:partOf"], ["ex:memberOf", "ex:has"],
+        )
+        assert graph.shortest_path("ex:Gene", "ex:Complex", 1) is None
+        assert graph.shortest_path("ex:Complex", "ex:Pathway", 3) == ["ex:assembles", "ex:memberOf"]
+
+    def test_shortest_paths_in_order(self, graph):
+        assert graph.shortest_paths("ex:Gene", "ex:Complex", 3) == [
+            ["ex:encodes", "ex:partOf"], ["ex:memberOf", "ex:has"],
+        ]
+        assert graph.shortest_paths("ex:Gene", "ex:Complex", 3, k=1) == [["ex:encodes", "ex:partOf"]]
+        assert graph.shortest_paths("ex:Gene", "ex:Complex", 1) == []
+
+    def test_cycle_back_to_source(self, graph):
+        assert graph.shortest_paths("ex:Gene", "ex:Gene", 3) == [
+            ["ex:encodes", "ex:partOf", "ex:assembles"], ["ex:memberOf", "ex:has", "ex:assembles"],
+        ]
+        assert graph.shortest_path("ex:Gene", "ex:Gene", 2) is None
+
+    def test_matches_exhaustive_search(self):
+        rng = random.Random(3)
+        classes = [f"ex:C{i}" for i in range(30)]
+        properties = [
+            (f"ex:p{i}", [rng.choice(classes)], [rng.choice(classes)]) for i in range(80)
+        ]
+        graph = PropertyGraph(properties)
+
+        def exhaustive(source, target, max_hops):
+            found, stack = [], [(source, [], {source})]
+            while stack:
+                node, props, seen = stack.pop()
+                for prop, domains, ranges in properties:
+                    if node in domains:
+                        for nxt in ranges:
+                            if nxt == target:
+                                found.append(props + [prop])
+                            elif nxt not in seen and len(props) + 1 < max_hops:
+                                stack.append((nxt, props + [prop], seen | {nxt}))
+            return found
+
+        for _ in range(40):
+            source, target = rng.choice(classes), rng.choice(classes)
+            expected = exhaustive(source, target, 3)
+            paths = graph.shortest_paths(source, target, 3)
+            assert sorted(paths) == sorted(expected)
+            assert [len(p) for p in paths] == sorted(len(p) for p in paths)
+            shortest = graph.shortest_path(source, target, 3)
+            assert (shortest is None) == (not expected)
+            if shortest:
+                assert len(shortest) == len(paths[0])
+
+
+class TestOntologyInfoIndexes:
+    """Tests for the lazy indexes of OntologyInfo."""
+
+    @pytest.fixture
+    def ontology(self):
+        return OntologyInfo(
+            uri="ex:onto",
+            classes={
+                "ex:Protein": OWLClass(uri="ex:Protein", label=["Protein"]),
+                "ex:Gene": OWLClass(uri="ex:Gene", label=["Gene"]),
+            },
+            properties={
+                "ex:encodes": OWLProperty(uri="ex:encodes", label=["encodes"]),
+            },
+        )
+
+    def test_label_lookups(self, ontology):
+        assert ontology.get_class_by_label("protein").uri == "ex:Protein"
+        assert ontology.get_property_by_label("Encodes").uri == "ex:encodes"
+        assert ontology.get_class_by_label("missing") is None
+        assert [c.uri for c in ontology.find_classes_by_prefix("ge")] == ["ex:Gene"]
+
+    def test_index_is_reused(self, ontology):
+        assert ontology.class_label_index() is ontology.class_label_index()
+
+    def test_index_rebuilt_when_classes_change(self, ontology):
+        ontology.get_class_by_label("protein")
+        ontology.classes["ex:Cell"] = OWLClass(uri="ex:Cell", label=["Cell"])
+        assert ontology.get_class_by_label("cell").uri == "ex:Cell"
+
+    def test_index_rebuilt_when_class_replaced(self, ontology):
+        ontology.get_class_by_label("protein")
+        ontology.classes["ex:Protein"] = OWLClass(uri="ex:Protein", label=["Enzyme"])
+        assert ontology.get_class_by_label("enzyme").uri == "ex:Protein"
+        assert ontology.get_class_by_label("protein") is None
+
+    def test_index_rebuilt_when_class_swapped(self, ontology):
+        ontology.get_class_by_label("protein")
+        del ontology.classes["ex:Protein"]
+        ontology.classes["ex:Cell"] = OWLClass(uri="ex:Cell", label=["Cell"])
+        assert ontology.get_class_by_label("protein") is None
+        assert ontology.get_class_by_label("cell").uri == "ex:Cell"
+
+    def test_index_rebuilt_when_dict_assigned(self, ontology):
+        ontology.get_subclasses("ex:Protein")
+        ontology.classes = {"ex:Enzyme": OWLClass(uri="ex:Enzyme", subclass_of=["ex:Protein"])}
+        assert ontology.get_subclasses("ex:Protein") == ["ex:Enzyme"]
+
+    def test_invalidate_after_in_place_edit(self, ontology):
+        ontology.get_class_by_label("gene")
+        ontology.classes["ex:Gene"].label.append("locus")
+        ontology.invalidate_indexes()
+        assert ontology.get_class_by_label("locus").uri == "ex:Gene"
+
+    def test_hierarchy_queries(self, ontology):
+        ontology.classes["ex:Enzyme"] = OWLClass(uri="ex:Enzyme", subclass_of=["ex:Protein"])
+        ontology.classes["ex:Kinase"] = OWLClass(uri="ex:Kinase", subclass_of=["ex:Enzyme"])
+        ontology.classes["ex:Receptor"] = OWLClass(uri="ex:Receptor", subclass_of=["ex:Protein"])
+
+        assert ontology.get_subclasses("ex:Protein") == ["ex:Enzyme", "ex:Receptor"]
+        assert ontology.get_subclasses("ex:Protein", recursive=True) == [
+            "ex:Enzyme", "ex:Receptor", "ex:Kinase",
+        ]
+        assert ontology.get_superclasses("ex:Kinase", recursive=True) == ["ex:Enzyme", "ex:Protein"]
+        assert ontology.get_siblings("ex:Enzyme") == ["ex:Receptor"]
+        assert ontology.is_subclass_of("ex:Kinase", "ex:Protein")
+        assert not ontology.is_subclass_of("ex:Gene", "ex:Protein")
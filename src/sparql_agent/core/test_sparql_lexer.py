@@ -0,0 +1,153 @@
+"""
+Tests for the single-pass SPARQL tokenizer and query analysis.
+
+Tests cover:
+- Tokenizing strings, IRIs, comments and prefixed names
+- Prefix, variable, IRI and literal inventory
+- Triple patterns, property paths and OPTIONAL blocks
+- SERVICE endpoints, solution modifiers and keyword counts
+- Memoization of analyses
+"""
+
+import pytest
+
+from sparql_agent.core.sparql_lexer import (
+    BAD_IRI,
+    IRI,
+    PNAME,
+    QUOTE,
+    STRING,
+    VAR,
+    TriplePattern,
+    analyze_sparql,
+    tokenize_sparql,
+)
+
+
+QUERY = """
+PREFIX foaf: <http://xmlns.com/foaf/0.1/>
+PREFIX ex: <http://example.org/>
+# SELECT ?ignored { comment }
+SELECT DISTINCT ?name (COUNT(?friend) AS ?friends)
+WHERE {
+    ?person foaf:name ?name ;
+            foaf:knows/foaf:name "Bob"@en .
+    OPTIONAL { ?person ex:age ?age }
+    SERVICE <http://example.org/sparql> { ?person ex:friend ?friend }
+    FILTER(regex(?name, "a{ OPTIONAL"))
+}
+GROUP BY ?name
+ORDER BY DESC(?friends)
+LIMIT 5
+"""
+
+
+class TestTokenize:
+    def test_strings_and_comments_are_single_tokens(self):
+        tokens = list(tokenize_sparql('SELECT ?s # { "\n WHERE { ?s ?p "a } b" }'))
+        kinds = [token.kind for token in tokens]
+        assert kinds.count(STRING) == 1
+        assert '{' not in [t.value for t in tokens if t.start < 12]
+
+    def test_term_kinds(self):
+        tokens = list(tokenize_sparql('?s $o <http://x/y> ex:p :local'))
+        assert [token.kind for token in tokens] == [VAR, VAR, IRI, PNAME, PNAME]
+
+    def test_iris_exclude_whitespace(self):
+        tokens = list(tokenize_sparql('FILTER(?x <ex:max && ?m>)'))
+        assert IRI not in [token.kind for token in tokens]
+        assert [token.value for token in tokens if token.kind == VAR] == ['?x', '?m']
+
+    def test_urls_with_spaces_are_bad_iris(self):
+        tokens = list(tokenize_sparql('?s ?p <http://example.org/a b> .'))
+        assert [(t.kind, t.value) for t in tokens if t.kind in (IRI, BAD_IRI)] == [
+            (BAD_IRI, '<http://example.org/a b>')
+        ]
+        assert analyze_sparql('SELECT * { ?s ?p <http://example.org/a b> }').iris
+
+    def test_unterminated_quote(self):
+        tokens = list(tokenize_sparql('SELECT * WHERE { ?s ?p "open }'))
+        assert QUOTE in [token.kind for token in tokens]
+
+
+class TestAnalyze:
+    def test_prefixes(self):
+        analysis = analyze_sparql(QUERY)
+        assert analysis.prefixes == {
+            'foaf': 'http://xmlns.com/foaf/0.1/',
+            'ex': 'http://example.org/',
+        }
+        assert analysis.used_prefixes == ('foaf', 'ex')
+        assert analysis.duplicate_prefixes == ()
+
+    def test_duplicate_prefixes(self):
+        analysis = analyze_sparql(
+            'PREFIX a: <http://a/> PREFIX a: <http://b/> SELECT ?s WHERE { ?s a:p ?o }'
+        )
+        assert analysis.duplicate_prefixes == ('a',)
+
+    def test_projection(self):
+        analysis = analyze_sparql(QUERY)
+        assert analysis.select_variables == ('name',)
+        assert analysis.select_aliases == ('friends',)
+        assert analysis.distinct
+        assert not analysis.select_star
+        assert 'ignored' not in analysis.variables
+
+    def test_triple_patterns(self):
+        analysis = analyze_sparql(QUERY)
+        assert analysis.triple_patterns == (
+            TriplePattern('?person', 'foaf:name', '?name', False),
+            TriplePattern('?person', 'foaf:knows/foaf:name', '"Bob"@en', False),
+            TriplePattern('?person', 'ex:age', '?age', True),
+            TriplePattern('?person', 'ex:friend', '?friend', False),
+        )
+        assert analysis.path_operators == frozenset({'/'})
+
+    def test_literals(self):
+        analysis = analyze_sparql(QUERY)
+        assert [(lit.value, lit.lang) for lit in analysis.literals] == [
+            ('"Bob"', 'en'),
+            ('"a{ OPTIONAL"', None),
+        ]
+
+    def test_modifiers_and_services(self):
+        analysis = analyze_sparql(QUERY)
+        assert analysis.services == ('<http://example.org/sparql>',)
+        assert analysis.limit == 5
+        assert analysis.offset is None
+        assert analysis.group_by == ('name',)
+        assert analysis.order_by == ('friends',)
+        assert analysis.regex_filters == 1
+
+    def test_keywords_in_strings_are_not_counted(self):
+        analysis = analyze_sparql(QUERY)
+        assert analysis.count('optional') == 1
+        assert analysis.count('SERVICE') == 1
+
+    def test_subqueries_limit_is_not_outer(self):
+        analysis = analyze_sparql(
+            'SELECT ?s WHERE { { SELECT ?s WHERE { ?s ?p ?o } LIMIT 3 } }'
+        )
+        assert analysis.subqueries == 1
+        assert analysis.limit is None
+        assert analysis.query_forms == ('SELECT', 'SELECT')
+
+    def test_construct_template_is_not_a_pattern(self):
+        analysis = analyze_sparql(
+            'CONSTRUCT { ?s ex:q ?o } WHERE { ?s ex:p ?o }'
+        )
+        assert analysis.triple_patterns == (TriplePattern('?s', 'ex:p', '?o', False),)
+
+    def test_select_star(self):
+        analysis = analyze_sparql('SELECT * WHERE { ?s ?p ?o }')
+        assert analysis.select_star
+        assert analysis.where_variables == frozenset({'s', 'p', 'o'})
+
+    @pytest.mark.parametrize('query', ['', 'not sparql at all', '}}}'])
+    def test_garbage_does_not_raise(self, query):
+        analysis = analyze_sparql(query)
+        assert analysis.query_forms == ()
+
+    def test_memoized(self):
+        assert analyze_sparql(QUERY) is analyze_sparql(QUERY)
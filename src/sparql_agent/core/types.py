@@ -9,7 +9,9 @@ LLM responses, and ontology representations.
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
-from typing import Any, Dict, List, Optional, Set, Union
+from typing import Any, Dict, List, Optional, Set, Tuple, Union
+
+from .ontology_index import ClassHierarchy, LabelIndex, PropertyGraph, VersionedDict
 
 
 class QueryStatus(Enum):
@@ -168,40 +170,93 @@ class OntologyInfo:
     modified: Optional[datetime] = None
     metadata: Dict[str, Any] = field(default_factory=dict)
 
+    def __setattr__(self, name: str, value: Any):
+        # Versioned term dicts tell the cached indexes when they are stale
+        if name in ("classes", "properties") and not isinstance(value, VersionedDict):
+            value = VersionedDict(value)
+        super().__setattr__(name, value)
+
     def get_class_by_label(self, label: str) -> Optional[OWLClass]:
         """Find a class by its label."""
-        for owl_class in self.classes.values():
-            if label.lower() in [lbl.lower() for lbl in owl_class.label]:
-                return owl_class
-        return None
+        uris = self.class_label_index().exact(label)
+        return self.classes[uris[0]] if uris else None
 
     def get_property_by_label(self, label: str) -> Optional[OWLProperty]:
         """Find a property by its label."""
-        for owl_property in self.properties.values():
-            if label.lower() in [lbl.lower() for lbl in owl_property.label]:
-                return owl_property
-        return None
+        uris = self.property_label_index().exact(label)
+        return self.properties[uris[0]] if uris else None
+
+    def find_classes_by_prefix(self, prefix: str, limit: int = 0) -> List[OWLClass]:
+        """Find classes with a label starting with a prefix (case-insensitive)."""
+        return [self.classes[uri] for uri in self.class_label_index().prefix(prefix, limit)]
+
+    def class_label_index(self) -> LabelIndex:
+        """Get the label index of the classes, building it on first use."""
+        return self._get_index("class_labels", self.classes, lambda: LabelIndex(
+            (uri, owl_class.label) for uri, owl_class in self.classes.items()
+        ))
+
+    def property_label_index(self) -> LabelIndex:
+        """Get the label index of the properties, building it on first use."""
+        return self._get_index("property_labels", self.properties, lambda: LabelIndex(
+            (uri, owl_property.label) for uri, owl_property in self.properties.items()
+        ))
+
+    def invalidate_indexes(self):
+        """
+        Drop cached lookup indexes.
+
+        ``classes`` and ``properties`` are ``VersionedDict``s, so indexes are
+        rebuilt when terms are added, removed or replaced. Call this after
+        editing terms in place, e.g. appending to ``OWLClass.label``,
+        ``OWLClass.subclass_of`` or ``OWLProperty.domain``.
+        """
+        self.__dict__.pop("_indexes", None)
+
+    def _get_index(self, name: str, source: "VersionedDict", build):
+        """Return a cached index, rebuilding it if its source dict changed."""
+        indexes: Dict[str, Tuple[int, Any]] = self.__dict__.setdefault("_indexes", {})
+        signature = source.version
+        cached = indexes.get(name)
+        if cached is None or cached[0] != signature:
+            cached = (signature, build())
+            indexes[name] = cached
+        return cached[1]
 
     def get_subclasses(self, class_uri: str, recursive: bool = False) -> List[str]:
         """Get all subclasses of a given class."""
-        subclasses = []
-        for uri, owl_class in self.classes.items():
-            if class_uri in owl_class.subclass_of:
-                subclasses.append(uri)
-                if recursive:
-                    subclasses.extend(self.get_subclasses(uri, recursive=True))
-        return list(set(subclasses))
+        hierarchy = self.class_hierarchy()
+        if recursive:
+            return hierarchy.descendants(class_uri)
+        return hierarchy.children(class_uri)
 
     def get_superclasses(self, class_uri: str, recursive: bool = False) -> List[str]:
         """Get all superclasses of a given class."""
-        if class_uri not in self.classes:
-            return []
-
-        superclasses = list(self.classes[class_uri].subclass_of)
+        hierarchy = self.class_hierarchy()
         if recursive:
-            for parent in list(superclasses):
-                superclasses.extend(self.get_superclasses(parent, recursive=True))
-        return list(set(superclasses))
+            return hierarchy.ancestors(class_uri)
+        return hierarchy.parents(class_uri)
+
+    def get_siblings(self, class_uri: str) -> List[str]:
+        """Get classes sharing a direct superclass with a given class."""
+        return self.class_hierarchy().siblings(class_uri)
+
+    def is_subclass_of(self, class_uri: str, ancestor_uri: str) -> bool:
+        """Check whether a class is, or is a subclass of, another class."""
+        return self.class_hierarchy().is_subclass_of(class_uri, ancestor_uri)
+
+    def class_hierarchy(self) -> ClassHierarchy:
+        """Get the subclass hierarchy index, building it on first use."""
+        return self._get_index("class_hierarchy", self.classes, lambda: ClassHierarchy(
+            (uri, owl_class.subclass_of) for uri, owl_class in self.classes.items()
+        ))
+
+    def property_graph(self) -> PropertyGraph:
+        """Get the domain/range adjacency index of properties, building it on first use."""
+        return self._get_index("property_graph", self.properties, lambda: PropertyGraph(
+            (uri, owl_property.domain, owl_property.range)
+            for uri, owl_property in self.properties.items()
+        ))
 
 
 @dataclass
@@ -3,16 +3,24 @@ SPARQL Endpoint Capabilities Detection and Prefix Extraction.
 
 This module provides tools for discovering SPARQL endpoint features,
 supported functions, available namespaces, and prefix mappings.
+
+With a ``SnapshotStore``, discovery results are persisted per endpoint and
+later runs only repeat the tasks whose inputs changed (see ``snapshots``).
 """
 
 import logging
 import re
+import time
+import urllib.error
+import urllib.request
 from collections import defaultdict
 from typing import Dict, List, Optional, Set, Tuple
 from urllib.parse import urlparse
 
 from SPARQLWrapper import SPARQLWrapper, JSON, SPARQLExceptions
 
+from .snapshots import ChangeSignals, DiscoverySnapshot, SnapshotStore, TaskSnapshot, task_fingerprint
+
 
 logger = logging.getLogger(__name__)
 
@@ -35,7 +43,9 @@ class CapabilitiesDetector:
         timeout: int = 30,
         fast_mode: bool = False,
         progressive_timeout: bool = True,
-        max_samples: int = 1000
+        max_samples: int = 1000,
+        snapshot_store: Optional[SnapshotStore] = None,
+        max_snapshot_age: float = 7 * 24 * 3600
     ):
         """
         Initialize the capabilities detector.
@@ -46,12 +56,16 @@ class CapabilitiesDetector:
             fast_mode: Skip expensive queries for faster discovery
             progressive_timeout: Use progressive timeout strategy
             max_samples: Maximum number of samples for discovery queries
+            snapshot_store: Store for discovery snapshots (None disables reuse)
+            max_snapshot_age: Seconds before a stored task result is re-run
         """
         self.endpoint_url = endpoint_url
         self.timeout = timeout
         self.fast_mode = fast_mode
         self.progressive_timeout = progressive_timeout
         self.max_samples = max_samples
+        self.snapshot_store = snapshot_store
+        self.max_snapshot_age = max_snapshot_age
         self.sparql = SPARQLWrapper(endpoint_url)
         self.sparql.setTimeout(timeout)
         self.sparql.setReturnFormat(JSON)
@@ -63,19 +77,22 @@ class CapabilitiesDetector:
         self._failed_queries: List[str] = []
         self._timed_out_queries: List[str] = []
 
-    def detect_all_capabilities(self, progress_callback=None) -> Dict:
+    def detect_all_capabilities(self, progress_callback=None, refresh: bool = False) -> Dict:
         """
         Run all capability detection queries and return comprehensive results.
 
         Uses progressive timeout strategy to handle large endpoints gracefully.
+        With a snapshot store, tasks whose inputs did not change since the
+        stored snapshot are not re-run; their stored results are used.
 
         Args:
             progress_callback: Optional callback function(step, total, message)
+            refresh: Re-run every task, ignoring the stored snapshot
 
         Returns:
             Dictionary with all detected capabilities
         """
-        if self._capabilities_cache is not None:
+        if self._capabilities_cache is not None and not refresh:
             return self._capabilities_cache
 
         logger.info(f"Detecting capabilities for endpoint: {self.endpoint_url}")
@@ -139,6 +156,18 @@ class CapabilitiesDetector:
         total_tasks = sum(len(phase['tasks']) for phase in phases)
         current_task = 0
 
+        # Change signals and the previous snapshot decide which tasks to re-run
+        signals = previous = None
+        changed_signals: List[str] = []
+        reused_tasks: List[str] = []
+        task_snapshots: Dict[str, TaskSnapshot] = {}
+        if self.snapshot_store is not None:
+            signals = self.detect_change_signals()
+            previous = self.snapshot_store.load(self.endpoint_url)
+            if previous is not None:
+                changed_signals = signals.changes(previous.signals)
+                task_snapshots.update(previous.tasks)
+
         # Execute phases with progressive timeouts
         for phase in phases:
             phase_name = phase['name']
@@ -151,12 +180,34 @@ class CapabilitiesDetector:
                 original_timeout = self.sparql.timeout
                 self.sparql.setTimeout(phase_timeout)
 
+            task_timeout = phase_timeout if self.progressive_timeout else self.timeout
+
             for key, func, kwargs in phase['tasks']:
                 current_task += 1
 
+                fingerprint = None
+                if signals is not None:
+                    fingerprint = task_fingerprint(key, self._task_settings(kwargs), signals)
+                    stored = previous.tasks.get(key) if previous is not None else None
+                    if (
+                        not refresh
+                        and stored is not None
+                        and stored.reusable(fingerprint, self.max_snapshot_age, timeout=task_timeout)
+                    ):
+                        if progress_callback:
+                            progress_callback(current_task, total_tasks, f"Reusing: {key}")
+                        capabilities[key] = stored.result
+                        if stored.error is not None:
+                            self._timed_out_queries.append(key)
+                            capabilities[f'{key}_error'] = stored.error
+                        reused_tasks.append(key)
+                        continue
+
                 if progress_callback:
                     progress_callback(current_task, total_tasks, f"Running: {key}")
 
+                error = None
+                timed_out = False
                 try:
                     logger.info(f"Executing discovery task: {key}")
                     result = func(**kwargs)
@@ -167,13 +218,24 @@ class CapabilitiesDetector:
                     logger.warning(f"Task {key} timed out after {phase_timeout}s: {e}")
                     self._timed_out_queries.append(key)
                     capabilities[key] = None
-                    capabilities[f'{key}_error'] = f"Timeout after {phase_timeout}s"
+                    capabilities[f'{key}_error'] = error = f"Timeout after {phase_timeout}s"
+                    timed_out = True
 
                 except Exception as e:
                     logger.warning(f"Task {key} failed: {e}")
                     self._failed_queries.append(key)
                     capabilities[key] = None
-                    capabilities[f'{key}_error'] = str(e)
+                    capabilities[f'{key}_error'] = error = str(e)
+
+                if signals is not None:
+                    task_snapshots[key] = TaskSnapshot(
+                        result=capabilities[key],
+                        fingerprint=fingerprint,
+                        completed_at=time.time(),
+                        error=error,
+                        timed_out=timed_out,
+                        timeout=task_timeout,
+                    )
 
             if self.progressive_timeout:
                 # Restore original timeout
@@ -188,9 +250,94 @@ class CapabilitiesDetector:
             'timeout': self.timeout,
         }
 
+        if signals is not None:
+            capabilities['_metadata'].update({
+                'reused_tasks': reused_tasks,
+                'change_signals': signals.to_dict(),
+                'changed_signals': changed_signals,
+            })
+            self.snapshot_store.save(DiscoverySnapshot(
+                endpoint_url=self.endpoint_url,
+                signals=signals,
+                tasks=task_snapshots,
+                updated_at=time.time(),
+            ))
+            logger.info(f"Reused {len(reused_tasks)}/{total_tasks} discovery tasks from snapshot")
+
         self._capabilities_cache = capabilities
         return capabilities
 
+    def _task_settings(self, kwargs: Dict) -> Dict:
+        """Detector settings and task arguments that affect a task's result."""
+        return {'fast_mode': self.fast_mode, 'max_samples': self.max_samples, **kwargs}
+
+    def detect_change_signals(self) -> ChangeSignals:
+        """
+        Collect cheap indicators of whether the endpoint changed.
+
+        Reads the VoID modification date and triple count, counts triples
+        and reads the HTTP validators of the endpoint, each with a short
+        timeout; signals that cannot be read are left unknown.
+
+        Returns:
+            Change signals of the endpoint
+        """
+        signals = ChangeSignals()
+        original_timeout = self.sparql.timeout
+        self.sparql.setTimeout(min(5, self.timeout))
+
+        try:
+            void_query = """
+            SELECT ?modified ?triples
+            WHERE {
+                ?dataset a <http://rdfs.org/ns/void#Dataset> .
+                OPTIONAL { ?dataset <http://purl.org/dc/terms/modified> ?modified }
+                OPTIONAL { ?dataset <http://rdfs.org/ns/void#triples> ?triples }
+            }
+            ORDER BY DESC(?modified)
+            LIMIT 1
+            """
+            try:
+                bindings = self._execute_query(void_query, max_retries=0).get('results', {}).get('bindings', [])
+                if bindings:
+                    signals.void_modified = bindings[0].get('modified', {}).get('value')
+                    if 'triples' in bindings[0]:
+                        signals.void_triples = int(bindings[0]['triples']['value'])
+            except Exception as e:
+                logger.debug(f"Could not read VoID description: {e}")
+
+            try:
+                count_query = "SELECT (COUNT(*) AS ?count) WHERE { ?s ?p ?o }"
+                bindings = self._execute_query(count_query, max_retries=0).get('results', {}).get('bindings', [])
+                if bindings:
+                    signals.triple_count = int(bindings[0]['count']['value'])
+            except Exception as e:
+                logger.debug(f"Could not count triples for change detection: {e}")
+        finally:
+            self.sparql.setTimeout(original_timeout)
+
+        for name, value in self._http_validators().items():
+            setattr(signals, name, value)
+
+        logger.info(f"Change signals: {signals.to_dict()}")
+        return signals
+
+    def _http_validators(self) -> Dict[str, Optional[str]]:
+        """Read the ETag, Last-Modified and Server headers of the endpoint."""
+        request = urllib.request.Request(self.endpoint_url, method="HEAD")
+        try:
+            with urllib.request.urlopen(request, timeout=min(5, self.timeout)) as response:
+                headers = response.headers
+        except (urllib.error.URLError, OSError, ValueError) as e:
+            logger.debug(f"Could not read HTTP validators: {e}")
+            return {}
+
+        return {
+            'etag': headers.get('ETag'),
+            'last_modified': headers.get('Last-Modified'),
+            'server': headers.get('Server'),
+        }
+
     def detect_sparql_version(self) -> str:
         """
         Detect SPARQL version by testing version-specific features.
@@ -0,0 +1,279 @@
+"""
+Persisted discovery snapshots and change detection.
+
+Endpoint discovery runs a few dozen introspection queries and takes minutes
+on large endpoints. ``CapabilitiesDetector`` can store the result of each
+discovery task in a ``SnapshotStore`` and, on the next run, reuse every task
+whose inputs have not changed. Inputs are summarized by cheap change signals:
+
+- data tasks (named graphs, namespaces, statistics) depend on the VoID
+  ``dcterms:modified`` date and ``void:triples`` count and on the triple
+  count; when the endpoint reports none of these, on the HTTP ``ETag`` and
+  ``Last-Modified`` headers. With no signal at all they are always re-run.
+- software tasks (SPARQL version, features, functions) depend on the HTTP
+  ``Server`` header.
+
+Task results also expire after a maximum age, and failed tasks are re-run,
+except timeouts, which would only time out again unless the timeout is now
+larger.
+
+Example:
+    >>> store = SnapshotStore("~/.cache/sparql_agent/discovery")
+    >>> detector = CapabilitiesDetector(endpoint_url, snapshot_store=store)
+    >>> capabilities = detector.detect_all_capabilities()
+    >>> capabilities['_metadata']['reused_tasks']
+    ['sparql_version', 'features', 'named_graphs', 'namespaces', ...]
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+from dataclasses import asdict, dataclass, field, fields
+from typing import Any, Dict, List, Optional
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SNAPSHOT_DIR = "~/.cache/sparql_agent/discovery"
+
+# Tasks whose results depend on the endpoint software rather than its data
+SOFTWARE_TASKS = frozenset({'sparql_version', 'features', 'supported_functions'})
+
+SNAPSHOT_VERSION = 1
+
+
+@dataclass
+class ChangeSignals:
+    """Cheap indicators of whether an endpoint changed since a snapshot."""
+
+    void_modified: Optional[str] = None
+    void_triples: Optional[int] = None
+    triple_count: Optional[int] = None
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    server: Optional[str] = None
+
+    def data_signals(self) -> Dict[str, Any]:
+        """
+        Get the signals data tasks depend on.
+
+        Returns:
+            The VoID and triple count signals that are known, or else the
+            HTTP validators that are known; empty if nothing is known
+        """
+        content = {
+            name: value for name, value in (
+                ('void_modified', self.void_modified),
+                ('void_triples', self.void_triples),
+                ('triple_count', self.triple_count),
+            ) if value is not None
+        }
+        if content:
+            return content
+        return {
+            name: value for name, value in (
+                ('etag', self.etag),
+                ('last_modified', self.last_modified),
+            ) if value is not None
+        }
+
+    def changes(self, previous: "ChangeSignals") -> List[str]:
+        """Names of the signals that differ from a previous observation."""
+        return [
+            item.name for item in fields(self)
+            if getattr(self, item.name) != getattr(previous, item.name)
+        ]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert signals to dictionary."""
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ChangeSignals":
+        """Create signals from a dictionary, ignoring unknown keys."""
+        known = {item.name for item in fields(cls)}
+        return cls(**{key: value for key, value in data.items() if key in known})
+
+
+def task_fingerprint(
+    task: str,
+    settings: Dict[str, Any],
+    signals: ChangeSignals
+) -> Optional[str]:
+    """
+    Summarize the inputs of a discovery task.
+
+    Args:
+        task: Task name, e.g. 'namespaces'
+        settings: Detector settings and task arguments affecting the result
+        signals: Current change signals
+
+    Returns:
+        Fingerprint equal across runs with the same inputs, or None if the
+        inputs cannot be known and the task must run
+    """
+    if task in SOFTWARE_TASKS:
+        inputs = {'server': signals.server}
+    else:
+        inputs = signals.data_signals()
+        if not inputs:
+            return None
+    material = json.dumps(
+        {'task': task, 'settings': settings, 'inputs': inputs},
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()[:32]
+
+
+@dataclass
+class TaskSnapshot:
+    """Stored result of one discovery task."""
+
+    result: Any
+    fingerprint: Optional[str]
+    completed_at: float
+    error: Optional[str] = None
+    timed_out: bool = False
+    timeout: Optional[float] = None
+
+    def reusable(
+        self,
+        fingerprint: Optional[str],
+        max_age: float,
+        now: Optional[float] = None,
+        timeout: Optional[float] = None
+    ) -> bool:
+        """
+        Whether the result still holds for a task with the given inputs.
+
+        Args:
+            fingerprint: Fingerprint of the task's current inputs
+            max_age: Maximum age of a result in seconds
+            now: Current time (``time.time()`` if not given)
+            timeout: Timeout the task would run with now; a stored timeout
+                is not reused if this is larger than the one it hit
+        """
+        now = time.time() if now is None else now
+        if fingerprint is None or fingerprint != self.fingerprint:
+            return False
+        if now - self.completed_at > max_age:
+            return False
+        if self.timed_out:
+            return timeout is None or (self.timeout is not None and timeout <= self.timeout)
+        return self.error is None
+
+
+@dataclass
+class DiscoverySnapshot:
+    """Discovery results of one endpoint, per task."""
+
+    endpoint_url: str
+    signals: ChangeSignals = field(default_factory=ChangeSignals)
+    tasks: Dict[str, TaskSnapshot] = field(default_factory=dict)
+    updated_at: float = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert snapshot to dictionary."""
+        return {
+            'version': SNAPSHOT_VERSION,
+            'endpoint_url': self.endpoint_url,
+            'signals': self.signals.to_dict(),
+            'tasks': {name: asdict(task) for name, task in self.tasks.items()},
+            'updated_at': self.updated_at,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "DiscoverySnapshot":
+        """
+        Create a snapshot from a dictionary.
+
+        Raises:
+            ValueError: If the data is not a snapshot of this version
+        """
+        if data.get('version') != SNAPSHOT_VERSION:
+            raise ValueError(f"Unsupported snapshot version: {data.get('version')}")
+        try:
+            return cls(
+                endpoint_url=data['endpoint_url'],
+                signals=ChangeSignals.from_dict(data.get('signals', {})),
+                tasks={
+                    name: TaskSnapshot(**task)
+                    for name, task in data.get('tasks', {}).items()
+                },
+                updated_at=float(data.get('updated_at', 0.0)),
+            )
+        except (KeyError, TypeError) as e:
+            raise ValueError(f"Invalid snapshot: {e}") from e
+
+
+class SnapshotStore:
+    """
+    Discovery snapshots persisted as one JSON file per endpoint.
+    """
+
+    def __init__(self, directory: str = DEFAULT_SNAPSHOT_DIR):
+        """
+        Initialize snapshot store.
+
+        Args:
+            directory: Directory holding the snapshot files
+        """
+        self.directory = os.path.expanduser(directory)
+
+    def path_for(self, endpoint_url: str) -> str:
+        """Get the snapshot file of an endpoint."""
+        name = hashlib.sha256(endpoint_url.encode("utf-8")).hexdigest()[:16]
+        return os.path.join(self.directory, f"{name}.json")
+
+    def load(self, endpoint_url: str) -> Optional[DiscoverySnapshot]:
+        """
+        Load the snapshot of an endpoint.
+
+        Args:
+            endpoint_url: SPARQL endpoint URL
+
+        Returns:
+            Snapshot, or None if there is none or it cannot be read
+        """
+        path = self.path_for(endpoint_url)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, encoding="utf-8") as f:
+                snapshot = DiscoverySnapshot.from_dict(json.load(f))
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable discovery snapshot {path}: {e}")
+            return None
+
+        if snapshot.endpoint_url != endpoint_url:
+            return None
+        return snapshot
+
+    def save(self, snapshot: DiscoverySnapshot):
+        """Write a snapshot (atomically replacing the previous one)."""
+        path = self.path_for(snapshot.endpoint_url)
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(snapshot.to_dict(), f, indent=2, default=str)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Failed to save discovery snapshot to {path}: {e}")
+
+    def delete(self, endpoint_url: str) -> bool:
+        """
+        Delete the snapshot of an endpoint.
+
+        Returns:
+            Whether a snapshot was deleted
+        """
+        try:
+            os.remove(self.path_for(endpoint_url))
+            return True
+        except FileNotFoundError:
+            return False
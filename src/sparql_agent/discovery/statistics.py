@@ -3,21 +3,95 @@ Dataset Statistics and Introspection Module
 
 Provides efficient collection and analysis of SPARQL dataset statistics,
 including triple counts, class distributions, property usage, and pattern detection.
+
+``collect_all_statistics`` schedules its queries as tasks: cheaper queries
+first, dependent ones (graph sizes need the named graphs) once their inputs
+are known, up to ``max_parallel_queries`` at a time against the endpoint.
+With a ``time_budget`` it returns whatever was collected when the budget runs
+out and lists the rest in ``DatasetStatistics.missing_statistics``.
+
+In approximate mode, or in auto mode when exact queries fail or time out,
+cardinalities and distributions are estimated from pages of triples read at
+random offsets (see ``sampling``), with confidence intervals recorded in
+``DatasetStatistics.confidence_intervals``. An interval whose upper end is
+None is a lower bound.
 """
 
 import logging
+import random
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Set, Tuple, Any
+from typing import Callable, Dict, List, Optional, Set, Tuple, Any
 from datetime import datetime
+from enum import Enum
+from functools import partial
 import time
-from collections import defaultdict
+from collections import Counter, defaultdict
 
 from SPARQLWrapper import SPARQLWrapper, JSON
 from SPARQLWrapper.SPARQLExceptions import SPARQLWrapperException
 
+from ..core.exceptions import QueryExecutionError
+from ..execution.cache import ResultCache
+from .sampling import DistinctSketch, estimate_total
+
 
 logger = logging.getLogger(__name__)
 
+# Relative cost of each statistic's queries. Cheaper statistics are scheduled
+# first, so a tight time budget still yields the headline numbers.
+STATISTIC_COSTS: Dict[str, float] = {
+    'total_triples': 1,
+    'distinct_predicates': 2,
+    'named_graphs': 2,
+    'top_classes': 3,
+    'top_properties': 3,
+    'typed_resources': 3,
+    'total_literals': 4,
+    'namespace_usage': 4,
+    'detected_patterns': 4,
+    'datatype_distribution': 5,
+    'language_distribution': 5,
+    'distinct_subjects': 5,
+    'distinct_objects': 6,
+    'graph_sizes': 6,
+    'untyped_resources': 8,
+}
+
+# Statistics that can be estimated from a sample of triples
+SAMPLED_STATISTICS: Tuple[str, ...] = (
+    'distinct_subjects',
+    'distinct_predicates',
+    'distinct_objects',
+    'top_classes',
+    'top_properties',
+    'typed_resources',
+    'untyped_resources',
+    'total_literals',
+    'datatype_distribution',
+    'language_distribution',
+    'namespace_usage',
+)
+
+RDF_TYPE = 'http://www.w3.org/1999/02/22-rdf-syntax-ns#type'
+RDF_LANG_STRING = 'http://www.w3.org/1999/02/22-rdf-syntax-ns#langString'
+XSD_STRING = 'http://www.w3.org/2001/XMLSchema#string'
+
+
+class StatisticsMode(Enum):
+    """How ``collect_all_statistics`` computes cardinalities and distributions."""
+    EXACT = "exact"                # Exact queries only
+    APPROXIMATE = "approximate"    # Estimate from a sample of triples
+    AUTO = "auto"                  # Exact queries, estimating those that fail or time out
+
+
+def _namespace_of(uri: str) -> str:
+    """Get the namespace of a URI: everything up to the last # or /."""
+    if '#' in uri:
+        return uri.rsplit('#', 1)[0] + '#'
+    return uri.rsplit('/', 1)[0] + '/'
+
 
 @dataclass
 class DatasetStatistics:
@@ -61,6 +135,18 @@ class DatasetStatistics:
     collection_time: str = ""
     collection_duration_seconds: float = 0.0
     query_timeout_seconds: int = 30
+    missing_statistics: List[str] = field(default_factory=list)
+
+    # Approximation
+    estimated_statistics: List[str] = field(default_factory=list)
+    confidence_intervals: Dict[str, Any] = field(default_factory=dict)
+    confidence_level: float = 0.95
+    sample_size: int = 0
+
+    @property
+    def complete(self) -> bool:
+        """Whether every requested statistic was collected."""
+        return not self.missing_statistics
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert statistics to dictionary."""
@@ -99,6 +185,13 @@ class DatasetStatistics:
                 'collection_time': self.collection_time,
                 'collection_duration_seconds': self.collection_duration_seconds,
                 'query_timeout_seconds': self.query_timeout_seconds,
+                'missing_statistics': self.missing_statistics,
+            },
+            'approximation': {
+                'estimated_statistics': self.estimated_statistics,
+                'confidence_intervals': self.confidence_intervals,
+                'confidence_level': self.confidence_level,
+                'sample_size': self.sample_size,
             }
         }
 
@@ -111,6 +204,8 @@ class DatasetStatistics:
             f"Endpoint: {self.endpoint_url}",
             f"Collected: {self.collection_time}",
             f"Duration: {self.collection_duration_seconds:.2f}s",
+            *([f"Missing: {', '.join(self.missing_statistics)}"]
+              if self.missing_statistics else []),
             "",
             "Basic Counts:",
             f"  Total Triples: {self.total_triples:,}",
@@ -186,10 +281,164 @@ class DatasetStatistics:
                 "",
             ])
 
+        if self.estimated_statistics:
+            lines.extend([
+                f"Estimated from {self.sample_size:,} sampled triples: "
+                f"{', '.join(self.estimated_statistics)}",
+                *[f"  {name}: {interval[0]:,} - {interval[1]:,} "
+                  f"({self.confidence_level:.0%} interval)"
+                  if interval[1] is not None else f"  {name}: at least {interval[0]:,}"
+                  for name, interval in self.confidence_intervals.items()
+                  if isinstance(interval, tuple)],
+                "",
+            ])
+
         lines.append("=" * 60)
         return "\n".join(lines)
 
 
+@dataclass
+class StatisticTask:
+    """
+    One statistic to collect as part of ``collect_all_statistics``.
+
+    Attributes:
+        name: Statistic name, as listed in ``missing_statistics``
+        collect: Runs the queries; receives the results of ``depends_on``
+        apply: Stores the result in a ``DatasetStatistics``
+        cost: Relative cost; cheaper tasks are scheduled first
+        depends_on: Names of the tasks whose results ``collect`` needs
+    """
+    name: str
+    collect: Callable[..., Any]
+    apply: Callable[[DatasetStatistics, Any], None]
+    cost: float = 1.0
+    depends_on: Tuple[str, ...] = ()
+
+
+def _assign(attribute: str) -> Callable[[DatasetStatistics, Any], None]:
+    """Create an ``apply`` function storing a result in one attribute."""
+    def apply(stats: DatasetStatistics, value: Any):
+        setattr(stats, attribute, value)
+    return apply
+
+
+class TripleSample:
+    """
+    Summary of triples read from pages at random offsets.
+
+    Keeps distinct value sketches of subjects, predicates and objects, and
+    per page counts of classes, properties, namespaces, literals, datatypes
+    and languages, from which ``sampling.estimate_total`` scales each count
+    to the dataset.
+    """
+
+    def __init__(self):
+        self.page_sizes: List[int] = []
+        self.page_counts: List[Counter] = []
+        self.subjects = DistinctSketch()
+        self.predicates = DistinctSketch()
+        self.objects = DistinctSketch()
+        self.typed_subjects = DistinctSketch()
+
+    @property
+    def size(self) -> int:
+        """Number of sampled triples."""
+        return sum(self.page_sizes)
+
+    def add_page(self, bindings: List[Dict[str, Any]]):
+        """
+        Add a page of ``?s ?p ?o`` bindings.
+
+        Args:
+            bindings: SPARQL JSON result bindings
+        """
+        counts: Counter = Counter()
+        rows = 0
+        for sketch in (self.subjects, self.predicates, self.objects, self.typed_subjects):
+            sketch.start_page()
+        for binding in bindings:
+            try:
+                subject = binding['s']['value']
+                predicate = binding['p']['value']
+                obj = binding['o']
+                value = obj['value']
+            except KeyError:
+                continue
+            rows += 1
+
+            self.subjects.add(subject)
+            self.predicates.add(predicate)
+            counts['property', predicate] += 1
+            counts['namespace', _namespace_of(predicate)] += 1
+
+            if predicate == RDF_TYPE:
+                counts['class', value] += 1
+                self.typed_subjects.add(subject)
+
+            if obj.get('type') in ('literal', 'typed-literal'):
+                language = obj.get('xml:lang')
+                datatype = obj.get('datatype') or (RDF_LANG_STRING if language else XSD_STRING)
+                counts['literal', ''] += 1
+                counts['datatype', datatype] += 1
+                if language:
+                    counts['language', language] += 1
+                self.objects.add(f'"{value}"@{language}' if language else f'"{value}"^^{datatype}')
+            else:
+                self.objects.add(value)
+
+        if rows:
+            self.page_sizes.append(rows)
+            self.page_counts.append(counts)
+
+    def sampled_count(self, kind: str, key: str = '') -> int:
+        """Number of sampled triples counted under a kind and key."""
+        return sum(counts[kind, key] for counts in self.page_counts)
+
+    def estimate_count(self, kind: str, key: str, population: int) -> Tuple[float, float, float]:
+        """
+        Estimate the number of triples counted under a kind and key.
+
+        Args:
+            kind: 'class', 'property', 'namespace', 'literal', 'datatype' or 'language'
+            key: Class, property, namespace, datatype or language ('' for literals)
+            population: Total triples
+
+        Returns:
+            ``(estimate, low, high)`` with a 95% confidence interval
+        """
+        return estimate_total(
+            [counts[kind, key] for counts in self.page_counts], self.page_sizes, population
+        )
+
+    def estimate_distribution(
+        self,
+        kind: str,
+        population: int,
+        limit: Optional[int] = None
+    ) -> List[Tuple[str, Tuple[float, float, float]]]:
+        """
+        Estimate the triple counts of the most frequent keys of a kind.
+
+        Args:
+            kind: 'class', 'property', 'namespace', 'datatype' or 'language'
+            population: Total triples
+            limit: Maximum number of keys (all if None)
+
+        Returns:
+            ``(key, (estimate, low, high))`` pairs, most frequent first
+        """
+        totals: Counter = Counter()
+        for counts in self.page_counts:
+            for (counted_kind, key), count in counts.items():
+                if counted_kind == kind:
+                    totals[key] += count
+        return [
+            (key, self.estimate_count(kind, key, population))
+            for key, _ in totals.most_common(limit)
+        ]
+
+
 class StatisticsCollector:
     """
     Efficient collector for SPARQL dataset statistics.
@@ -205,7 +454,14 @@ class StatisticsCollector:
         timeout: int = 30,
         max_retries: int = 3,
         cache_results: bool = True,
-        progress_callback: Optional[callable] = None
+        progress_callback: Optional[callable] = None,
+        cache_size: int = 256,
+        cache_ttl: Optional[float] = 3600,
+        max_parallel_queries: int = 1,
+        sample_pages: int = 20,
+        sample_page_size: int = 1000,
+        sample_seed: Optional[int] = None,
+        max_probe_offset: int = 1_000_000
     ):
         """
         Initialize the statistics collector.
@@ -216,25 +472,55 @@ class StatisticsCollector:
             max_retries: Maximum number of retries for failed queries
             cache_results: Whether to cache query results
             progress_callback: Optional callback for progress reporting
+            cache_size: Maximum number of cached query results
+            cache_ttl: Seconds before a cached result expires (None = never)
+            max_parallel_queries: Maximum concurrent queries against the
+                endpoint during ``collect_all_statistics``
+            sample_pages: Pages of triples read to estimate statistics
+            sample_page_size: Triples per sampled page
+            sample_seed: Seed for choosing the sampled pages
+            max_probe_offset: Deepest OFFSET read when bounding the triple
+                count by probing or sampling pages of triples
         """
         self.endpoint_url = endpoint_url
         self.timeout = timeout
         self.max_retries = max_retries
         self.cache_results = cache_results
         self.progress_callback = progress_callback
+        self.max_parallel_queries = max(1, max_parallel_queries)
+        self.sample_pages = sample_pages
+        self.sample_page_size = sample_page_size
+        self.sample_seed = sample_seed
+        self.max_probe_offset = max(1, max_probe_offset)
 
-        self.sparql = SPARQLWrapper(endpoint_url)
-        self.sparql.setTimeout(timeout)
-        self.sparql.setReturnFormat(JSON)
+        self.sparql = self._create_sparql()
 
-        self._cache: Dict[str, Any] = {}
+        self._cache = ResultCache(max_entries=cache_size, default_ttl=cache_ttl)
         self._query_count = 0
         self._failed_queries: List[str] = []
 
+        # Worker threads query through their own SPARQLWrapper
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._progress_lock = threading.Lock()
+
+    def _create_sparql(self) -> SPARQLWrapper:
+        """Create a SPARQLWrapper configured for the endpoint."""
+        sparql = SPARQLWrapper(self.endpoint_url)
+        sparql.setTimeout(self.timeout)
+        sparql.setReturnFormat(JSON)
+        return sparql
+
+    def _init_worker(self):
+        """Give a worker thread its own SPARQLWrapper, which is not thread-safe."""
+        self._local.sparql = self._create_sparql()
+
     def _report_progress(self, message: str, current: int = 0, total: int = 0):
         """Report progress to callback if available."""
         if self.progress_callback:
-            self.progress_callback(message, current, total)
+            # Statistics collected in parallel report from worker threads
+            with self._progress_lock:
+                self.progress_callback(message, current, total)
         else:
             if total > 0:
                 logger.info(f"{message} ({current}/{total})")
@@ -259,20 +545,25 @@ class StatisticsCollector:
             Query results as dictionary or None if failed
         """
         # Check cache
-        if cache_key and self.cache_results and cache_key in self._cache:
-            logger.debug(f"Using cached result for: {cache_key}")
-            return self._cache[cache_key]
+        if cache_key and self.cache_results:
+            cached = self._cache.get(cache_key)
+            if cached is not None:
+                logger.debug(f"Using cached result for: {cache_key}")
+                return cached
 
         try:
-            self._query_count += 1
-            logger.debug(f"Executing query #{self._query_count}: {query[:100]}...")
+            with self._lock:
+                self._query_count += 1
+                query_number = self._query_count
+            logger.debug(f"Executing query #{query_number}: {query[:100]}...")
 
-            self.sparql.setQuery(query)
-            results = self.sparql.queryAndConvert()
+            sparql = getattr(self._local, 'sparql', None) or self.sparql
+            sparql.setQuery(query)
+            results = sparql.queryAndConvert()
 
             # Cache results
             if cache_key and self.cache_results:
-                self._cache[cache_key] = results
+                self._cache.set(cache_key, results, endpoint_url=self.endpoint_url)
 
             return results
 
@@ -283,15 +574,37 @@ class StatisticsCollector:
                 time.sleep(2 ** retry_count)  # Exponential backoff
                 return self._execute_query(query, cache_key, retry_count + 1)
             else:
-                self._failed_queries.append(query[:200])
+                self._record_failure(query)
                 logger.error(f"Query failed after {self.max_retries} retries")
                 return None
 
         except Exception as e:
+            # Includes client-side timeouts, which are not retried
             logger.error(f"Unexpected error executing query: {str(e)}")
-            self._failed_queries.append(query[:200])
+            self._record_failure(query)
             return None
 
+    def _record_failure(self, query: str):
+        """Record a failed query, also for the statistic being collected."""
+        self._failed_queries.append(query[:200])
+        self._local.failures = getattr(self._local, 'failures', 0) + 1
+
+    def _strict(self, collect: Callable[..., Any]) -> Callable[..., Any]:
+        """
+        Make a statistic fail when one of its queries fails.
+
+        The query methods report 0 or empty results for failed queries; in
+        ``collect_all_statistics`` such a statistic is listed as missing, or
+        estimated in auto mode, instead.
+        """
+        def run(*args):
+            self._local.failures = 0
+            value = collect(*args)
+            if self._local.failures:
+                raise QueryExecutionError(f"{self._local.failures} queries failed")
+            return value
+        return run
+
     def _extract_single_value(self, results: Optional[Dict], var_name: str) -> int:
         """Extract a single integer value from query results."""
         if not results or 'results' not in results:
@@ -638,13 +951,7 @@ class StatisticsCollector:
                     predicate = binding['p']['value']
                     count = int(binding['count']['value'])
 
-                    # Extract namespace (everything before # or last /)
-                    if '#' in predicate:
-                        namespace = predicate.rsplit('#', 1)[0] + '#'
-                    else:
-                        namespace = predicate.rsplit('/', 1)[0] + '/'
-
-                    namespace_counts[namespace] += count
+                    namespace_counts[_namespace_of(predicate)] += count
 
                 except (ValueError, KeyError):
                     continue
@@ -732,24 +1039,468 @@ class StatisticsCollector:
         logger.info(f"Detected {len(patterns)} patterns")
         return patterns
 
+    def _statistic_tasks(
+        self,
+        include_graphs: bool,
+        class_limit: int,
+        property_limit: int
+    ) -> List[StatisticTask]:
+        """Build the tasks collecting each statistic."""
+        def apply_top_classes(stats: DatasetStatistics, classes: List[Tuple[str, int]]):
+            stats.top_classes = classes
+            stats.total_classes = len(classes)
+
+        def apply_top_properties(stats: DatasetStatistics, properties: List[Tuple[str, int]]):
+            stats.top_properties = properties
+            stats.total_properties = len(properties)
+
+        tasks = [
+            StatisticTask('total_triples', self.count_total_triples, _assign('total_triples')),
+            StatisticTask('distinct_subjects', self.count_distinct_subjects, _assign('distinct_subjects')),
+            StatisticTask('distinct_predicates', self.count_distinct_predicates, _assign('distinct_predicates')),
+            StatisticTask('distinct_objects', self.count_distinct_objects, _assign('distinct_objects')),
+            StatisticTask('top_classes', lambda: self.get_top_classes(class_limit), apply_top_classes),
+            StatisticTask('top_properties', lambda: self.get_top_properties(property_limit), apply_top_properties),
+            StatisticTask('typed_resources', self.count_typed_resources, _assign('typed_resources')),
+            StatisticTask('untyped_resources', self.count_untyped_resources, _assign('untyped_resources')),
+            StatisticTask('total_literals', self.count_literals, _assign('total_literals')),
+            StatisticTask('datatype_distribution', self.get_datatype_distribution, _assign('datatype_distribution')),
+            StatisticTask('language_distribution', self.get_language_distribution, _assign('language_distribution')),
+            StatisticTask('namespace_usage', self.analyze_namespace_usage, _assign('namespace_usage')),
+            StatisticTask('detected_patterns', self.detect_patterns, _assign('detected_patterns')),
+        ]
+
+        if include_graphs:
+            tasks.extend([
+                StatisticTask('named_graphs', self.get_named_graphs, _assign('named_graphs')),
+                StatisticTask(
+                    'graph_sizes',
+                    lambda graphs: self.get_graph_sizes(graphs) if graphs else {},
+                    _assign('graph_sizes'),
+                    depends_on=('named_graphs',),
+                ),
+            ])
+
+        for task in tasks:
+            task.collect = self._strict(task.collect)
+            task.cost = STATISTIC_COSTS.get(task.name, task.cost)
+        return tasks
+
+    def _run_tasks(
+        self,
+        tasks: List[StatisticTask],
+        stats: DatasetStatistics,
+        deadline: Optional[float] = None
+    ) -> List[str]:
+        """
+        Run statistic tasks cheapest first, respecting their dependencies.
+
+        Up to ``max_parallel_queries`` tasks run at once. Results are applied
+        to ``stats`` in the calling thread as tasks complete.
+
+        Args:
+            tasks: Tasks to run
+            stats: Statistics receiving the results
+            deadline: ``time.monotonic()`` value after which no task is
+                started or waited for (no limit if None)
+
+        Returns:
+            Names of the tasks that did not complete
+        """
+        pending = sorted(tasks, key=lambda task: task.cost)
+        running: Dict[Future, StatisticTask] = {}
+        results: Dict[str, Any] = {}
+        # Dependencies on tasks that are not scheduled can never be met
+        unavailable: Set[str] = {
+            name for task in tasks for name in task.depends_on
+        } - {task.name for task in tasks}
+        total = len(tasks)
+
+        # A single query at a time without a deadline runs in the calling thread
+        pool = None
+        if self.max_parallel_queries > 1 or deadline is not None:
+            pool = ThreadPoolExecutor(
+                max_workers=self.max_parallel_queries,
+                thread_name_prefix="sparql-statistics",
+                initializer=self._init_worker,
+            )
+
+        out_of_time = False
+        try:
+            while pending or running:
+                if deadline is not None and time.monotonic() >= deadline:
+                    out_of_time = True
+                    break
+
+                # Start the cheapest tasks whose dependencies are available
+                for task in list(pending):
+                    if len(running) >= self.max_parallel_queries:
+                        break
+                    if any(name in unavailable for name in task.depends_on):
+                        pending.remove(task)
+                        unavailable.add(task.name)
+                        continue
+                    if any(name not in results for name in task.depends_on):
+                        continue
+                    pending.remove(task)
+                    args = [results[name] for name in task.depends_on]
+                    running[self._submit_task(pool, task, args)] = task
+
+                if not running:
+                    # Only tasks with failed dependencies were left
+                    continue
+
+                timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+                done, _ = wait(running, timeout=timeout, return_when=FIRST_COMPLETED)
+                if not done:
+                    out_of_time = True
+                    break
+
+                for future in done:
+                    task = running.pop(future)
+                    try:
+                        results[task.name] = future.result()
+                    except Exception as e:
+                        logger.error(f"Failed to collect {task.name}: {e}")
+                        unavailable.add(task.name)
+                        continue
+                    task.apply(stats, results[task.name])
+                    self._report_progress(f"Collected {task.name}", len(results), total)
+        finally:
+            if pool is not None:
+                # Queries still running when the budget runs out are abandoned;
+                # their results still reach the cache for the next collection
+                pool.shutdown(wait=not out_of_time, cancel_futures=True)
+
+        if out_of_time:
+            logger.warning(
+                f"Statistics time budget exhausted with {len(running)} queries running "
+                f"and {len(pending)} not started"
+            )
+
+        return [task.name for task in tasks if task.name not in results]
+
+    @staticmethod
+    def _submit_task(
+        pool: Optional[ThreadPoolExecutor],
+        task: StatisticTask,
+        args: List[Any]
+    ) -> Future:
+        """Run a task on the pool, or right away if there is no pool."""
+        if pool is not None:
+            return pool.submit(task.collect, *args)
+
+        future: Future = Future()
+        try:
+            future.set_result(task.collect(*args))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+    def _fetch_sample_page(self, offset: int) -> List[Dict[str, Any]]:
+        """Read one page of triples for sampling."""
+        query = f"SELECT ?s ?p ?o WHERE {{ ?s ?p ?o }} OFFSET {offset} LIMIT {self.sample_page_size}"
+        results = self._execute_query(
+            query, cache_key=f"sample_page_{self.sample_page_size}_{offset}"
+        )
+        if not results or 'results' not in results:
+            raise QueryExecutionError(f"Failed to read sample page at offset {offset}")
+        return results['results']['bindings']
+
+    def sample_triples(
+        self,
+        total_triples: int,
+        deadline: Optional[float] = None
+    ) -> TripleSample:
+        """
+        Read pages of triples at random offsets.
+
+        Reads ``sample_pages`` non-overlapping pages of ``sample_page_size``
+        triples, or every page of a dataset smaller than that. Pages are
+        read like statistics in ``collect_all_statistics``; pages not read
+        by the deadline, or whose query failed, are left out of the sample.
+
+        Deep OFFSETs time out on large endpoints, so pages are only drawn
+        from the first ``max_probe_offset`` triples. On a larger dataset the
+        sample, and the estimates scaled from it, are biased towards the
+        triples the endpoint returns first, which are often clustered by
+        subject or graph.
+
+        Args:
+            total_triples: Triples in the dataset
+            deadline: ``time.monotonic()`` value to stop reading at
+
+        Returns:
+            Sample of the dataset
+        """
+        page_size = self.sample_page_size
+        sampled_range = min(total_triples, self.max_probe_offset + page_size)
+        if sampled_range < total_triples:
+            logger.info(
+                f"Sampling the first {sampled_range:,} of {total_triples:,} triples; "
+                f"estimates may be biased"
+            )
+        slots = -(-sampled_range // page_size)
+        if slots <= self.sample_pages:
+            offsets = [slot * page_size for slot in range(slots)]
+        else:
+            rng = random.Random(self.sample_seed)
+            offsets = sorted(slot * page_size for slot in rng.sample(range(slots), self.sample_pages))
+
+        self._report_progress(f"Sampling {len(offsets)} pages of {page_size} triples...")
+        sample = TripleSample()
+        tasks = [
+            StatisticTask(
+                f"sample_page_{offset}",
+                partial(self._fetch_sample_page, offset),
+                lambda stats, bindings: sample.add_page(bindings),
+            )
+            for offset in offsets
+        ]
+        self._run_tasks(tasks, DatasetStatistics(), deadline)
+
+        logger.info(f"Sampled {sample.size:,} triples from {len(sample.page_sizes)} pages")
+        return sample
+
+    def _declared_triple_count(self) -> Optional[int]:
+        """
+        Get the triple count from cheaper sources than COUNT(*).
+
+        Tries the ``void:triples`` a VoID description declares, then the sum
+        of per-predicate counts, which some stores answer from index
+        statistics.
+
+        Returns:
+            Triple count, or None if neither source gave one
+        """
+        queries = [
+            ("void_triples", """
+            PREFIX void: <http://rdfs.org/ns/void#>
+            SELECT (MAX(?n) AS ?triples)
+            WHERE {
+                ?dataset void:triples ?n
+            }
+            """),
+            ("predicate_triples", """
+            SELECT (SUM(?count) AS ?triples)
+            WHERE {
+                { SELECT ?p (COUNT(*) AS ?count) WHERE { ?s ?p ?o } GROUP BY ?p }
+            }
+            """),
+        ]
+        for cache_key, query in queries:
+            results = self._execute_query(query, cache_key=cache_key)
+            count = self._extract_single_value(results, "triples")
+            if count > 0:
+                return count
+        return None
+
+    def estimate_triple_count(
+        self,
+        deadline: Optional[float] = None
+    ) -> Optional[Tuple[int, Optional[int]]]:
+        """
+        Bound the number of triples for when COUNT fails.
+
+        Uses the count declared in VoID or the sum of per-predicate counts if
+        the endpoint gives one. Otherwise probes offsets: doubles the offset
+        up to ``max_probe_offset`` until no triple is found, then bisects
+        until the bounds are within 1% of each other. A dataset with a triple
+        at ``max_probe_offset`` only gets a lower bound.
+
+        Args:
+            deadline: ``time.monotonic()`` value to stop probing at
+
+        Returns:
+            ``(low, high)`` bounds on the triple count, with ``high`` None
+            for a lower bound, or None if no bound was found
+        """
+        def has_at_least(count: int) -> bool:
+            query = f"SELECT ?s WHERE {{ ?s ?p ?o }} OFFSET {count - 1} LIMIT 1"
+            results = self._execute_query(query, cache_key=f"offset_probe_{count}")
+            if not results or 'results' not in results:
+                raise QueryExecutionError(f"Offset probe at {count} failed")
+            return bool(results['results']['bindings'])
+
+        def out_of_time() -> bool:
+            return deadline is not None and time.monotonic() >= deadline
+
+        if out_of_time():
+            return None
+
+        self._report_progress("Estimating triple count...")
+        declared = self._declared_triple_count()
+        if declared is not None:
+            return declared, declared
+        if out_of_time():
+            return None
+
+        cap = self.max_probe_offset + 1
+        try:
+            if not has_at_least(1):
+                return 0, 0
+
+            low, count = 1, min(cap, max(2, self.sample_page_size))
+            while has_at_least(count):
+                if count == cap:
+                    logger.info(f"Dataset has more than {self.max_probe_offset:,} triples")
+                    return count, None
+                if out_of_time():
+                    return None
+                low, count = count, min(cap, count * 2)
+            high = count - 1
+
+            while high - low > max(1, low // 100) and not out_of_time():
+                middle = (low + high + 1) // 2
+                if has_at_least(middle):
+                    low = middle
+                else:
+                    high = middle - 1
+        except QueryExecutionError as e:
+            logger.warning(f"Could not estimate triple count: {e}")
+            return None
+
+        return low, high
+
+    def _apply_estimates(
+        self,
+        stats: DatasetStatistics,
+        sample: TripleSample,
+        names: List[str],
+        population: int,
+        class_limit: int,
+        property_limit: int
+    ):
+        """Store estimates of the named statistics with their intervals."""
+        intervals = stats.confidence_intervals
+
+        def scalar(name: str, estimate: Tuple[float, float, float]):
+            value, low, high = estimate
+            setattr(stats, name, round(value))
+            intervals[name] = (round(low), round(high))
+
+        def distribution(name: str, kind: str, limit: Optional[int] = None) -> List[Tuple[str, int]]:
+            estimates = sample.estimate_distribution(kind, population, limit)
+            intervals[name] = {key: (round(low), round(high)) for key, (_, low, high) in estimates}
+            return [(key, round(value)) for key, (value, _, _) in estimates]
+
+        size = sample.size
+        subjects = sample.subjects.estimate(size, population)
+        type_triples = sample.estimate_count('property', RDF_TYPE, population)
+        # Type triples are ordered like the other triples of their subject
+        typed = sample.typed_subjects.estimate(
+            sample.sampled_count('property', RDF_TYPE),
+            round(type_triples[0]),
+            clustering=sample.subjects.clustering(),
+        )
+
+        for name in names:
+            if name == 'distinct_subjects':
+                scalar(name, subjects)
+            elif name == 'distinct_predicates':
+                scalar(name, sample.predicates.estimate(size, population))
+            elif name == 'distinct_objects':
+                scalar(name, sample.objects.estimate(size, population))
+            elif name == 'typed_resources':
+                scalar(name, typed)
+            elif name == 'untyped_resources':
+                scalar(name, (
+                    max(0.0, subjects[0] - typed[0]),
+                    max(0.0, subjects[1] - typed[2]),
+                    max(0.0, subjects[2] - typed[1]),
+                ))
+            elif name == 'total_literals':
+                scalar(name, sample.estimate_count('literal', '', population))
+            elif name == 'top_classes':
+                stats.top_classes = distribution(name, 'class', class_limit)
+                stats.total_classes = len(stats.top_classes)
+            elif name == 'top_properties':
+                stats.top_properties = distribution(name, 'property', property_limit)
+                stats.total_properties = len(stats.top_properties)
+            elif name == 'datatype_distribution':
+                stats.datatype_distribution = dict(distribution(name, 'datatype', 20))
+            elif name == 'language_distribution':
+                stats.language_distribution = dict(distribution(name, 'language', 20))
+            elif name == 'namespace_usage':
+                stats.namespace_usage = dict(distribution(name, 'namespace'))
+            else:
+                continue
+            stats.estimated_statistics.append(name)
+
+    def _estimate_statistics(
+        self,
+        stats: DatasetStatistics,
+        names: List[str],
+        deadline: Optional[float],
+        class_limit: int,
+        property_limit: int
+    ):
+        """Estimate statistics from a sample of triples."""
+        if 'total_triples' in stats.missing_statistics:
+            bounds = self.estimate_triple_count(deadline)
+            if bounds is None:
+                stats.missing_statistics.extend(
+                    name for name in names if name not in stats.missing_statistics
+                )
+                return
+            low, high = bounds
+            stats.total_triples = low if high is None else (low + high) // 2
+            stats.confidence_intervals['total_triples'] = bounds
+            stats.estimated_statistics.append('total_triples')
+            stats.missing_statistics.remove('total_triples')
+
+        if stats.total_triples == 0:
+            # Nothing to sample: every count is 0
+            stats.missing_statistics = [n for n in stats.missing_statistics if n not in names]
+            return
+
+        sample = self.sample_triples(stats.total_triples, deadline)
+        stats.sample_size = sample.size
+        if sample.size:
+            self._apply_estimates(
+                stats, sample, names, stats.total_triples, class_limit, property_limit
+            )
+
+        estimated = set(stats.estimated_statistics)
+        stats.missing_statistics = [n for n in stats.missing_statistics if n not in estimated]
+        stats.missing_statistics.extend(
+            name for name in names
+            if name not in estimated and name not in stats.missing_statistics
+        )
+
     def collect_all_statistics(
         self,
         include_graphs: bool = False,
         class_limit: int = 20,
-        property_limit: int = 20
+        property_limit: int = 20,
+        time_budget: Optional[float] = None,
+        mode: StatisticsMode = StatisticsMode.EXACT
     ) -> DatasetStatistics:
         """
         Collect comprehensive dataset statistics.
 
+        Queries run cheapest first, up to ``max_parallel_queries`` at a time.
+        When the time budget runs out, the statistics collected so far are
+        returned and the others are listed in ``missing_statistics``.
+
+        In approximate mode the statistics in ``SAMPLED_STATISTICS`` are
+        estimated from a sample of triples instead of queried; in auto mode
+        only those whose exact queries fail or time out are. Estimated
+        statistics are listed in ``estimated_statistics``, with their
+        intervals in ``confidence_intervals``.
+
         Args:
             include_graphs: Whether to analyze named graphs (can be slow)
             class_limit: Maximum number of top classes to collect
             property_limit: Maximum number of top properties to collect
+            time_budget: Wall-clock budget in seconds (None = no limit)
+            mode: Exact, approximate or auto (also accepted as a string)
 
         Returns:
             DatasetStatistics object with all collected statistics
         """
         start_time = time.time()
+        deadline = time.monotonic() + time_budget if time_budget is not None else None
 
         logger.info(f"Starting statistics collection for {self.endpoint_url}")
         self._report_progress("Collecting dataset statistics...")
@@ -760,40 +1511,21 @@ class StatisticsCollector:
             query_timeout_seconds=self.timeout
         )
 
-        # Basic counts (parallel concepts, sequential execution for simplicity)
-        stats.total_triples = self.count_total_triples()
-        stats.distinct_subjects = self.count_distinct_subjects()
-        stats.distinct_predicates = self.count_distinct_predicates()
-        stats.distinct_objects = self.count_distinct_objects()
-
-        # Class statistics
-        stats.top_classes = self.get_top_classes(class_limit)
-        stats.total_classes = len(stats.top_classes)
+        mode = StatisticsMode(mode)
+        tasks = self._statistic_tasks(include_graphs, class_limit, property_limit)
+        if mode is StatisticsMode.APPROXIMATE:
+            tasks = [task for task in tasks if task.name not in SAMPLED_STATISTICS]
+        stats.missing_statistics = self._run_tasks(tasks, stats, deadline)
 
-        # Property statistics
-        stats.top_properties = self.get_top_properties(property_limit)
-        stats.total_properties = len(stats.top_properties)
-
-        # Type statistics
-        stats.typed_resources = self.count_typed_resources()
-        stats.untyped_resources = self.count_untyped_resources()
-
-        # Literal statistics
-        stats.total_literals = self.count_literals()
-        stats.datatype_distribution = self.get_datatype_distribution()
-        stats.language_distribution = self.get_language_distribution()
-
-        # Graph statistics (optional, can be slow)
-        if include_graphs:
-            stats.named_graphs = self.get_named_graphs()
-            if stats.named_graphs:
-                stats.graph_sizes = self.get_graph_sizes(stats.named_graphs)
-
-        # Namespace analysis
-        stats.namespace_usage = self.analyze_namespace_usage()
-
-        # Pattern detection
-        stats.detected_patterns = self.detect_patterns()
+        if mode is StatisticsMode.APPROXIMATE:
+            estimate = list(SAMPLED_STATISTICS)
+        elif mode is StatisticsMode.AUTO:
+            estimate = [name for name in SAMPLED_STATISTICS if name in stats.missing_statistics]
+        else:
+            estimate = []
+        if estimate:
+            logger.info(f"Estimating from a sample: {', '.join(estimate)}")
+            self._estimate_statistics(stats, estimate, deadline, class_limit, property_limit)
 
         # Finalize
         stats.collection_duration_seconds = time.time() - start_time
@@ -804,7 +1536,11 @@ class StatisticsCollector:
         if self._failed_queries:
             logger.warning(f"{len(self._failed_queries)} queries failed")
 
-        self._report_progress("Statistics collection complete!")
+        if stats.missing_statistics:
+            logger.warning(f"Missing statistics: {', '.join(stats.missing_statistics)}")
+            self._report_progress("Statistics collection incomplete")
+        else:
+            self._report_progress("Statistics collection complete!")
 
         return stats
 
@@ -817,7 +1553,8 @@ class StatisticsCollector:
         """Get information about the cache."""
         return {
             'cache_size': len(self._cache),
-            'cache_keys': list(self._cache.keys()),
+            'cache_keys': self._cache.keys(),
+            'cache_stats': self._cache.get_statistics(),
             'query_count': self._query_count,
             'failed_queries': len(self._failed_queries)
         }
@@ -829,7 +1566,10 @@ def collect_statistics(
     include_graphs: bool = False,
     class_limit: int = 20,
     property_limit: int = 20,
-    progress_callback: Optional[callable] = None
+    progress_callback: Optional[callable] = None,
+    max_parallel_queries: int = 1,
+    time_budget: Optional[float] = None,
+    mode: StatisticsMode = StatisticsMode.EXACT
 ) -> DatasetStatistics:
     """
     Convenience function to collect dataset statistics.
@@ -841,6 +1581,9 @@ def collect_statistics(
         class_limit: Maximum number of top classes to collect
         property_limit: Maximum number of top properties to collect
         progress_callback: Optional callback for progress reporting
+        max_parallel_queries: Maximum concurrent queries against the endpoint
+        time_budget: Wall-clock budget in seconds (None = no limit)
+        mode: Exact, approximate or auto (see ``StatisticsMode``)
 
     Returns:
         DatasetStatistics object
@@ -848,13 +1591,16 @@ def collect_statistics(
     collector = StatisticsCollector(
         endpoint_url=endpoint_url,
         timeout=timeout,
-        progress_callback=progress_callback
+        progress_callback=progress_callback,
+        max_parallel_queries=max_parallel_queries
     )
 
     return collector.collect_all_statistics(
         include_graphs=include_graphs,
         class_limit=class_limit,
-        property_limit=property_limit
+        property_limit=property_limit,
+        time_budget=time_budget,
+        mode=mode
     )
 
 
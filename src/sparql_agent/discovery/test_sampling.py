@@ -0,0 +1,263 @@
+"""
+Tests for approximate statistics.
+
+Tests cover:
+- HyperLogLog accuracy and merging
+- Distinct value estimates scaled from a sample
+- Cluster sample totals and their confidence intervals
+- Approximate and auto modes of StatisticsCollector
+"""
+
+import random
+import re
+
+import pytest
+
+from sparql_agent.discovery.sampling import DistinctSketch, HyperLogLog, estimate_total
+from sparql_agent.discovery.statistics import (
+    RDF_TYPE,
+    SAMPLED_STATISTICS,
+    StatisticsCollector,
+    StatisticsMode,
+)
+
+
+class TestHyperLogLog:
+    @pytest.mark.parametrize("count", [10, 1000, 50000])
+    def test_count_within_error(self, count):
+        hll = HyperLogLog()
+        for i in range(count):
+            hll.add(f"http://example.org/r{i}")
+            hll.add(f"http://example.org/r{i}")
+        assert abs(hll.count() - count) <= 4 * hll.relative_error * count + 1
+
+    def test_merge(self):
+        left, right = HyperLogLog(10), HyperLogLog(10)
+        for i in range(3000):
+            (left if i % 2 else right).add(str(i))
+        left.merge(right)
+        assert abs(left.count() - 3000) <= 4 * left.relative_error * 3000
+
+    def test_invalid_precision(self):
+        with pytest.raises(ValueError):
+            HyperLogLog(20)
+        with pytest.raises(ValueError):
+            HyperLogLog(10).merge(HyperLogLog(11))
+
+
+class TestDistinctSketch:
+    def test_full_sample_is_distinct_count(self):
+        sketch = DistinctSketch()
+        for i in range(500):
+            sketch.add(str(i % 100))
+        estimate, low, high = sketch.estimate(500, 500)
+        assert low <= 100 <= high
+        assert estimate == pytest.approx(100, rel=0.05)
+
+    def test_scales_singletons(self):
+        # Each of 10,000 subjects has 10 triples; a 10% sample of triples
+        # sees most subjects about once
+        population = [f"s{i}" for i in range(10000) for _ in range(10)]
+        sample = random.Random(1).sample(population, 10000)
+        sketch = DistinctSketch(capacity=1024)
+        for value in sample:
+            sketch.add(value)
+
+        estimate, low, high = sketch.estimate(len(sample), len(population))
+        assert low <= 10000 <= high
+        assert sketch.distinct() < estimate <= len(population)
+
+    def test_clustered_values(self):
+        # Pages of 100 triples over subjects with 20 adjacent triples each
+        sketch = DistinctSketch()
+        for page in (3, 40, 71):
+            sketch.start_page()
+            for i in range(100):
+                sketch.add(f"s{(page * 100 + i) // 20}")
+
+        assert sketch.clustering() == 1.0
+        estimate, low, high = sketch.estimate(300, 20000)
+        assert estimate == pytest.approx(1000)
+        assert low <= 1000 <= high
+
+    def test_tracking_is_bounded(self):
+        sketch = DistinctSketch(capacity=64)
+        for i in range(10000):
+            sketch.add(str(i))
+        assert len(sketch._tracked) <= 64
+        assert sketch.singleton_ratio() == 1.0
+
+
+class TestEstimateTotal:
+    def test_uniform_pages(self):
+        estimate, low, high = estimate_total([10, 10, 10, 10], [100] * 4, 10000)
+        assert estimate == pytest.approx(1000)
+        assert low == high == pytest.approx(1000)
+
+    def test_interval_widens_with_spread(self):
+        _, low, high = estimate_total([0, 20, 5, 15], [100] * 4, 10000)
+        assert low < 1000 < high
+        assert low >= 0
+
+    def test_empty(self):
+        assert estimate_total([], [], 100) == (0.0, 0.0, 100.0)
+
+
+DATASET_SIZE = 20000
+
+
+def make_dataset():
+    """1,000 typed people with 19 more triples each, some literals tagged."""
+    triples = []
+    for i in range(1000):
+        subject = {'type': 'uri', 'value': f'http://example.org/person/{i}'}
+        triples.append((subject, {'type': 'uri', 'value': RDF_TYPE},
+                        {'type': 'uri', 'value': 'http://xmlns.com/foaf/0.1/Person'}))
+        for j in range(19):
+            if j % 2:
+                obj = {'type': 'literal', 'value': f'name {i} {j}', 'xml:lang': 'en'}
+            else:
+                obj = {'type': 'uri', 'value': f'http://example.org/thing/{(i * 19 + j) % 5000}'}
+            triples.append((subject, {'type': 'uri', 'value': f'http://example.org/p{j}'}, obj))
+    return triples
+
+
+TOTAL_TRIPLES = "SELECT (COUNT(*) AS ?triples) WHERE { ?s ?p ?o }"
+DISTINCT_SUBJECTS = "SELECT (COUNT(DISTINCT ?s) AS ?count) WHERE { ?s ?p ?o }"
+DISTINCT_OBJECTS = "SELECT (COUNT(DISTINCT ?o) AS ?count) WHERE { ?s ?p ?o }"
+
+
+class DatasetEndpoint:
+    """SPARQLWrapper serving pages and counts of a dataset; some queries time out."""
+
+    def __init__(self, timing_out=()):
+        self.triples = make_dataset()
+        self.timing_out = set(timing_out)
+        self.query = None
+
+    def setQuery(self, query):
+        self.query = query
+
+    def queryAndConvert(self):
+        if self.query in self.timing_out:
+            raise TimeoutError("timed out")
+        page = re.search(r"OFFSET (\d+) LIMIT (\d+)", self.query)
+        if page:
+            offset, limit = int(page.group(1)), int(page.group(2))
+            return {'results': {'bindings': [
+                {'s': s, 'p': p, 'o': o}
+                for s, p, o in self.triples[offset:offset + limit]
+            ]}}
+        if self.query == TOTAL_TRIPLES:
+            return {'results': {'bindings': [{'triples': {'value': str(len(self.triples))}}]}}
+        return {'results': {'bindings': [{'count': {'value': '1'}}]}}
+
+
+class VoIDEndpoint(DatasetEndpoint):
+    """Dataset endpoint with a VoID description; records the queries it gets."""
+
+    def __init__(self, timing_out=()):
+        super().__init__(timing_out)
+        self.queries = []
+
+    def queryAndConvert(self):
+        self.queries.append(self.query)
+        if "void:triples" in self.query:
+            return {'results': {'bindings': [{'triples': {'value': str(len(self.triples))}}]}}
+        return super().queryAndConvert()
+
+
+def make_collector(endpoint, **kwargs):
+    collector = StatisticsCollector(
+        "http://example.org/sparql",
+        sample_pages=8,
+        sample_page_size=500,
+        sample_seed=7,
+        **kwargs,
+    )
+    collector.sparql = endpoint
+    return collector
+
+
+class TestApproximateMode:
+    def test_estimates_sampled_statistics(self):
+        collector = make_collector(DatasetEndpoint())
+        stats = collector.collect_all_statistics(mode="approximate")
+
+        assert stats.complete
+        assert stats.total_triples == DATASET_SIZE
+        assert stats.sample_size == 4000
+        assert set(stats.estimated_statistics) == set(SAMPLED_STATISTICS)
+
+        low, high = stats.confidence_intervals['distinct_subjects']
+        assert low <= 1000 <= high
+        assert stats.distinct_predicates == pytest.approx(20, abs=2)
+        assert stats.typed_resources == pytest.approx(1000, rel=0.1)
+        assert stats.top_classes[0][0] == 'http://xmlns.com/foaf/0.1/Person'
+        low, high = stats.confidence_intervals['top_classes']['http://xmlns.com/foaf/0.1/Person']
+        assert low <= 1000 <= high
+        assert list(stats.language_distribution) == ['en']
+        assert stats.total_literals == pytest.approx(9000, rel=0.2)
+        assert "Estimated from 4,000 sampled triples" in stats.summary()
+
+    def test_small_dataset_is_read_completely(self):
+        endpoint = DatasetEndpoint()
+        endpoint.triples = endpoint.triples[:1000]
+        stats = make_collector(endpoint).collect_all_statistics(mode=StatisticsMode.APPROXIMATE)
+
+        assert stats.sample_size == 1000
+        assert stats.distinct_subjects == pytest.approx(50, abs=2)
+        assert dict(stats.top_properties)[RDF_TYPE] == 50
+
+
+class TestAutoMode:
+    def test_falls_back_for_failed_queries(self):
+        endpoint = DatasetEndpoint(timing_out={DISTINCT_SUBJECTS, DISTINCT_OBJECTS})
+        stats = make_collector(endpoint).collect_all_statistics(mode="auto")
+
+        assert stats.complete
+        assert stats.estimated_statistics == ['distinct_subjects', 'distinct_objects']
+        assert stats.distinct_predicates == 1
+        assert 'distinct_predicates' not in stats.confidence_intervals
+
+    def test_probes_triple_count_when_count_fails(self):
+        endpoint = DatasetEndpoint(timing_out={TOTAL_TRIPLES, DISTINCT_SUBJECTS})
+        stats = make_collector(endpoint).collect_all_statistics(mode="auto")
+
+        low, high = stats.confidence_intervals['total_triples']
+        assert low <= DATASET_SIZE <= high
+        assert high - low <= DATASET_SIZE // 100 + 1
+        assert 'total_triples' in stats.estimated_statistics
+        assert 'distinct_subjects' in stats.estimated_statistics
+
+    def test_declared_void_count_skips_probing(self):
+        endpoint = VoIDEndpoint(timing_out={TOTAL_TRIPLES})
+        collector = make_collector(endpoint)
+
+        assert collector.estimate_triple_count() == (DATASET_SIZE, DATASET_SIZE)
+        assert not any("OFFSET" in query for query in endpoint.queries)
+
+    def test_probe_offset_is_capped(self):
+        endpoint = DatasetEndpoint(timing_out={TOTAL_TRIPLES, DISTINCT_SUBJECTS})
+        collector = make_collector(endpoint, max_probe_offset=2000)
+        stats = collector.collect_all_statistics(mode="auto")
+
+        assert stats.confidence_intervals['total_triples'] == (2001, None)
+        assert stats.total_triples == 2001
+        assert "total_triples: at least 2,001" in stats.summary()
+
+    def test_sample_offsets_are_capped(self):
+        endpoint = VoIDEndpoint()
+        collector = make_collector(endpoint, max_probe_offset=1000)
+        sample = collector.sample_triples(10**9)
+
+        offsets = [int(re.search(r"OFFSET (\d+)", query).group(1)) for query in endpoint.queries]
+        assert offsets and max(offsets) <= 1000
+        assert sample.size > 0
+
+    def test_exact_mode_reports_failures_as_missing(self):
+        endpoint = DatasetEndpoint(timing_out={DISTINCT_SUBJECTS})
+        stats = make_collector(endpoint).collect_all_statistics()
+
+        assert stats.missing_statistics == ['distinct_subjects']
+        assert not stats.estimated_statistics
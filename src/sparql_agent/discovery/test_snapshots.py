@@ -0,0 +1,200 @@
+"""
+Tests for persisted discovery snapshots.
+
+Tests cover:
+- Reusing task results when the change signals are unchanged
+- Re-running data tasks when the data changed, software tasks when the
+  server changed
+- Refresh, maximum age, and reuse of timed out but not failed tasks,
+  unless the timeout grew
+- Snapshot store round trip and unreadable snapshots
+"""
+
+import json
+
+import pytest
+
+from sparql_agent.discovery.capabilities import CapabilitiesDetector
+from sparql_agent.discovery.snapshots import (
+    ChangeSignals,
+    DiscoverySnapshot,
+    SnapshotStore,
+    TaskSnapshot,
+    task_fingerprint,
+)
+
+
+ENDPOINT = "http://example.org/sparql"
+
+TASKS = ('sparql_version', 'features', 'named_graphs', 'namespaces', 'supported_functions', 'statistics')
+
+
+class StubDetector(CapabilitiesDetector):
+    """Detector whose tasks and change signals are canned and counted."""
+
+    def __init__(self, store, signals, failures=None, **kwargs):
+        super().__init__(ENDPOINT, snapshot_store=store, **kwargs)
+        self.signals = signals
+        self.failures = failures or {}
+        self.calls = []
+
+    def detect_change_signals(self):
+        return self.signals
+
+    def _run(self, key, result):
+        self.calls.append(key)
+        if key in self.failures:
+            raise self.failures[key]
+        return result
+
+    def detect_sparql_version(self):
+        return self._run('sparql_version', '1.1')
+
+    def detect_features(self):
+        return self._run('features', {'BIND': True})
+
+    def find_named_graphs(self, limit=100):
+        return self._run('named_graphs', ['http://example.org/g1'])
+
+    def discover_namespaces(self, limit=1000):
+        return self._run('namespaces', ['http://example.org/'])
+
+    def detect_supported_functions(self):
+        return self._run('supported_functions', {'STRLEN': True})
+
+    def get_endpoint_statistics(self):
+        return self._run('statistics', {'total_triples': 10})
+
+
+def discover(store, signals, **kwargs):
+    detector = StubDetector(store, signals, **kwargs)
+    capabilities = detector.detect_all_capabilities()
+    return detector, capabilities
+
+
+@pytest.fixture
+def store(tmp_path):
+    return SnapshotStore(str(tmp_path))
+
+
+SIGNALS = ChangeSignals(void_modified="2026-01-01", triple_count=10, server="Virtuoso/7.2")
+
+
+class TestReuse:
+    def test_unchanged_signals_reuse_every_task(self, store):
+        first, _ = discover(store, SIGNALS)
+        assert sorted(first.calls) == sorted(TASKS)
+
+        second, capabilities = discover(store, ChangeSignals(**SIGNALS.to_dict()))
+        assert second.calls == []
+        assert capabilities['namespaces'] == ['http://example.org/']
+        assert sorted(capabilities['_metadata']['reused_tasks']) == sorted(TASKS)
+        assert capabilities['_metadata']['changed_signals'] == []
+
+    def test_changed_data_reruns_data_tasks(self, store):
+        discover(store, SIGNALS)
+        detector, capabilities = discover(
+            store, ChangeSignals(void_modified="2026-01-01", triple_count=11, server="Virtuoso/7.2")
+        )
+
+        assert sorted(detector.calls) == ['named_graphs', 'namespaces', 'statistics']
+        assert capabilities['_metadata']['changed_signals'] == ['triple_count']
+
+    def test_changed_server_reruns_software_tasks(self, store):
+        discover(store, SIGNALS)
+        detector, _ = discover(
+            store, ChangeSignals(void_modified="2026-01-01", triple_count=10, server="Virtuoso/7.3")
+        )
+
+        assert sorted(detector.calls) == ['features', 'sparql_version', 'supported_functions']
+
+    def test_changed_settings_rerun_tasks(self, store):
+        discover(store, SIGNALS)
+        detector, _ = discover(store, SIGNALS, max_samples=50)
+        assert 'namespaces' in detector.calls
+
+    def test_data_tasks_without_signals_always_run(self, store):
+        signals = ChangeSignals(server="Virtuoso/7.2")
+        discover(store, signals)
+        detector, _ = discover(store, signals)
+
+        assert sorted(detector.calls) == ['named_graphs', 'namespaces', 'statistics']
+
+    def test_refresh_reruns_everything(self, store):
+        discover(store, SIGNALS)
+        detector = StubDetector(store, SIGNALS)
+        detector.detect_all_capabilities(refresh=True)
+
+        assert sorted(detector.calls) == sorted(TASKS)
+
+    def test_old_results_expire(self, store):
+        discover(store, SIGNALS)
+        detector, _ = discover(store, SIGNALS, max_snapshot_age=-1)
+        assert sorted(detector.calls) == sorted(TASKS)
+
+    def test_without_store_nothing_is_saved(self, tmp_path):
+        detector = StubDetector(None, SIGNALS)
+        capabilities = detector.detect_all_capabilities()
+
+        assert 'reused_tasks' not in capabilities['_metadata']
+        assert list(tmp_path.iterdir()) == []
+
+
+class TestFailures:
+    def test_timeouts_are_reused(self, store):
+        discover(store, SIGNALS, failures={'statistics': TimeoutError("timed out")})
+        detector, capabilities = discover(store, SIGNALS)
+
+        assert 'statistics' not in detector.calls
+        assert capabilities['statistics'] is None
+        assert capabilities['statistics_error'].startswith("Timeout")
+        assert 'statistics' in capabilities['_metadata']['timed_out_queries']
+
+    def test_timeouts_rerun_with_larger_timeout(self, store):
+        discover(store, SIGNALS, failures={'statistics': TimeoutError("timed out")}, timeout=30)
+
+        detector, _ = discover(store, SIGNALS, timeout=20)
+        assert 'statistics' not in detector.calls
+
+        detector, capabilities = discover(store, SIGNALS, timeout=120)
+        assert detector.calls == ['statistics']
+        assert capabilities['statistics'] == {'total_triples': 10}
+
+    def test_errors_are_rerun(self, store):
+        discover(store, SIGNALS, failures={'namespaces': RuntimeError("boom")})
+        detector, capabilities = discover(store, SIGNALS)
+
+        assert detector.calls == ['namespaces']
+        assert capabilities['namespaces'] == ['http://example.org/']
+
+
+class TestSnapshotStore:
+    def test_round_trip(self, store):
+        snapshot = DiscoverySnapshot(
+            endpoint_url=ENDPOINT,
+            signals=SIGNALS,
+            tasks={'features': TaskSnapshot({'BIND': True}, "abc", 100.0)},
+            updated_at=100.0,
+        )
+        store.save(snapshot)
+
+        assert store.load(ENDPOINT) == snapshot
+        assert store.load("http://example.org/other") is None
+        assert store.delete(ENDPOINT)
+        assert store.load(ENDPOINT) is None
+
+    @pytest.mark.parametrize("content", ["{not json", json.dumps({'version': 0}), json.dumps({'version': 1})])
+    def test_unreadable_snapshot_is_ignored(self, store, tmp_path, content):
+        with open(store.path_for(ENDPOINT), "w") as f:
+            f.write(content)
+        assert store.load(ENDPOINT) is None
+
+    def test_fingerprint_depends_on_inputs(self):
+        settings = {'limit': 50}
+        base = task_fingerprint('namespaces', settings, SIGNALS)
+
+        assert base == task_fingerprint('namespaces', dict(settings), ChangeSignals(**SIGNALS.to_dict()))
+        assert base != task_fingerprint('namespaces', {'limit': 10}, SIGNALS)
+        assert base != task_fingerprint('named_graphs', settings, SIGNALS)
+        assert task_fingerprint('namespaces', settings, ChangeSignals(server="x")) is None
+        assert task_fingerprint('features', {}, ChangeSignals()) is not None
@@ -0,0 +1,151 @@
+"""
+Tests for scheduled statistics collection.
+
+Tests cover:
+- Cheapest-first scheduling and dependencies between statistics
+- The per-endpoint parallelism cap
+- Partial statistics when the time budget runs out
+- Progress reporting from worker threads
+"""
+
+import threading
+import time
+
+import pytest
+
+from sparql_agent.discovery.statistics import (
+    DatasetStatistics,
+    StatisticsCollector,
+    StatisticTask,
+)
+
+
+class FakeEndpoint:
+    """Answers every query with a count after an optional per-key delay."""
+
+    def __init__(self, delays=None, default_delay=0.0):
+        self.delays = delays or {}
+        self.default_delay = default_delay
+        self.lock = threading.Lock()
+        self.active = 0
+        self.max_active = 0
+        self.keys = []
+
+    def __call__(self, query, cache_key=None, retry_count=0):
+        with self.lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+            self.keys.append(cache_key)
+        try:
+            time.sleep(self.delays.get(cache_key, self.default_delay))
+            if cache_key == "named_graphs":
+                return {'results': {'bindings': [
+                    {'g': {'value': 'http://example.org/g1'}},
+                ]}}
+            return {'results': {'bindings': [
+                {'triples': {'value': '10'}, 'count': {'value': '10'}},
+            ]}}
+        finally:
+            with self.lock:
+                self.active -= 1
+
+
+def make_collector(endpoint, **kwargs):
+    collector = StatisticsCollector("http://example.org/sparql", **kwargs)
+    collector._execute_query = endpoint
+    return collector
+
+
+class TestScheduling:
+    def test_sequential_collection_is_complete(self):
+        endpoint = FakeEndpoint()
+        stats = make_collector(endpoint).collect_all_statistics()
+
+        assert stats.complete
+        assert stats.total_triples == 10
+        assert stats.distinct_objects == 10
+        assert endpoint.keys[0] == "total_triples"
+        assert endpoint.keys.index("distinct_predicates") < endpoint.keys.index("untyped_resources")
+
+    def test_graph_sizes_wait_for_named_graphs(self):
+        endpoint = FakeEndpoint(delays={"named_graphs": 0.05})
+        collector = make_collector(endpoint, max_parallel_queries=4)
+        stats = collector.collect_all_statistics(include_graphs=True)
+
+        assert stats.named_graphs == ['http://example.org/g1']
+        assert stats.graph_sizes == {'http://example.org/g1': 10}
+        assert endpoint.keys.index("named_graphs") < endpoint.keys.index(
+            "graph_size_http://example.org/g1"
+        )
+
+    def test_parallelism_cap(self):
+        endpoint = FakeEndpoint(default_delay=0.02)
+        collector = make_collector(endpoint, max_parallel_queries=3)
+        stats = collector.collect_all_statistics()
+
+        assert stats.complete
+        assert 1 < endpoint.max_active <= 3
+
+    def test_failed_dependency_skips_dependents(self):
+        collector = make_collector(FakeEndpoint())
+
+        def fail():
+            raise RuntimeError("boom")
+
+        tasks = [
+            StatisticTask('named_graphs', fail, lambda stats, value: None),
+            StatisticTask('graph_sizes', lambda graphs: {}, lambda stats, value: None,
+                          depends_on=('named_graphs',)),
+            StatisticTask('orphan', lambda missing: 1, lambda stats, value: None,
+                          depends_on=('not_scheduled',)),
+        ]
+        missing = collector._run_tasks(tasks, DatasetStatistics())
+
+        assert missing == ['named_graphs', 'graph_sizes', 'orphan']
+
+
+class TestTimeBudget:
+    def test_partial_statistics_when_budget_runs_out(self):
+        endpoint = FakeEndpoint(delays={
+            "distinct_subjects": 1.5,
+            "distinct_objects": 1.5,
+            "untyped_resources": 1.5,
+        })
+        collector = make_collector(endpoint, max_parallel_queries=4)
+
+        start = time.monotonic()
+        stats = collector.collect_all_statistics(time_budget=0.3)
+        elapsed = time.monotonic() - start
+
+        assert elapsed < 1.0
+        assert not stats.complete
+        assert stats.total_triples == 10
+        assert set(stats.missing_statistics) == {
+            "distinct_subjects", "distinct_objects", "untyped_resources",
+        }
+        assert stats.to_dict()['metadata']['missing_statistics'] == stats.missing_statistics
+        assert "Missing:" in stats.summary()
+
+
+class TestProgress:
+    def test_progress_counts_completed_statistics(self):
+        events = []
+        collector = make_collector(
+            FakeEndpoint(default_delay=0.01),
+            max_parallel_queries=4,
+            progress_callback=lambda message, current, total: events.append(
+                (message, current, total)
+            ),
+        )
+        collector.collect_all_statistics()
+
+        collected = [event for event in events if event[0].startswith("Collected ")]
+        assert [current for _, current, _ in collected] == list(range(1, 14))
+        assert {total for _, _, total in collected} == {13}
+        assert events[-1][0] == "Statistics collection complete!"
+
+
+@pytest.mark.parametrize("max_parallel", [0, -2])
+def test_parallelism_is_at_least_one(max_parallel):
+    collector = StatisticsCollector("http://example.org/sparql", max_parallel_queries=max_parallel)
+    assert collector.max_parallel_queries == 1
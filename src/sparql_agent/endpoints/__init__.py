@@ -36,6 +36,9 @@ from .federated import (
     CrossDatasetExamples,
     ResultMerger,
     ResilientFederatedExecutor,
+    FederatedQueryPlan,
+    ServiceCall,
+    decompose_federated_query,
     EndpointCapabilities,
     QueryOptimizationHints,
     OptimizationStrategy,
@@ -46,6 +49,13 @@ from .federated import (
     FEDERATED_QUERY_BEST_PRACTICES,
 )
 
+from .cost_model import (
+    ServiceCostModel,
+    ServiceCostEstimate,
+    EndpointCardinalities,
+    EndpointLatencyStore,
+)
+
 __all__ = [
     # UniProt
     "UNIPROT_ENDPOINT",
@@ -75,6 +85,9 @@ __all__ = [
     "CrossDatasetExamples",
     "ResultMerger",
     "ResilientFederatedExecutor",
+    "FederatedQueryPlan",
+    "ServiceCall",
+    "decompose_federated_query",
     "EndpointCapabilities",
     "QueryOptimizationHints",
     "OptimizationStrategy",
@@ -83,4 +96,10 @@ __all__ = [
     "get_federated_prefix_string",
     "FederatedQueryError",
     "FEDERATED_QUERY_BEST_PRACTICES",
+
+    # Cost model
+    "ServiceCostModel",
+    "ServiceCostEstimate",
+    "EndpointCardinalities",
+    "EndpointLatencyStore",
 ]
@@ -0,0 +1,534 @@
+"""
+Cost model for ordering SERVICE clauses of federated queries.
+
+Cardinalities come from statistics that are already collected elsewhere:
+
+- ``discovery.statistics.DatasetStatistics`` (total triples, top classes and
+  top properties)
+- ``schema.void_parser.VoIDDataset`` (class and property partitions)
+
+Each triple pattern of a SERVICE block is estimated from the class and
+property counts of its endpoint. Bound subjects and objects are scaled down
+by the number of distinct subjects and objects. A block's result size is the
+smallest estimate among its patterns.
+
+A service's cost is its expected latency plus a per-row transfer cost.
+Latency is learned from observations that ``EndpointLatencyStore`` persists
+between runs. Services are ordered greedily: the cheapest one runs first, and
+services that share a variable with those already placed are preferred, so
+join variables are bound early and cross products are avoided.
+
+Example:
+    >>> model = ServiceCostModel(latency_store=EndpointLatencyStore("~/.cache/sparql_agent/latency.json"))
+    >>> model.add_dataset_statistics(uniprot_url, collector.collect_all_statistics())
+    >>> builder = FederatedQueryBuilder(cost_model=model)
+"""
+
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Set, Tuple
+
+if TYPE_CHECKING:
+    from ..discovery.statistics import DatasetStatistics
+    from ..schema.void_parser import VoIDDataset
+
+
+logger = logging.getLogger(__name__)
+
+RDF_TYPE = "http://www.w3.org/1999/02/22-rdf-syntax-ns#type"
+
+# Result size assumed for endpoints without statistics
+DEFAULT_CARDINALITY = 100_000
+
+# Share of an endpoint's triples matched by a class or property missing from its statistics
+UNKNOWN_TERM_SELECTIVITY = 0.01
+
+_TERM_PATTERN = re.compile(
+    r"<[^>]*>"
+    r"|\"(?:[^\"\\]|\\.)*\"\S*"
+    r"|'(?:[^'\\]|\\.)*'\S*"
+    r"|[;,]"
+    r"|[^\s;,]+"
+)
+_STATEMENT_END = re.compile(r"\s\.(?=\s|$)|\s\.$")
+_NON_TRIPLE_KEYWORDS = {"FILTER", "OPTIONAL", "BIND", "VALUES", "MINUS", "SERVICE", "UNION", "{", "}"}
+
+
+@dataclass
+class EndpointCardinalities:
+    """
+    Cardinality statistics of one endpoint.
+
+    Attributes:
+        triples: Total number of triples
+        distinct_subjects: Number of distinct subjects
+        distinct_objects: Number of distinct objects
+        classes: Class IRI to instance count
+        properties: Property IRI to triple count
+    """
+    triples: Optional[int] = None
+    distinct_subjects: Optional[int] = None
+    distinct_objects: Optional[int] = None
+    classes: Dict[str, int] = field(default_factory=dict)
+    properties: Dict[str, int] = field(default_factory=dict)
+
+
+@dataclass
+class ServiceCostEstimate:
+    """
+    Estimated cost of one SERVICE block.
+
+    Attributes:
+        endpoint_url: Endpoint of the block
+        cardinality: Estimated number of result rows
+        latency: Expected round-trip latency in seconds
+        cost: Expected seconds to answer the block
+        variables: Variables used by the block
+        joined_on: Variables bound by services placed earlier
+    """
+    endpoint_url: str
+    cardinality: float
+    latency: float
+    cost: float
+    variables: Set[str] = field(default_factory=set)
+    joined_on: Set[str] = field(default_factory=set)
+
+
+class EndpointLatencyStore:
+    """
+    Exponentially weighted latency per endpoint, persisted as JSON.
+
+    Observations are loaded from ``path`` on creation and written back every
+    ``autosave_every`` observations and on ``save()``. Thread-safe.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        smoothing: float = 0.2,
+        autosave_every: int = 20,
+    ):
+        """
+        Initialize latency store.
+
+        Args:
+            path: JSON file for persistence (None keeps observations in memory)
+            smoothing: Weight of a new observation in the moving average (0-1)
+            autosave_every: Observations between automatic saves (0 disables)
+        """
+        self.path = os.path.expanduser(path) if path else None
+        self.smoothing = smoothing
+        self.autosave_every = autosave_every
+
+        self._lock = threading.Lock()
+        self._latency: Dict[str, float] = {}
+        self._count: Dict[str, int] = {}
+        self._unsaved = 0
+
+        if self.path and os.path.exists(self.path):
+            self._load()
+
+    def record(self, endpoint_url: str, seconds: float):
+        """
+        Record a response time.
+
+        Args:
+            endpoint_url: Endpoint that answered
+            seconds: Response time in seconds
+        """
+        with self._lock:
+            previous = self._latency.get(endpoint_url)
+            self._latency[endpoint_url] = (
+                seconds if previous is None
+                else previous + self.smoothing * (seconds - previous)
+            )
+            self._count[endpoint_url] = self._count.get(endpoint_url, 0) + 1
+            self._unsaved += 1
+            autosave = self.autosave_every and self._unsaved >= self.autosave_every
+
+        if autosave:
+            self.save()
+
+    def estimate(self, endpoint_url: str) -> Optional[float]:
+        """Expected latency of an endpoint in seconds (None if never observed)."""
+        with self._lock:
+            return self._latency.get(endpoint_url)
+
+    def observations(self, endpoint_url: str) -> int:
+        """Number of observations recorded for an endpoint."""
+        with self._lock:
+            return self._count.get(endpoint_url, 0)
+
+    def save(self):
+        """Write observations to ``path`` (atomically replacing the file)."""
+        if not self.path:
+            return
+        with self._lock:
+            data = {
+                url: {"latency": latency, "observations": self._count.get(url, 0)}
+                for url, latency in self._latency.items()
+            }
+            self._unsaved = 0
+
+        directory = os.path.dirname(self.path) or "."
+        try:
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            with os.fdopen(fd, "w") as f:
+                json.dump(data, f, indent=2, sort_keys=True)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning(f"Failed to save endpoint latencies to {self.path}: {e}")
+
+    def _load(self):
+        """Read observations from ``path``."""
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable latency file {self.path}: {e}")
+            return
+
+        for url, entry in data.items():
+            try:
+                self._latency[url] = float(entry["latency"])
+                self._count[url] = int(entry.get("observations", 0))
+            except (KeyError, TypeError, ValueError):
+                continue
+
+    def get_statistics(self) -> Dict[str, Dict[str, float]]:
+        """Get latency and observation count per endpoint."""
+        with self._lock:
+            return {
+                url: {"latency": latency, "observations": self._count.get(url, 0)}
+                for url, latency in self._latency.items()
+            }
+
+
+class ServiceCostModel:
+    """
+    Estimates SERVICE result sizes and costs and orders services by them.
+    """
+
+    def __init__(
+        self,
+        prefixes: Optional[Dict[str, str]] = None,
+        latency_store: Optional[EndpointLatencyStore] = None,
+        default_latency: float = 2.0,
+        seconds_per_row: float = 0.0001,
+    ):
+        """
+        Initialize cost model.
+
+        Args:
+            prefixes: Prefix to namespace map for prefixed names in patterns
+                (defaults to ``FEDERATED_PREFIXES``)
+            latency_store: Observed endpoint latencies
+            default_latency: Latency assumed for endpoints never observed
+            seconds_per_row: Transfer and join cost per result row
+        """
+        if prefixes is None:
+            from .federated import FEDERATED_PREFIXES
+            prefixes = FEDERATED_PREFIXES
+        self.prefixes = dict(prefixes)
+        self.prefixes.setdefault("rdf", "http://www.w3.org/1999/02/22-rdf-syntax-ns#")
+        self.latency_store = latency_store
+        self.default_latency = default_latency
+        self.seconds_per_row = seconds_per_row
+        self.endpoints: Dict[str, EndpointCardinalities] = {}
+
+    def add_cardinalities(
+        self,
+        endpoint_url: str,
+        triples: Optional[int] = None,
+        distinct_subjects: Optional[int] = None,
+        distinct_objects: Optional[int] = None,
+        classes: Optional[Dict[str, int]] = None,
+        properties: Optional[Dict[str, int]] = None,
+    ):
+        """
+        Add statistics for an endpoint, keeping values already known.
+
+        Args:
+            endpoint_url: Endpoint URL
+            triples: Total number of triples
+            distinct_subjects: Number of distinct subjects
+            distinct_objects: Number of distinct objects
+            classes: Class IRI to instance count
+            properties: Property IRI to triple count
+        """
+        stats = self.endpoints.setdefault(endpoint_url, EndpointCardinalities())
+        stats.triples = triples or stats.triples
+        stats.distinct_subjects = distinct_subjects or stats.distinct_subjects
+        stats.distinct_objects = distinct_objects or stats.distinct_objects
+        stats.classes.update(classes or {})
+        stats.properties.update(properties or {})
+
+    def add_dataset_statistics(self, endpoint_url: str, statistics: "DatasetStatistics"):
+        """
+        Add statistics gathered by ``StatisticsCollector``.
+
+        Args:
+            endpoint_url: Endpoint URL
+            statistics: Collected dataset statistics
+        """
+        self.add_cardinalities(
+            endpoint_url,
+            triples=statistics.total_triples,
+            distinct_subjects=statistics.distinct_subjects,
+            distinct_objects=statistics.distinct_objects,
+            classes=dict(statistics.top_classes),
+            properties=dict(statistics.top_properties),
+        )
+
+    def add_void_dataset(self, endpoint_url: str, dataset: "VoIDDataset"):
+        """
+        Add statistics from a VoID description.
+
+        Args:
+            endpoint_url: Endpoint URL
+            dataset: Parsed VoID dataset with class and property partitions
+        """
+        self.add_cardinalities(
+            endpoint_url,
+            triples=dataset.triples,
+            distinct_subjects=dataset.distinct_subjects,
+            distinct_objects=dataset.distinct_objects,
+            classes=dataset.class_partitions,
+            properties=dataset.property_partitions,
+        )
+
+    def expected_latency(self, endpoint_url: str) -> float:
+        """Observed (or default) latency of an endpoint in seconds."""
+        if self.latency_store is not None:
+            observed = self.latency_store.estimate(endpoint_url)
+            if observed is not None:
+                return observed
+        return self.default_latency
+
+    def estimate_pattern_cardinality(
+        self,
+        endpoint_url: str,
+        subject: str,
+        predicate: str,
+        obj: str,
+    ) -> Optional[float]:
+        """
+        Estimate the number of matches of one triple pattern.
+
+        Args:
+            endpoint_url: Endpoint the pattern runs at
+            subject: Subject term as written in the query
+            predicate: Predicate term
+            obj: Object term
+
+        Returns:
+            Estimated matches, or None without statistics for the endpoint
+        """
+        stats = self.endpoints.get(endpoint_url)
+        if stats is None:
+            return None
+
+        triples = stats.triples or DEFAULT_CARDINALITY
+        if _is_variable(predicate):
+            cardinality = float(triples)
+        else:
+            predicate_iri = self._expand(predicate)
+            if predicate_iri == RDF_TYPE and not _is_variable(obj):
+                return max(1.0, float(_lookup(stats.classes, self._expand(obj), triples)))
+            cardinality = float(_lookup(stats.properties, predicate_iri, triples))
+
+        if not _is_variable(subject):
+            cardinality /= max(1, stats.distinct_subjects or 1)
+        if not _is_variable(obj):
+            cardinality /= max(1, stats.distinct_objects or 1)
+        return max(1.0, cardinality)
+
+    def estimate_service_cardinality(
+        self,
+        endpoint_url: str,
+        patterns: List[str],
+        selectivity: Optional[float] = None,
+    ) -> float:
+        """
+        Estimate the result size of a SERVICE block.
+
+        Args:
+            endpoint_url: Endpoint of the block
+            patterns: Graph patterns of the block
+            selectivity: Fallback selectivity (0-1) for endpoints without statistics
+
+        Returns:
+            Estimated number of result rows
+        """
+        estimates = [
+            self.estimate_pattern_cardinality(endpoint_url, *triple)
+            for triple in _triple_patterns(patterns)
+        ]
+        known = [estimate for estimate in estimates if estimate is not None]
+        if known:
+            return min(known)
+        return DEFAULT_CARDINALITY * (selectivity if selectivity is not None else 0.5)
+
+    def estimate_service_cost(
+        self,
+        endpoint_url: str,
+        patterns: List[str],
+        bound_variables: Optional[Set[str]] = None,
+        bound_rows: Optional[float] = None,
+        selectivity: Optional[float] = None,
+    ) -> ServiceCostEstimate:
+        """
+        Estimate the cost of a SERVICE block given variables bound earlier.
+
+        If the block shares variables with services placed before it, its
+        result is limited by the rows flowing in from those services (bind join).
+
+        Args:
+            endpoint_url: Endpoint of the block
+            patterns: Graph patterns of the block
+            bound_variables: Variables bound by earlier services
+            bound_rows: Estimated rows produced by earlier services
+            selectivity: Fallback selectivity for endpoints without statistics
+
+        Returns:
+            Cost estimate
+        """
+        variables = _pattern_variables(patterns)
+        joined_on = variables & (bound_variables or set())
+        cardinality = self.estimate_service_cardinality(endpoint_url, patterns, selectivity)
+        if joined_on and bound_rows is not None:
+            cardinality = min(cardinality, bound_rows)
+
+        latency = self.expected_latency(endpoint_url)
+        return ServiceCostEstimate(
+            endpoint_url=endpoint_url,
+            cardinality=cardinality,
+            latency=latency,
+            cost=latency + cardinality * self.seconds_per_row,
+            variables=variables,
+            joined_on=joined_on,
+        )
+
+    def plan(
+        self,
+        services: Dict[str, List[str]],
+        selectivity: Optional[Dict[str, float]] = None,
+    ) -> List[ServiceCostEstimate]:
+        """
+        Order services greedily by cost, keeping the join graph connected.
+
+        Args:
+            services: Endpoint URL to graph patterns
+            selectivity: Fallback selectivity per endpoint without statistics
+
+        Returns:
+            Cost estimates in execution order
+        """
+        selectivity = selectivity or {}
+        remaining = list(services)
+        bound: Set[str] = set()
+        bound_rows: Optional[float] = None
+        ordered: List[ServiceCostEstimate] = []
+
+        while remaining:
+            estimates = [
+                self.estimate_service_cost(
+                    url, services[url], bound, bound_rows, selectivity.get(url)
+                )
+                for url in remaining
+            ]
+            connected = [e for e in estimates if e.joined_on] or estimates
+            best = min(connected, key=lambda e: (e.cost, -len(e.joined_on)))
+
+            ordered.append(best)
+            remaining.remove(best.endpoint_url)
+            bound |= best.variables
+            bound_rows = best.cardinality
+
+        return ordered
+
+    def order_services(
+        self,
+        services: Dict[str, List[str]],
+        selectivity: Optional[Dict[str, float]] = None,
+    ) -> Dict[str, List[str]]:
+        """
+        Reorder a service map so selective, connected services come first.
+
+        Args:
+            services: Endpoint URL to graph patterns
+            selectivity: Fallback selectivity per endpoint without statistics
+
+        Returns:
+            Reordered service map
+        """
+        return {
+            estimate.endpoint_url: services[estimate.endpoint_url]
+            for estimate in self.plan(services, selectivity)
+        }
+
+    def _expand(self, term: str) -> str:
+        """Expand a prefixed name or strip IRI brackets."""
+        if term == "a":
+            return RDF_TYPE
+        if term.startswith("<") and term.endswith(">"):
+            return term[1:-1]
+        prefix, sep, local = term.partition(":")
+        if sep and prefix in self.prefixes:
+            return self.prefixes[prefix] + local
+        return term
+
+
+def _is_variable(term: str) -> bool:
+    """Check whether a term is a variable."""
+    return term.startswith("?") or term.startswith("$")
+
+
+def _lookup(counts: Dict[str, int], iri: str, triples: int) -> float:
+    """
+    Count of a class or property.
+
+    Statistics list only the most frequent terms, so a missing term is at most
+    as frequent as the least frequent listed one.
+    """
+    if iri in counts:
+        return counts[iri]
+    if counts:
+        return min(counts.values())
+    return triples * UNKNOWN_TERM_SELECTIVITY
+
+
+def _triple_patterns(patterns: List[str]) -> Iterator[Tuple[str, str, str]]:
+    """Extract (subject, predicate, object) terms from basic graph patterns."""
+    for text in patterns:
+        text = re.sub(r"(?m)^\s*#.*$", "", text)
+        for statement in _STATEMENT_END.split(text):
+            tokens = _TERM_PATTERN.findall(statement)
+            if not tokens or tokens[0].upper().split("(")[0] in _NON_TRIPLE_KEYWORDS:
+                continue
+
+            subject = tokens[0]
+            predicate: Optional[str] = None
+            for token in tokens[1:]:
+                if token == ";":
+                    predicate = None
+                elif token == ",":
+                    continue
+                elif predicate is None:
+                    predicate = token
+                else:
+                    yield subject, predicate, token
+
+
+def _pattern_variables(patterns: List[str]) -> Set[str]:
+    """Variables mentioned in graph patterns (without '?')."""
+    return {
+        match[1:] for text in patterns
+        for match in re.findall(r"[?$]\w+", text)
+    }
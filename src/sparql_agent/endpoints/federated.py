@@ -24,14 +24,28 @@ Official Documentation:
 - Wikidata SPARQL: https://query.wikidata.org/sparql
 """
 
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Set, Tuple, Any, Callable
+from functools import partial
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple, Any, Callable
 from enum import Enum
+import itertools
+import math
+import os
+import pickle
+import re
+import shutil
+import tempfile
+import threading
 import time
 import logging
-from datetime import datetime, timedelta
+from datetime import datetime
 
 from ..core.types import EndpointInfo, QueryResult, QueryStatus
+from ..execution.executor import QueryExecutor
+from ..execution.merging import OrderBy, UnionMerger, order_key, parse_order_by
+from ..execution.resilience import CircuitBreaker, LatencyTracker
+from .cost_model import EndpointLatencyStore, ServiceCostModel
 from .uniprot import UNIPROT_PREFIXES, get_prefix_string as uniprot_prefixes
 
 
@@ -273,7 +287,8 @@ class FederatedQueryBuilder:
         coordinator_endpoint: Optional[str] = None,
         enable_optimization: bool = True,
         cache_results: bool = True,
-        timeout: int = 120
+        timeout: int = 120,
+        cost_model: Optional[ServiceCostModel] = None
     ):
         """
         Initialize the federated query builder.
@@ -283,14 +298,15 @@ class FederatedQueryBuilder:
             enable_optimization: Enable query optimization
             cache_results: Cache intermediate results
             timeout: Default timeout for federated queries
+            cost_model: Statistics-based cost model for SERVICE ordering and cost
+                estimates (static heuristics are used if None)
         """
         self.coordinator_endpoint = coordinator_endpoint
         self.enable_optimization = enable_optimization
         self.cache_results = cache_results
         self.timeout = timeout
+        self.cost_model = cost_model
         self.logger = logging.getLogger(__name__)
-        self._result_cache: Dict[str, Tuple[Any, datetime]] = {}
-        self._cache_ttl = timedelta(hours=1)
 
     def build_service_clause(
         self,
@@ -376,8 +392,10 @@ class FederatedQueryBuilder:
             ...     limit=10
             ... )
         """
-        if optimization_hints and self.enable_optimization:
-            services = self._optimize_service_order(services, optimization_hints)
+        if self.enable_optimization and (optimization_hints or self.cost_model):
+            services = self._optimize_service_order(
+                services, optimization_hints or QueryOptimizationHints()
+            )
 
         # Build query components
         select_clause = f"SELECT {' '.join(select_vars)}"
@@ -435,6 +453,11 @@ class FederatedQueryBuilder:
         """
         Optimize the order of SERVICE clauses based on selectivity.
 
+        With a cost model, services are ordered by estimated cost from endpoint
+        statistics and observed latency, keeping services that share variables
+        adjacent; ``hints.estimated_selectivity`` covers endpoints without
+        statistics.
+
         Args:
             services: Original service patterns
             hints: Optimization hints
@@ -442,6 +465,9 @@ class FederatedQueryBuilder:
         Returns:
             Reordered services dictionary
         """
+        if self.cost_model is not None:
+            return self.cost_model.order_services(services, hints.estimated_selectivity)
+
         if not hints.estimated_selectivity:
             return services
 
@@ -486,26 +512,39 @@ class FederatedQueryBuilder:
             optimization_hints: Optimization hints
 
         Returns:
-            Dictionary with cost estimates
+            Dictionary with cost estimates (with a cost model, also the planned
+            ``service_order`` and per-service ``estimated_rows``)
         """
         total_services = len(services)
         total_patterns = sum(len(patterns) for patterns in services.values())
+        plan = None
 
-        # Estimate based on service count and pattern complexity
-        estimated_time = total_services * 2.0  # Base 2 seconds per service
-        estimated_time += total_patterns * 0.5  # +0.5 seconds per pattern
+        if self.cost_model is not None:
+            selectivity = optimization_hints.estimated_selectivity if optimization_hints else None
+            plan = self.cost_model.plan(services, selectivity)
+            estimated_time = sum(estimate.cost for estimate in plan)
+        else:
+            # Estimate based on service count and pattern complexity
+            estimated_time = total_services * 2.0  # Base 2 seconds per service
+            estimated_time += total_patterns * 0.5  # +0.5 seconds per pattern
 
         # Adjust for optimization
         if optimization_hints and OptimizationStrategy.MINIMIZE_TRANSFER in optimization_hints.strategies:
             estimated_time *= 0.7  # 30% reduction with optimization
 
-        return {
+        cost = {
             "estimated_time_seconds": estimated_time,
             "service_count": total_services,
             "pattern_count": total_patterns,
             "complexity_score": min(100, total_services * 10 + total_patterns * 2),
             "recommended_timeout": max(60, int(estimated_time * 2))
         }
+        if plan is not None:
+            cost["service_order"] = [estimate.endpoint_url for estimate in plan]
+            cost["estimated_rows"] = {
+                estimate.endpoint_url: estimate.cardinality for estimate in plan
+            }
+        return cost
 
 
 # =============================================================================
@@ -1099,6 +1138,195 @@ LIMIT {limit}
 # RESULT MERGING STRATEGIES
 # =============================================================================
 
+JOIN_TYPES = frozenset({"inner", "left", "full"})
+
+
+def _hashable(value: Any) -> Any:
+    """Convert a binding value (possibly a SPARQL JSON term dict) to a hashable form."""
+    if isinstance(value, dict):
+        return tuple(sorted((k, _hashable(v)) for k, v in value.items()))
+    if isinstance(value, list):
+        return tuple(_hashable(v) for v in value)
+    return value
+
+
+def _join_key(binding: Dict[str, Any], join_keys: List[str]) -> Tuple[Any, ...]:
+    """Build the hash key of a binding; unbound variables key as None."""
+    return tuple(_hashable(binding.get(key)) for key in join_keys)
+
+
+def _compatible(left_key: Tuple[Any, ...], right_key: Tuple[Any, ...]) -> bool:
+    """SPARQL compatibility: every shared variable is unbound on one side or equal."""
+    return all(
+        left is None or right is None or left == right
+        for left, right in zip(left_key, right_key)
+    )
+
+
+def _merge_compatible(
+    first: Dict[str, Any],
+    second: Dict[str, Any],
+    join_keys: List[str]
+) -> Dict[str, Any]:
+    """Merge two compatible rows, keeping join variables bound on either side."""
+    merged = {**first, **second}
+    for key in join_keys:
+        if merged.get(key) is None and first.get(key) is not None:
+            merged[key] = first[key]
+    return merged
+
+
+def _hash_join(
+    left: List[Dict[str, Any]],
+    right: List[Dict[str, Any]],
+    join_keys: List[str],
+    join_type: str
+) -> List[Dict[str, Any]]:
+    """
+    Join two binding lists in memory with a hash table on the smaller side.
+
+    Merged rows are always built as ``{**left, **right}``. Unmatched rows from
+    the preserved side(s) are appended as-is: left rows for ``left`` and
+    ``full`` joins, right rows for ``full`` joins.
+
+    As in SPARQL, a join variable unbound in one row is compatible with any
+    value of the other row. Build rows with unbound join variables are kept
+    out of the hash table and checked against every probe row.
+    """
+    build_left = len(left) < len(right)
+    build, probe = (left, right) if build_left else (right, left)
+    keep_probe = join_type == "full" or (join_type == "left" and not build_left)
+    keep_build = join_type == "full" or (join_type == "left" and build_left)
+
+    table: Dict[Tuple[Any, ...], List[int]] = {}
+    build_keys = [_join_key(binding, join_keys) for binding in build]
+    unbound: List[int] = []
+    for index, key in enumerate(build_keys):
+        if None in key:
+            unbound.append(index)
+        else:
+            table.setdefault(key, []).append(index)
+
+    matched = [False] * len(build) if keep_build else None
+    output: List[Dict[str, Any]] = []
+
+    for probe_binding in probe:
+        key = _join_key(probe_binding, join_keys)
+        if None in key:
+            indices = [i for i, build_key in enumerate(build_keys) if _compatible(key, build_key)]
+        else:
+            indices = table.get(key)
+            if unbound:
+                indices = (indices or []) + [
+                    i for i in unbound if _compatible(key, build_keys[i])
+                ]
+        if not indices:
+            if keep_probe:
+                output.append(probe_binding)
+            continue
+
+        for index in indices:
+            build_binding = build[index]
+            first, second = (
+                (build_binding, probe_binding) if build_left else (probe_binding, build_binding)
+            )
+            if None in key or None in build_keys[index]:
+                output.append(_merge_compatible(first, second, join_keys))
+            else:
+                output.append({**first, **second})
+            if matched is not None:
+                matched[index] = True
+
+    if matched is not None:
+        output.extend(b for b, hit in zip(build, matched) if not hit)
+
+    return output
+
+
+def _partitioned_hash_join(
+    left: List[Dict[str, Any]],
+    right: List[Dict[str, Any]],
+    join_keys: List[str],
+    join_type: str,
+    memory_budget: int,
+    spill_dir: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """
+    Grace hash join: partition both inputs to disk, then join partition pairs.
+
+    Rows with equal join keys always land in the same partition, so joining each
+    pair independently gives the same rows as a single in-memory join. The
+    partition count is chosen so that each build partition fits the budget.
+    Rows with unbound join variables are compatible with rows of any
+    partition, so inputs containing them are joined in memory instead.
+    """
+    logger = logging.getLogger(__name__)
+    if any(
+        None in _join_key(binding, join_keys) for binding in itertools.chain(left, right)
+    ):
+        logger.debug("Join input has unbound join variables, joining in memory")
+        return _hash_join(left, right, join_keys, join_type)
+
+    build_rows = min(len(left), len(right))
+    num_partitions = max(2, -(-build_rows // max(1, memory_budget)))
+
+    logger.debug(
+        f"Join build side has {build_rows} rows (budget {memory_budget}), "
+        f"spilling to {num_partitions} partitions"
+    )
+
+    work_dir = tempfile.mkdtemp(prefix="sparql_join_", dir=spill_dir)
+    try:
+        left_paths = _spill_partitions(left, join_keys, num_partitions, work_dir, "left")
+        right_paths = _spill_partitions(right, join_keys, num_partitions, work_dir, "right")
+
+        output: List[Dict[str, Any]] = []
+        for left_path, right_path in zip(left_paths, right_paths):
+            output.extend(
+                _hash_join(
+                    _load_partition(left_path),
+                    _load_partition(right_path),
+                    join_keys,
+                    join_type
+                )
+            )
+        return output
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def _spill_partitions(
+    bindings: List[Dict[str, Any]],
+    join_keys: List[str],
+    num_partitions: int,
+    work_dir: str,
+    side: str
+) -> List[str]:
+    """Write bindings into ``num_partitions`` pickle files by join-key hash."""
+    paths = [os.path.join(work_dir, f"{side}_{i}.pkl") for i in range(num_partitions)]
+    handles = [open(path, "wb") for path in paths]
+    try:
+        for binding in bindings:
+            partition = hash(_join_key(binding, join_keys)) % num_partitions
+            pickle.dump(binding, handles[partition], protocol=pickle.HIGHEST_PROTOCOL)
+    finally:
+        for handle in handles:
+            handle.close()
+    return paths
+
+
+def _load_partition(path: str) -> List[Dict[str, Any]]:
+    """Read back all bindings from a spill file."""
+    bindings = []
+    with open(path, "rb") as handle:
+        while True:
+            try:
+                bindings.append(pickle.load(handle))
+            except EOFError:
+                break
+    return bindings
+
+
 class ResultMerger:
     """
     Strategies for merging results from heterogeneous federated queries.
@@ -1111,7 +1339,9 @@ class ResultMerger:
     @staticmethod
     def merge_with_union(
         results: List[QueryResult],
-        deduplicate: bool = True
+        deduplicate: bool = True,
+        order_by: Optional[OrderBy] = None,
+        bloom_capacity: Optional[int] = None
     ) -> QueryResult:
         """
         Merge results using UNION semantics (combine all rows).
@@ -1119,6 +1349,10 @@ class ResultMerger:
         Args:
             results: List of query results to merge
             deduplicate: Remove duplicate rows
+            order_by: (variable, descending) pairs every result is sorted by;
+                the results are then k-way merged (see ``parse_order_by``)
+            bloom_capacity: Deduplicate with a Bloom filter sized for this many
+                rows instead of an exact hash set
 
         Returns:
             Merged query result
@@ -1126,26 +1360,14 @@ class ResultMerger:
         if not results:
             return QueryResult(status=QueryStatus.SUCCESS, row_count=0)
 
-        # Combine all bindings
-        all_bindings = []
         all_variables = set()
-
         for result in results:
             if result.is_success:
-                all_bindings.extend(result.bindings)
                 all_variables.update(result.variables)
 
-        # Deduplicate if requested
-        if deduplicate:
-            seen = set()
-            unique_bindings = []
-            for binding in all_bindings:
-                # Create a hashable representation
-                binding_tuple = tuple(sorted(binding.items()))
-                if binding_tuple not in seen:
-                    seen.add(binding_tuple)
-                    unique_bindings.append(binding)
-            all_bindings = unique_bindings
+        all_bindings = list(ResultMerger.iter_union(
+            results, deduplicate, order_by, bloom_capacity
+        ))
 
         return QueryResult(
             status=QueryStatus.SUCCESS,
@@ -1155,23 +1377,73 @@ class ResultMerger:
             data=all_bindings
         )
 
+    @staticmethod
+    def iter_union(
+        results: Iterable[QueryResult],
+        deduplicate: bool = True,
+        order_by: Optional[OrderBy] = None,
+        bloom_capacity: Optional[int] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Stream rows of results with UNION semantics.
+
+        Without ``order_by``, rows of each result are yielded as soon as it is
+        produced by ``results``, so a generator yielding endpoint results as
+        they complete gives rows from the fastest endpoint first.
+
+        Args:
+            results: Query results, possibly lazily produced
+            deduplicate: Skip duplicate rows (detected by row hash)
+            order_by: (variable, descending) pairs every result is sorted by
+            bloom_capacity: Deduplicate with a Bloom filter sized for this many rows
+
+        Returns:
+            Iterator over the merged rows
+        """
+        merger = UnionMerger(
+            deduplicate=deduplicate, order_by=order_by, bloom_capacity=bloom_capacity
+        )
+        return merger.merge(
+            result.bindings for result in results if result.is_success
+        )
+
     @staticmethod
     def merge_with_join(
         results: List[QueryResult],
         join_keys: List[str],
-        join_type: str = "inner"
+        join_type: str = "inner",
+        memory_budget: Optional[int] = None,
+        spill_dir: Optional[str] = None
     ) -> QueryResult:
         """
         Merge results using JOIN semantics (combine on common keys).
 
+        Each pairwise join is a hash join: the smaller input is loaded into a
+        hash table keyed on the join variables and the larger one is streamed
+        against it, so the cost is linear in the size of both inputs. When the
+        build side exceeds ``memory_budget`` rows, both inputs are hash
+        partitioned to temporary files and joined one partition at a time.
+        Row order follows the larger input and is not guaranteed when spilling.
+
         Args:
             results: List of query results to merge
             join_keys: Variables to join on
             join_type: Type of join (inner, left, full)
+            memory_budget: Maximum number of build-side rows held in memory
+                before spilling to disk (None for no limit)
+            spill_dir: Directory for spill files (defaults to the system temp dir)
 
         Returns:
             Merged query result
+
+        Raises:
+            ValueError: If join_type is not one of inner, left or full
         """
+        if join_type not in JOIN_TYPES:
+            raise ValueError(
+                f"Unsupported join type '{join_type}', expected one of {sorted(JOIN_TYPES)}"
+            )
+
         if not results or len(results) < 2:
             return results[0] if results else QueryResult(status=QueryStatus.SUCCESS)
 
@@ -1185,39 +1457,17 @@ class ResultMerger:
                 continue
 
             all_variables.update(result.variables)
-            new_bindings = []
-
-            for left_binding in merged_bindings:
-                matched = False
-
-                for right_binding in result.bindings:
-                    # Check if join keys match
-                    if all(
-                        left_binding.get(key) == right_binding.get(key)
-                        for key in join_keys
-                    ):
-                        # Merge bindings
-                        merged_binding = {**left_binding, **right_binding}
-                        new_bindings.append(merged_binding)
-                        matched = True
-
-                # Handle outer join
-                if not matched and join_type in ("left", "full"):
-                    new_bindings.append(left_binding)
-
-            # Handle full outer join (right side)
-            if join_type == "full":
-                for right_binding in result.bindings:
-                    if not any(
-                        all(
-                            left_binding.get(key) == right_binding.get(key)
-                            for key in join_keys
-                        )
-                        for left_binding in merged_bindings
-                    ):
-                        new_bindings.append(right_binding)
-
-            merged_bindings = new_bindings
+
+            build_rows = min(len(merged_bindings), len(result.bindings))
+            if memory_budget is not None and build_rows > memory_budget:
+                merged_bindings = _partitioned_hash_join(
+                    merged_bindings, result.bindings, join_keys, join_type,
+                    memory_budget, spill_dir
+                )
+            else:
+                merged_bindings = _hash_join(
+                    merged_bindings, result.bindings, join_keys, join_type
+                )
 
         return QueryResult(
             status=QueryStatus.SUCCESS,
@@ -1252,6 +1502,303 @@ class ResultMerger:
         return result
 
 
+# =============================================================================
+# FEDERATED QUERY DECOMPOSITION
+# =============================================================================
+
+_SERVICE_PATTERN = re.compile(r"\bSERVICE\s+(SILENT\s+)?<([^>]*)>\s*\{", re.IGNORECASE)
+_OPTIONAL_OPEN_PATTERN = re.compile(r"\bOPTIONAL\s*\{\s*$", re.IGNORECASE)
+_SELECT_PATTERN = re.compile(
+    r"\bSELECT\s+(?:(DISTINCT|REDUCED)\s+)?(.*?)\s*(?:\bWHERE\s*)?\{", re.IGNORECASE | re.DOTALL
+)
+_IRI_PATTERN = re.compile(r"<[^<>\"{}|^`\\\s]*>")
+_UNSUPPORTED_MODIFIERS = re.compile(r"\b(GROUP\s+BY|HAVING|VALUES)\b", re.IGNORECASE)
+_VARIABLE_PATTERN = re.compile(r"[?$](\w+)")
+_VALUES_IRI_PATTERN = re.compile(r"(https?://|urn:)[^\s<>\"{}|^`\\]*")
+
+
+def _pattern_variables(pattern: str) -> Set[str]:
+    """Variables mentioned in a graph pattern (without '?')."""
+    return set(_VARIABLE_PATTERN.findall(_IRI_PATTERN.sub(" ", pattern)))
+
+
+def _values_term(value: Any) -> Optional[str]:
+    """
+    Render a binding value as a term of a VALUES block.
+
+    SPARQL JSON term dicts keep their type, datatype and language, and plain
+    values that look like IRIs are sent as IRIs; unbound values are UNDEF.
+    Other plain values have lost their datatype or language tag, so a plain
+    literal would not match ``"42"^^xsd:int`` or ``"chat"@fr`` remotely: for
+    them None is returned and the caller must not bind-join.
+    """
+    if value is None:
+        return "UNDEF"
+    if isinstance(value, dict):
+        term_type = value.get("type")
+        text = str(value.get("value", ""))
+        if term_type == "uri":
+            return f"<{text}>"
+        if term_type not in ("literal", "typed-literal"):
+            return None
+        literal = _string_literal(text)
+        if value.get("xml:lang"):
+            return f"{literal}@{value['xml:lang']}"
+        if value.get("datatype"):
+            return f"{literal}^^<{value['datatype']}>"
+        return literal
+    if isinstance(value, str) and _VALUES_IRI_PATTERN.fullmatch(value):
+        return f"<{value}>"
+    return None
+
+
+def _string_literal(text: str) -> str:
+    """Quote a string as a SPARQL literal."""
+    escaped = (
+        text.replace("\\", "\\\\")
+        .replace('"', '\\"')
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+    return f'"{escaped}"'
+
+
+def _order_clause(order_by: OrderBy) -> str:
+    """Render (variable, descending) pairs as an ORDER BY clause."""
+    terms = [f"DESC(?{var})" if descending else f"?{var}" for var, descending in order_by]
+    return f" ORDER BY {' '.join(terms)}"
+
+
+@dataclass
+class ServiceCall:
+    """
+    A SERVICE block of a federated query.
+
+    Attributes:
+        endpoint_url: Remote endpoint of the SERVICE
+        pattern: Graph pattern inside the SERVICE braces
+        silent: SERVICE SILENT (failures yield no bindings instead of an error)
+        optional: SERVICE is wrapped in OPTIONAL (left join)
+    """
+    endpoint_url: str
+    pattern: str
+    silent: bool = False
+    optional: bool = False
+
+
+@dataclass
+class FederatedQueryPlan:
+    """
+    A federated query split into independent SERVICE calls.
+
+    The WHERE clause consists only of (optionally OPTIONAL-wrapped) SERVICE
+    blocks, so the query can be answered by running every block at its
+    endpoint and joining the results client-side.
+
+    Attributes:
+        prefixes: Prologue (PREFIX/BASE declarations) of the query
+        services: SERVICE calls in query order
+        projection: Selected variables without '?' (None for SELECT *)
+        distinct: SELECT DISTINCT/REDUCED
+        order_by: (variable, descending) pairs of the ORDER BY clause
+        limit: LIMIT of the query
+        offset: OFFSET of the query
+    """
+    prefixes: str
+    services: List[ServiceCall]
+    projection: Optional[List[str]] = None
+    distinct: bool = False
+    order_by: Optional[OrderBy] = None
+    limit: Optional[int] = None
+    offset: Optional[int] = None
+
+    def service_query(
+        self,
+        call: ServiceCall,
+        limit: Optional[int] = None,
+        values: Optional[Tuple[List[str], List[Tuple[Any, ...]]]] = None,
+        pushdown: bool = False
+    ) -> str:
+        """
+        Build the standalone query sent to a SERVICE endpoint.
+
+        Args:
+            call: SERVICE call
+            limit: LIMIT of the service query (e.g. the per-service row cap)
+            values: Join variables and their value tuples bound by earlier
+                services, sent as a VALUES block (bind join)
+            pushdown: Also send the query's ORDER BY (and, for a query with a
+                single SERVICE, its projection and DISTINCT), so that ``limit``
+                can be ``pushdown_limit()``
+
+        Returns:
+            SPARQL query
+        """
+        pattern = call.pattern
+        if values is not None:
+            variables, rows = values
+            header = " ".join(f"?{var}" for var in variables)
+            body = " ".join(
+                "(" + " ".join(_values_term(value) or "UNDEF" for value in row) + ")"
+                for row in rows
+            )
+            pattern = f" VALUES ({header}) {{ {body} }} {pattern}"
+
+        select = "*"
+        modifiers = ""
+        if pushdown:
+            if len(self.services) == 1:
+                if self.projection is not None:
+                    select = " ".join(f"?{var}" for var in self.projection)
+                if self.distinct:
+                    select = f"DISTINCT {select}"
+            if self.order_by:
+                modifiers = _order_clause(self.order_by)
+        if limit is not None:
+            modifiers += f" LIMIT {limit}"
+        return f"{self.prefixes}SELECT {select} WHERE {{{pattern}}}{modifiers}"
+
+    def pushdown_limit(self) -> Optional[int]:
+        """
+        Number of rows that the only required SERVICE must return at most.
+
+        The query's LIMIT (plus OFFSET) can be sent to a SERVICE when joining
+        cannot drop or reorder its rows: it is the only SERVICE, or every
+        other SERVICE is OPTIONAL (a left join keeps every row), the query is
+        not DISTINCT and it orders only by variables of that SERVICE.
+
+        Returns:
+            Row limit for the required SERVICE (sent with ``pushdown=True``),
+            or None if the limit must be applied after joining
+        """
+        if self.limit is None:
+            return None
+        required = [call for call in self.services if not call.optional]
+        if len(required) != 1:
+            return None
+        if len(self.services) > 1:
+            if self.distinct:
+                return None
+            ordered_by = {var for var, _ in self.order_by or []}
+            if not ordered_by <= _pattern_variables(required[0].pattern):
+                return None
+        return (self.offset or 0) + self.limit
+
+
+def _closing_brace(text: str, open_index: int) -> int:
+    """Find the brace closing the one at ``open_index``, skipping strings, IRIs and comments."""
+    depth = 0
+    i = open_index
+    length = len(text)
+    while i < length:
+        char = text[i]
+        if char in "\"'":
+            i += 1
+            while i < length and text[i] != char:
+                i += 2 if text[i] == "\\" else 1
+        elif char == "<":
+            iri = _IRI_PATTERN.match(text, i)
+            if iri:
+                i = iri.end() - 1
+        elif char == "#":
+            newline = text.find("\n", i)
+            i = length if newline < 0 else newline
+        elif char == "{":
+            depth += 1
+        elif char == "}":
+            depth -= 1
+            if depth == 0:
+                return i
+        i += 1
+    raise ValueError("Unbalanced braces in query")
+
+
+def decompose_federated_query(query: str) -> Optional[FederatedQueryPlan]:
+    """
+    Split a SELECT query whose WHERE clause is made only of SERVICE blocks.
+
+    Args:
+        query: Federated SPARQL query
+
+    Returns:
+        Query plan, or None if the query has patterns outside SERVICE blocks,
+        projection expressions, GROUP BY/HAVING/VALUES, or an ORDER BY on
+        expressions (such queries must run on a federating endpoint)
+    """
+    select = _SELECT_PATTERN.search(query)
+    if not select:
+        return None
+
+    projection_text = select.group(2).strip()
+    projection: Optional[List[str]] = None
+    if projection_text != "*":
+        tokens = projection_text.split()
+        if not tokens or not all(re.fullmatch(r"[?$]\w+", token) for token in tokens):
+            return None
+        projection = [token[1:] for token in tokens]
+
+    body_open = select.end() - 1
+    try:
+        body_close = _closing_brace(query, body_open)
+    except ValueError:
+        return None
+    body = query[body_open + 1:body_close]
+    tail = query[body_close + 1:]
+
+    if _UNSUPPORTED_MODIFIERS.search(tail):
+        return None
+    order_by = parse_order_by(query)
+    if order_by is None and re.search(r"\bORDER\s+BY\b", tail, re.IGNORECASE):
+        return None
+    limit = re.search(r"\bLIMIT\s+(\d+)", tail, re.IGNORECASE)
+    offset = re.search(r"\bOFFSET\s+(\d+)", tail, re.IGNORECASE)
+
+    services: List[ServiceCall] = []
+    residual: List[str] = []
+    position = 0
+    while True:
+        match = _SERVICE_PATTERN.search(body, position)
+        if not match:
+            break
+        block_open = match.end() - 1
+        try:
+            block_close = _closing_brace(body, block_open)
+        except ValueError:
+            return None
+
+        start, end = match.start(), block_close + 1
+        optional = _OPTIONAL_OPEN_PATTERN.search(body, position, start)
+        if optional:
+            after = re.compile(r"\s*\}").match(body, end)
+            if not after:
+                return None
+            start, end = optional.start(), after.end()
+
+        residual.append(body[position:start])
+        services.append(ServiceCall(
+            endpoint_url=match.group(2),
+            pattern=body[block_open + 1:block_close],
+            silent=bool(match.group(1)),
+            optional=bool(optional),
+        ))
+        position = end
+    residual.append(body[position:])
+
+    leftover = re.sub(r"#[^\n]*", "", "".join(residual))
+    if not services or leftover.replace(".", "").strip():
+        return None
+
+    return FederatedQueryPlan(
+        prefixes=query[:select.start()],
+        services=services,
+        projection=projection,
+        distinct=bool(select.group(1)),
+        order_by=order_by,
+        limit=int(limit.group(1)) if limit else None,
+        offset=int(offset.group(1)) if offset else None,
+    )
+
+
 # =============================================================================
 # ERROR HANDLING AND RESILIENCE
 # =============================================================================
@@ -1270,15 +1817,55 @@ class ResilientFederatedExecutor:
     """
     Execute federated queries with error handling and graceful degradation.
 
-    This executor can handle endpoint failures, timeouts, and partial results,
-    providing the best possible results even when some services fail.
+    Queries whose WHERE clause consists of SERVICE blocks are decomposed: each
+    block runs at its endpoint through a ``QueryExecutor`` and the results are
+    hash-joined client-side. Other queries are sent whole to the
+    ``coordinator_endpoint``.
+
+    Remote result sizes are bounded:
+
+    - the query's LIMIT is pushed down to its SERVICE when joining cannot
+      drop or reorder rows (see ``FederatedQueryPlan.pushdown_limit``)
+    - the most selective required SERVICE (by ``cost_model``, else the first)
+      runs first, and later services sharing variables with the rows bound
+      so far receive those values as VALUES blocks (bind join)
+    - with ``max_service_rows`` set, each SERVICE returns at most that many
+      rows; a SERVICE that has more is truncated and the result flagged as
+      partial
+
+    Every remote call gets:
+
+    - a deadline (per SERVICE endpoint, falling back to the endpoint registry)
+    - a circuit breaker per endpoint, so failing endpoints are skipped quickly
+    - a hedged request to a mirror endpoint if the primary has not answered
+      within its p95 latency; the first success wins
+    - retries with linear backoff while the deadline allows
+
+    Failed SERVICE SILENT and OPTIONAL blocks contribute no bindings, as in
+    SPARQL. Other failed blocks fail the query unless ``allow_partial_results``
+    is set, in which case the remaining blocks are joined and the result is
+    flagged with ``metadata["partial"]``.
     """
 
     def __init__(
         self,
         max_retries: int = 2,
         retry_delay: float = 1.0,
-        allow_partial_results: bool = True
+        allow_partial_results: bool = True,
+        executor: Optional[QueryExecutor] = None,
+        coordinator_endpoint: Optional[str] = None,
+        mirrors: Optional[Dict[str, List[str]]] = None,
+        service_deadlines: Optional[Dict[str, float]] = None,
+        default_deadline: float = 60.0,
+        hedge_percentile: float = 0.95,
+        hedge_delay: float = 1.0,
+        min_hedge_samples: int = 20,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 30.0,
+        latency_store: Optional[EndpointLatencyStore] = None,
+        cost_model: Optional[ServiceCostModel] = None,
+        max_service_rows: Optional[int] = None,
+        bind_join_batch_size: int = 100
     ):
         """
         Initialize the resilient executor.
@@ -1287,6 +1874,24 @@ class ResilientFederatedExecutor:
             max_retries: Maximum retry attempts per service
             retry_delay: Delay between retries (seconds)
             allow_partial_results: Return partial results if some services fail
+            executor: Executor used for remote calls (a private one is created if None);
+                give it a ``ResultCache`` to cache SERVICE results
+            coordinator_endpoint: Endpoint that runs queries which cannot be decomposed
+            mirrors: Endpoint URL to mirror URLs serving the same data
+            service_deadlines: Endpoint URL to deadline in seconds
+            default_deadline: Deadline for endpoints without a configured one
+            hedge_percentile: Latency percentile after which a hedge is sent
+            hedge_delay: Hedge delay until an endpoint has ``min_hedge_samples`` samples
+            min_hedge_samples: Samples needed before the percentile is trusted
+            failure_threshold: Consecutive failures that open an endpoint's circuit
+            recovery_timeout: Seconds before an open circuit allows a trial request
+            latency_store: Persistent latency store fed with every successful call
+                (share it with a ``ServiceCostModel`` so its estimates improve)
+            cost_model: Cardinality estimates choosing the SERVICE that runs first
+            max_service_rows: Maximum rows fetched per SERVICE (None for no
+                cap); a capped SERVICE may drop join results, so the result
+                is then flagged ``partial``
+            bind_join_batch_size: Bound value tuples sent per bind join request
         """
         self.max_retries = max_retries
         self.retry_delay = retry_delay
@@ -1294,6 +1899,42 @@ class ResilientFederatedExecutor:
         self.errors: List[FederatedQueryError] = []
         self.logger = logging.getLogger(__name__)
 
+        self._owns_executor = executor is None
+        self.executor = executor or QueryExecutor()
+        self.coordinator_endpoint = coordinator_endpoint
+        self.mirrors = mirrors or {}
+        self.service_deadlines = service_deadlines or {}
+        self.default_deadline = default_deadline
+        self.hedge_percentile = hedge_percentile
+        self.hedge_delay = hedge_delay
+        self.min_hedge_samples = min_hedge_samples
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.cost_model = cost_model
+        self.max_service_rows = max_service_rows
+        self.bind_join_batch_size = max(1, bind_join_batch_size)
+
+        self.latencies = LatencyTracker()
+        self.latency_store = latency_store
+        self.breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(thread_name_prefix="sparql-service")
+
+        # Statistics
+        self.stats = {
+            "queries": 0,
+            "service_calls": 0,
+            "hedged_requests": 0,
+            "hedge_wins": 0,
+            "retries": 0,
+            "deadline_exceeded": 0,
+            "circuit_rejections": 0,
+            "partial_results": 0,
+            "limit_pushdowns": 0,
+            "bind_joins": 0,
+            "truncated_services": 0,
+        }
+
     def execute_with_fallback(
         self,
         query: str,
@@ -1327,9 +1968,9 @@ class ResilientFederatedExecutor:
 
         return result
 
-    def _try_execute(self, query: str) -> QueryResult:
+    def execute(self, query: str) -> QueryResult:
         """
-        Try to execute a query with retries.
+        Execute a federated query once (no fallback queries).
 
         Args:
             query: SPARQL query
@@ -1337,37 +1978,445 @@ class ResilientFederatedExecutor:
         Returns:
             Query result
         """
-        # This is a placeholder - actual implementation would use SPARQLWrapper
-        # or similar to execute the query
+        return self._try_execute(query)
 
-        for attempt in range(self.max_retries + 1):
-            try:
-                # Simulate execution
-                # In real implementation:
-                # from SPARQLWrapper import SPARQLWrapper
-                # sparql = SPARQLWrapper(endpoint_url)
-                # sparql.setQuery(query)
-                # results = sparql.query().convert()
-
-                return QueryResult(
-                    status=QueryStatus.SUCCESS,
-                    query=query,
-                    row_count=0,
-                    metadata={"attempt": attempt + 1}
-                )
+    def _try_execute(self, query: str) -> QueryResult:
+        """
+        Execute a query by SERVICE decomposition or on the coordinator.
 
-            except Exception as e:
-                self.logger.warning(f"Attempt {attempt + 1} failed: {e}")
+        Args:
+            query: SPARQL query
 
-                if attempt < self.max_retries:
-                    time.sleep(self.retry_delay * (attempt + 1))
+        Returns:
+            Query result
+        """
+        self._count("queries")
+        start = time.monotonic()
+
+        plan = decompose_federated_query(query)
+        if plan is not None:
+            result = self._execute_plan(query, plan)
+        elif self.coordinator_endpoint:
+            result = self._call_service(self.coordinator_endpoint, query)
+            if not result.is_success:
+                self._record_error(self.coordinator_endpoint, result)
+        else:
+            result = QueryResult(
+                status=QueryStatus.FAILED,
+                query=query,
+                error_message=(
+                    "Query has patterns outside SERVICE blocks and no coordinator "
+                    "endpoint is configured"
+                ),
+            )
+
+        result.query = query
+        result.execution_time = time.monotonic() - start
+        return result
+
+    def _execute_plan(self, query: str, plan: FederatedQueryPlan) -> QueryResult:
+        """Run the SERVICE calls, bind-joining dependent ones, and join their results."""
+        order = self._service_order(plan)
+        pushdown = plan.pushdown_limit()
+        if pushdown is not None:
+            self._count("limit_pushdowns")
+
+        # Services sharing no variable with an earlier one cannot be bind-joined
+        # and start right away; the others wait for the rows they join with
+        prefetched: Dict[int, Future] = {}
+        seen: Set[str] = set()
+        for index, call in enumerate(order):
+            pattern_variables = _pattern_variables(call.pattern)
+            if index == 0 or not pattern_variables & seen:
+                first = index == 0 and pushdown is not None
+                prefetched[index] = self._pool.submit(
+                    self._call_service,
+                    call.endpoint_url,
+                    plan.service_query(
+                        call, self._service_limit(pushdown if first else None), pushdown=first
+                    ),
+                )
+            seen |= pattern_variables
+
+        rows: Optional[List[Dict[str, Any]]] = None
+        variables: Set[str] = set()
+        failed: List[str] = []
+        truncated: List[str] = []
+        services: Dict[str, Dict[str, Any]] = {}
+
+        try:
+            # Required blocks first, so OPTIONAL blocks are left-joined onto them
+            for index, call in enumerate(order):
+                if rows is not None and not rows:
+                    # Joining onto no rows gives no rows
+                    break
+
+                join_variables = sorted(variables & _pattern_variables(call.pattern))
+                if index in prefetched:
+                    outcome = prefetched.pop(index).result()
+                elif join_variables and rows is not None:
+                    outcome = self._bind_join(plan, call, rows, join_variables)
                 else:
+                    outcome = self._call_service(
+                        call.endpoint_url, plan.service_query(call, self._service_limit(None))
+                    )
+
+                services[call.endpoint_url] = {
+                    key: outcome.metadata.get(key) for key in ("served_by", "hedged", "attempts")
+                }
+                if not outcome.is_success:
+                    failed.append(call.endpoint_url)
+                    self._record_error(call.endpoint_url, outcome)
+                    if call.silent or call.optional or self.allow_partial_results:
+                        continue
                     return QueryResult(
                         status=QueryStatus.FAILED,
                         query=query,
-                        error_message=str(e),
-                        metadata={"attempts": attempt + 1}
+                        error_message=f"SERVICE <{call.endpoint_url}> failed: {outcome.error_message}",
+                        metadata={"failed_services": failed, "services": services},
+                    )
+
+                bindings = list(outcome.bindings)
+                if self.max_service_rows is not None and len(bindings) > self.max_service_rows:
+                    bindings = bindings[:self.max_service_rows]
+                    truncated.append(call.endpoint_url)
+                    self._count("truncated_services")
+                    self.logger.warning(
+                        f"SERVICE <{call.endpoint_url}> has more than {self.max_service_rows} "
+                        f"rows; using the first {self.max_service_rows}"
                     )
+                services[call.endpoint_url].update({
+                    "rows": len(bindings),
+                    "bind_join_requests": outcome.metadata.get("bind_join_requests", 0),
+                    "truncated": call.endpoint_url in truncated,
+                })
+
+                if rows is None:
+                    rows = bindings
+                else:
+                    join_keys = sorted(variables.intersection(outcome.variables))
+                    rows = _hash_join(rows, bindings, join_keys, "left" if call.optional else "inner")
+                variables.update(outcome.variables)
+        finally:
+            for future in prefetched.values():
+                future.cancel()
+
+        if rows is None:
+            return QueryResult(
+                status=QueryStatus.FAILED,
+                query=query,
+                error_message=f"All SERVICE calls failed: {', '.join(failed)}",
+                metadata={"failed_services": failed, "services": services},
+            )
+
+        if failed or truncated:
+            self._count("partial_results")
+        rows = _apply_solution_modifiers(rows, plan)
+
+        return QueryResult(
+            status=QueryStatus.SUCCESS,
+            query=query,
+            bindings=rows,
+            row_count=len(rows),
+            variables=plan.projection or sorted(variables),
+            data=rows,
+            metadata={
+                "partial": bool(failed or truncated),
+                "failed_services": failed,
+                "truncated_services": truncated,
+                "services": services,
+            },
+        )
+
+    def _service_order(self, plan: FederatedQueryPlan) -> List[ServiceCall]:
+        """Order SERVICE calls: the most selective required one first, OPTIONAL ones last."""
+        required = [call for call in plan.services if not call.optional]
+        if self.cost_model is not None and len(required) > 1:
+            first = min(
+                required,
+                key=lambda call: self.cost_model.estimate_service_cardinality(
+                    call.endpoint_url, [call.pattern]
+                ),
+            )
+            required.remove(first)
+            required.insert(0, first)
+        return required + [call for call in plan.services if call.optional]
+
+    def _service_limit(self, pushdown: Optional[int]) -> Optional[int]:
+        """LIMIT of a service query: the pushed-down limit, or one row over the cap."""
+        cap = None if self.max_service_rows is None else self.max_service_rows + 1
+        if pushdown is None:
+            return cap
+        return pushdown if cap is None else min(pushdown, cap)
+
+    def _bind_join(
+        self,
+        plan: FederatedQueryPlan,
+        call: ServiceCall,
+        rows: List[Dict[str, Any]],
+        join_variables: List[str]
+    ) -> QueryResult:
+        """
+        Call a SERVICE with the join values of the rows bound so far.
+
+        The distinct value tuples are sent in batches of
+        ``bind_join_batch_size`` as VALUES blocks, concurrently, and the
+        answers are concatenated. Rows with unbound join variables would
+        match every value, and values whose RDF term is not known exactly
+        (plain literals without their datatype or language tag) would not
+        match their typed counterparts, so in both cases the SERVICE is
+        called without VALUES and hash-joined instead.
+        """
+        bound: Dict[Tuple[Any, ...], Tuple[Any, ...]] = {}
+        for row in rows:
+            key = _join_key(row, join_variables)
+            values = tuple(row.get(var) for var in join_variables)
+            if None in key or any(_values_term(value) is None for value in values):
+                return self._call_service(
+                    call.endpoint_url, plan.service_query(call, self._service_limit(None))
+                )
+            bound.setdefault(key, values)
+
+        self._count("bind_joins")
+        tuples = list(bound.values())
+        size = self.bind_join_batch_size
+        futures = [
+            self._pool.submit(
+                self._call_service,
+                call.endpoint_url,
+                plan.service_query(
+                    call,
+                    self._service_limit(None),
+                    values=(join_variables, tuples[start:start + size]),
+                ),
+            )
+            for start in range(0, len(tuples), size)
+        ]
+        outcomes = [future.result() for future in futures]
+
+        for outcome in outcomes:
+            if not outcome.is_success:
+                return outcome
+
+        bindings: List[Dict[str, Any]] = []
+        result_variables: Set[str] = set()
+        for outcome in outcomes:
+            bindings.extend(outcome.bindings)
+            result_variables.update(outcome.variables)
+        return QueryResult(
+            status=QueryStatus.SUCCESS,
+            bindings=bindings,
+            row_count=len(bindings),
+            variables=sorted(result_variables),
+            metadata={**outcomes[0].metadata, "bind_join_requests": len(outcomes)},
+        )
+
+    def _call_service(self, endpoint_url: str, query: str) -> QueryResult:
+        """Call an endpoint (with hedging) and retry failures until its deadline."""
+        self._count("service_calls")
+        deadline = time.monotonic() + self.get_deadline(endpoint_url)
+        targets = [endpoint_url] + self.mirrors.get(endpoint_url, [])
+
+        attempt = 0
+        while True:
+            result = self._hedged_request(targets, query, deadline)
+            if result.is_success or attempt >= self.max_retries:
+                break
+            if result.metadata.get("error_type") == "DeadlineExceeded":
+                break
+
+            delay = self.retry_delay * (attempt + 1)
+            if time.monotonic() + delay >= deadline:
+                break
+            self.logger.warning(f"Attempt {attempt + 1} at {endpoint_url} failed: {result.error_message}")
+            time.sleep(delay)
+            attempt += 1
+            self._count("retries")
+
+        result.metadata["attempts"] = attempt + 1
+        return result
+
+    def _hedged_request(self, targets: List[str], query: str, deadline: float) -> QueryResult:
+        """
+        Send a request to the first available target, hedging to the next ones.
+
+        A hedge is sent when the primary has not answered within its hedge
+        delay; a target that fails is replaced by the next one immediately.
+        """
+        futures: Dict[Future, str] = {}
+        candidates = iter(targets)
+
+        def launch() -> bool:
+            for url in candidates:
+                if self._breaker(url).allow():
+                    future = self.executor.scheduler.submit(
+                        url, partial(self._request, url, query, deadline)
+                    )
+                    futures[future] = url
+                    return True
+                self._count("circuit_rejections")
+            return False
+
+        if not launch():
+            return self._failed_result(
+                query, "CircuitOpen", f"Circuit open for all of {', '.join(targets)}"
+            )
+
+        primary = next(iter(futures.values()))
+        hedge_at = time.monotonic() + self.get_hedge_delay(primary)
+        hedged = False
+        last_failure: Optional[QueryResult] = None
+
+        try:
+            while futures:
+                now = time.monotonic()
+                if now >= deadline:
+                    self._count("deadline_exceeded")
+                    return self._failed_result(
+                        query, "DeadlineExceeded", f"Deadline exceeded for {', '.join(targets)}"
+                    )
+
+                timeout = deadline - now if hedged else min(deadline, hedge_at) - now
+                done, _ = wait(futures, timeout=max(0.0, timeout), return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    url = futures.pop(future)
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        result = self._failed_result(query, type(e).__name__, str(e))
+                    if result.is_success:
+                        result.metadata["served_by"] = url
+                        result.metadata["hedged"] = hedged
+                        if url != primary:
+                            self._count("hedge_wins")
+                        return result
+                    last_failure = result
+
+                if not futures:
+                    # Everything sent so far failed: fail over to the next target
+                    launch()
+                elif not hedged and time.monotonic() >= hedge_at:
+                    hedged = True
+                    if launch():
+                        self._count("hedged_requests")
+                        self.logger.info(f"Hedging request to {primary} with a mirror")
+        finally:
+            for future, url in futures.items():
+                if future.cancel():
+                    self._breaker(url).release()
+
+        return last_failure or self._failed_result(query, "QueryExecutionError", "No endpoint answered")
+
+    def _request(self, endpoint_url: str, query: str, deadline: float) -> QueryResult:
+        """Execute one request and feed the outcome to the endpoint's breaker and latency window."""
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            self._breaker(endpoint_url).release()
+            return self._failed_result(query, "DeadlineExceeded", "Deadline exceeded before sending")
+
+        start = time.monotonic()
+        result = self.executor.execute(
+            query, EndpointInfo(url=endpoint_url), timeout=max(1, math.ceil(remaining))
+        )
+        if result.is_success:
+            elapsed = time.monotonic() - start
+            self.latencies.record(endpoint_url, elapsed)
+            if self.latency_store is not None:
+                self.latency_store.record(endpoint_url, elapsed)
+            self._breaker(endpoint_url).record_success()
+        else:
+            self._breaker(endpoint_url).record_failure()
+        return result
+
+    def get_deadline(self, endpoint_url: str) -> float:
+        """Deadline in seconds for calls to an endpoint."""
+        if endpoint_url in self.service_deadlines:
+            return self.service_deadlines[endpoint_url]
+        for info in BIOMEDICAL_ENDPOINTS.values():
+            if info.url == endpoint_url and info.timeout:
+                return float(info.timeout)
+        return self.default_deadline
+
+    def get_hedge_delay(self, endpoint_url: str) -> float:
+        """Delay before hedging a request to an endpoint (its p95 latency once known)."""
+        if self.latencies.sample_count(endpoint_url) < self.min_hedge_samples:
+            return self.hedge_delay
+        return self.latencies.percentile(endpoint_url, self.hedge_percentile)
+
+    def _breaker(self, endpoint_url: str) -> CircuitBreaker:
+        """Get or create the circuit breaker of an endpoint."""
+        with self._lock:
+            breaker = self.breakers.get(endpoint_url)
+            if breaker is None:
+                breaker = CircuitBreaker(self.failure_threshold, self.recovery_timeout)
+                self.breakers[endpoint_url] = breaker
+            return breaker
+
+    def _count(self, name: str):
+        """Increment a statistics counter."""
+        with self._lock:
+            self.stats[name] += 1
+
+    def _failed_result(self, query: str, error_type: str, message: str) -> QueryResult:
+        """Build a failed result for errors raised by this executor."""
+        return QueryResult(
+            status=QueryStatus.FAILED,
+            query=query,
+            error_message=message,
+            metadata={"error_type": error_type},
+        )
+
+    def _record_error(self, endpoint_url: str, result: QueryResult):
+        """Remember a failed call in ``errors``."""
+        error_type = result.metadata.get("error_type", "QueryExecutionError")
+        self.errors.append(FederatedQueryError(
+            endpoint=endpoint_url,
+            error_type=error_type,
+            message=result.error_message or "",
+            is_recoverable=error_type != "CircuitOpen",
+        ))
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get call counters, breaker states and latency percentiles."""
+        with self._lock:
+            stats: Dict[str, Any] = dict(self.stats)
+            breakers = dict(self.breakers)
+        stats["circuit_breakers"] = {url: b.get_statistics() for url, b in breakers.items()}
+        stats["latency"] = self.latencies.get_statistics()
+        return stats
+
+    def close(self):
+        """Release worker threads (and the executor if it was created here)."""
+        self._pool.shutdown(wait=False)
+        if self.latency_store is not None:
+            self.latency_store.save()
+        if self._owns_executor:
+            self.executor.close()
+
+    def __enter__(self):
+        """Context manager entry."""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit."""
+        self.close()
+
+
+def _apply_solution_modifiers(
+    rows: List[Dict[str, Any]],
+    plan: FederatedQueryPlan
+) -> List[Dict[str, Any]]:
+    """Apply ORDER BY, projection, DISTINCT, OFFSET and LIMIT in SPARQL order."""
+    if plan.order_by:
+        rows.sort(key=order_key(plan.order_by))
+    if plan.projection is not None:
+        rows = [{var: row[var] for var in plan.projection if var in row} for row in rows]
+    if plan.distinct:
+        rows = list(UnionMerger(deduplicate=True).merge([rows]))
+    start = plan.offset or 0
+    end = start + plan.limit if plan.limit is not None else None
+    return rows[start:end]
 
 
 # =============================================================================
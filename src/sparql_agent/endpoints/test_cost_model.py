@@ -0,0 +1,169 @@
+"""
+Unit tests for the statistics-based SERVICE cost model.
+
+Run tests with:
+    pytest test_cost_model.py -v
+"""
+
+import json
+
+import pytest
+
+from ..discovery.statistics import DatasetStatistics
+from .cost_model import EndpointLatencyStore, ServiceCostModel
+from .federated import FederatedQueryBuilder, QueryOptimizationHints
+
+
+UNIPROT = "https://sparql.uniprot.org/sparql"
+PDB = "https://rdf.wwpdb.org/sparql"
+CHEBI = "https://example.org/chebi/sparql"
+
+UP = "http://purl.uniprot.org/core/"
+PDBO = "https://rdf.wwpdb.org/schema/pdbx-v50.owl#"
+
+
+@pytest.fixture
+def cost_model():
+    """Cost model with statistics for UniProt and PDB."""
+    model = ServiceCostModel()
+    model.add_dataset_statistics(UNIPROT, DatasetStatistics(
+        endpoint_url=UNIPROT,
+        total_triples=10_000_000_000,
+        distinct_subjects=1_000_000_000,
+        distinct_objects=2_000_000_000,
+        top_classes=[(UP + "Protein", 250_000_000), (UP + "Taxon", 3_000_000)],
+        top_properties=[(UP + "mnemonic", 250_000_000), (UP + "organism", 250_000_000)],
+    ))
+    model.add_cardinalities(
+        PDB,
+        triples=500_000_000,
+        distinct_subjects=50_000_000,
+        distinct_objects=80_000_000,
+        properties={PDBO + "has_entity": 1_000_000, PDBO + "entity_uniprot": 400_000},
+    )
+    return model
+
+
+class TestCardinalityEstimates:
+    """Test triple pattern and SERVICE cardinality estimates."""
+
+    def test_class_pattern_uses_class_count(self, cost_model):
+        """rdf:type patterns are estimated from the class partition."""
+        assert cost_model.estimate_pattern_cardinality(
+            UNIPROT, "?t", "a", "up:Taxon"
+        ) == 3_000_000
+
+    def test_bound_object_is_selective(self, cost_model):
+        """A constant object divides the property count by distinct objects."""
+        estimate = cost_model.estimate_pattern_cardinality(
+            UNIPROT, "?p", "up:mnemonic", '"BRCA1_HUMAN"'
+        )
+        assert estimate == 1.0
+
+    def test_unlisted_term_bounded_by_smallest_listed(self, cost_model):
+        """Terms outside the top lists are at most as frequent as the rarest one."""
+        assert cost_model.estimate_pattern_cardinality(
+            UNIPROT, "?x", "a", "up:Gene"
+        ) == 3_000_000
+
+    def test_service_takes_most_selective_pattern(self, cost_model):
+        """A block is estimated by its most selective pattern."""
+        patterns = [
+            "?protein a up:Protein ;",
+            '    up:mnemonic "BRCA1_HUMAN" .',
+        ]
+        assert cost_model.estimate_service_cardinality(UNIPROT, [" ".join(patterns)]) == 1.0
+
+    def test_unknown_endpoint_uses_selectivity(self, cost_model):
+        """Endpoints without statistics fall back to the hinted selectivity."""
+        low = cost_model.estimate_service_cardinality(CHEBI, ["?x ?p ?o ."], 0.01)
+        high = cost_model.estimate_service_cardinality(CHEBI, ["?x ?p ?o ."], 0.9)
+        assert low < high
+
+
+class TestServiceOrdering:
+    """Test cost-based SERVICE ordering."""
+
+    def test_selective_service_first(self, cost_model):
+        """The service with the smallest estimated result runs first."""
+        services = {
+            PDB: ["?structure pdb:has_entity ?entity .", "?entity pdb:entity_uniprot ?protein ."],
+            UNIPROT: ["?protein a up:Protein .", '?protein up:mnemonic "BRCA1_HUMAN" .'],
+        }
+        order = list(cost_model.order_services(services))
+        assert order == [UNIPROT, PDB]
+
+    def test_connected_services_before_cross_products(self, cost_model):
+        """Services sharing variables with placed ones come before unrelated cheaper ones."""
+        cost_model.latency_store = EndpointLatencyStore()
+        cost_model.latency_store.record(PDB, 5.0)
+        services = {
+            CHEBI: ["?compound rdfs:label ?label ."],
+            PDB: ["?structure pdb:has_entity ?entity .", "?entity pdb:entity_uniprot ?protein ."],
+            UNIPROT: ['?protein up:mnemonic "BRCA1_HUMAN" .'],
+        }
+        plan = cost_model.plan(services, {CHEBI: 0.001})
+
+        assert [estimate.endpoint_url for estimate in plan] == [UNIPROT, PDB, CHEBI]
+        assert plan[1].joined_on == {"protein"}
+        assert plan[1].cardinality == 1.0
+        assert plan[2].joined_on == set()
+
+    def test_observed_latency_changes_order(self):
+        """A slow endpoint is deferred when cardinalities are equal."""
+        store = EndpointLatencyStore()
+        store.record(UNIPROT, 10.0)
+        store.record(PDB, 0.2)
+        model = ServiceCostModel(latency_store=store)
+        services = {UNIPROT: ["?a ?b ?c ."], PDB: ["?d ?e ?f ."]}
+
+        assert list(model.order_services(services)) == [PDB, UNIPROT]
+
+    def test_builder_uses_cost_model(self, cost_model):
+        """The builder orders SERVICE clauses and estimates cost with the model."""
+        builder = FederatedQueryBuilder(cost_model=cost_model, cache_results=False)
+        services = {
+            PDB: ["?structure pdb:has_entity ?entity .", "?entity pdb:entity_uniprot ?protein ."],
+            UNIPROT: ['?protein up:mnemonic "BRCA1_HUMAN" .'],
+        }
+
+        query = builder.build_federated_query(["?protein", "?structure"], services)
+        assert query.index(UNIPROT) < query.index(PDB)
+
+        cost = builder.estimate_query_cost(services, QueryOptimizationHints())
+        assert cost["service_order"] == [UNIPROT, PDB]
+        assert cost["estimated_rows"][UNIPROT] == 1.0
+        assert cost["recommended_timeout"] >= 60
+
+
+class TestEndpointLatencyStore:
+    """Test persisted latency observations."""
+
+    def test_moving_average(self):
+        """Later observations move the estimate by the smoothing factor."""
+        store = EndpointLatencyStore(smoothing=0.5)
+        assert store.estimate(UNIPROT) is None
+        store.record(UNIPROT, 2.0)
+        store.record(UNIPROT, 4.0)
+
+        assert store.estimate(UNIPROT) == 3.0
+        assert store.observations(UNIPROT) == 2
+
+    def test_persists_between_instances(self, tmp_path):
+        """Observations are saved to and loaded from the JSON file."""
+        path = tmp_path / "latency.json"
+        store = EndpointLatencyStore(str(path), autosave_every=2)
+        store.record(PDB, 1.5)
+        assert not path.exists()
+        store.record(PDB, 1.5)
+        assert json.loads(path.read_text())[PDB]["observations"] == 2
+
+        reloaded = EndpointLatencyStore(str(path))
+        assert reloaded.estimate(PDB) == 1.5
+
+    def test_ignores_corrupt_file(self, tmp_path):
+        """An unreadable file starts an empty store."""
+        path = tmp_path / "latency.json"
+        path.write_text("{not json")
+
+        assert EndpointLatencyStore(str(path)).get_statistics() == {}
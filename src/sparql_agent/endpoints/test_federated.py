@@ -6,6 +6,8 @@ Run tests with:
     pytest test_federated.py::TestFederatedQueryBuilder -v
 """
 
+import time
+
 import pytest
 from datetime import datetime, timedelta
 from typing import Dict, List
@@ -22,9 +24,12 @@ from .federated import (
     BIOMEDICAL_ENDPOINTS,
     FEDERATED_PREFIXES,
     get_federated_prefix_string,
+    decompose_federated_query,
 )
+from .cost_model import ServiceCostModel
 
 from ..core.types import QueryResult, QueryStatus
+from ..execution.executor import QueryExecutor
 
 
 # =============================================================================
@@ -408,6 +413,27 @@ class TestResultMerger:
 
         assert merged.row_count == 3  # Duplicate removed
 
+    def test_merge_with_union_ordered(self, result_merger):
+        """Test k-way UNION merge of results sorted by ORDER BY."""
+        result1 = QueryResult(
+            status=QueryStatus.SUCCESS,
+            bindings=[{"mass": "10"}, {"mass": "30"}],
+            variables=["mass"],
+            row_count=2
+        )
+        result2 = QueryResult(
+            status=QueryStatus.SUCCESS,
+            bindings=[{"mass": "20"}, {"mass": "30"}, {"mass": "100"}],
+            variables=["mass"],
+            row_count=3
+        )
+
+        merged = result_merger.merge_with_union(
+            [result1, result2], order_by=[("mass", False)]
+        )
+
+        assert [b["mass"] for b in merged.bindings] == ["10", "20", "30", "100"]
+
     def test_merge_with_join_inner(self, result_merger, sample_query_results):
         """Test inner JOIN merge."""
         result1, result2 = sample_query_results
@@ -457,6 +483,118 @@ class TestResultMerger:
         # Should have: P12345 (matched), P67890 (left only), P99999 (right only)
         assert merged.row_count >= 2
 
+    def test_merge_with_join_full_exact_rows(self, result_merger, sample_query_results):
+        """Test full outer JOIN keeps unmatched rows from both sides once."""
+        result1, result2 = sample_query_results
+
+        merged = result_merger.merge_with_join(
+            [result1, result2],
+            join_keys=["protein"],
+            join_type="full"
+        )
+
+        proteins = sorted(b["protein"] for b in merged.bindings)
+        assert proteins == ["P12345", "P67890", "P99999"]
+
+    def test_merge_with_join_smaller_left_side(self, result_merger):
+        """Test left JOIN when the left input is the hash build side."""
+        left = QueryResult(
+            status=QueryStatus.SUCCESS,
+            bindings=[{"protein": "P1", "name": "A"}, {"protein": "P2", "name": "B"}],
+            variables=["protein", "name"],
+            row_count=2
+        )
+        right = QueryResult(
+            status=QueryStatus.SUCCESS,
+            bindings=[
+                {"protein": "P1", "pdbId": "1ABC"},
+                {"protein": "P1", "pdbId": "2DEF"},
+                {"protein": "P3", "pdbId": "3GHI"},
+            ],
+            variables=["protein", "pdbId"],
+            row_count=3
+        )
+
+        merged = result_merger.merge_with_join(
+            [left, right],
+            join_keys=["protein"],
+            join_type="left"
+        )
+
+        rows = sorted((b["protein"], b.get("pdbId")) for b in merged.bindings)
+        assert rows == [("P1", "1ABC"), ("P1", "2DEF"), ("P2", None)]
+
+    def test_merge_with_join_sparql_json_terms(self, result_merger):
+        """Test joining on SPARQL JSON term dicts."""
+        term = {"type": "uri", "value": "http://purl.uniprot.org/uniprot/P12345"}
+        left = QueryResult(
+            status=QueryStatus.SUCCESS,
+            bindings=[{"protein": dict(term), "name": {"type": "literal", "value": "A"}}],
+            variables=["protein", "name"]
+        )
+        right = QueryResult(
+            status=QueryStatus.SUCCESS,
+            bindings=[{"protein": dict(term), "pdbId": {"type": "literal", "value": "1ABC"}}],
+            variables=["protein", "pdbId"]
+        )
+
+        merged = result_merger.merge_with_join([left, right], join_keys=["protein"])
+
+        assert merged.row_count == 1
+        assert merged.bindings[0]["pdbId"]["value"] == "1ABC"
+
+    @pytest.mark.parametrize("join_type", ["inner", "left", "full"])
+    def test_merge_with_join_spill_matches_in_memory(self, result_merger, join_type, tmp_path):
+        """Test the spill-to-disk join returns the same rows as the in-memory join."""
+        left = QueryResult(
+            status=QueryStatus.SUCCESS,
+            bindings=[{"id": str(i % 40), "l": i} for i in range(100)],
+            variables=["id", "l"]
+        )
+        right = QueryResult(
+            status=QueryStatus.SUCCESS,
+            bindings=[{"id": str(i), "r": i} for i in range(20, 70)],
+            variables=["id", "r"]
+        )
+
+        in_memory = result_merger.merge_with_join([left, right], ["id"], join_type)
+        spilled = result_merger.merge_with_join(
+            [left, right], ["id"], join_type, memory_budget=10, spill_dir=str(tmp_path)
+        )
+
+        def normalize(bindings):
+            return sorted(tuple(sorted(b.items())) for b in bindings)
+
+        assert normalize(spilled.bindings) == normalize(in_memory.bindings)
+        assert list(tmp_path.iterdir()) == []
+
+    def test_merge_with_join_unbound_is_compatible(self, result_merger):
+        """Test that an unbound join variable matches any value, as in SPARQL."""
+        left = QueryResult(
+            status=QueryStatus.SUCCESS,
+            bindings=[{"s": "1"}, {"s": "2", "o": "b"}],
+            variables=["s", "o"]
+        )
+        right = QueryResult(
+            status=QueryStatus.SUCCESS,
+            bindings=[{"s": "1", "o": "a", "x": 1}, {"s": "2", "o": "c", "x": 2}, {"s": "2", "x": 3}],
+            variables=["s", "o", "x"]
+        )
+
+        merged = result_merger.merge_with_join([left, right], join_keys=["s", "o"])
+
+        rows = sorted((b["s"], b.get("o"), b["x"]) for b in merged.bindings)
+        assert rows == [("1", "a", 1), ("2", "b", 3)]
+
+    def test_merge_with_join_invalid_type(self, result_merger, sample_query_results):
+        """Test unknown join types are rejected."""
+        with pytest.raises(ValueError):
+            result_merger.merge_with_join(
+                list(sample_query_results),
+                join_keys=["protein"],
+                join_type="cross"
+            )
+
     def test_handle_missing_optional_data(self, result_merger):
         """Test filling missing optional data."""
         result = QueryResult(
@@ -485,33 +623,382 @@ class TestResultMerger:
 class TestResilientFederatedExecutor:
     """Tests for ResilientFederatedExecutor class."""
 
+    UNIPROT = "https://sparql.uniprot.org/sparql"
+    PDB = "https://rdf.wwpdb.org/sparql"
+    MIRROR = "https://mirror.example.org/sparql"
+
+    @staticmethod
+    def make_executor(responses, sent=None, **kwargs):
+        """Create an executor whose endpoint calls are answered by ``responses``."""
+        def fake_execute(query, endpoint, timeout=None):
+            if sent is not None:
+                sent.append((endpoint.url, query))
+            response = responses[endpoint.url]
+            return response() if callable(response) else response
+
+        query_executor = QueryExecutor()
+        query_executor.execute = fake_execute
+        kwargs.setdefault("retry_delay", 0.01)
+        return ResilientFederatedExecutor(executor=query_executor, **kwargs)
+
+    @staticmethod
+    def rows(*bindings):
+        """Successful result with the given rows."""
+        return QueryResult(
+            status=QueryStatus.SUCCESS,
+            bindings=list(bindings),
+            row_count=len(bindings),
+            variables=sorted({var for b in bindings for var in b}),
+        )
+
+    @staticmethod
+    def failure(error_type="EndpointUnavailableError"):
+        """Failed result as returned by QueryExecutor."""
+        return QueryResult(
+            status=QueryStatus.FAILED,
+            error_message="503 Service Unavailable",
+            metadata={"error_type": error_type},
+        )
+
+    def federated_query(self, silent=False):
+        """Two SERVICE blocks joined on ?protein."""
+        keyword = "SERVICE SILENT" if silent else "SERVICE"
+        return f"""
+        PREFIX up: <http://purl.uniprot.org/core/>
+        SELECT ?protein ?name ?structure WHERE {{
+            {keyword} <{self.UNIPROT}> {{ ?protein up:mnemonic ?name . }}
+            {keyword} <{self.PDB}> {{ ?structure <http://example.org/of> ?protein . }}
+        }}
+        ORDER BY ?name
+        LIMIT 10
+        """
+
     def test_initialization(self, resilient_executor):
         """Test executor initialization."""
         assert resilient_executor.max_retries == 2
         assert resilient_executor.retry_delay == 0.1
         assert resilient_executor.allow_partial_results is True
 
-    def test_execute_with_fallback_success(self, resilient_executor):
-        """Test successful execution without fallback."""
-        query = "SELECT ?s ?p ?o WHERE { ?s ?p ?o . } LIMIT 10"
+    def test_decompose_builder_query(self, query_builder):
+        """Test that builder-generated queries split into SERVICE calls."""
+        query = query_builder.build_federated_query(
+            select_vars=["?protein", "?structure"],
+            services={
+                self.UNIPROT: ["?protein a up:Protein ."],
+                self.PDB: ["?structure pdbo:of ?protein ."],
+            },
+            optimization_hints=QueryOptimizationHints(use_optional_for={self.PDB}),
+            order_by=["DESC(?protein)"],
+            limit=5,
+        )
+
+        plan = decompose_federated_query(query)
+
+        assert [s.endpoint_url for s in plan.services] == [self.UNIPROT, self.PDB]
+        assert all(s.silent for s in plan.services)
+        assert [s.optional for s in plan.services] == [False, True]
+        assert plan.projection == ["protein", "structure"]
+        assert plan.order_by == [("protein", True)]
+        assert plan.limit == 5
+        assert plan.service_query(plan.services[0]).startswith("PREFIX")
+
+    def test_decompose_rejects_local_patterns(self):
+        """Test that patterns outside SERVICE blocks prevent decomposition."""
+        query = f"SELECT * WHERE {{ ?s ?p ?o . SERVICE <{self.PDB}> {{ ?s ?q ?v }} }}"
+        assert decompose_federated_query(query) is None
+        assert decompose_federated_query(
+            f"SELECT (COUNT(?s) AS ?n) WHERE {{ SERVICE <{self.PDB}> {{ ?s ?p ?o }} }}"
+        ) is None
+
+    def test_services_are_joined(self):
+        """Test that SERVICE results are joined and solution modifiers applied."""
+        executor = self.make_executor({
+            self.UNIPROT: self.rows(
+                {"protein": "P2", "name": "B"}, {"protein": "P1", "name": "A"}
+            ),
+            self.PDB: self.rows(
+                {"protein": "P1", "structure": "1ABC"},
+                {"protein": "P2", "structure": "2XYZ"},
+                {"protein": "P3", "structure": "3DEF"},
+            ),
+        })
+
+        result = executor.execute(self.federated_query())
+
+        assert result.is_success
+        assert result.bindings == [
+            {"protein": "P1", "name": "A", "structure": "1ABC"},
+            {"protein": "P2", "name": "B", "structure": "2XYZ"},
+        ]
+        assert result.variables == ["protein", "name", "structure"]
+        assert result.metadata["partial"] is False
+
+    def test_partial_results(self):
+        """Test partial-result assembly when one SERVICE fails."""
+        responses = {
+            self.UNIPROT: self.rows({"protein": "P1", "name": "A"}),
+            self.PDB: self.failure(),
+        }
+
+        result = self.make_executor(responses, max_retries=0).execute(self.federated_query())
+        assert result.is_success
+        assert result.metadata["partial"] is True
+        assert result.metadata["failed_services"] == [self.PDB]
+        assert result.bindings == [{"protein": "P1", "name": "A"}]
+
+        strict = self.make_executor(responses, max_retries=0, allow_partial_results=False)
+        assert not strict.execute(self.federated_query()).is_success
+        assert strict.execute(self.federated_query(silent=True)).is_success
+
+    def test_limit_pushed_down_to_single_service(self):
+        """Test that LIMIT, OFFSET and ORDER BY are sent to a lone SERVICE."""
+        sent = []
+        executor = self.make_executor(
+            {self.UNIPROT: self.rows({"protein": "P1", "name": "A"})}, sent=sent
+        )
+        query = f"""
+        SELECT DISTINCT ?protein WHERE {{
+            SERVICE <{self.UNIPROT}> {{ ?protein up:mnemonic ?name . }}
+        }}
+        ORDER BY DESC(?name) OFFSET 2 LIMIT 5
+        """
+
+        executor.execute(query)
+
+        assert sent[0][1].endswith("ORDER BY DESC(?name) LIMIT 7")
+        assert "SELECT DISTINCT ?protein WHERE" in sent[0][1]
+        assert executor.get_statistics()["limit_pushdowns"] == 1
+
+    def test_limit_not_pushed_through_inner_join(self):
+        """Test that services joined on required patterns get only the row cap."""
+        sent = []
+        executor = self.make_executor(
+            {
+                self.UNIPROT: self.rows({"protein": "P1", "name": "A"}),
+                self.PDB: self.rows({"protein": "P1", "structure": "1ABC"}),
+            },
+            sent=sent,
+            max_service_rows=1000,
+        )
+
+        executor.execute(self.federated_query())
+
+        assert all(query.endswith("LIMIT 1001") for _, query in sent)
+        assert executor.get_statistics()["limit_pushdowns"] == 0
+
+    def test_bind_join_sends_bound_values(self):
+        """Test that later services receive the join values of earlier ones."""
+        sent = []
+        executor = self.make_executor(
+            {
+                self.UNIPROT: self.rows(
+                    {"protein": "http://purl.uniprot.org/uniprot/P1", "name": "A"},
+                    {"protein": "http://purl.uniprot.org/uniprot/P2", "name": 'B "2"'},
+                    {"protein": "http://purl.uniprot.org/uniprot/P1", "name": "C"},
+                ),
+                self.PDB: self.rows(
+                    {"protein": "http://purl.uniprot.org/uniprot/P1", "structure": "1ABC"}
+                ),
+            },
+            sent=sent,
+            bind_join_batch_size=1,
+        )
+
+        result = executor.execute(self.federated_query())
+
+        assert [url for url, _ in sent] == [self.UNIPROT, self.PDB, self.PDB]
+        pdb_queries = sorted(query for url, query in sent if url == self.PDB)
+        assert "VALUES (?protein) { (<http://purl.uniprot.org/uniprot/P1>) }" in pdb_queries[0]
+        assert "VALUES (?protein) { (<http://purl.uniprot.org/uniprot/P2>) }" in pdb_queries[1]
+        assert result.metadata["services"][self.PDB]["bind_join_requests"] == 2
+        assert executor.get_statistics()["bind_joins"] == 1
+
+    def test_cost_model_picks_first_service(self):
+        """Test that the most selective required SERVICE runs first."""
+        sent = []
+        model = ServiceCostModel()
+        model.add_cardinalities(self.UNIPROT, properties={"http://purl.uniprot.org/core/mnemonic": 10**8})
+        model.add_cardinalities(self.PDB, properties={"http://example.org/of": 10})
+        executor = self.make_executor(
+            {
+                self.UNIPROT: self.rows({"protein": "P1", "name": "A"}),
+                self.PDB: self.rows({"protein": "P1", "structure": "1ABC"}),
+            },
+            sent=sent,
+            cost_model=model,
+        )
+
+        result = executor.execute(self.federated_query())
+
+        assert [url for url, _ in sent] == [self.PDB, self.UNIPROT]
+        assert result.row_count == 1
+
+    def test_plain_literals_are_not_bind_joined(self):
+        """Test that values without their datatype or language are hash-joined."""
+        sent = []
+        executor = self.make_executor(
+            {
+                self.UNIPROT: self.rows({"protein": "P1", "name": "A"}),
+                self.PDB: self.rows({"protein": "P1", "structure": "1ABC"}),
+            },
+            sent=sent,
+        )
+
+        result = executor.execute(self.federated_query())
+
+        assert "VALUES" not in sent[1][1]
+        assert result.row_count == 1
+        assert executor.get_statistics()["bind_joins"] == 0
+
+    def test_bind_join_keeps_literal_terms(self):
+        """Test that SPARQL JSON literals are sent with datatype and language."""
+        typed = {"type": "literal", "value": "42", "datatype": "http://www.w3.org/2001/XMLSchema#int"}
+        tagged = {"type": "literal", "value": "chat", "xml:lang": "fr"}
+        sent = []
+        executor = self.make_executor(
+            {
+                self.UNIPROT: self.rows({"protein": typed, "name": "A"}, {"protein": tagged, "name": "B"}),
+                self.PDB: self.rows({"protein": typed, "structure": "1ABC"}),
+            },
+            sent=sent,
+        )
+
+        result = executor.execute(self.federated_query())
+
+        assert ('VALUES (?protein) { ("42"^^<http://www.w3.org/2001/XMLSchema#int>) ("chat"@fr) }'
+                in sent[1][1])
+        assert result.row_count == 1
+
+    def test_row_cap_gives_partial_result(self):
+        """Test that a SERVICE over the row cap is truncated and flagged."""
+        executor = self.make_executor(
+            {
+                self.UNIPROT: self.rows(*({"protein": f"P{i}", "name": str(i)} for i in range(5))),
+                self.PDB: self.rows({"protein": "P1", "structure": "1ABC"}),
+            },
+            max_service_rows=3,
+        )
+
+        result = executor.execute(self.federated_query())
+
+        assert result.is_success
+        assert result.metadata["partial"] is True
+        assert result.metadata["truncated_services"] == [self.UNIPROT]
+        assert result.metadata["services"][self.UNIPROT]["rows"] == 3
+
+    def test_no_row_cap_by_default(self):
+        """Test that services are not truncated unless a cap is set."""
+        sent = []
+        executor = self.make_executor(
+            {
+                self.UNIPROT: self.rows(*({"protein": f"P{i}", "name": str(i)} for i in range(5))),
+                self.PDB: self.rows({"protein": "P1", "structure": "1ABC"}),
+            },
+            sent=sent,
+        )
+
+        result = executor.execute(self.federated_query())
+
+        assert executor.max_service_rows is None
+        assert not any("LIMIT" in query for _, query in sent)
+        assert result.metadata["partial"] is False
+
+    def test_hedged_request_to_mirror(self):
+        """Test that a slow primary is hedged to its mirror."""
+        def slow():
+            time.sleep(0.5)
+            return self.rows({"protein": "P1", "name": "slow"})
+
+        executor = self.make_executor(
+            {
+                self.UNIPROT: slow,
+                self.MIRROR: self.rows({"protein": "P1", "name": "mirror"}),
+                self.PDB: self.rows({"protein": "P1", "structure": "1ABC"}),
+            },
+            mirrors={self.UNIPROT: [self.MIRROR]},
+            hedge_delay=0.05,
+        )
+
+        result = executor.execute(self.federated_query())
+
+        assert result.bindings[0]["name"] == "mirror"
+        assert result.metadata["services"][self.UNIPROT]["served_by"] == self.MIRROR
+        stats = executor.get_statistics()
+        assert stats["hedged_requests"] == 1
+        assert stats["hedge_wins"] == 1
+
+    def test_hedge_delay_uses_percentile(self):
+        """Test that the hedge delay follows observed latency."""
+        executor = ResilientFederatedExecutor(hedge_delay=2.0, min_hedge_samples=10)
+        assert executor.get_hedge_delay(self.UNIPROT) == 2.0
+        for i in range(1, 101):
+            executor.latencies.record(self.UNIPROT, i / 100)
+        assert executor.get_hedge_delay(self.UNIPROT) == 0.95
+
+    def test_per_service_deadline(self):
+        """Test that a SERVICE exceeding its deadline is dropped."""
+        def hang():
+            time.sleep(1.0)
+            return self.rows({"protein": "P1", "structure": "late"})
+
+        executor = self.make_executor(
+            {self.UNIPROT: self.rows({"protein": "P1", "name": "A"}), self.PDB: hang},
+            service_deadlines={self.PDB: 0.1},
+        )
+
+        start = time.monotonic()
+        result = executor.execute(self.federated_query())
 
-        result = resilient_executor.execute_with_fallback(query)
+        assert time.monotonic() - start < 0.8
+        assert result.metadata["partial"] is True
+        assert executor.errors[-1].error_type == "DeadlineExceeded"
+        assert executor.get_deadline(self.UNIPROT) == 60.0
+
+    def test_circuit_breaker_skips_failing_endpoint(self):
+        """Test that an open circuit stops requests to an endpoint."""
+        calls = []
+
+        def failing():
+            calls.append(1)
+            return self.failure()
+
+        executor = self.make_executor(
+            {self.UNIPROT: self.rows({"protein": "P1", "name": "A"}), self.PDB: failing},
+            max_retries=0,
+            failure_threshold=1,
+        )
 
-        assert result.status == QueryStatus.SUCCESS
+        executor.execute(self.federated_query())
+        executor.execute(self.federated_query())
 
-    def test_execute_with_fallback_uses_fallback(self, resilient_executor):
+        assert len(calls) == 1
+        assert executor.get_statistics()["circuit_breakers"][self.PDB]["state"] == "open"
+        assert executor.errors[-1].error_type == "CircuitOpen"
+
+    def test_coordinator_for_undecomposable_queries(self):
+        """Test that other queries run on the coordinator endpoint."""
+        executor = self.make_executor(
+            {self.UNIPROT: self.rows({"s": "x"})}, coordinator_endpoint=self.UNIPROT
+        )
+        assert executor.execute("SELECT ?s WHERE { ?s ?p ?o . } LIMIT 10").row_count == 1
+
+        without_coordinator = self.make_executor({})
+        assert not without_coordinator.execute("SELECT ?s WHERE { ?s ?p ?o . }").is_success
+
+    def test_execute_with_fallback_uses_fallback(self):
         """Test that fallback is used when primary fails."""
-        # This is a placeholder test - actual implementation would need
-        # to mock endpoint failures
-        primary_query = "INVALID QUERY"
-        fallback_query = "SELECT ?s ?p ?o WHERE { ?s ?p ?o . } LIMIT 10"
-
-        # In actual test with mocking:
-        # result = resilient_executor.execute_with_fallback(
-        #     primary_query,
-        #     [fallback_query]
-        # )
-        # assert result.metadata.get("fallback_used") is True
+        executor = self.make_executor(
+            {self.UNIPROT: self.rows({"protein": "P1", "name": "A"}), self.PDB: self.failure()},
+            max_retries=0,
+            allow_partial_results=False,
+        )
+        fallback = f"SELECT * WHERE {{ SERVICE <{self.UNIPROT}> {{ ?protein ?p ?name }} }}"
+
+        result = executor.execute_with_fallback(self.federated_query(), [fallback])
+
+        assert result.is_success
+        assert result.metadata.get("fallback_used") is True
+        assert result.metadata["fallback_index"] == 0
 
 
 # =============================================================================
@@ -5,6 +5,7 @@ This module provides SPARQL query execution and endpoint management.
 """
 
 from .validator import (
+    ParseCache,
     QueryValidator,
     ValidationIssue,
     ValidationResult,
@@ -22,10 +23,56 @@ from .executor import (
     ConnectionPool,
     ResultParser,
     StreamingResultIterator,
+    QueryResultStream,
+    AsyncQueryResultStream,
     execute_query,
     execute_query_with_validation,
     execute_federated_query,
 )
+from .async_executor import (
+    AsyncQueryExecutor,
+    AsyncConnectionPool,
+    AsyncResultStream,
+)
+from .cache import (
+    ResultCache,
+    make_cache_key,
+    normalize_query,
+)
+from .coalescing import (
+    SingleFlight,
+    AsyncSingleFlight,
+)
+from .columnar import (
+    ColumnarBindings,
+    ColumnarResultBuilder,
+)
+from .merging import (
+    UnionMerger,
+    BloomFilter,
+    merge_union,
+    parse_order_by,
+    row_hash,
+    row_key,
+)
+from .resilience import (
+    CircuitBreaker,
+    CircuitState,
+    LatencyTracker,
+)
+from .scheduler import (
+    FederationScheduler,
+    AIMDLimit,
+)
+from .streaming import (
+    IncrementalResultParser,
+    IncrementalJSONParser,
+    IncrementalXMLParser,
+    IncrementalCSVParser,
+    IncrementalTSVParser,
+    create_incremental_parser,
+    parse_turtle_term,
+)
 from .error_handler import (
     ErrorHandler,
     ErrorCategory,
@@ -41,6 +88,7 @@ from .error_handler import (
 
 __all__ = [
     # Validation
+    'ParseCache',
     'QueryValidator',
     'ValidationIssue',
     'ValidationResult',
@@ -57,9 +105,47 @@ __all__ = [
     'ConnectionPool',
     'ResultParser',
     'StreamingResultIterator',
+    'QueryResultStream',
+    'AsyncQueryResultStream',
     'execute_query',
     'execute_query_with_validation',
     'execute_federated_query',
+    # Async execution
+    'AsyncQueryExecutor',
+    'AsyncConnectionPool',
+    'AsyncResultStream',
+    # Result cache
+    'ResultCache',
+    'make_cache_key',
+    'normalize_query',
+    # Request coalescing
+    'SingleFlight',
+    'AsyncSingleFlight',
+    # Columnar results
+    'ColumnarBindings',
+    'ColumnarResultBuilder',
+    # Union merging
+    'UnionMerger',
+    'BloomFilter',
+    'merge_union',
+    'parse_order_by',
+    'row_hash',
+    'row_key',
+    # Resilience
+    'CircuitBreaker',
+    'CircuitState',
+    'LatencyTracker',
+    # Federation scheduling
+    'FederationScheduler',
+    'AIMDLimit',
+    # Streaming
+    'IncrementalResultParser',
+    'IncrementalJSONParser',
+    'IncrementalXMLParser',
+    'IncrementalCSVParser',
+    'IncrementalTSVParser',
+    'create_incremental_parser',
+    'parse_turtle_term',
     # Error Handling
     'ErrorHandler',
     'ErrorCategory',
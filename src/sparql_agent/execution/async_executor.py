@@ -0,0 +1,788 @@
+"""
+Native asynchronous SPARQL query execution.
+
+``AsyncQueryExecutor`` mirrors ``QueryExecutor`` but sends requests through a
+pooled ``httpx.AsyncClient`` instead of SPARQLWrapper/requests, so awaiting a
+query never blocks the event loop. A single worker can keep hundreds of
+endpoint queries in flight, bounded only by the pool size.
+
+Results, metrics and statistics follow the same contract as the synchronous
+executor: ``execute()`` returns a ``QueryResult`` with ``metadata["metrics"]``,
+``execute_iter()`` returns an async row stream, and ``get_statistics()``
+reports the same counters.
+
+Example:
+    >>> from sparql_agent.execution import AsyncQueryExecutor
+    >>>
+    >>> async with AsyncQueryExecutor(timeout=30) as executor:
+    ...     results = await asyncio.gather(*[
+    ...         executor.execute(query, endpoint) for endpoint in endpoints
+    ...     ])
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional, Tuple, Union
+
+import httpx
+
+from ..core.types import QueryResult, QueryStatus, EndpointInfo
+from ..core.exceptions import (
+    QueryExecutionError,
+    QueryTimeoutError,
+    EndpointConnectionError,
+)
+from .cache import ResultCache
+from .coalescing import AsyncSingleFlight
+from .columnar import ColumnarResultBuilder
+from .executor import (
+    BaseQueryExecutor,
+    ExecutionMetrics,
+    FederatedQuery,
+    ResultFormat,
+)
+from .streaming import IncrementalResultParser, create_incremental_parser
+
+
+logger = logging.getLogger(__name__)
+
+# Formats whose responses are SPARQL result tables rather than RDF graphs
+TABULAR_FORMATS = (ResultFormat.JSON, ResultFormat.XML, ResultFormat.CSV, ResultFormat.TSV)
+
+
+class AsyncConnectionPool:
+    """
+    Pooled async HTTP client shared by all endpoints of an executor.
+
+    Connections are kept alive and reused across endpoints; responses with a
+    retryable status (429, 500, 502, 503, 504) are retried with exponential
+    backoff, like the urllib3 retry policy used by ``ConnectionPool``.
+    """
+
+    RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+    def __init__(
+        self,
+        pool_size: int = 100,
+        max_keepalive: int = 20,
+        max_retries: int = 3,
+        backoff_factor: float = 0.3,
+        timeout: int = 30,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        """
+        Initialize connection pool.
+
+        Args:
+            pool_size: Maximum number of concurrent connections
+            max_keepalive: Maximum number of idle keep-alive connections
+            max_retries: Maximum number of retry attempts
+            backoff_factor: Backoff factor for retries
+            timeout: Default timeout in seconds
+            transport: Custom httpx transport (e.g. for testing)
+        """
+        self.pool_size = pool_size
+        self.max_keepalive = max_keepalive
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.timeout = timeout
+        self._transport = transport
+        self._client: Optional[httpx.AsyncClient] = None
+
+        # Statistics
+        self.stats = {
+            "connections_created": 0,
+            "connections_reused": 0,
+            "requests_sent": 0,
+            "requests_failed": 0,
+        }
+
+    def get_client(self) -> httpx.AsyncClient:
+        """
+        Get or create the shared async client.
+
+        Returns:
+            Configured httpx.AsyncClient
+        """
+        if self._client is None or self._client.is_closed:
+            transport = self._transport or httpx.AsyncHTTPTransport(
+                retries=self.max_retries,
+                limits=httpx.Limits(
+                    max_connections=self.pool_size,
+                    max_keepalive_connections=self.max_keepalive,
+                ),
+            )
+            self._client = httpx.AsyncClient(transport=transport, timeout=self.timeout)
+            self.stats["connections_created"] += 1
+            logger.debug("Created new async HTTP client")
+        else:
+            self.stats["connections_reused"] += 1
+
+        return self._client
+
+    async def send(
+        self,
+        request: httpx.Request,
+        auth: Optional[Tuple[str, str]] = None,
+        metrics: Optional[ExecutionMetrics] = None,
+    ) -> httpx.Response:
+        """
+        Send a request, retrying retryable statuses, and return an unread response.
+
+        Args:
+            request: Prepared request
+            auth: Basic authentication credentials (username, password)
+            metrics: Metrics updated with the retry count
+
+        Returns:
+            Response with its body still unread
+
+        Raises:
+            httpx.HTTPStatusError: If the final response is an error status
+            httpx.RequestError: If the request could not be sent
+        """
+        client = self.get_client()
+        attempt = 0
+
+        while True:
+            self.stats["requests_sent"] += 1
+            try:
+                response = await client.send(request, auth=auth, stream=True)
+            except httpx.RequestError:
+                self.stats["requests_failed"] += 1
+                raise
+
+            if response.status_code in self.RETRY_STATUSES and attempt < self.max_retries:
+                await response.aclose()
+                if metrics is not None:
+                    metrics.retry_count += 1
+                await asyncio.sleep(self.backoff_factor * (2 ** attempt))
+                attempt += 1
+                continue
+
+            if response.is_error:
+                self.stats["requests_failed"] += 1
+                await response.aclose()
+                response.raise_for_status()
+            return response
+
+    async def aclose(self):
+        """Close the shared client and all pooled connections."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+        logger.info("Closed all connections in async pool")
+
+    def get_statistics(self) -> Dict[str, int]:
+        """Get connection pool statistics."""
+        return dict(self.stats)
+
+
+class AsyncResultStream:
+    """
+    Lazily evaluated query result returned by ``AsyncQueryExecutor.execute_iter()``.
+
+    Rows are parsed from the response body as it arrives over the async
+    client. Closing the stream early (explicitly or via ``async with``) closes
+    the HTTP response and counts the query as cancelled.
+
+    Example:
+        >>> stream = await executor.execute_iter(query, endpoint, batch_size=500)
+        >>> async with stream:
+        ...     async for batch in stream:
+        ...         await websocket.send_json(batch)
+    """
+
+    def __init__(
+        self,
+        executor: "AsyncQueryExecutor",
+        response: httpx.Response,
+        format: ResultFormat,
+        query: str,
+        endpoint: EndpointInfo,
+        metrics: ExecutionMetrics,
+        batch_size: Optional[int] = None,
+    ):
+        """
+        Initialize result stream.
+
+        Args:
+            executor: Executor that owns statistics for this execution
+            response: Open response with its body still unread
+            format: Result format (JSON, XML, CSV or TSV)
+            query: SPARQL query string
+            endpoint: Endpoint the query runs against
+            metrics: Metrics for this execution
+            batch_size: Yield lists of this many rows instead of single rows
+
+        Raises:
+            NotImplementedError: If the format is not a tabular result format
+        """
+        self.query = query
+        self.endpoint = endpoint
+        self.metrics = metrics
+        self.batch_size = batch_size
+        self._executor = executor
+        self._response = response
+        self._parser: IncrementalResultParser = create_incremental_parser(format.value)
+        self._chunks: Optional[AsyncIterator[bytes]] = None
+        self._pending: Deque[Dict[str, Any]] = deque()
+        self._exhausted = False
+        self._finished = False
+
+    @property
+    def variables(self) -> List[str]:
+        """Result variables announced in the response header."""
+        return self._parser.variables
+
+    @property
+    def closed(self) -> bool:
+        """Whether the stream has been exhausted, failed or cancelled."""
+        return self._finished
+
+    def __aiter__(self) -> "AsyncResultStream":
+        """Return async iterator."""
+        return self
+
+    async def __anext__(self) -> Union[Dict[str, Any], List[Dict[str, Any]]]:
+        """Get the next row, or the next batch of rows when batching."""
+        if self._finished:
+            raise StopAsyncIteration
+
+        try:
+            if self.batch_size:
+                batch = []
+                while len(batch) < self.batch_size:
+                    row = await self._next_row()
+                    if row is None:
+                        break
+                    batch.append(row)
+                if not batch:
+                    await self._complete()
+                    raise StopAsyncIteration
+                return batch
+
+            row = await self._next_row()
+            if row is None:
+                await self._complete()
+                raise StopAsyncIteration
+            return row
+        except StopAsyncIteration:
+            raise
+        except Exception as e:
+            await self._fail(e)
+            raise self._executor._convert_exception(e, self.endpoint) from e
+
+    async def _next_row(self) -> Optional[Dict[str, Any]]:
+        """Return the next converted row, or None at end of input."""
+        while not self._pending:
+            if self._exhausted:
+                return None
+            await self._read_chunk()
+
+        raw_row = self._pending.popleft()
+        self.metrics.mark_first_row()
+        self.metrics.result_count += 1
+        return {var: term.get("value", "") for var, term in raw_row.items()}
+
+    async def _read_chunk(self):
+        """Read the next chunk from the response and queue completed rows."""
+        if self._chunks is None:
+            self._chunks = self._response.aiter_bytes()
+
+        try:
+            chunk = await self._chunks.__anext__()
+        except StopAsyncIteration:
+            self._exhausted = True
+            self._pending.extend(self._parser.close())
+            if self._parser.boolean is not None:
+                self._pending.append(
+                    {"result": {"type": "literal", "value": self._parser.boolean}}
+                )
+            await self._response.aclose()
+            return
+
+        if chunk:
+            self.metrics.bytes_transferred += len(chunk)
+            self._pending.extend(self._parser.feed(chunk))
+
+    async def _complete(self):
+        """Record a fully consumed stream."""
+        if self._finished:
+            return
+        self._finished = True
+        self.metrics.finalize()
+        self._executor._record_success(self.metrics)
+        self._executor._active_executions.pop(self.metrics.query_hash, None)
+
+    async def _fail(self, error: Exception):
+        """Record a stream that failed mid-iteration."""
+        if self._finished:
+            return
+        self._finished = True
+        await self._response.aclose()
+        self.metrics.finalize()
+        self._executor._record_failure(self.metrics, error)
+        self._executor._active_executions.pop(self.metrics.query_hash, None)
+
+    async def aclose(self):
+        """Cancel the stream early and close the HTTP response."""
+        if self._finished:
+            return
+        self._finished = True
+        self._pending.clear()
+        await self._response.aclose()
+        self.metrics.cancelled = True
+        self.metrics.finalize()
+        self._executor._record_cancelled(self.metrics)
+        self._executor._active_executions.pop(self.metrics.query_hash, None)
+
+    async def __aenter__(self) -> "AsyncResultStream":
+        """Async context manager entry."""
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Async context manager exit."""
+        await self.aclose()
+
+
+class AsyncQueryExecutor(BaseQueryExecutor):
+    """
+    Asynchronous query executor built on a pooled httpx client.
+
+    Features:
+    - Non-blocking query execution for async web handlers
+    - Shared keep-alive connection pool across endpoints
+    - Incremental parsing of JSON, XML, CSV and TSV results
+    - Concurrent federated execution with asyncio.gather
+    - Same QueryResult, ExecutionMetrics and statistics as QueryExecutor
+
+    Example:
+        >>> executor = AsyncQueryExecutor(timeout=60, pool_size=200)
+        >>> result = await executor.execute(
+        ...     query="SELECT ?s ?p ?o WHERE { ?s ?p ?o } LIMIT 10",
+        ...     endpoint=EndpointInfo(url="https://sparql.uniprot.org/sparql")
+        ... )
+        >>> print(f"Found {result.row_count} results")
+        >>> await executor.aclose()
+    """
+
+    def __init__(
+        self,
+        timeout: int = 60,
+        max_retries: int = 3,
+        pool_size: int = 100,
+        enable_metrics: bool = True,
+        user_agent: str = "SPARQL-Agent/1.0",
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        cache: Optional[ResultCache] = None,
+        coalesce_requests: bool = True,
+        columnar_results: bool = False,
+    ):
+        """
+        Initialize async query executor.
+
+        Args:
+            timeout: Default timeout for queries in seconds
+            max_retries: Maximum number of retry attempts
+            pool_size: Maximum number of concurrent connections
+            enable_metrics: Enable performance metrics collection
+            user_agent: User agent string for requests
+            transport: Custom httpx transport (e.g. for testing)
+            cache: Result cache consulted before sending queries (None disables caching)
+            coalesce_requests: Let concurrent identical queries share one request
+            columnar_results: Store result bindings as ColumnarBindings
+        """
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.enable_metrics = enable_metrics
+        self.user_agent = user_agent
+        self.cache = cache
+        self.columnar_results = columnar_results
+        self._flight = AsyncSingleFlight() if coalesce_requests else None
+
+        # Initialize connection pool
+        self.pool = AsyncConnectionPool(
+            pool_size=pool_size,
+            max_retries=max_retries,
+            timeout=timeout,
+            transport=transport,
+        )
+
+        self._init_statistics()
+
+    async def execute(
+        self,
+        query: str,
+        endpoint: Union[EndpointInfo, str],
+        format: ResultFormat = ResultFormat.JSON,
+        timeout: Optional[int] = None,
+        credentials: Optional[Dict[str, str]] = None,
+        custom_headers: Optional[Dict[str, str]] = None,
+    ) -> QueryResult:
+        """
+        Execute a SPARQL query against an endpoint.
+
+        Failures are reported through the returned result rather than raised,
+        exactly like ``QueryExecutor.execute()``.
+
+        Args:
+            query: SPARQL query string
+            endpoint: Endpoint info or URL
+            format: Desired result format
+            timeout: Query timeout (uses default if None)
+            credentials: Authentication credentials (username, password)
+            custom_headers: Custom HTTP headers
+
+        Returns:
+            QueryResult with execution results and metadata
+        """
+        if isinstance(endpoint, str):
+            endpoint = EndpointInfo(url=endpoint)
+
+        metrics = ExecutionMetrics(endpoint_url=endpoint.url)
+        query_hash = str(hash(query))
+        metrics.query_hash = query_hash
+
+        if self.enable_metrics:
+            self._active_executions[query_hash] = metrics
+
+        actual_timeout = timeout or endpoint.timeout or self.timeout
+
+        self.stats["total_queries"] += 1
+        self.stats["queries_by_endpoint"][endpoint.url] += 1
+
+        try:
+            cached = self._cache_lookup(query, endpoint, format, metrics)
+            if cached is not None:
+                return cached
+
+            logger.info(f"Executing async query on {endpoint.url} (timeout: {actual_timeout}s)")
+            logger.debug(f"Query: {query[:200]}...")
+
+            def send():
+                return self._execute_request(
+                    query, endpoint, format, actual_timeout, credentials, custom_headers, metrics
+                )
+
+            flight_key = self._coalesce_key(query, endpoint, format, credentials, custom_headers)
+            if self._flight is not None and flight_key is not None:
+                result, shared = await self._flight.do(flight_key, send)
+                result = self._share_result(result, shared)
+            else:
+                result = await send()
+
+            metrics.finalize()
+            metrics.result_count = result.row_count
+            self._record_success(metrics)
+            self._cache_store(query, endpoint, format, result)
+
+            if self.enable_metrics:
+                result.metadata["metrics"] = metrics.to_dict()
+
+            logger.info(
+                f"Query executed successfully: {result.row_count} results in "
+                f"{metrics.execution_time:.2f}s"
+            )
+
+            return result
+
+        except Exception as e:
+            metrics.finalize()
+            self._record_failure(metrics, e)
+
+            error = self._convert_exception(e, endpoint)
+            logger.error(f"Query execution failed: {error}")
+
+            return QueryResult(
+                status=QueryStatus.FAILED,
+                query=query,
+                error_message=str(error),
+                execution_time=metrics.execution_time,
+                metadata={
+                    "error_type": type(error).__name__,
+                    **({"metrics": metrics.to_dict()} if self.enable_metrics else {}),
+                }
+            )
+
+        finally:
+            self._active_executions.pop(query_hash, None)
+
+    async def execute_iter(
+        self,
+        query: str,
+        endpoint: Union[EndpointInfo, str],
+        format: ResultFormat = ResultFormat.JSON,
+        timeout: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        credentials: Optional[Dict[str, str]] = None,
+        custom_headers: Optional[Dict[str, str]] = None,
+    ) -> AsyncResultStream:
+        """
+        Execute a SPARQL query and iterate over its rows lazily.
+
+        Args:
+            query: SPARQL query string
+            endpoint: Endpoint info or URL
+            format: Result format (JSON, XML, CSV or TSV)
+            timeout: Query timeout (uses default if None)
+            batch_size: Yield lists of this many rows instead of single rows
+            credentials: Authentication credentials (username, password)
+            custom_headers: Custom HTTP headers
+
+        Returns:
+            AsyncResultStream yielding ``{variable: value}`` rows or row batches
+
+        Raises:
+            QueryTimeoutError: If the request times out
+            EndpointConnectionError: If connection fails
+            QueryExecutionError: If the endpoint rejects the query; errors
+                raised while iterating are converted the same way
+        """
+        if isinstance(endpoint, str):
+            endpoint = EndpointInfo(url=endpoint)
+
+        metrics = ExecutionMetrics(endpoint_url=endpoint.url)
+        metrics.query_hash = str(hash(query))
+        actual_timeout = timeout or endpoint.timeout or self.timeout
+
+        self.stats["total_queries"] += 1
+        self.stats["queries_by_endpoint"][endpoint.url] += 1
+
+        logger.info(f"Streaming async query on {endpoint.url} (timeout: {actual_timeout}s)")
+        logger.debug(f"Query: {query[:200]}...")
+
+        try:
+            if format not in TABULAR_FORMATS:
+                raise NotImplementedError(f"Streaming not implemented for {format.value}")
+
+            start_network = time.time()
+            response = await self._open_stream(
+                query, endpoint, format, actual_timeout, credentials, custom_headers, metrics
+            )
+            metrics.network_time = time.time() - start_network
+            stream = AsyncResultStream(
+                self, response, format, query, endpoint, metrics, batch_size
+            )
+        except Exception as e:
+            metrics.finalize()
+            self._record_failure(metrics, e)
+            raise self._convert_exception(e, endpoint) from e
+
+        if self.enable_metrics:
+            self._active_executions[metrics.query_hash] = metrics
+
+        return stream
+
+    async def _execute_request(
+        self,
+        query: str,
+        endpoint: EndpointInfo,
+        format: ResultFormat,
+        timeout: int,
+        credentials: Optional[Dict[str, str]],
+        custom_headers: Optional[Dict[str, str]],
+        metrics: ExecutionMetrics,
+    ) -> QueryResult:
+        """Send the query and read the full response into a QueryResult."""
+        start_network = time.time()
+        response = await self._open_stream(
+            query, endpoint, format, timeout, credentials, custom_headers, metrics
+        )
+
+        if format not in TABULAR_FORMATS:
+            # For RDF formats, return raw data
+            try:
+                body = await response.aread()
+            finally:
+                await response.aclose()
+            network_time = time.time() - start_network
+            metrics.network_time = network_time
+            metrics.bytes_transferred = len(body)
+            return QueryResult(
+                status=QueryStatus.SUCCESS,
+                query=query,
+                data=body.decode(response.encoding or "utf-8", errors="replace"),
+                execution_time=network_time,
+                metadata={
+                    "format": format.value,
+                    "endpoint": endpoint.url,
+                    "network_time": network_time,
+                    "parse_time": 0.0,
+                }
+            )
+
+        # Parse chunks as they arrive; parse time is accumulated separately
+        parser = create_incremental_parser(format.value)
+        raw_rows: List[Dict[str, Any]] = []
+        parse_time = 0.0
+
+        try:
+            async for chunk in response.aiter_bytes():
+                metrics.bytes_transferred += len(chunk)
+                start_parse = time.time()
+                raw_rows.extend(parser.feed(chunk))
+                parse_time += time.time() - start_parse
+        finally:
+            await response.aclose()
+
+        start_parse = time.time()
+        raw_rows.extend(parser.close())
+        if parser.boolean is not None:
+            raw_rows.append({"result": {"type": "literal", "value": parser.boolean}})
+
+        if self.columnar_results:
+            builder = ColumnarResultBuilder(parser.variables or None)
+            builder.add_term_rows(raw_rows)
+            bindings = builder.build()
+        else:
+            bindings = [
+                {var: term.get("value", "") for var, term in raw_row.items()}
+                for raw_row in raw_rows
+            ]
+        parse_time += time.time() - start_parse
+        network_time = time.time() - start_network - parse_time
+
+        metrics.network_time = network_time
+        metrics.parse_time = parse_time
+        if bindings:
+            metrics.mark_first_row()
+
+        variables = parser.variables or (list(bindings[0].keys()) if bindings else [])
+
+        return QueryResult(
+            status=QueryStatus.SUCCESS,
+            query=query,
+            bindings=bindings,
+            row_count=len(bindings),
+            variables=variables,
+            execution_time=network_time + parse_time,
+            metadata={
+                "format": format.value,
+                "endpoint": endpoint.url,
+                "network_time": network_time,
+                "parse_time": parse_time,
+            }
+        )
+
+    async def _open_stream(
+        self,
+        query: str,
+        endpoint: EndpointInfo,
+        format: ResultFormat,
+        timeout: int,
+        credentials: Optional[Dict[str, str]],
+        custom_headers: Optional[Dict[str, str]],
+        metrics: Optional[ExecutionMetrics] = None,
+    ) -> httpx.Response:
+        """Send the query and return the response with its body still unread."""
+        headers = {
+            "User-Agent": self.user_agent,
+            "Accept": self._get_accept_header(format),
+        }
+
+        if custom_headers:
+            headers.update(custom_headers)
+
+        # Add authentication
+        auth = None
+        if credentials:
+            auth = (credentials.get("username"), credentials.get("password"))
+        elif endpoint.authentication_required and endpoint.metadata.get("credentials"):
+            creds = endpoint.metadata["credentials"]
+            auth = (creds.get("username"), creds.get("password"))
+
+        client = self.pool.get_client()
+        request = client.build_request(
+            "POST",
+            endpoint.url,
+            data={"query": query},
+            headers=headers,
+            timeout=timeout,
+        )
+
+        # HTTP status errors propagate so _convert_exception can map them to
+        # authentication, rate limit and availability errors
+        try:
+            return await self.pool.send(request, auth, metrics)
+
+        except httpx.TimeoutException as e:
+            raise QueryTimeoutError(
+                f"Query timed out after {timeout}s",
+                details={"endpoint": endpoint.url, "timeout": timeout}
+            ) from e
+        except httpx.RequestError as e:
+            raise EndpointConnectionError(
+                f"Connection failed: {e}",
+                details={"endpoint": endpoint.url}
+            ) from e
+
+    async def execute_federated(
+        self,
+        query: str,
+        config: FederatedQuery,
+        timeout: Optional[int] = None,
+    ) -> QueryResult:
+        """
+        Execute a federated query across multiple endpoints.
+
+        Parallel federation runs every endpoint concurrently on the event
+        loop; sequential federation awaits them one after another.
+
+        Args:
+            query: SPARQL query string
+            config: Federation configuration
+            timeout: Overall timeout for all queries
+
+        Returns:
+            Merged QueryResult from all endpoints
+
+        Raises:
+            QueryExecutionError: If federation fails and ``fail_on_error`` is set
+        """
+        logger.info(f"Executing async federated query across {len(config.endpoints)} endpoints")
+
+        per_endpoint_timeout = config.timeout_per_endpoint or timeout
+        results: List[QueryResult] = []
+        errors: List[Tuple[EndpointInfo, str]] = []
+
+        if config.parallel:
+            outcomes = await asyncio.gather(*[
+                self.execute(query, endpoint, timeout=per_endpoint_timeout)
+                for endpoint in config.endpoints
+            ])
+        else:
+            outcomes = []
+            for endpoint in config.endpoints:
+                outcome = await self.execute(query, endpoint, timeout=per_endpoint_timeout)
+                outcomes.append(outcome)
+                if not outcome.is_success and config.fail_on_error:
+                    break
+
+        for endpoint, result in zip(config.endpoints, outcomes):
+            if result.is_success:
+                results.append(result)
+            else:
+                errors.append((endpoint, result.error_message))
+                if config.fail_on_error:
+                    raise QueryExecutionError(
+                        f"Federated query failed at {endpoint.url}: {result.error_message}",
+                        details={"endpoint": endpoint.url}
+                    )
+
+        return self._merge_results(results, config.merge_strategy, errors, query, config)
+
+    async def aclose(self):
+        """Close executor and all connections."""
+        await self.pool.aclose()
+        logger.info("Async query executor closed")
+
+    async def __aenter__(self) -> "AsyncQueryExecutor":
+        """Async context manager entry."""
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Async context manager exit."""
+        await self.aclose()
@@ -0,0 +1,526 @@
+"""
+Shared, content-addressed cache for SPARQL query results.
+
+Results are keyed on a hash of the normalized query text, the endpoint URL and
+the result format, so queries that differ only in whitespace or comments share
+an entry. The cache has two tiers:
+
+- an in-memory LRU tier bounded by entry count and approximate size
+- an optional on-disk SQLite tier bounded by total size, which survives
+  restarts and is shared by every process pointing at the same file
+
+Entries expire after a TTL that can be set per endpoint. Hit, miss, eviction
+and expiration counts are available from ``get_statistics()``.
+
+Example:
+    >>> cache = ResultCache(
+    ...     disk_path="~/.cache/sparql_agent/results.db",
+    ...     endpoint_ttls={"https://query.wikidata.org/sparql": 300},
+    ... )
+    >>> executor = QueryExecutor(cache=cache)
+    >>> executor.execute(query, endpoint)   # miss, sent to the endpoint
+    >>> executor.execute(query, endpoint)   # hit, served from memory
+"""
+
+import hashlib
+import logging
+import os
+import pickle
+import sqlite3
+import sys
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional
+
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+def normalize_query(query: str) -> str:
+    """
+    Normalize query text for cache keying.
+
+    Comments are removed and runs of whitespace collapsed to a single space,
+    except inside string literals and IRIs, which are kept verbatim.
+
+    Args:
+        query: SPARQL query string
+
+    Returns:
+        Normalized query text
+    """
+    out: List[str] = []
+    i = 0
+    length = len(query)
+    pending_space = False
+
+    while i < length:
+        char = query[i]
+
+        if char.isspace():
+            pending_space = True
+            i += 1
+            continue
+
+        if char == "#":
+            # Comment runs to end of line
+            end = query.find("\n", i)
+            i = length if end == -1 else end
+            pending_space = True
+            continue
+
+        if pending_space and out:
+            out.append(" ")
+        pending_space = False
+
+        if char in "\"'":
+            # Copy string literal verbatim, including long (triple-quoted) forms
+            quote = query[i:i + 3] if query[i:i + 3] in ('"""', "'''") else char
+            end = i + len(quote)
+            while end < length and not query.startswith(quote, end):
+                end += 2 if query[end] == "\\" else 1
+            end = min(end + len(quote), length)
+            out.append(query[i:end])
+            i = end
+            continue
+
+        if char == "<":
+            # Copy IRI verbatim; a '<' followed by whitespace is an operator
+            end = i + 1
+            while end < length and query[end] not in "> \t\r\n":
+                end += 1
+            if end < length and query[end] == ">":
+                out.append(query[i:end + 1])
+                i = end + 1
+                continue
+
+        out.append(char)
+        i += 1
+
+    return "".join(out)
+
+
+def make_cache_key(query: str, endpoint_url: str, format: str = "json") -> str:
+    """
+    Build the content-addressed key for a query result.
+
+    Args:
+        query: SPARQL query string
+        endpoint_url: Endpoint URL
+        format: Result format value
+
+    Returns:
+        Hex SHA-256 digest of the normalized query, endpoint and format
+    """
+    material = "\x00".join([normalize_query(query), endpoint_url.rstrip("/"), format])
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class _CacheEntry:
+    """A cached value with its expiry, approximate size and source endpoint."""
+    value: Any
+    expires_at: Optional[float]
+    size: int
+    endpoint_url: Optional[str] = None
+
+    def is_expired(self, now: float) -> bool:
+        """Check whether the entry has outlived its TTL."""
+        return self.expires_at is not None and now >= self.expires_at
+
+
+class ResultCache:
+    """
+    Two-tier (memory LRU + SQLite) result cache with per-endpoint TTLs.
+
+    Besides ``get_result()``/``put_result()`` for query results, the cache can
+    be used as a mapping with arbitrary string keys (``cache[key] = value``),
+    which is how collectors that already name their entries use it. ``len()``,
+    ``keys()`` and ``in`` reflect the memory tier.
+
+    All operations are thread-safe.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        max_memory_bytes: int = 64 * 1024 * 1024,
+        disk_path: Optional[str] = None,
+        max_disk_bytes: int = 512 * 1024 * 1024,
+        default_ttl: Optional[float] = 3600,
+        endpoint_ttls: Optional[Dict[str, float]] = None,
+    ):
+        """
+        Initialize result cache.
+
+        Args:
+            max_entries: Maximum number of entries in the memory tier
+            max_memory_bytes: Approximate size limit of the memory tier
+            disk_path: SQLite file for the disk tier (None for memory only)
+            max_disk_bytes: Size limit of the disk tier
+            default_ttl: TTL in seconds for endpoints without their own (None = no expiry)
+            endpoint_ttls: Per-endpoint TTLs in seconds, keyed by endpoint URL
+        """
+        self.max_entries = max_entries
+        self.max_memory_bytes = max_memory_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self.default_ttl = default_ttl
+        self.endpoint_ttls: Dict[str, float] = {
+            url.rstrip("/"): ttl for url, ttl in (endpoint_ttls or {}).items()
+        }
+
+        self._memory: "OrderedDict[str, _CacheEntry]" = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.RLock()
+
+        self.disk_path = os.path.expanduser(disk_path) if disk_path else None
+        self._db: Optional[sqlite3.Connection] = None
+        if self.disk_path:
+            self._open_disk()
+
+        # Statistics
+        self.stats = {
+            "hits": 0,
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "writes": 0,
+            "evictions": 0,
+            "disk_evictions": 0,
+            "expirations": 0,
+        }
+
+    # ------------------------------------------------------------------
+    # Query result API
+    # ------------------------------------------------------------------
+
+    def get_result(self, query: str, endpoint_url: str, format: str = "json") -> Any:
+        """
+        Look up a cached query result.
+
+        Args:
+            query: SPARQL query string
+            endpoint_url: Endpoint URL
+            format: Result format value
+
+        Returns:
+            The cached value, or None on a miss
+        """
+        return self.get(make_cache_key(query, endpoint_url, format))
+
+    def put_result(
+        self,
+        query: str,
+        endpoint_url: str,
+        value: Any,
+        format: str = "json",
+        ttl: Optional[float] = None,
+    ) -> str:
+        """
+        Cache a query result.
+
+        Args:
+            query: SPARQL query string
+            endpoint_url: Endpoint URL
+            value: Result to cache
+            format: Result format value
+            ttl: TTL in seconds (defaults to the endpoint's TTL)
+
+        Returns:
+            The cache key of the entry
+        """
+        key = make_cache_key(query, endpoint_url, format)
+        self.set(key, value, ttl=ttl, endpoint_url=endpoint_url)
+        return key
+
+    def ttl_for(self, endpoint_url: Optional[str]) -> Optional[float]:
+        """Get the TTL that applies to an endpoint."""
+        if endpoint_url is not None:
+            ttl = self.endpoint_ttls.get(endpoint_url.rstrip("/"))
+            if ttl is not None:
+                return ttl
+        return self.default_ttl
+
+    # ------------------------------------------------------------------
+    # Key/value API
+    # ------------------------------------------------------------------
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """
+        Look up a key in the memory tier, then the disk tier.
+
+        Disk hits are promoted to the memory tier.
+
+        Args:
+            key: Cache key
+            default: Value returned on a miss
+
+        Returns:
+            The cached value or ``default``
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if entry.is_expired(now):
+                    self._drop_memory(key)
+                    self.stats["expirations"] += 1
+                else:
+                    self._memory.move_to_end(key)
+                    self.stats["hits"] += 1
+                    self.stats["memory_hits"] += 1
+                    return entry.value
+
+            entry = self._disk_get(key, now)
+            if entry is not None:
+                self._memory_put(key, entry)
+                self.stats["hits"] += 1
+                self.stats["disk_hits"] += 1
+                return entry.value
+
+            self.stats["misses"] += 1
+            return default
+
+    def set(
+        self,
+        key: str,
+        value: Any,
+        ttl: Optional[float] = None,
+        endpoint_url: Optional[str] = None,
+    ):
+        """
+        Store a value in both tiers.
+
+        Args:
+            key: Cache key
+            value: Value to cache
+            ttl: TTL in seconds (defaults to the endpoint's TTL)
+            endpoint_url: Endpoint the value came from, for TTL and invalidation
+        """
+        ttl = ttl if ttl is not None else self.ttl_for(endpoint_url)
+        expires_at = time.time() + ttl if ttl is not None else None
+
+        try:
+            payload: Optional[bytes] = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+            size = len(payload)
+        except (pickle.PicklingError, TypeError, AttributeError):
+            payload = None
+            size = sys.getsizeof(value)
+
+        entry = _CacheEntry(value, expires_at, size, endpoint_url)
+
+        with self._lock:
+            self._memory_put(key, entry)
+            if payload is not None:
+                self._disk_put(key, payload, entry)
+            self.stats["writes"] += 1
+
+    def delete(self, key: str):
+        """Remove a key from both tiers."""
+        with self._lock:
+            self._drop_memory(key)
+            if self._db is not None:
+                self._db.execute("DELETE FROM entries WHERE key = ?", (key,))
+                self._db.commit()
+
+    def invalidate(self, endpoint_url: Optional[str] = None):
+        """
+        Drop cached entries, optionally only those from one endpoint.
+
+        Args:
+            endpoint_url: Endpoint whose entries to drop (None for all)
+        """
+        with self._lock:
+            if endpoint_url is None:
+                self.clear()
+                return
+
+            for key in [k for k, e in self._memory.items() if e.endpoint_url == endpoint_url]:
+                self._drop_memory(key)
+            if self._db is not None:
+                self._db.execute("DELETE FROM entries WHERE endpoint = ?", (endpoint_url,))
+                self._db.commit()
+
+    def clear(self):
+        """Drop all entries from both tiers."""
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+            if self._db is not None:
+                self._db.execute("DELETE FROM entries")
+                self._db.commit()
+
+    def keys(self) -> List[str]:
+        """Keys currently held in the memory tier (least recently used first)."""
+        with self._lock:
+            return list(self._memory.keys())
+
+    def __getitem__(self, key: str) -> Any:
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key: str, value: Any):
+        self.set(key, value)
+
+    def __delitem__(self, key: str):
+        self.delete(key)
+
+    def __contains__(self, key: object) -> bool:
+        with self._lock:
+            entry = self._memory.get(key)  # type: ignore[arg-type]
+            return entry is not None and not entry.is_expired(time.time())
+
+    def __len__(self) -> int:
+        return len(self._memory)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.keys())
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get hit/miss counts and tier sizes."""
+        with self._lock:
+            stats: Dict[str, Any] = dict(self.stats)
+            lookups = stats["hits"] + stats["misses"]
+            stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+            stats["memory_entries"] = len(self._memory)
+            stats["memory_bytes"] = self._memory_bytes
+            if self._db is not None:
+                count, size = self._db.execute(
+                    "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries"
+                ).fetchone()
+                stats["disk_entries"] = count
+                stats["disk_bytes"] = size
+            return stats
+
+    def close(self):
+        """Close the disk tier."""
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    # ------------------------------------------------------------------
+    # Memory tier
+    # ------------------------------------------------------------------
+
+    def _memory_put(self, key: str, entry: _CacheEntry):
+        """Insert into the memory tier and evict least recently used entries."""
+        self._drop_memory(key)
+        if entry.size > self.max_memory_bytes:
+            return
+
+        self._memory[key] = entry
+        self._memory_bytes += entry.size
+
+        while self._memory and (
+            len(self._memory) > self.max_entries
+            or self._memory_bytes > self.max_memory_bytes
+        ):
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= evicted.size
+            self.stats["evictions"] += 1
+
+    def _drop_memory(self, key: str):
+        """Remove a key from the memory tier if present."""
+        entry = self._memory.pop(key, None)
+        if entry is not None:
+            self._memory_bytes -= entry.size
+
+    # ------------------------------------------------------------------
+    # Disk tier
+    # ------------------------------------------------------------------
+
+    def _open_disk(self):
+        """Open (and create if needed) the SQLite disk tier."""
+        directory = os.path.dirname(self.disk_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._db = sqlite3.connect(self.disk_path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                value BLOB NOT NULL,
+                endpoint TEXT,
+                expires_at REAL,
+                size INTEGER NOT NULL,
+                last_access REAL NOT NULL
+            )
+            """
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS idx_last_access ON entries(last_access)")
+        self._db.commit()
+        logger.debug(f"Opened result cache disk tier at {self.disk_path}")
+
+    def _disk_get(self, key: str, now: float) -> Optional[_CacheEntry]:
+        """Read an entry from the disk tier, dropping it if expired."""
+        if self._db is None:
+            return None
+
+        row = self._db.execute(
+            "SELECT value, endpoint, expires_at, size FROM entries WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+
+        payload, endpoint_url, expires_at, size = row
+        if expires_at is not None and now >= expires_at:
+            self._db.execute("DELETE FROM entries WHERE key = ?", (key,))
+            self._db.commit()
+            self.stats["expirations"] += 1
+            return None
+
+        try:
+            value = pickle.loads(payload)
+        except Exception as e:
+            logger.warning(f"Dropping unreadable cache entry {key}: {e}")
+            self._db.execute("DELETE FROM entries WHERE key = ?", (key,))
+            self._db.commit()
+            return None
+
+        self._db.execute("UPDATE entries SET last_access = ? WHERE key = ?", (now, key))
+        self._db.commit()
+        return _CacheEntry(value, expires_at, size, endpoint_url)
+
+    def _disk_put(self, key: str, payload: bytes, entry: _CacheEntry):
+        """Write an entry to the disk tier and enforce the size limit."""
+        if self._db is None or len(payload) > self.max_disk_bytes:
+            return
+
+        now = time.time()
+        self._db.execute(
+            "INSERT OR REPLACE INTO entries "
+            "(key, value, endpoint, expires_at, size, last_access) VALUES (?, ?, ?, ?, ?, ?)",
+            (key, sqlite3.Binary(payload), entry.endpoint_url, entry.expires_at,
+             len(payload), now),
+        )
+
+        # Expired entries go first, then least recently used ones
+        deleted = self._db.execute(
+            "DELETE FROM entries WHERE expires_at IS NOT NULL AND expires_at <= ?", (now,)
+        ).rowcount
+        self.stats["expirations"] += max(deleted, 0)
+
+        (total,) = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()
+        if total > self.max_disk_bytes:
+            rows = self._db.execute(
+                "SELECT key, size FROM entries WHERE key != ? ORDER BY last_access", (key,)
+            ).fetchall()
+            victims = []
+            for victim, size in rows:
+                if total <= self.max_disk_bytes:
+                    break
+                victims.append((victim,))
+                total -= size
+            self._db.executemany("DELETE FROM entries WHERE key = ?", victims)
+            self.stats["disk_evictions"] += len(victims)
+
+        self._db.commit()
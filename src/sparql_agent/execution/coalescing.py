@@ -0,0 +1,156 @@
+"""
+Request coalescing ("single flight") for identical concurrent queries.
+
+When several callers ask for the same thing at the same moment, only the first
+(the leader) does the work; the others wait for it and share its outcome,
+including any exception. Once the call finishes the key is released, so a
+later caller starts a fresh request.
+
+``SingleFlight`` coordinates threads (e.g. the federated thread pool and
+synchronous web handlers); ``AsyncSingleFlight`` coordinates coroutines on one
+event loop.
+
+Example:
+    >>> flight = SingleFlight()
+    >>> result, shared = flight.do(key, lambda: send_request(query))
+"""
+
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Generic, Optional, Tuple, TypeVar
+
+
+T = TypeVar("T")
+
+
+class _Call(Generic[T]):
+    """An in-flight call that followers can wait on."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Optional[T] = None
+        self.error: Optional[BaseException] = None
+        self.followers = 0
+
+
+class SingleFlight:
+    """
+    Thread-safe single-flight group.
+
+    Attributes:
+        stats: Counts of leader calls and coalesced (shared) calls
+    """
+
+    def __init__(self):
+        """Initialize an empty group."""
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _Call[Any]] = {}
+        self.stats = {"leaders": 0, "coalesced": 0}
+
+    def do(self, key: str, fn: Callable[[], T]) -> Tuple[T, bool]:
+        """
+        Run ``fn`` once per key among concurrent callers.
+
+        Args:
+            key: Identity of the work (equal keys are coalesced)
+            fn: Work to run if no call with this key is in flight
+
+        Returns:
+            Tuple of (result, shared) where ``shared`` is True if this caller
+            waited on another caller's execution
+
+        Raises:
+            Exception: Whatever ``fn`` raised, in the leader and every follower
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.followers += 1
+                self.stats["coalesced"] += 1
+                leader = False
+            else:
+                call = _Call()
+                self._calls[key] = call
+                self.stats["leaders"] += 1
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+        return call.result, False
+
+    def in_flight(self) -> int:
+        """Number of distinct keys currently executing."""
+        with self._lock:
+            return len(self._calls)
+
+
+class AsyncSingleFlight:
+    """
+    Single-flight group for coroutines running on one event loop.
+
+    The leader's work runs as a task that every caller awaits through
+    ``asyncio.shield``, so cancelling one waiting caller (the leader
+    included) does not cancel the request for the others.
+
+    Attributes:
+        stats: Counts of leader calls and coalesced (shared) calls
+    """
+
+    def __init__(self):
+        """Initialize an empty group."""
+        self._tasks: Dict[str, "asyncio.Future[Any]"] = {}
+        self.stats = {"leaders": 0, "coalesced": 0}
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[T]]) -> Tuple[T, bool]:
+        """
+        Await ``fn()`` once per key among concurrent callers.
+
+        Args:
+            key: Identity of the work (equal keys are coalesced)
+            fn: Coroutine factory called if no call with this key is in flight
+
+        Returns:
+            Tuple of (result, shared) where ``shared`` is True if this caller
+            waited on another caller's execution
+
+        Raises:
+            Exception: Whatever ``fn()`` raised, in the leader and every follower
+        """
+        task = self._tasks.get(key)
+        shared = task is not None
+
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._tasks[key] = task
+            self.stats["leaders"] += 1
+            task.add_done_callback(lambda _: self._release(key, task))
+        else:
+            self.stats["coalesced"] += 1
+
+        return await asyncio.shield(task), shared
+
+    def _release(self, key: str, task: "asyncio.Future[Any]"):
+        """Forget a finished task so the next caller starts a fresh call."""
+        if self._tasks.get(key) is task:
+            del self._tasks[key]
+        if not task.cancelled():
+            # Mark the exception as retrieved if nobody is left waiting on it
+            task.exception()
+
+    def in_flight(self) -> int:
+        """Number of distinct keys currently executing."""
+        return len(self._tasks)
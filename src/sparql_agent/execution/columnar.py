@@ -0,0 +1,453 @@
+"""
+Compact columnar storage for SPARQL SELECT results.
+
+``QueryResult.bindings`` is normally a list with one dict per row. For large
+results most of that memory is overhead: every row repeats the variable names
+as dict keys, and the parsers create a ``Binding`` object per cell on the way.
+``ColumnarBindings`` stores the same data column by column:
+
+- variable names are stored once
+- each variable has one list of values (``None`` where unbound)
+- term type, datatype and language are interned into a small table per
+  result, and each cell stores a 16-bit code into that table
+- repeated IRIs share one string object
+
+``ColumnarBindings`` is a read-only sequence of row dicts, so existing code
+that iterates, indexes or ``len()``s ``result.bindings`` keeps working. Rows
+are built on access and not kept. Formatters that understand the columnar
+layout read the column lists directly (see ``formatting.structured``).
+
+Example:
+    >>> builder = ColumnarResultBuilder(["s", "label"])
+    >>> for raw_row in parser.feed(chunk):
+    ...     builder.add_term_row(raw_row)
+    >>> bindings = builder.build()
+    >>> bindings[0]
+    {'s': 'http://example.org/1', 'label': 'One'}
+    >>> bindings.column("label")
+    ['One', 'Two']
+    >>> bindings.term(0, "label")
+    {'type': 'literal', 'value': 'One', 'xml:lang': 'en'}
+"""
+
+from array import array
+from itertools import chain
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union, overload
+
+
+#: Kind code of an unbound cell
+UNBOUND = 0
+
+#: (term type, datatype, language) of a bound cell
+TermKind = Tuple[str, Optional[str], Optional[str]]
+
+# Kind codes are stored as unsigned 16-bit ints until a result needs more
+_SMALL_CODES = "H"
+_LARGE_CODES = "I"
+_SMALL_CODES_LIMIT = 1 << 16
+
+# BindingType values mapped to SPARQL JSON term types
+_TERM_TYPES = {"uri": "uri", "bnode": "bnode", "literal": "literal", "typed-literal": "literal"}
+
+
+class ColumnarBindings(Sequence[Dict[str, Any]]):
+    """
+    Read-only, column-oriented sequence of result rows.
+
+    Indexing and iteration yield ``{variable: value}`` dicts containing only
+    the bound variables, the same shape ``QueryExecutor`` has always returned.
+    Use ``column()``/``columns`` for zero-copy access to the value lists and
+    ``term()`` for the full SPARQL JSON term of a cell.
+    """
+
+    __slots__ = ("variables", "_values", "_kinds", "_kind_table", "_length")
+
+    def __init__(
+        self,
+        variables: List[str],
+        values: Dict[str, List[Any]],
+        kinds: Dict[str, array],
+        kind_table: List[Optional[TermKind]],
+        length: int,
+    ):
+        """
+        Initialize from prepared columns (use ``ColumnarResultBuilder``).
+
+        Args:
+            variables: Column names in result order
+            values: Value list per variable
+            kinds: Kind code array per variable
+            kind_table: Interned term kinds; index 0 is ``None`` (unbound)
+            length: Number of rows
+        """
+        self.variables = variables
+        self._values = values
+        self._kinds = kinds
+        self._kind_table = kind_table
+        self._length = length
+
+    @classmethod
+    def from_rows(
+        cls,
+        rows: Iterable[Dict[str, Any]],
+        variables: Optional[List[str]] = None,
+    ) -> "ColumnarBindings":
+        """
+        Build columns from plain ``{variable: value}`` rows.
+
+        Values that look like http(s) IRIs are recorded as URIs, everything
+        else as plain literals.
+
+        Args:
+            rows: Row dicts
+            variables: Column order (defaults to order of first appearance)
+
+        Returns:
+            ColumnarBindings with the same rows
+        """
+        builder = ColumnarResultBuilder(variables)
+        for row in rows:
+            builder.add_value_row(row)
+        return builder.build()
+
+    @classmethod
+    def concat(cls, parts: Iterable[Sequence[Dict[str, Any]]]) -> "ColumnarBindings":
+        """
+        Concatenate results, keeping term kinds of columnar parts.
+
+        Args:
+            parts: ColumnarBindings or lists of plain row dicts
+
+        Returns:
+            ColumnarBindings with the rows of all parts in order
+        """
+        builder = ColumnarResultBuilder()
+        for part in parts:
+            if isinstance(part, ColumnarBindings):
+                for row in part.iter_terms():
+                    builder.add_term_row(row)
+            else:
+                for row in part:
+                    builder.add_value_row(row)
+        return builder.build()
+
+    # ------------------------------------------------------------------
+    # Sequence interface (lazy row view)
+    # ------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return self._length
+
+    @overload
+    def __getitem__(self, index: int) -> Dict[str, Any]: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[Dict[str, Any]]: ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Any:
+        if isinstance(index, slice):
+            return [self._row(i) for i in range(*index.indices(self._length))]
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("row index out of range")
+        return self._row(index)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        variables = self.variables
+        for values in zip(*(self._values[var] for var in variables)):
+            yield {var: value for var, value in zip(variables, values) if value is not None}
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, ColumnarBindings):
+            return self.variables == other.variables and self._values == other._values
+        if isinstance(other, Sequence) and not isinstance(other, str):
+            return len(other) == self._length and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"ColumnarBindings(variables={self.variables!r}, rows={self._length})"
+
+    def _row(self, index: int) -> Dict[str, Any]:
+        """Build the row dict for one index."""
+        row = {}
+        for var in self.variables:
+            value = self._values[var][index]
+            if value is not None:
+                row[var] = value
+        return row
+
+    # ------------------------------------------------------------------
+    # Column access
+    # ------------------------------------------------------------------
+
+    @property
+    def columns(self) -> Dict[str, List[Any]]:
+        """Value list per variable, in variable order (shared, do not mutate)."""
+        return {var: self._values[var] for var in self.variables}
+
+    def column(self, variable: str) -> List[Any]:
+        """
+        Get the value list of one variable without copying.
+
+        Args:
+            variable: Variable name
+
+        Returns:
+            Values by row index, ``None`` where unbound (shared, do not mutate)
+
+        Raises:
+            KeyError: If the variable is not part of the result
+        """
+        return self._values[variable]
+
+    def term_kind(self, index: int, variable: str) -> Optional[TermKind]:
+        """
+        Get the (type, datatype, language) of one cell.
+
+        Args:
+            index: Row index
+            variable: Variable name
+
+        Returns:
+            Term kind, or None if the variable is unbound in that row
+        """
+        return self._kind_table[self._kinds[variable][index]]
+
+    def term(self, index: int, variable: str) -> Optional[Dict[str, Any]]:
+        """
+        Get one cell as a SPARQL JSON term.
+
+        Args:
+            index: Row index
+            variable: Variable name
+
+        Returns:
+            Term dict with ``type``, ``value`` and optional ``datatype`` and
+            ``xml:lang``, or None if the variable is unbound in that row
+        """
+        kind = self.term_kind(index, variable)
+        if kind is None:
+            return None
+        return _make_term(kind, self._values[variable][index])
+
+    def iter_terms(self) -> Iterator[Dict[str, Dict[str, Any]]]:
+        """Iterate over rows as SPARQL JSON term dicts (``results.bindings`` shape)."""
+        variables = self.variables
+        table = self._kind_table
+        columns = [(var, self._values[var], self._kinds[var]) for var in variables]
+        for index in range(self._length):
+            row = {}
+            for var, values, kinds in columns:
+                kind = table[kinds[index]]
+                if kind is not None:
+                    row[var] = _make_term(kind, values[index])
+            yield row
+
+    def to_rows(self) -> List[Dict[str, Any]]:
+        """Materialize all rows as a list of dicts."""
+        return list(self)
+
+    def __getstate__(self) -> Tuple[Any, ...]:
+        return (self.variables, self._values, self._kinds, self._kind_table, self._length)
+
+    def __setstate__(self, state: Tuple[Any, ...]):
+        self.variables, self._values, self._kinds, self._kind_table, self._length = state
+
+
+class ColumnarResultBuilder:
+    """
+    Append rows one at a time and produce a ``ColumnarBindings``.
+
+    Rows can be SPARQL JSON term dicts (from ``ResultParser`` input or the
+    incremental parsers), ``Binding`` dicts, or plain values. Variables that
+    first appear part-way through are added as new columns, unbound in the
+    earlier rows.
+    """
+
+    def __init__(self, variables: Optional[List[str]] = None):
+        """
+        Initialize an empty builder.
+
+        Args:
+            variables: Known column order (e.g. from the result head)
+        """
+        self.variables: List[str] = []
+        self._values: Dict[str, List[Any]] = {}
+        self._kinds: Dict[str, array] = {}
+        self._typecode = _SMALL_CODES
+        self._kind_table: List[Optional[TermKind]] = [None]
+        self._kind_index: Dict[TermKind, int] = {}
+        self._iris: Dict[str, str] = {}
+        self._length = 0
+
+        for var in variables or []:
+            self._add_column(var)
+
+    def __len__(self) -> int:
+        return self._length
+
+    def add_term_row(self, row: Dict[str, Dict[str, Any]]):
+        """
+        Append a row of SPARQL JSON terms.
+
+        Args:
+            row: Mapping of variable to ``{"type", "value", "datatype", "xml:lang"}``
+        """
+        self._append(
+            row,
+            lambda term: (term.get("value", ""), term.get("type", "literal"),
+                          term.get("datatype"), term.get("xml:lang")),
+        )
+
+    def add_term_rows(self, rows: Iterable[Dict[str, Dict[str, Any]]]):
+        """
+        Append many rows of SPARQL JSON terms at once.
+
+        The rows are processed column by column with comprehensions instead
+        of cell by cell, which is several times faster than calling
+        ``add_term_row()`` in a loop.
+
+        Args:
+            rows: Rows mapping variable to SPARQL JSON term
+        """
+        rows = rows if isinstance(rows, list) else list(rows)
+        if not rows:
+            return
+
+        for var in dict.fromkeys(chain.from_iterable(rows)):
+            if var not in self._values:
+                self._add_column(var)
+
+        known_code = self._kind_index.get
+        intern_iri = self._iris.setdefault
+
+        for var in self.variables:
+            terms = [row.get(var) for row in rows]
+            self._values[var].extend([
+                None if term is None
+                else intern_iri(term["value"], term["value"]) if term.get("type") == "uri"
+                else term.get("value", "")
+                for term in terms
+            ])
+
+            # Known kinds are looked up inline; the few new ones are marked
+            # with -1 and interned afterwards
+            codes = [
+                UNBOUND if term is None
+                else known_code(
+                    (term.get("type", "literal"), term.get("datatype"), term.get("xml:lang")), -1
+                )
+                for term in terms
+            ]
+            if -1 in codes:
+                for i, code in enumerate(codes):
+                    if code == -1:
+                        term = terms[i]
+                        codes[i] = self._kind_code(
+                            (term.get("type", "literal"), term.get("datatype"), term.get("xml:lang"))
+                        )
+            # Look the array up after coding, in case the codes were widened
+            self._kinds[var].extend(codes)
+
+        self._length += len(rows)
+
+    def add_binding_row(self, row: Dict[str, Any]):
+        """
+        Append a row of ``Binding`` objects.
+
+        Args:
+            row: Mapping of variable to ``Binding``
+        """
+        self._append(
+            row,
+            lambda b: (b.value, _TERM_TYPES.get(b.binding_type.value, "literal"),
+                       b.datatype, b.language),
+        )
+
+    def add_value_row(self, row: Dict[str, Any]):
+        """
+        Append a row of plain values.
+
+        Args:
+            row: Mapping of variable to value
+        """
+        self._append(
+            row,
+            lambda value: (value, _guess_type(value), None, None),
+        )
+
+    def build(self) -> ColumnarBindings:
+        """Create the columnar result (the builder should not be reused)."""
+        return ColumnarBindings(
+            self.variables, self._values, self._kinds, self._kind_table, self._length
+        )
+
+    def _append(self, row: Dict[str, Any], unpack: Any):
+        """Append one row, unpacking each cell into (value, type, datatype, language)."""
+        bound = 0
+        for var in self.variables:
+            cell = row.get(var)
+            if cell is None:
+                self._values[var].append(None)
+                self._kinds[var].append(UNBOUND)
+            else:
+                bound += 1
+                self._store(var, *unpack(cell))
+
+        if bound < len(row):
+            # Variables not seen before
+            for var, cell in row.items():
+                if var not in self._values and cell is not None:
+                    self._add_column(var)
+                    self._store(var, *unpack(cell))
+
+        self._length += 1
+
+    def _store(self, var: str, value: Any, term_type: str, datatype: Optional[str],
+               language: Optional[str]):
+        """Store one bound cell."""
+        if term_type == "uri" and isinstance(value, str):
+            value = self._iris.setdefault(value, value)
+        self._values[var].append(value)
+        self._kinds[var].append(self._kind_code((term_type, datatype, language)))
+
+    def _kind_code(self, kind: TermKind) -> int:
+        """Intern a term kind and return its code."""
+        code = self._kind_index.get(kind)
+        if code is None:
+            code = len(self._kind_table)
+            if code >= _SMALL_CODES_LIMIT and self._typecode == _SMALL_CODES:
+                self._typecode = _LARGE_CODES
+                self._kinds = {
+                    var: array(_LARGE_CODES, codes) for var, codes in self._kinds.items()
+                }
+            self._kind_table.append(kind)
+            self._kind_index[kind] = code
+        return code
+
+    def _add_column(self, var: str):
+        """Add a column, unbound in all rows appended so far."""
+        self.variables.append(var)
+        self._values[var] = [None] * self._length
+        self._kinds[var] = array(self._typecode, bytes(array(self._typecode).itemsize * self._length))
+
+
+def _make_term(kind: TermKind, value: Any) -> Dict[str, Any]:
+    """Build a SPARQL JSON term dict."""
+    term_type, datatype, language = kind
+    term: Dict[str, Any] = {"type": term_type, "value": value}
+    if datatype:
+        term["datatype"] = datatype
+    if language:
+        term["xml:lang"] = language
+    return term
+
+
+def _guess_type(value: Any) -> str:
+    """Best-effort term type of a plain value."""
+    if isinstance(value, str) and value.startswith(("http://", "https://")):
+        return "uri"
+    return "literal"
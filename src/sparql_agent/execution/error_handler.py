@@ -35,6 +35,7 @@ from ..core.exceptions import (
     EndpointUnavailableError,
     EndpointNotFoundError,
 )
+from ..core.sparql_lexer import analyze_sparql
 from ..core.types import EndpointInfo, QueryResult, QueryStatus
 
 
@@ -592,8 +593,9 @@ class ErrorHandler:
         ]
 
         # Analyze query complexity
-        optional_count = len(re.findall(r'\bOPTIONAL\b', query, re.IGNORECASE))
-        union_count = len(re.findall(r'\bUNION\b', query, re.IGNORECASE))
+        analysis = analyze_sparql(query)
+        optional_count = analysis.count('OPTIONAL')
+        union_count = analysis.count('UNION')
 
         if optional_count > 5:
             context.suggestions.insert(0, f"Query has {optional_count} OPTIONAL clauses - try reducing to fewer")
@@ -915,9 +917,10 @@ class ErrorHandler:
     def _analyze_query_performance(self, query: str) -> List[QueryOptimization]:
         """Analyze query for performance issues and optimization opportunities."""
         optimizations = []
+        analysis = analyze_sparql(query)
 
         # Check for LIMIT clause
-        if not re.search(r'\bLIMIT\b', query, re.IGNORECASE):
+        if analysis.limit is None:
             optimizations.append(QueryOptimization(
                 level=OptimizationLevel.HIGH,
                 issue="No LIMIT clause",
@@ -928,7 +931,7 @@ class ErrorHandler:
             ))
 
         # Check for SELECT *
-        if re.search(r'SELECT\s+\*', query, re.IGNORECASE):
+        if analysis.select_star:
             optimizations.append(QueryOptimization(
                 level=OptimizationLevel.MEDIUM,
                 issue="Using SELECT *",
@@ -939,7 +942,7 @@ class ErrorHandler:
             ))
 
         # Check for excessive OPTIONAL clauses
-        optional_count = len(re.findall(r'\bOPTIONAL\b', query, re.IGNORECASE))
+        optional_count = analysis.count('OPTIONAL')
         if optional_count > 3:
             optimizations.append(QueryOptimization(
                 level=OptimizationLevel.HIGH,
@@ -951,8 +954,8 @@ class ErrorHandler:
             ))
 
         # Check for DISTINCT with large results
-        if re.search(r'SELECT\s+DISTINCT', query, re.IGNORECASE):
-            if not re.search(r'\bLIMIT\b', query, re.IGNORECASE):
+        if analysis.distinct:
+            if analysis.limit is None:
                 optimizations.append(QueryOptimization(
                     level=OptimizationLevel.MEDIUM,
                     issue="DISTINCT without LIMIT",
@@ -963,8 +966,8 @@ class ErrorHandler:
                 ))
 
         # Check for ORDER BY without LIMIT
-        if re.search(r'\bORDER\s+BY\b', query, re.IGNORECASE):
-            if not re.search(r'\bLIMIT\b', query, re.IGNORECASE):
+        if analysis.order_by is not None:
+            if analysis.limit is None:
                 optimizations.append(QueryOptimization(
                     level=OptimizationLevel.MEDIUM,
                     issue="ORDER BY without LIMIT",
@@ -975,7 +978,10 @@ class ErrorHandler:
                 ))
 
         # Check for triple wildcards
-        if re.search(r'\?\w+\s+\?\w+\s+\?\w+', query):
+        if any(
+            all(term.startswith(('?', '$')) for term in triple[:3])
+            for triple in analysis.triple_patterns
+        ):
             optimizations.append(QueryOptimization(
                 level=OptimizationLevel.HIGH,
                 issue="Triple wildcard pattern detected",
@@ -986,12 +992,11 @@ class ErrorHandler:
             ))
 
         # Check for FILTER placement
-        filter_matches = list(re.finditer(r'\bFILTER\b', query, re.IGNORECASE))
-        if filter_matches:
+        if analysis.filter_positions:
             # Check if FILTERs come late in query
             query_pos = len(query)
-            for match in filter_matches:
-                if match.start() > query_pos * 0.7:
+            for position in analysis.filter_positions:
+                if position > query_pos * 0.7:
                     optimizations.append(QueryOptimization(
                         level=OptimizationLevel.MEDIUM,
                         issue="FILTER clause appears late in query",
@@ -1003,7 +1008,7 @@ class ErrorHandler:
                     break
 
         # Check for regex FILTER
-        if re.search(r'FILTER\s*\(\s*regex', query, re.IGNORECASE):
+        if analysis.regex_filters:
             optimizations.append(QueryOptimization(
                 level=OptimizationLevel.LOW,
                 issue="Using regex in FILTER",
@@ -1014,7 +1019,7 @@ class ErrorHandler:
             ))
 
         # Check for nested subqueries
-        subquery_count = len(re.findall(r'\{\s*SELECT', query, re.IGNORECASE))
+        subquery_count = analysis.subqueries
         if subquery_count > 2:
             optimizations.append(QueryOptimization(
                 level=OptimizationLevel.MEDIUM,
@@ -27,20 +27,23 @@ Example:
     ...     print(binding)
 """
 
+import asyncio
 import logging
 import time
-from collections import defaultdict
-from dataclasses import dataclass, field
+from collections import defaultdict, deque
+from dataclasses import dataclass, field, replace
 from datetime import datetime
 from enum import Enum
 from typing import (
-    Any, AsyncIterator, Dict, Iterator, List, Optional, Set, Tuple, Union
+    Any, AsyncIterator, Deque, Dict, Iterator, List, Optional, Set, Tuple, Union
 )
 from urllib.parse import urlparse
 import json
 import csv
 import io
-from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeoutError
+from itertools import islice
+from concurrent.futures import as_completed, TimeoutError as FuturesTimeoutError
+from functools import partial
 
 import requests
 from requests.adapters import HTTPAdapter
@@ -64,10 +67,40 @@ from ..core.exceptions import (
     EndpointRateLimitError,
     EndpointUnavailableError,
 )
+from .cache import ResultCache, make_cache_key
+from .coalescing import SingleFlight
+from .columnar import ColumnarBindings, ColumnarResultBuilder
+from .merging import UnionMerger, parse_order_by
+from .scheduler import FederationScheduler
+from .streaming import create_incremental_parser
 
 
 logger = logging.getLogger(__name__)
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def load_json(data: Union[str, bytes, bytearray]) -> Any:
+    """
+    Decode a JSON document, using orjson when it is installed.
+
+    Args:
+        data: JSON text or UTF-8 bytes
+
+    Returns:
+        Decoded document
+
+    Raises:
+        json.JSONDecodeError: If the document is malformed (orjson's error is a subclass)
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
 
 class ResultFormat(Enum):
     """Supported SPARQL result formats."""
@@ -148,6 +181,8 @@ class ExecutionMetrics:
         endpoint_url: Endpoint URL
         query_hash: Hash of the query
         cache_hit: Whether result was from cache
+        time_to_first_row: Seconds from start until the first row was available
+        cancelled: Whether a streamed execution was closed before completion
     """
     start_time: datetime = field(default_factory=datetime.now)
     end_time: Optional[datetime] = None
@@ -160,6 +195,13 @@ class ExecutionMetrics:
     endpoint_url: str = ""
     query_hash: str = ""
     cache_hit: bool = False
+    time_to_first_row: Optional[float] = None
+    cancelled: bool = False
+
+    def mark_first_row(self):
+        """Record time-to-first-row if it has not been recorded yet."""
+        if self.time_to_first_row is None:
+            self.time_to_first_row = (datetime.now() - self.start_time).total_seconds()
 
     def finalize(self):
         """Finalize metrics after execution."""
@@ -180,6 +222,8 @@ class ExecutionMetrics:
             "retry_count": self.retry_count,
             "endpoint_url": self.endpoint_url,
             "cache_hit": self.cache_hit,
+            "time_to_first_row": self.time_to_first_row,
+            "cancelled": self.cancelled,
         }
 
 
@@ -194,12 +238,19 @@ class FederatedQuery:
         parallel: Execute queries in parallel
         fail_on_error: Fail entire query if one endpoint fails
         timeout_per_endpoint: Timeout for each endpoint
+        deduplicate: Drop duplicate rows from union results
+        ordered_merge: k-way merge union results when the query has an ORDER BY
+        bloom_capacity: Deduplicate with a Bloom filter sized for this many rows
+            instead of an exact hash set (bounded memory, approximate)
     """
     endpoints: List[EndpointInfo]
     merge_strategy: str = "union"  # union, intersection, sequential
     parallel: bool = True
     fail_on_error: bool = False
     timeout_per_endpoint: Optional[int] = None
+    deduplicate: bool = False
+    ordered_merge: bool = True
+    bloom_capacity: Optional[int] = None
 
 
 class ConnectionPool:
@@ -353,8 +404,8 @@ class ResultParser:
         Returns:
             List of binding dictionaries
         """
-        if isinstance(data, str):
-            data = json.loads(data)
+        if isinstance(data, (str, bytes)):
+            data = load_json(data)
 
         results = []
 
@@ -376,6 +427,85 @@ class ResultParser:
 
         return results
 
+    @staticmethod
+    def parse_json_columnar(data: Union[str, dict]) -> ColumnarBindings:
+        """
+        Parse SPARQL JSON results straight into columnar storage.
+
+        No ``Binding`` objects are created; term types, datatypes and
+        languages are interned per result.
+
+        Args:
+            data: JSON string or dictionary
+
+        Returns:
+            ColumnarBindings in the variable order of the result head
+        """
+        if isinstance(data, (str, bytes)):
+            data = load_json(data)
+
+        builder = ColumnarResultBuilder(data.get("head", {}).get("vars"))
+
+        if "results" in data and "bindings" in data["results"]:
+            builder.add_term_rows(data["results"]["bindings"])
+        elif "boolean" in data:
+            builder.add_term_row({"result": {"type": "literal", "value": data["boolean"]}})
+
+        return builder.build()
+
+    @staticmethod
+    def parse_json_values(data: Union[str, bytes, dict]) -> Tuple[List[str], List[Dict[str, Any]]]:
+        """
+        Parse SPARQL JSON results straight into ``{variable: value}`` rows.
+
+        This is the shape ``QueryExecutor`` returns. Unlike ``parse_json()``
+        no ``Binding`` object is created per cell, which makes it several
+        times faster on large results.
+
+        Args:
+            data: JSON string, bytes or dictionary
+
+        Returns:
+            Tuple of (variables, rows); variables come from the result head,
+            or from the first row if the head has none
+        """
+        if isinstance(data, (str, bytes)):
+            data = load_json(data)
+
+        if "results" in data and "bindings" in data["results"]:
+            rows = [
+                {var: term.get("value", "") for var, term in binding_set.items()}
+                for binding_set in data["results"]["bindings"]
+            ]
+        elif "boolean" in data:
+            rows = [{"result": data["boolean"]}]
+        else:
+            rows = []
+
+        variables = data.get("head", {}).get("vars") or (list(rows[0]) if rows else [])
+        return variables, rows
+
+    @staticmethod
+    def load_response(raw_results: Any) -> Any:
+        """
+        Decode a SPARQLWrapper JSON response.
+
+        When orjson is installed the raw body is decoded with it; otherwise
+        (or if the body is not available as text) SPARQLWrapper's own
+        conversion is used.
+
+        Args:
+            raw_results: SPARQLWrapper query result
+
+        Returns:
+            Decoded SPARQL JSON document
+        """
+        if ORJSON_AVAILABLE:
+            body = raw_results.response.read()
+            if isinstance(body, (bytes, str)):
+                return load_json(body)
+        return raw_results.convert()
+
     @staticmethod
     def _parse_json_binding(variable: str, binding: Dict[str, Any]) -> Binding:
         """Parse a single JSON binding."""
@@ -504,131 +634,317 @@ class ResultParser:
 class StreamingResultIterator:
     """
     Iterator for streaming large SPARQL results with lazy loading.
+
+    The response body is read in chunks and fed to an incremental parser, so
+    rows are yielded while bytes are still arriving and memory stays bounded
+    by the chunk size plus one row. JSON, XML, CSV and TSV are supported.
     """
 
     def __init__(
         self,
         response: requests.Response,
         format: ResultFormat = ResultFormat.JSON,
-        chunk_size: int = 1024,
+        chunk_size: int = 65536,
     ):
         """
         Initialize streaming iterator.
 
         Args:
-            response: HTTP response object
+            response: HTTP response object (opened with ``stream=True``)
             format: Result format
             chunk_size: Size of chunks to read
+
+        Raises:
+            NotImplementedError: If the format is not a tabular result format
         """
         self.response = response
         self.format = format
         self.chunk_size = chunk_size
-        self._buffer = ""
-        self._iterator = None
+        self._parser = create_incremental_parser(format.value)
+        self._pending: Deque[Dict[str, Dict[str, Any]]] = deque()
+        self._chunks: Optional[Iterator[bytes]] = None
         self._exhausted = False
 
+    @property
+    def variables(self) -> List[str]:
+        """Result variables announced in the response header."""
+        return self._parser.variables
+
     def __iter__(self) -> Iterator[Dict[str, Binding]]:
         """Return iterator."""
         return self
 
     def __next__(self) -> Dict[str, Binding]:
         """Get next result binding."""
-        if self._exhausted:
-            raise StopIteration
-
-        # For JSON streaming, we need to parse line by line or in chunks
-        if self.format == ResultFormat.JSON:
-            return self._next_json()
-        else:
-            raise NotImplementedError(f"Streaming not implemented for {self.format}")
-
-    def _next_json(self) -> Dict[str, Binding]:
-        """Get next JSON result."""
-        # This is a simplified implementation
-        # A production version would use ijson or similar for true streaming
-        if self._iterator is None:
-            # Load all data (for now)
-            data = self.response.json()
-            if "results" in data and "bindings" in data["results"]:
-                self._iterator = iter(data["results"]["bindings"])
-            else:
-                self._exhausted = True
+        while not self._pending:
+            if self._exhausted:
                 raise StopIteration
+            self._read_chunk()
+
+        raw_row = self._pending.popleft()
+        return {
+            var: ResultParser._parse_json_binding(var, binding)
+            for var, binding in raw_row.items()
+        }
+
+    def _read_chunk(self):
+        """Read the next chunk from the response and queue completed rows."""
+        if self._chunks is None:
+            self._chunks = self.response.iter_content(chunk_size=self.chunk_size)
 
         try:
-            binding_set = next(self._iterator)
-            parsed_binding = {}
-            for var, binding in binding_set.items():
-                parsed_binding[var] = ResultParser._parse_json_binding(var, binding)
-            return parsed_binding
+            chunk = next(self._chunks)
         except StopIteration:
             self._exhausted = True
-            raise
+            self._pending.extend(self._parser.close())
+            if self._parser.boolean is not None:
+                self._pending.append(
+                    {"result": {"type": "literal", "value": self._parser.boolean}}
+                )
+            self.response.close()
+            return
+
+        if chunk:
+            self._pending.extend(self._parser.feed(chunk))
+
+    def close(self):
+        """Stop iterating and release the underlying HTTP connection."""
+        self._exhausted = True
+        self._pending.clear()
+        self.response.close()
 
 
-class QueryExecutor:
+class QueryResultStream:
     """
-    Main query executor with support for multiple endpoints, formats, and execution modes.
+    Lazily evaluated query result returned by ``QueryExecutor.execute_iter()``.
 
-    Features:
-    - Execute queries against SPARQL endpoints
-    - Multiple result format support (JSON, XML, CSV, Turtle)
-    - Streaming for large result sets
-    - Connection pooling and reuse
-    - Federation support across multiple endpoints
-    - Performance monitoring and metrics
-    - Retry logic and error recovery
-    - Timeout management
+    Rows are produced as the response is parsed, so memory does not grow with
+    result size. Closing the stream early (explicitly, via ``with`` or by
+    abandoning iteration) closes the underlying HTTP response.
 
     Example:
-        >>> executor = QueryExecutor(timeout=60, enable_metrics=True)
-        >>> result = executor.execute(
-        ...     query="SELECT ?s ?p ?o WHERE { ?s ?p ?o } LIMIT 10",
-        ...     endpoint=EndpointInfo(url="https://sparql.uniprot.org/sparql")
-        ... )
-        >>> print(f"Found {result.row_count} results")
-        >>> for binding in result.bindings:
-        ...     print(binding)
+        >>> with executor.execute_iter(query, endpoint, batch_size=1000) as stream:
+        ...     for batch in stream:
+        ...         write_rows(batch)
+        >>> print(stream.metrics.time_to_first_row)
     """
 
     def __init__(
         self,
-        timeout: int = 60,
-        max_retries: int = 3,
-        pool_size: int = 10,
-        enable_streaming: bool = False,
-        enable_metrics: bool = True,
-        user_agent: str = "SPARQL-Agent/1.0",
+        executor: "QueryExecutor",
+        iterator: StreamingResultIterator,
+        query: str,
+        endpoint: EndpointInfo,
+        metrics: ExecutionMetrics,
+        batch_size: Optional[int] = None,
     ):
         """
-        Initialize query executor.
+        Initialize result stream.
 
         Args:
-            timeout: Default timeout for queries in seconds
-            max_retries: Maximum number of retry attempts
-            pool_size: Connection pool size
-            enable_streaming: Enable streaming for large results
-            enable_metrics: Enable performance metrics collection
-            user_agent: User agent string for requests
+            executor: Executor that owns statistics for this execution
+            iterator: Streaming iterator over the open response
+            query: SPARQL query string
+            endpoint: Endpoint the query runs against
+            metrics: Metrics for this execution
+            batch_size: Yield lists of this many rows instead of single rows
         """
-        self.timeout = timeout
-        self.max_retries = max_retries
-        self.enable_streaming = enable_streaming
-        self.enable_metrics = enable_metrics
-        self.user_agent = user_agent
+        self.query = query
+        self.endpoint = endpoint
+        self.metrics = metrics
+        self.batch_size = batch_size
+        self._executor = executor
+        self._iterator = iterator
+        self._finished = False
+
+    @property
+    def variables(self) -> List[str]:
+        """Result variables announced in the response header."""
+        return self._iterator.variables
+
+    @property
+    def closed(self) -> bool:
+        """Whether the stream has been exhausted, failed or cancelled."""
+        return self._finished
+
+    def __iter__(self) -> "QueryResultStream":
+        """Return iterator."""
+        return self
 
-        # Initialize connection pool
-        self.pool = ConnectionPool(
-            pool_size=pool_size,
-            max_retries=max_retries,
-            timeout=timeout
-        )
+    def __next__(self) -> Union[Dict[str, Any], List[Dict[str, Any]]]:
+        """Get the next row, or the next batch of rows when batching."""
+        if self._finished:
+            raise StopIteration
+
+        try:
+            if self.batch_size:
+                batch = [
+                    self._convert_row(binding)
+                    for binding in islice(self._iterator, self.batch_size)
+                ]
+                if not batch:
+                    raise StopIteration
+                return batch
+            return self._convert_row(next(self._iterator))
+        except StopIteration:
+            self._complete()
+            raise
+        except Exception as e:
+            self._fail(e)
+            raise self._executor._convert_exception(e, self.endpoint) from e
+
+    def _convert_row(self, binding: Dict[str, Binding]) -> Dict[str, Any]:
+        """Convert a parsed row to plain values and update metrics."""
+        self.metrics.mark_first_row()
+        self.metrics.result_count += 1
+        return {var: b.value for var, b in binding.items()}
+
+    def _complete(self):
+        """Record a fully consumed stream."""
+        if self._finished:
+            return
+        self._finished = True
+        self.metrics.finalize()
+        self._executor._record_success(self.metrics)
+        self._executor._active_executions.pop(self.metrics.query_hash, None)
+
+    def _fail(self, error: Exception):
+        """Record a stream that failed mid-iteration."""
+        if self._finished:
+            return
+        self._finished = True
+        self._iterator.close()
+        self.metrics.finalize()
+        self._executor._record_failure(self.metrics, error)
+        self._executor._active_executions.pop(self.metrics.query_hash, None)
+
+    def close(self):
+        """Cancel the stream early and close the HTTP response."""
+        if self._finished:
+            return
+        self._finished = True
+        self._iterator.close()
+        self.metrics.cancelled = True
+        self.metrics.finalize()
+        self._executor._record_cancelled(self.metrics)
+        self._executor._active_executions.pop(self.metrics.query_hash, None)
+
+    def __enter__(self) -> "QueryResultStream":
+        """Context manager entry."""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit."""
+        self.close()
+
+    def __del__(self):
+        """Release the connection if the stream is garbage collected unfinished."""
+        try:
+            if not self._finished:
+                self.close()
+        except Exception:
+            pass
+
+
+class AsyncQueryResultStream:
+    """
+    Async twin of ``QueryResultStream`` returned by ``QueryExecutor.aexecute_iter()``.
+
+    Blocking reads from the response run in the default thread pool, a chunk
+    of rows at a time, so the event loop is never blocked on the network.
+
+    Example:
+        >>> stream = await executor.aexecute_iter(query, endpoint)
+        >>> async with stream:
+        ...     async for row in stream:
+        ...         await websocket.send_json(row)
+    """
+
+    def __init__(self, stream: QueryResultStream, prefetch: int = 500):
+        """
+        Initialize async result stream.
+
+        Args:
+            stream: Synchronous stream to wrap
+            prefetch: Rows pulled per thread hop when not batching
+        """
+        self._stream = stream
+        self._prefetch = prefetch
+        self._buffer: Deque[Any] = deque()
+
+    @property
+    def variables(self) -> List[str]:
+        """Result variables announced in the response header."""
+        return self._stream.variables
+
+    @property
+    def metrics(self) -> ExecutionMetrics:
+        """Metrics for this execution."""
+        return self._stream.metrics
+
+    @property
+    def closed(self) -> bool:
+        """Whether the stream has been exhausted, failed or cancelled."""
+        return self._stream.closed and not self._buffer
+
+    def __aiter__(self) -> "AsyncQueryResultStream":
+        """Return async iterator."""
+        return self
 
+    async def __anext__(self) -> Union[Dict[str, Any], List[Dict[str, Any]]]:
+        """Get the next row, or the next batch of rows when batching."""
+        if not self._buffer:
+            count = 1 if self._stream.batch_size else self._prefetch
+            loop = asyncio.get_running_loop()
+            items = await loop.run_in_executor(None, self._pull, count)
+            if not items:
+                raise StopAsyncIteration
+            self._buffer.extend(items)
+        return self._buffer.popleft()
+
+    def _pull(self, count: int) -> List[Any]:
+        """Pull up to ``count`` items from the synchronous stream."""
+        return list(islice(self._stream, count))
+
+    async def aclose(self):
+        """Cancel the stream early and close the HTTP response."""
+        self._buffer.clear()
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self._stream.close)
+
+    async def __aenter__(self) -> "AsyncQueryResultStream":
+        """Async context manager entry."""
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Async context manager exit."""
+        await self.aclose()
+
+
+class BaseQueryExecutor:
+    """
+    Bookkeeping shared by the synchronous and asynchronous executors.
+
+    Holds execution statistics and active-execution tracking, and implements
+    exception conversion and federated result merging, so both executors
+    report the same metrics and return the same result shapes.
+    """
+
+    pool: Any
+    cache: Optional[ResultCache] = None
+    enable_metrics: bool = True
+    columnar_results: bool = False
+    _flight: Any = None
+
+    def _init_statistics(self):
+        """Initialize execution statistics and active execution tracking."""
         # Execution statistics
         self.stats = {
             "total_queries": 0,
             "successful_queries": 0,
             "failed_queries": 0,
+            "cancelled_queries": 0,
+            "coalesced_queries": 0,
             "total_results": 0,
             "total_execution_time": 0.0,
             "average_execution_time": 0.0,
@@ -639,101 +955,453 @@ class QueryExecutor:
         # Active executions for monitoring
         self._active_executions: Dict[str, ExecutionMetrics] = {}
 
-    def execute(
+    def _merge_results(
         self,
-        query: str,
-        endpoint: Union[EndpointInfo, str],
-        format: ResultFormat = ResultFormat.JSON,
-        timeout: Optional[int] = None,
-        stream: Optional[bool] = None,
-        credentials: Optional[Dict[str, str]] = None,
-        custom_headers: Optional[Dict[str, str]] = None,
+        results: List[QueryResult],
+        strategy: str,
+        errors: List[Tuple[EndpointInfo, str]],
+        query: Optional[str] = None,
+        config: Optional[FederatedQuery] = None,
     ) -> QueryResult:
         """
-        Execute a SPARQL query against an endpoint.
+        Merge results from multiple endpoints.
 
         Args:
-            query: SPARQL query string
-            endpoint: Endpoint info or URL
-            format: Desired result format
-            timeout: Query timeout (uses default if None)
-            stream: Enable streaming (uses default if None)
-            credentials: Authentication credentials (username, password)
-            custom_headers: Custom HTTP headers
+            results: List of query results
+            strategy: Merge strategy (union, intersection, etc.)
+            errors: List of errors from failed endpoints
+            query: The federated query (its ORDER BY drives an ordered union)
+            config: Federation configuration (union deduplication options)
 
         Returns:
-            QueryResult with execution results and metadata
-
-        Raises:
-            QueryExecutionError: If query execution fails
-            QueryTimeoutError: If query times out
-            EndpointConnectionError: If connection fails
+            Merged QueryResult
         """
-        # Normalize endpoint
-        if isinstance(endpoint, str):
-            endpoint = EndpointInfo(url=endpoint)
-
-        # Initialize metrics
-        metrics = ExecutionMetrics(endpoint_url=endpoint.url)
-        query_hash = str(hash(query))
-        metrics.query_hash = query_hash
-
-        if self.enable_metrics:
-            self._active_executions[query_hash] = metrics
-
-        # Use provided timeout or defaults
-        actual_timeout = timeout or endpoint.timeout or self.timeout
-        actual_stream = stream if stream is not None else self.enable_streaming
-
-        self.stats["total_queries"] += 1
-        self.stats["queries_by_endpoint"][endpoint.url] += 1
+        if not results:
+            return QueryResult(
+                status=QueryStatus.FAILED,
+                error_message=f"All endpoints failed: {errors}",
+                row_count=0,
+                metadata={"errors": errors}
+            )
 
-        try:
-            logger.info(f"Executing query on {endpoint.url} (timeout: {actual_timeout}s)")
-            logger.debug(f"Query: {query[:200]}...")
+        if strategy == "union":
+            # Union: combine all results
+            merger = self._union_merger(query, config)
+            all_variables = set()
 
-            # Execute query
-            start_time = time.time()
+            for result in results:
+                all_variables.update(result.variables)
 
-            if actual_stream:
-                result = self._execute_streaming(
-                    query, endpoint, format, actual_timeout, credentials, custom_headers
-                )
+            if merger.is_passthrough and self.columnar_results:
+                merged_bindings = ColumnarBindings.concat([r.bindings for r in results])
+            elif merger.is_passthrough:
+                merged_bindings = []
+                for result in results:
+                    merged_bindings.extend(result.bindings)
             else:
-                result = self._execute_standard(
-                    query, endpoint, format, actual_timeout, credentials, custom_headers
-                )
-
-            # Update metrics
-            metrics.finalize()
-            metrics.result_count = result.row_count
+                merged_bindings = list(merger.merge(r.bindings for r in results))
+                if self.columnar_results:
+                    merged_bindings = ColumnarBindings.from_rows(merged_bindings)
 
-            # Update statistics
-            self.stats["successful_queries"] += 1
-            self.stats["total_results"] += result.row_count
-            self.stats["total_execution_time"] += metrics.execution_time
-            self.stats["average_execution_time"] = (
-                self.stats["total_execution_time"] / self.stats["successful_queries"]
+            return QueryResult(
+                status=QueryStatus.SUCCESS,
+                bindings=merged_bindings,
+                row_count=len(merged_bindings),
+                variables=list(all_variables),
+                execution_time=max(r.execution_time for r in results),
+                metadata={
+                    "merge_strategy": strategy,
+                    "endpoints_count": len(results),
+                    "errors": errors if errors else None,
+                    "ordered": merger.order_by is not None,
+                    "duplicates_removed": merger.stats["duplicates"],
+                }
             )
 
-            # Add metrics to result
-            if self.enable_metrics:
-                result.metadata["metrics"] = metrics.to_dict()
-
-            logger.info(
-                f"Query executed successfully: {result.row_count} results in "
-                f"{metrics.execution_time:.2f}s"
-            )
+        elif strategy == "intersection":
+            # Intersection: only common results
+            if not results:
+                return QueryResult(status=QueryStatus.SUCCESS, row_count=0)
 
-            return result
+            # Convert to sets for intersection
+            binding_sets = [
+                set(tuple(sorted(b.items())) for b in r.bindings)
+                for r in results
+            ]
 
-        except Exception as e:
-            # Update error statistics
-            self.stats["failed_queries"] += 1
-            self.stats["errors_by_type"][type(e).__name__] += 1
+            common = binding_sets[0]
+            for bs in binding_sets[1:]:
+                common = common.intersection(bs)
 
-            # Finalize metrics
+            # Convert back to list of dicts
+            merged_bindings = [dict(b) for b in common]
+
+            return QueryResult(
+                status=QueryStatus.SUCCESS,
+                bindings=merged_bindings,
+                row_count=len(merged_bindings),
+                variables=results[0].variables if results else [],
+                execution_time=max(r.execution_time for r in results),
+                metadata={
+                    "merge_strategy": strategy,
+                    "endpoints_count": len(results),
+                }
+            )
+
+        else:  # sequential
+            # Sequential: results from first successful endpoint
+            return results[0]
+
+    @staticmethod
+    def _union_merger(
+        query: Optional[str],
+        config: Optional[FederatedQuery],
+    ) -> UnionMerger:
+        """Create the union merger for a federated query and its configuration."""
+        ordered = query is not None and (config is None or config.ordered_merge)
+        return UnionMerger(
+            deduplicate=config.deduplicate if config else False,
+            order_by=parse_order_by(query) if ordered else None,
+            bloom_capacity=config.bloom_capacity if config else None,
+        )
+
+    def _get_accept_header(self, format: ResultFormat) -> str:
+        """Get Accept header for result format."""
+        format_headers = {
+            ResultFormat.JSON: "application/sparql-results+json",
+            ResultFormat.XML: "application/sparql-results+xml",
+            ResultFormat.CSV: "text/csv",
+            ResultFormat.TSV: "text/tab-separated-values",
+            ResultFormat.TURTLE: "text/turtle",
+            ResultFormat.N_TRIPLES: "application/n-triples",
+            ResultFormat.RDF_XML: "application/rdf+xml",
+        }
+        return format_headers.get(format, "application/sparql-results+json")
+
+    def _convert_exception(self, error: Exception, endpoint: EndpointInfo) -> Exception:
+        """Convert generic exceptions to specific SPARQL exceptions."""
+        if isinstance(error, (QueryExecutionError, QueryTimeoutError)):
+            return error
+
+        error_str = str(error).lower()
+
+        if "timeout" in error_str:
+            return QueryTimeoutError(
+                f"Query timed out: {error}",
+                details={"endpoint": endpoint.url}
+            )
+        elif "401" in error_str or "unauthorized" in error_str:
+            return EndpointAuthenticationError(
+                f"Authentication failed: {error}",
+                details={"endpoint": endpoint.url}
+            )
+        elif "429" in error_str or "rate limit" in error_str:
+            return EndpointRateLimitError(
+                f"Rate limit exceeded: {error}",
+                details={"endpoint": endpoint.url}
+            )
+        elif "503" in error_str or "unavailable" in error_str:
+            return EndpointUnavailableError(
+                f"Endpoint unavailable: {error}",
+                details={"endpoint": endpoint.url}
+            )
+        elif "connection" in error_str or "network" in error_str:
+            return EndpointConnectionError(
+                f"Connection failed: {error}",
+                details={"endpoint": endpoint.url}
+            )
+        else:
+            return QueryExecutionError(
+                f"Query execution failed: {error}",
+                details={"endpoint": endpoint.url}
+            )
+
+    def _cache_lookup(
+        self,
+        query: str,
+        endpoint: EndpointInfo,
+        format: ResultFormat,
+        metrics: ExecutionMetrics,
+    ) -> Optional[QueryResult]:
+        """Return a copy of a cached result and record it as a successful execution."""
+        if self.cache is None:
+            return None
+
+        cached = self.cache.get_result(query, endpoint.url, format.value)
+        if cached is None:
+            return None
+
+        result = replace(
+            cached, bindings=self._copy_bindings(cached.bindings), metadata=dict(cached.metadata)
+        )
+        metrics.cache_hit = True
+        metrics.result_count = result.row_count
+        metrics.finalize()
+        self._record_success(metrics)
+        result.metadata["cache_hit"] = True
+        if self.enable_metrics:
+            result.metadata["metrics"] = metrics.to_dict()
+
+        logger.info(f"Serving {result.row_count} cached results for query on {endpoint.url}")
+        return result
+
+    def _cache_store(
+        self,
+        query: str,
+        endpoint: EndpointInfo,
+        format: ResultFormat,
+        result: QueryResult,
+    ):
+        """Cache a successful result, detached from the caller's metadata dict."""
+        if self.cache is not None and result.is_success:
+            self.cache.put_result(
+                query, endpoint.url, replace(result, metadata=dict(result.metadata)), format.value
+            )
+
+    def _coalesce_key(
+        self,
+        query: str,
+        endpoint: EndpointInfo,
+        format: ResultFormat,
+        credentials: Optional[Dict[str, str]],
+        custom_headers: Optional[Dict[str, str]],
+    ) -> Optional[str]:
+        """Key identical requests share, or None if the request must not be coalesced."""
+        if credentials or custom_headers:
+            # Per-caller credentials or headers may change the response
+            return None
+        return make_cache_key(query, endpoint.url, format.value)
+
+    @staticmethod
+    def _copy_bindings(bindings):
+        """Copy result rows for another caller, keeping their layout."""
+        if isinstance(bindings, ColumnarBindings):
+            # Columnar results are read-only and can be shared as is
+            return bindings
+        return list(bindings)
+
+    def _share_result(self, result: QueryResult, shared: bool) -> QueryResult:
+        """Give a coalesced caller its own copy of the leader's result."""
+        if not shared:
+            return result
+        self.stats["coalesced_queries"] += 1
+        result = replace(
+            result, bindings=self._copy_bindings(result.bindings), metadata=dict(result.metadata)
+        )
+        result.metadata["coalesced"] = True
+        return result
+
+    def _record_success(self, metrics: ExecutionMetrics):
+        """Update statistics for a completed execution."""
+        self.stats["successful_queries"] += 1
+        self.stats["total_results"] += metrics.result_count
+        self.stats["total_execution_time"] += metrics.execution_time
+        self.stats["average_execution_time"] = (
+            self.stats["total_execution_time"] / self.stats["successful_queries"]
+        )
+
+    def _record_failure(self, metrics: ExecutionMetrics, error: Exception):
+        """Update statistics for a failed execution."""
+        self.stats["failed_queries"] += 1
+        self.stats["errors_by_type"][type(error).__name__] += 1
+
+    def _record_cancelled(self, metrics: ExecutionMetrics):
+        """Update statistics for a stream closed before completion."""
+        self.stats["cancelled_queries"] += 1
+        self.stats["total_results"] += metrics.result_count
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get executor statistics."""
+        stats = dict(self.stats)
+        stats["pool_stats"] = self.pool.get_statistics()
+        stats["active_executions"] = len(self._active_executions)
+        stats["in_flight_requests"] = self._flight.in_flight() if self._flight else 0
+        if self.cache is not None:
+            stats["cache"] = self.cache.get_statistics()
+        scheduler = getattr(self, "scheduler", None)
+        if scheduler is not None:
+            stats["scheduler"] = scheduler.get_statistics()
+        return stats
+
+    def get_active_executions(self) -> Dict[str, Dict[str, Any]]:
+        """Get currently active executions."""
+        return {
+            query_hash: metrics.to_dict()
+            for query_hash, metrics in self._active_executions.items()
+        }
+
+
+class QueryExecutor(BaseQueryExecutor):
+    """
+    Main query executor with support for multiple endpoints, formats, and execution modes.
+
+    Features:
+    - Execute queries against SPARQL endpoints
+    - Multiple result format support (JSON, XML, CSV, Turtle)
+    - Streaming for large result sets
+    - Connection pooling and reuse
+    - Federation support across multiple endpoints
+    - Performance monitoring and metrics
+    - Retry logic and error recovery
+    - Timeout management
+
+    Example:
+        >>> executor = QueryExecutor(timeout=60, enable_metrics=True)
+        >>> result = executor.execute(
+        ...     query="SELECT ?s ?p ?o WHERE { ?s ?p ?o } LIMIT 10",
+        ...     endpoint=EndpointInfo(url="https://sparql.uniprot.org/sparql")
+        ... )
+        >>> print(f"Found {result.row_count} results")
+        >>> for binding in result.bindings:
+        ...     print(binding)
+    """
+
+    def __init__(
+        self,
+        timeout: int = 60,
+        max_retries: int = 3,
+        pool_size: int = 10,
+        enable_streaming: bool = False,
+        enable_metrics: bool = True,
+        user_agent: str = "SPARQL-Agent/1.0",
+        cache: Optional[ResultCache] = None,
+        coalesce_requests: bool = True,
+        columnar_results: bool = False,
+        scheduler: Optional[FederationScheduler] = None,
+    ):
+        """
+        Initialize query executor.
+
+        Args:
+            timeout: Default timeout for queries in seconds
+            max_retries: Maximum number of retry attempts
+            pool_size: Connection pool size
+            enable_streaming: Enable streaming for large results
+            enable_metrics: Enable performance metrics collection
+            user_agent: User agent string for requests
+            cache: Result cache consulted before sending queries (None disables caching)
+            coalesce_requests: Let concurrent identical queries share one request
+            columnar_results: Store result bindings as ColumnarBindings
+            scheduler: Scheduler for parallel federated queries, may be shared
+                between executors (default: one owned by this executor)
+        """
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.enable_streaming = enable_streaming
+        self.enable_metrics = enable_metrics
+        self.user_agent = user_agent
+        self.cache = cache
+        self.columnar_results = columnar_results
+        self._flight = SingleFlight() if coalesce_requests else None
+        self._owns_scheduler = scheduler is None
+        self.scheduler = scheduler or FederationScheduler()
+
+        # Initialize connection pool
+        self.pool = ConnectionPool(
+            pool_size=pool_size,
+            max_retries=max_retries,
+            timeout=timeout
+        )
+
+        self._init_statistics()
+
+    def execute(
+        self,
+        query: str,
+        endpoint: Union[EndpointInfo, str],
+        format: ResultFormat = ResultFormat.JSON,
+        timeout: Optional[int] = None,
+        stream: Optional[bool] = None,
+        credentials: Optional[Dict[str, str]] = None,
+        custom_headers: Optional[Dict[str, str]] = None,
+    ) -> QueryResult:
+        """
+        Execute a SPARQL query against an endpoint.
+
+        Args:
+            query: SPARQL query string
+            endpoint: Endpoint info or URL
+            format: Desired result format
+            timeout: Query timeout (uses default if None)
+            stream: Enable streaming (uses default if None)
+            credentials: Authentication credentials (username, password)
+            custom_headers: Custom HTTP headers
+
+        Returns:
+            QueryResult with execution results and metadata
+
+        Raises:
+            QueryExecutionError: If query execution fails
+            QueryTimeoutError: If query times out
+            EndpointConnectionError: If connection fails
+        """
+        # Normalize endpoint
+        if isinstance(endpoint, str):
+            endpoint = EndpointInfo(url=endpoint)
+
+        # Initialize metrics
+        metrics = ExecutionMetrics(endpoint_url=endpoint.url)
+        query_hash = str(hash(query))
+        metrics.query_hash = query_hash
+
+        if self.enable_metrics:
+            self._active_executions[query_hash] = metrics
+
+        # Use provided timeout or defaults
+        actual_timeout = timeout or endpoint.timeout or self.timeout
+        actual_stream = stream if stream is not None else self.enable_streaming
+
+        self.stats["total_queries"] += 1
+        self.stats["queries_by_endpoint"][endpoint.url] += 1
+
+        try:
+            cached = self._cache_lookup(query, endpoint, format, metrics)
+            if cached is not None:
+                return cached
+
+            logger.info(f"Executing query on {endpoint.url} (timeout: {actual_timeout}s)")
+            logger.debug(f"Query: {query[:200]}...")
+
+            # Execute query
+            start_time = time.time()
+
+            def send() -> QueryResult:
+                if actual_stream:
+                    return self._execute_streaming(
+                        query, endpoint, format, actual_timeout, credentials, custom_headers
+                    )
+                return self._execute_standard(
+                    query, endpoint, format, actual_timeout, credentials, custom_headers
+                )
+
+            flight_key = self._coalesce_key(query, endpoint, format, credentials, custom_headers)
+            if self._flight is not None and flight_key is not None:
+                result, shared = self._flight.do(flight_key, send)
+                result = self._share_result(result, shared)
+            else:
+                result = send()
+
+            # Update metrics
+            metrics.finalize()
+            metrics.result_count = result.row_count
+            self._record_success(metrics)
+            self._cache_store(query, endpoint, format, result)
+
+            # Add metrics to result
+            if self.enable_metrics:
+                result.metadata["metrics"] = metrics.to_dict()
+
+            logger.info(
+                f"Query executed successfully: {result.row_count} results in "
+                f"{metrics.execution_time:.2f}s"
+            )
+
+            return result
+
+        except Exception as e:
+            # Finalize metrics and update error statistics
             metrics.finalize()
+            self._record_failure(metrics, e)
 
             # Convert to appropriate exception
             error = self._convert_exception(e, endpoint)
@@ -745,7 +1413,10 @@ class QueryExecutor:
                 query=query,
                 error_message=str(error),
                 execution_time=metrics.execution_time,
-                metadata={"metrics": metrics.to_dict()} if self.enable_metrics else {}
+                metadata={
+                    "error_type": type(error).__name__,
+                    **({"metrics": metrics.to_dict()} if self.enable_metrics else {}),
+                }
             )
 
         finally:
@@ -753,6 +1424,108 @@ class QueryExecutor:
             if query_hash in self._active_executions:
                 del self._active_executions[query_hash]
 
+    def execute_iter(
+        self,
+        query: str,
+        endpoint: Union[EndpointInfo, str],
+        format: ResultFormat = ResultFormat.JSON,
+        timeout: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        credentials: Optional[Dict[str, str]] = None,
+        custom_headers: Optional[Dict[str, str]] = None,
+    ) -> QueryResultStream:
+        """
+        Execute a SPARQL query and iterate over its rows lazily.
+
+        Unlike ``execute()``, rows are never collected into a list: they are
+        parsed from the response as it arrives. Close the returned stream (or
+        use it as a context manager) to cancel early and free the connection.
+
+        Args:
+            query: SPARQL query string
+            endpoint: Endpoint info or URL
+            format: Result format (JSON, XML, CSV or TSV)
+            timeout: Query timeout (uses default if None)
+            batch_size: Yield lists of this many rows instead of single rows
+            credentials: Authentication credentials (username, password)
+            custom_headers: Custom HTTP headers
+
+        Returns:
+            QueryResultStream yielding ``{variable: value}`` rows or row batches
+
+        Raises:
+            QueryTimeoutError: If the request times out
+            EndpointConnectionError: If connection fails
+            QueryExecutionError: If the endpoint rejects the query; errors
+                raised while iterating are converted the same way
+        """
+        if isinstance(endpoint, str):
+            endpoint = EndpointInfo(url=endpoint)
+
+        metrics = ExecutionMetrics(endpoint_url=endpoint.url)
+        metrics.query_hash = str(hash(query))
+        actual_timeout = timeout or endpoint.timeout or self.timeout
+
+        self.stats["total_queries"] += 1
+        self.stats["queries_by_endpoint"][endpoint.url] += 1
+
+        logger.info(f"Streaming query on {endpoint.url} (timeout: {actual_timeout}s)")
+        logger.debug(f"Query: {query[:200]}...")
+
+        try:
+            start_network = time.time()
+            response = self._open_stream(
+                query, endpoint, format, actual_timeout, credentials, custom_headers
+            )
+            metrics.network_time = time.time() - start_network
+            iterator = StreamingResultIterator(response, format)
+        except Exception as e:
+            metrics.finalize()
+            self._record_failure(metrics, e)
+            raise self._convert_exception(e, endpoint) from e
+
+        if self.enable_metrics:
+            self._active_executions[metrics.query_hash] = metrics
+
+        return QueryResultStream(self, iterator, query, endpoint, metrics, batch_size)
+
+    async def aexecute_iter(
+        self,
+        query: str,
+        endpoint: Union[EndpointInfo, str],
+        format: ResultFormat = ResultFormat.JSON,
+        timeout: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        credentials: Optional[Dict[str, str]] = None,
+        custom_headers: Optional[Dict[str, str]] = None,
+    ) -> AsyncQueryResultStream:
+        """
+        Async twin of ``execute_iter()``.
+
+        The request is sent and the response read in the default thread
+        pool, so awaiting rows never blocks the event loop.
+
+        Args:
+            query: SPARQL query string
+            endpoint: Endpoint info or URL
+            format: Result format (JSON, XML, CSV or TSV)
+            timeout: Query timeout (uses default if None)
+            batch_size: Yield lists of this many rows instead of single rows
+            credentials: Authentication credentials (username, password)
+            custom_headers: Custom HTTP headers
+
+        Returns:
+            AsyncQueryResultStream yielding rows or row batches
+        """
+        loop = asyncio.get_running_loop()
+        stream = await loop.run_in_executor(
+            None,
+            lambda: self.execute_iter(
+                query, endpoint, format, timeout, batch_size, credentials, custom_headers
+            ),
+        )
+        return AsyncQueryResultStream(stream)
+
     def _execute_standard(
         self,
         query: str,
@@ -793,37 +1566,48 @@ class QueryExecutor:
             start_parse = time.time()
 
             if format == ResultFormat.JSON:
-                data = raw_results.convert()
-                bindings = ResultParser.parse_json(data)
-            elif format == ResultFormat.XML:
-                data = raw_results.convert()
-                bindings = ResultParser.parse_xml(data)
-            elif format == ResultFormat.CSV:
-                data = raw_results.convert()
-                bindings = ResultParser.parse_csv(data)
+                # Fast path: no per-cell Binding objects
+                data = ResultParser.load_response(raw_results)
+                if self.columnar_results:
+                    standard_bindings = ResultParser.parse_json_columnar(data)
+                    variables = standard_bindings.variables
+                else:
+                    variables, standard_bindings = ResultParser.parse_json_values(data)
             else:
-                # For RDF formats, return raw data
-                data = raw_results.convert()
-                bindings = []
+                if format == ResultFormat.XML:
+                    data = raw_results.convert()
+                    bindings = ResultParser.parse_xml(data)
+                elif format == ResultFormat.CSV:
+                    data = raw_results.convert()
+                    bindings = ResultParser.parse_csv(data)
+                else:
+                    # For RDF formats, return raw data
+                    data = raw_results.convert()
+                    bindings = []
+
+                # Convert bindings to standard format
+                if self.columnar_results:
+                    builder = ColumnarResultBuilder()
+                    for binding_dict in bindings:
+                        builder.add_binding_row(binding_dict)
+                    standard_bindings = builder.build()
+                    variables = standard_bindings.variables
+                else:
+                    variables = list(bindings[0].keys()) if bindings else []
+                    standard_bindings = []
+                    for binding_dict in bindings:
+                        standard_binding = {}
+                        for var, binding in binding_dict.items():
+                            standard_binding[var] = binding.value
+                        standard_bindings.append(standard_binding)
 
             parse_time = time.time() - start_parse
 
-            # Build result
-            variables = list(bindings[0].keys()) if bindings else []
-
-            # Convert bindings to standard format
-            standard_bindings = []
-            for binding_dict in bindings:
-                standard_binding = {}
-                for var, binding in binding_dict.items():
-                    standard_binding[var] = binding.value
-                standard_bindings.append(standard_binding)
-
             result = QueryResult(
                 status=QueryStatus.SUCCESS,
                 query=query,
                 bindings=standard_bindings,
-                row_count=len(bindings),
+                row_count=len(standard_bindings),
                 variables=variables,
                 execution_time=network_time + parse_time,
                 metadata={
@@ -851,8 +1635,59 @@ class QueryExecutor:
         credentials: Optional[Dict[str, str]],
         custom_headers: Optional[Dict[str, str]],
     ) -> QueryResult:
-        """Execute query in streaming mode."""
-        # Build request
+        """Execute query in streaming mode, parsing the response incrementally."""
+        start_time = time.time()
+
+        response = self._open_stream(
+            query, endpoint, format, timeout, credentials, custom_headers
+        )
+        iterator = StreamingResultIterator(response, format)
+
+        try:
+            if self.columnar_results:
+                builder = ColumnarResultBuilder()
+                for binding in iterator:
+                    builder.add_binding_row(binding)
+                bindings = builder.build()
+            else:
+                bindings = [
+                    {var: b.value for var, b in binding.items()}
+                    for binding in iterator
+                ]
+        except requests.exceptions.RequestException as e:
+            iterator.close()
+            raise EndpointConnectionError(
+                f"Connection failed: {e}",
+                details={"endpoint": endpoint.url}
+            )
+
+        execution_time = time.time() - start_time
+        variables = iterator.variables or (list(bindings[0].keys()) if bindings else [])
+
+        return QueryResult(
+            status=QueryStatus.SUCCESS,
+            query=query,
+            bindings=bindings,
+            row_count=len(bindings),
+            variables=variables,
+            execution_time=execution_time,
+            metadata={
+                "format": format.value,
+                "endpoint": endpoint.url,
+                "streaming": True,
+            }
+        )
+
+    def _open_stream(
+        self,
+        query: str,
+        endpoint: EndpointInfo,
+        format: ResultFormat,
+        timeout: int,
+        credentials: Optional[Dict[str, str]],
+        custom_headers: Optional[Dict[str, str]],
+    ) -> requests.Response:
+        """Send the query and return the response with its body still unread."""
         session = self.pool.get_session(endpoint.url)
 
         headers = {
@@ -871,9 +1706,6 @@ class QueryExecutor:
             creds = endpoint.metadata["credentials"]
             auth = (creds.get("username"), creds.get("password"))
 
-        # Execute request
-        start_time = time.time()
-
         try:
             response = session.post(
                 endpoint.url,
@@ -884,34 +1716,7 @@ class QueryExecutor:
                 stream=True
             )
             response.raise_for_status()
-
-            # Create streaming iterator
-            iterator = StreamingResultIterator(response, format)
-
-            # Collect results (in streaming mode, could yield)
-            bindings = []
-            for binding in iterator:
-                standard_binding = {var: b.value for var, b in binding.items()}
-                bindings.append(standard_binding)
-
-            execution_time = time.time() - start_time
-            variables = list(bindings[0].keys()) if bindings else []
-
-            result = QueryResult(
-                status=QueryStatus.SUCCESS,
-                query=query,
-                bindings=bindings,
-                row_count=len(bindings),
-                variables=variables,
-                execution_time=execution_time,
-                metadata={
-                    "format": format.value,
-                    "endpoint": endpoint.url,
-                    "streaming": True,
-                }
-            )
-
-            return result
+            return response
 
         except requests.exceptions.Timeout:
             raise QueryTimeoutError(
@@ -951,6 +1756,52 @@ class QueryExecutor:
         else:
             return self._execute_federated_sequential(query, config, timeout)
 
+    def execute_federated_iter(
+        self,
+        query: str,
+        config: FederatedQuery,
+        timeout: Optional[int] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Execute a federated union query and yield rows as endpoints respond.
+
+        Rows of the first endpoint to answer are yielded while the others are
+        still running. If the query has an ORDER BY (and ``ordered_merge`` is
+        set), rows are k-way merged instead, which waits for every endpoint.
+        Closing the iterator early cancels requests that have not started.
+
+        Args:
+            query: SPARQL query string
+            config: Federation configuration (``merge_strategy`` must be "union")
+            timeout: Overall timeout for all queries
+
+        Yields:
+            Merged result rows
+
+        Raises:
+            ValueError: If the merge strategy is not "union"
+            QueryExecutionError: If an endpoint fails and ``fail_on_error`` is set
+        """
+        if config.merge_strategy != "union":
+            raise ValueError(
+                f"Streaming federation requires the 'union' merge strategy, got '{config.merge_strategy}'"
+            )
+
+        errors: List[Tuple[EndpointInfo, str]] = []
+        if config.parallel:
+            results = self._iter_federated_parallel(query, config, timeout, errors)
+        else:
+            results = self._iter_federated_sequential(query, config, timeout, errors)
+
+        merger = self._union_merger(query, config)
+        try:
+            yield from merger.merge(result.bindings for result in results)
+        finally:
+            results.close()
+
+        if errors:
+            logger.warning(f"Federated query skipped {len(errors)} failed endpoints: {errors}")
+
     def _execute_federated_parallel(
         self,
         query: str,
@@ -958,30 +1809,48 @@ class QueryExecutor:
         timeout: Optional[int],
     ) -> QueryResult:
         """Execute federated query in parallel."""
-        results = []
         errors = []
+        results = list(self._iter_federated_parallel(query, config, timeout, errors))
+
+        # Merge results
+        return self._merge_results(results, config.merge_strategy, errors, query, config)
+
+    def _iter_federated_parallel(
+        self,
+        query: str,
+        config: FederatedQuery,
+        timeout: Optional[int],
+        errors: List[Tuple[EndpointInfo, str]],
+    ) -> Iterator[QueryResult]:
+        """
+        Yield successful endpoint results in completion order.
+
+        Endpoint requests go through the shared scheduler, which applies the
+        per-endpoint adaptive limits and interleaves this query's requests
+        fairly with those of other callers. Failures are appended to ``errors``.
+        """
+        caller = object()
 
-        with ThreadPoolExecutor(max_workers=len(config.endpoints)) as executor:
-            # Submit all queries
-            futures = {
-                executor.submit(
+        futures = {
+            self.scheduler.submit(
+                endpoint.url,
+                partial(
                     self.execute,
                     query,
                     endpoint,
                     timeout=config.timeout_per_endpoint or timeout
-                ): endpoint
-                for endpoint in config.endpoints
-            }
+                ),
+                caller=caller,
+            ): endpoint
+            for endpoint in config.endpoints
+        }
 
+        try:
             # Collect results
             for future in as_completed(futures):
                 endpoint = futures[future]
                 try:
                     result = future.result()
-                    if result.is_success:
-                        results.append(result)
-                    else:
-                        errors.append((endpoint, result.error_message))
                 except Exception as e:
                     errors.append((endpoint, str(e)))
                     if config.fail_on_error:
@@ -989,9 +1858,15 @@ class QueryExecutor:
                             f"Federated query failed at {endpoint.url}: {e}",
                             details={"endpoint": endpoint.url}
                         )
+                    continue
 
-        # Merge results
-        return self._merge_results(results, config.merge_strategy, errors)
+                if result.is_success:
+                    yield result
+                else:
+                    errors.append((endpoint, result.error_message))
+        finally:
+            for pending in futures:
+                pending.cancel()
 
     def _execute_federated_sequential(
         self,
@@ -1000,9 +1875,20 @@ class QueryExecutor:
         timeout: Optional[int],
     ) -> QueryResult:
         """Execute federated query sequentially."""
-        results = []
         errors = []
+        results = list(self._iter_federated_sequential(query, config, timeout, errors))
+
+        # Merge results
+        return self._merge_results(results, config.merge_strategy, errors, query, config)
 
+    def _iter_federated_sequential(
+        self,
+        query: str,
+        config: FederatedQuery,
+        timeout: Optional[int],
+        errors: List[Tuple[EndpointInfo, str]],
+    ) -> Iterator[QueryResult]:
+        """Yield successful endpoint results one endpoint at a time."""
         for endpoint in config.endpoints:
             try:
                 result = self.execute(
@@ -1010,171 +1896,26 @@ class QueryExecutor:
                     endpoint,
                     timeout=config.timeout_per_endpoint or timeout
                 )
-                if result.is_success:
-                    results.append(result)
-                else:
-                    errors.append((endpoint, result.error_message))
-                    if config.fail_on_error:
-                        raise QueryExecutionError(
-                            f"Federated query failed at {endpoint.url}: {result.error_message}",
-                            details={"endpoint": endpoint.url}
-                        )
             except Exception as e:
                 errors.append((endpoint, str(e)))
                 if config.fail_on_error:
                     raise
+                continue
 
-        # Merge results
-        return self._merge_results(results, config.merge_strategy, errors)
-
-    def _merge_results(
-        self,
-        results: List[QueryResult],
-        strategy: str,
-        errors: List[Tuple[EndpointInfo, str]],
-    ) -> QueryResult:
-        """
-        Merge results from multiple endpoints.
-
-        Args:
-            results: List of query results
-            strategy: Merge strategy (union, intersection, etc.)
-            errors: List of errors from failed endpoints
-
-        Returns:
-            Merged QueryResult
-        """
-        if not results:
-            return QueryResult(
-                status=QueryStatus.FAILED,
-                error_message=f"All endpoints failed: {errors}",
-                row_count=0,
-                metadata={"errors": errors}
-            )
-
-        if strategy == "union":
-            # Union: combine all results
-            merged_bindings = []
-            all_variables = set()
-
-            for result in results:
-                merged_bindings.extend(result.bindings)
-                all_variables.update(result.variables)
-
-            return QueryResult(
-                status=QueryStatus.SUCCESS,
-                bindings=merged_bindings,
-                row_count=len(merged_bindings),
-                variables=list(all_variables),
-                execution_time=max(r.execution_time for r in results),
-                metadata={
-                    "merge_strategy": strategy,
-                    "endpoints_count": len(results),
-                    "errors": errors if errors else None,
-                }
-            )
-
-        elif strategy == "intersection":
-            # Intersection: only common results
-            if not results:
-                return QueryResult(status=QueryStatus.SUCCESS, row_count=0)
-
-            # Convert to sets for intersection
-            binding_sets = [
-                set(tuple(sorted(b.items())) for b in r.bindings)
-                for r in results
-            ]
-
-            common = binding_sets[0]
-            for bs in binding_sets[1:]:
-                common = common.intersection(bs)
-
-            # Convert back to list of dicts
-            merged_bindings = [dict(b) for b in common]
-
-            return QueryResult(
-                status=QueryStatus.SUCCESS,
-                bindings=merged_bindings,
-                row_count=len(merged_bindings),
-                variables=results[0].variables if results else [],
-                execution_time=max(r.execution_time for r in results),
-                metadata={
-                    "merge_strategy": strategy,
-                    "endpoints_count": len(results),
-                }
-            )
-
-        else:  # sequential
-            # Sequential: results from first successful endpoint
-            return results[0]
-
-    def _get_accept_header(self, format: ResultFormat) -> str:
-        """Get Accept header for result format."""
-        format_headers = {
-            ResultFormat.JSON: "application/sparql-results+json",
-            ResultFormat.XML: "application/sparql-results+xml",
-            ResultFormat.CSV: "text/csv",
-            ResultFormat.TSV: "text/tab-separated-values",
-            ResultFormat.TURTLE: "text/turtle",
-            ResultFormat.N_TRIPLES: "application/n-triples",
-            ResultFormat.RDF_XML: "application/rdf+xml",
-        }
-        return format_headers.get(format, "application/sparql-results+json")
-
-    def _convert_exception(self, error: Exception, endpoint: EndpointInfo) -> Exception:
-        """Convert generic exceptions to specific SPARQL exceptions."""
-        if isinstance(error, (QueryExecutionError, QueryTimeoutError)):
-            return error
-
-        error_str = str(error).lower()
-
-        if "timeout" in error_str:
-            return QueryTimeoutError(
-                f"Query timed out: {error}",
-                details={"endpoint": endpoint.url}
-            )
-        elif "401" in error_str or "unauthorized" in error_str:
-            return EndpointAuthenticationError(
-                f"Authentication failed: {error}",
-                details={"endpoint": endpoint.url}
-            )
-        elif "429" in error_str or "rate limit" in error_str:
-            return EndpointRateLimitError(
-                f"Rate limit exceeded: {error}",
-                details={"endpoint": endpoint.url}
-            )
-        elif "503" in error_str or "unavailable" in error_str:
-            return EndpointUnavailableError(
-                f"Endpoint unavailable: {error}",
-                details={"endpoint": endpoint.url}
-            )
-        elif "connection" in error_str or "network" in error_str:
-            return EndpointConnectionError(
-                f"Connection failed: {error}",
-                details={"endpoint": endpoint.url}
-            )
-        else:
-            return QueryExecutionError(
-                f"Query execution failed: {error}",
-                details={"endpoint": endpoint.url}
-            )
-
-    def get_statistics(self) -> Dict[str, Any]:
-        """Get executor statistics."""
-        stats = dict(self.stats)
-        stats["pool_stats"] = self.pool.get_statistics()
-        stats["active_executions"] = len(self._active_executions)
-        return stats
-
-    def get_active_executions(self) -> Dict[str, Dict[str, Any]]:
-        """Get currently active executions."""
-        return {
-            query_hash: metrics.to_dict()
-            for query_hash, metrics in self._active_executions.items()
-        }
+            if result.is_success:
+                yield result
+            else:
+                errors.append((endpoint, result.error_message))
+                if config.fail_on_error:
+                    raise QueryExecutionError(
+                        f"Federated query failed at {endpoint.url}: {result.error_message}",
+                        details={"endpoint": endpoint.url}
+                    )
 
     def close(self):
         """Close executor and all connections."""
+        if self._owns_scheduler:
+            self.scheduler.shutdown(wait=False)
         self.pool.close_all()
         logger.info("Query executor closed")
 
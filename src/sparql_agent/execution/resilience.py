@@ -0,0 +1,204 @@
+"""
+Circuit breaking and latency tracking for remote endpoints.
+
+``CircuitBreaker`` stops sending requests to an endpoint after repeated
+failures and lets a single trial request through once a recovery timeout has
+passed. ``LatencyTracker`` keeps a window of recent response times per
+endpoint and reports percentiles, e.g. to pick a hedging delay.
+
+Example:
+    >>> breaker = CircuitBreaker(failure_threshold=5, recovery_timeout=30)
+    >>> if breaker.allow():
+    ...     ok = send_request()
+    ...     breaker.record_success() if ok else breaker.record_failure()
+"""
+
+import logging
+import math
+import threading
+import time
+from collections import defaultdict, deque
+from enum import Enum
+from typing import Deque, Dict, Optional
+
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitState(Enum):
+    """Circuit breaker states."""
+    CLOSED = "closed"        # Requests flow normally
+    OPEN = "open"            # Requests are rejected
+    HALF_OPEN = "half_open"  # One trial request is allowed
+
+
+class CircuitBreaker:
+    """
+    Thread-safe circuit breaker for one endpoint.
+
+    After ``failure_threshold`` consecutive failures the circuit opens and
+    ``allow()`` returns False. Once ``recovery_timeout`` seconds have passed it
+    becomes half-open and admits a single trial request. Success closes the
+    circuit; failure opens it again.
+    """
+
+    def __init__(self, failure_threshold: int = 5, recovery_timeout: float = 30.0):
+        """
+        Initialize circuit breaker.
+
+        Args:
+            failure_threshold: Consecutive failures that open the circuit
+            recovery_timeout: Seconds to wait before allowing a trial request
+        """
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+
+        self._lock = threading.Lock()
+        self._state = CircuitState.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+
+        # Statistics
+        self.stats = {
+            "successes": 0,
+            "failures": 0,
+            "rejected": 0,
+            "times_opened": 0,
+        }
+
+    @property
+    def state(self) -> CircuitState:
+        """Current state (an expired open circuit reports half-open)."""
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self) -> CircuitState:
+        """Resolve the open to half-open transition (lock held)."""
+        if (
+            self._state is CircuitState.OPEN
+            and time.monotonic() - self._opened_at >= self.recovery_timeout
+        ):
+            self._state = CircuitState.HALF_OPEN
+            self._trial_in_flight = False
+        return self._state
+
+    def allow(self) -> bool:
+        """
+        Check whether a request may be sent, reserving the trial slot if half-open.
+
+        Returns:
+            True if the request may proceed
+        """
+        with self._lock:
+            state = self._current_state()
+            if state is CircuitState.CLOSED:
+                return True
+            if state is CircuitState.HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            self.stats["rejected"] += 1
+            return False
+
+    def release(self):
+        """Give back a trial slot reserved by ``allow()`` for a request never sent."""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_success(self):
+        """Record a successful request; closes the circuit."""
+        with self._lock:
+            self.stats["successes"] += 1
+            self._failures = 0
+            self._state = CircuitState.CLOSED
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        """Record a failed request; may open the circuit."""
+        with self._lock:
+            self.stats["failures"] += 1
+            self._failures += 1
+            state = self._current_state()
+            if state is CircuitState.HALF_OPEN or self._failures >= self.failure_threshold:
+                if state is not CircuitState.OPEN:
+                    self.stats["times_opened"] += 1
+                    logger.warning(f"Circuit opened after {self._failures} consecutive failures")
+                self._state = CircuitState.OPEN
+                self._opened_at = time.monotonic()
+                self._trial_in_flight = False
+
+    def get_statistics(self) -> Dict[str, object]:
+        """Get breaker state and counters."""
+        with self._lock:
+            stats: Dict[str, object] = dict(self.stats)
+            stats["state"] = self._current_state().value
+            stats["consecutive_failures"] = self._failures
+            return stats
+
+
+class LatencyTracker:
+    """
+    Sliding window of response times per endpoint.
+
+    Percentiles are computed from the last ``window`` samples of each endpoint.
+    """
+
+    def __init__(self, window: int = 200):
+        """
+        Initialize tracker.
+
+        Args:
+            window: Number of recent samples kept per endpoint
+        """
+        self.window = window
+        self._lock = threading.Lock()
+        self._samples: Dict[str, Deque[float]] = defaultdict(lambda: deque(maxlen=self.window))
+
+    def record(self, endpoint_url: str, latency: float):
+        """
+        Record a response time.
+
+        Args:
+            endpoint_url: Endpoint that answered
+            latency: Response time in seconds
+        """
+        with self._lock:
+            self._samples[endpoint_url].append(latency)
+
+    def sample_count(self, endpoint_url: str) -> int:
+        """Number of samples held for an endpoint."""
+        with self._lock:
+            samples = self._samples.get(endpoint_url)
+            return len(samples) if samples else 0
+
+    def percentile(self, endpoint_url: str, percentile: float) -> Optional[float]:
+        """
+        Get a latency percentile (nearest rank).
+
+        Args:
+            endpoint_url: Endpoint URL
+            percentile: Percentile between 0 and 1 (e.g. 0.95)
+
+        Returns:
+            Latency in seconds, or None if there are no samples
+        """
+        with self._lock:
+            samples = self._samples.get(endpoint_url)
+            if not samples:
+                return None
+            ordered = sorted(samples)
+        rank = max(1, math.ceil(percentile * len(ordered)))
+        return ordered[rank - 1]
+
+    def get_statistics(self) -> Dict[str, Dict[str, Optional[float]]]:
+        """Get sample counts and p50/p95 per endpoint."""
+        with self._lock:
+            urls = list(self._samples)
+        return {
+            url: {
+                "samples": self.sample_count(url),
+                "p50": self.percentile(url, 0.5),
+                "p95": self.percentile(url, 0.95),
+            }
+            for url in urls
+        }
@@ -0,0 +1,422 @@
+"""
+Adaptive, fair scheduling of queries across SPARQL endpoints.
+
+``FederationScheduler`` is a long-lived replacement for creating a thread
+pool per federated query. It provides:
+
+- a global cap on worker threads shared by every caller
+- a per-endpoint concurrency limit that adapts AIMD style: it grows by about
+  one slot per window of fast successful responses, and is cut
+  multiplicatively when an endpoint answers 429/503, times out or its
+  latency rises well above its baseline; other failures leave it unchanged
+- fair queuing: queued work for an endpoint is served round robin across
+  callers, so one large federated query cannot starve the others
+
+Queue depths and current limits are reported by ``get_statistics()``.
+
+Example:
+    >>> scheduler = FederationScheduler(max_workers=32)
+    >>> future = scheduler.submit(endpoint.url, lambda: executor.execute(query, endpoint))
+    >>> result = future.result()
+    >>> scheduler.get_statistics()["endpoints"][endpoint.url]["limit"]
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, Hashable, Optional
+
+from ..core.exceptions import EndpointRateLimitError, EndpointUnavailableError, QueryTimeoutError
+from ..core.types import QueryStatus
+
+
+logger = logging.getLogger(__name__)
+
+# Errors that mean "slow down" rather than "this query failed"; SPARQL
+# endpoints mostly signal overload by timing out
+OVERLOAD_ERRORS = (EndpointRateLimitError, EndpointUnavailableError, QueryTimeoutError, TimeoutError)
+_OVERLOAD_ERROR_NAMES = frozenset(cls.__name__ for cls in OVERLOAD_ERRORS)
+
+
+class AIMDLimit:
+    """
+    Additive-increase/multiplicative-decrease concurrency limit.
+
+    The latency baseline follows improvements immediately and regressions
+    slowly, so a latency well above it indicates queueing at the endpoint.
+    Only one decrease is applied per window: responses to requests that were
+    sent before the last decrease are not counted again.
+    """
+
+    def __init__(
+        self,
+        initial: float = 4,
+        min_limit: int = 1,
+        max_limit: int = 64,
+        backoff_ratio: float = 0.5,
+        latency_tolerance: float = 2.0,
+        baseline_drift: float = 0.05,
+    ):
+        """
+        Initialize limit.
+
+        Args:
+            initial: Starting limit
+            min_limit: Lower bound of the limit
+            max_limit: Upper bound of the limit
+            backoff_ratio: Factor applied to the limit on a decrease
+            latency_tolerance: Latency above ``tolerance * baseline`` counts as congestion
+            baseline_drift: How fast the baseline follows rising latencies (0-1)
+        """
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.backoff_ratio = backoff_ratio
+        self.latency_tolerance = latency_tolerance
+        self.baseline_drift = baseline_drift
+
+        self._limit = float(min(max(initial, min_limit), max_limit))
+        self.baseline: Optional[float] = None
+        self._decreased_at = float("-inf")
+        self.increases = 0
+        self.decreases = 0
+
+    @property
+    def value(self) -> int:
+        """Number of requests currently allowed in flight."""
+        return max(self.min_limit, int(self._limit))
+
+    def on_success(self, started_at: float, latency: float):
+        """
+        Record a successful response.
+
+        Args:
+            started_at: Monotonic time the request was started
+            latency: Response time in seconds
+        """
+        baseline = self.baseline
+        if baseline is None or latency < baseline:
+            self.baseline = latency
+        else:
+            self.baseline = baseline + self.baseline_drift * (latency - baseline)
+
+        if baseline is not None and latency > self.latency_tolerance * baseline:
+            self._decrease(started_at)
+        else:
+            # About +1 per window of `limit` fast responses
+            self._limit = min(self.max_limit, self._limit + 1 / self._limit)
+            self.increases += 1
+
+    def on_overload(self, started_at: float):
+        """
+        Record a 429/503 response or a timeout.
+
+        Args:
+            started_at: Monotonic time the request was started
+        """
+        self._decrease(started_at)
+
+    def _decrease(self, started_at: float):
+        """Cut the limit, at most once per window."""
+        if started_at < self._decreased_at:
+            return
+        self._limit = max(self.min_limit, self._limit * self.backoff_ratio)
+        self._decreased_at = time.monotonic()
+        self.decreases += 1
+
+
+@dataclass
+class _Task:
+    """A queued call and the future it resolves."""
+    fn: Callable[[], Any]
+    future: Future
+    caller: Hashable
+
+
+@dataclass
+class _EndpointQueue:
+    """Limit, in-flight count and per-caller queues of one endpoint."""
+    limit: AIMDLimit
+    in_flight: int = 0
+    queued: int = 0
+    completed: int = 0
+    overloads: int = 0
+    callers: "OrderedDict[Hashable, Deque[_Task]]" = field(default_factory=OrderedDict)
+
+    def push(self, task: _Task):
+        """Queue a task behind the caller's earlier tasks."""
+        self.callers.setdefault(task.caller, deque()).append(task)
+        self.queued += 1
+
+    def pop(self) -> _Task:
+        """Take the next task, round robin across callers."""
+        caller, tasks = next(iter(self.callers.items()))
+        task = tasks.popleft()
+        if tasks:
+            self.callers.move_to_end(caller)
+        else:
+            del self.callers[caller]
+        self.queued -= 1
+        return task
+
+
+class FederationScheduler:
+    """
+    Shared scheduler with adaptive per-endpoint limits and a global worker cap.
+
+    Work is queued per endpoint and per caller. A task starts when its
+    endpoint is below its current limit and a worker is free, and endpoints
+    take turns when workers are scarce. All methods are thread-safe.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 32,
+        initial_limit: int = 4,
+        min_limit: int = 1,
+        max_limit: int = 64,
+        backoff_ratio: float = 0.5,
+        latency_tolerance: float = 2.0,
+        is_overload: Optional[Callable[[Any], bool]] = None,
+    ):
+        """
+        Initialize scheduler.
+
+        Args:
+            max_workers: Maximum number of tasks running at once, across endpoints
+            initial_limit: Starting concurrency limit of each endpoint
+            min_limit: Lowest concurrency limit of an endpoint
+            max_limit: Highest concurrency limit of an endpoint
+            backoff_ratio: Factor applied to a limit on 429/503 or congestion
+            latency_tolerance: Latency above ``tolerance * baseline`` counts as congestion
+            is_overload: Classifies a task's result or exception as an overload
+                signal (defaults to rate-limit/unavailable errors and timeouts)
+        """
+        self.max_workers = max_workers
+        self._limit_options = {
+            "initial": initial_limit,
+            "min_limit": min_limit,
+            "max_limit": max_limit,
+            "backoff_ratio": backoff_ratio,
+            "latency_tolerance": latency_tolerance,
+        }
+        self._is_overload = is_overload or is_overload_outcome
+
+        self._lock = threading.Lock()
+        self._endpoints: "OrderedDict[str, _EndpointQueue]" = OrderedDict()
+        self._running = 0
+        self._closed = False
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="sparql-federation")
+
+        # Statistics
+        self.stats = {
+            "submitted": 0,
+            "completed": 0,
+            "cancelled": 0,
+            "overloads": 0,
+            "max_queue_depth": 0,
+        }
+
+    def submit(
+        self,
+        endpoint_url: str,
+        fn: Callable[[], Any],
+        caller: Optional[Hashable] = None,
+    ) -> Future:
+        """
+        Queue a call against an endpoint.
+
+        Args:
+            endpoint_url: Endpoint the call talks to (its limit applies)
+            fn: Work to run; may return a QueryResult or raise
+            caller: Fairness key; tasks of different callers are interleaved
+                (defaults to the submitting thread)
+
+        Returns:
+            Future resolved with ``fn``'s result or exception; cancelling it
+            before it starts removes the task from the queue
+
+        Raises:
+            RuntimeError: If the scheduler has been shut down
+        """
+        future: Future = Future()
+        task = _Task(fn, future, caller if caller is not None else threading.get_ident())
+
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("FederationScheduler has been shut down")
+
+            queue = self._endpoints.get(endpoint_url)
+            if queue is None:
+                queue = _EndpointQueue(AIMDLimit(**self._limit_options))
+                self._endpoints[endpoint_url] = queue
+            queue.push(task)
+
+            self.stats["submitted"] += 1
+            depth = sum(q.queued for q in self._endpoints.values())
+            self.stats["max_queue_depth"] = max(self.stats["max_queue_depth"], depth)
+            self._dispatch()
+
+        return future
+
+    def _dispatch(self):
+        """Start queued tasks while limits and the worker cap allow (lock held)."""
+        started = True
+        while started and self._running < self.max_workers:
+            started = False
+            for url, queue in list(self._endpoints.items()):
+                if self._running >= self.max_workers:
+                    break
+                if not queue.queued or queue.in_flight >= queue.limit.value:
+                    continue
+
+                task = queue.pop()
+                started = True
+                if not task.future.set_running_or_notify_cancel():
+                    self.stats["cancelled"] += 1
+                    continue
+
+                queue.in_flight += 1
+                self._running += 1
+                # Let the other endpoints go first next round
+                self._endpoints.move_to_end(url)
+                self._pool.submit(self._run, url, queue, task)
+
+    def _run(self, url: str, queue: _EndpointQueue, task: _Task):
+        """Run one task, feed its outcome to the endpoint limit and start more work."""
+        started_at = time.monotonic()
+        result: Any = None
+        error: Optional[BaseException] = None
+        try:
+            result = task.fn()
+        except BaseException as e:
+            error = e
+        latency = time.monotonic() - started_at
+
+        with self._lock:
+            queue.in_flight -= 1
+            queue.completed += 1
+            self._running -= 1
+            self.stats["completed"] += 1
+
+            if self._is_overload(error if error is not None else result):
+                queue.overloads += 1
+                self.stats["overloads"] += 1
+                queue.limit.on_overload(started_at)
+                logger.debug(f"Overload from {url}; limit now {queue.limit.value}")
+            elif error is None and is_success_outcome(result) and not is_local_outcome(result):
+                queue.limit.on_success(started_at, latency)
+
+            if not self._closed:
+                self._dispatch()
+
+        if error is not None:
+            task.future.set_exception(error)
+        else:
+            task.future.set_result(result)
+
+    def queue_depth(self, endpoint_url: Optional[str] = None) -> int:
+        """
+        Number of queued (not yet started) tasks.
+
+        Args:
+            endpoint_url: Only count this endpoint's queue (None for all)
+        """
+        with self._lock:
+            if endpoint_url is not None:
+                queue = self._endpoints.get(endpoint_url)
+                return queue.queued if queue else 0
+            return sum(q.queued for q in self._endpoints.values())
+
+    def current_limit(self, endpoint_url: str) -> int:
+        """Current concurrency limit of an endpoint."""
+        with self._lock:
+            queue = self._endpoints.get(endpoint_url)
+            return queue.limit.value if queue else self._limit_options["initial"]
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get queue depths, limits and counters, overall and per endpoint."""
+        with self._lock:
+            stats: Dict[str, Any] = dict(self.stats)
+            stats["max_workers"] = self.max_workers
+            stats["running"] = self._running
+            stats["queue_depth"] = sum(q.queued for q in self._endpoints.values())
+            stats["endpoints"] = {
+                url: {
+                    "limit": q.limit.value,
+                    "in_flight": q.in_flight,
+                    "queue_depth": q.queued,
+                    "waiting_callers": len(q.callers),
+                    "completed": q.completed,
+                    "overloads": q.overloads,
+                    "latency_baseline": q.limit.baseline,
+                    "limit_increases": q.limit.increases,
+                    "limit_decreases": q.limit.decreases,
+                }
+                for url, q in self._endpoints.items()
+            }
+            return stats
+
+    def shutdown(self, wait: bool = True):
+        """
+        Stop accepting work and cancel queued tasks.
+
+        Args:
+            wait: Wait for running tasks to finish
+        """
+        with self._lock:
+            self._closed = True
+            for queue in self._endpoints.values():
+                while queue.queued:
+                    if queue.pop().future.cancel():
+                        self.stats["cancelled"] += 1
+        self._pool.shutdown(wait=wait)
+
+
+def is_overload_outcome(outcome: Any) -> bool:
+    """
+    Check whether a task outcome says the endpoint is overloaded.
+
+    Args:
+        outcome: The task's exception, or its result (failed QueryResults
+            carry the error type in ``metadata["error_type"]``)
+
+    Returns:
+        True for rate-limit (429) and unavailable (503) errors and timeouts
+    """
+    if isinstance(outcome, BaseException):
+        return isinstance(outcome, OVERLOAD_ERRORS)
+    if getattr(outcome, "status", None) == QueryStatus.TIMEOUT:
+        return True
+    metadata = getattr(outcome, "metadata", None)
+    if isinstance(metadata, dict):
+        return metadata.get("error_type") in _OVERLOAD_ERROR_NAMES
+    return False
+
+
+def is_success_outcome(result: Any) -> bool:
+    """
+    Check whether a task's return value is a success.
+
+    Executors return failed QueryResults instead of raising, so only results
+    with a success status may raise an endpoint's limit. Other return values
+    count as successes.
+    """
+    status = getattr(result, "status", None)
+    return not isinstance(status, QueryStatus) or status == QueryStatus.SUCCESS
+
+
+def is_local_outcome(result: Any) -> bool:
+    """
+    Check whether a result was served without querying the endpoint.
+
+    Cache hits and results shared from an identical in-flight query return
+    in about a millisecond; as latency samples they would collapse the
+    baseline and make the next real query look congested.
+    """
+    metadata = getattr(result, "metadata", None)
+    return isinstance(metadata, dict) and bool(
+        metadata.get("cache_hit") or metadata.get("coalesced")
+    )
@@ -0,0 +1,570 @@
+"""
+Incremental SPARQL Result Parsers.
+
+This module provides push-style parsers for SPARQL result documents that
+yield rows while the response body is still arriving:
+- SPARQL 1.1 Query Results JSON
+- SPARQL Query Results XML
+- SPARQL 1.1 Query Results CSV and TSV
+
+Each parser accepts chunks through ``feed()`` and returns the rows completed
+by that chunk. Only the unfinished tail of the document is buffered, so
+memory stays bounded by the size of a single row regardless of result size.
+
+Rows are always returned in SPARQL JSON term form
+(``{"type": ..., "value": ..., "datatype": ..., "xml:lang": ...}``) whatever
+the wire format, so callers convert every format with one code path.
+
+Example:
+    >>> parser = create_incremental_parser("json")
+    >>> for chunk in response.iter_content(chunk_size=65536):
+    ...     for row in parser.feed(chunk):
+    ...         print(row)
+    >>> for row in parser.close():
+    ...     print(row)
+"""
+
+import codecs
+import csv
+import json
+import re
+import xml.etree.ElementTree as ET
+from typing import Dict, List, Optional, Pattern, Tuple, Union
+
+from ..core.exceptions import QueryResultError
+
+
+# A single RDF term in SPARQL JSON form, and a row of them keyed by variable
+TermDict = Dict[str, str]
+RawRow = Dict[str, TermDict]
+
+XSD_NS = "http://www.w3.org/2001/XMLSchema#"
+SPARQL_RESULTS_NS = "{http://www.w3.org/2005/sparql-results#}"
+XML_LANG_ATTR = "{http://www.w3.org/XML/1998/namespace}lang"
+
+_JSON_DECODER = json.JSONDecoder()
+_WHITESPACE = re.compile(r"[ \t\r\n]*")
+_STRING_TAIL = re.compile(r'[^"\\]*(?:\\.[^"\\]*)*"', re.S)
+_SCALAR = re.compile(r"[^\s,\]}]+")
+_OBJECT_TOKENS = re.compile(r'[{}"]')
+_ARRAY_TOKENS = re.compile(r'[\[\]"]')
+
+_TURTLE_ESCAPE = re.compile(r'\\(?:u([0-9A-Fa-f]{4})|U([0-9A-Fa-f]{8})|(.))', re.S)
+_TURTLE_ESCAPES = {
+    "t": "\t", "b": "\b", "n": "\n", "r": "\r", "f": "\f",
+    '"': '"', "'": "'", "\\": "\\",
+}
+_INTEGER = re.compile(r"[+-]?\d+$")
+_DECIMAL = re.compile(r"[+-]?\d*\.\d+$")
+_DOUBLE = re.compile(r"[+-]?(?:\d+\.?\d*|\.\d+)[eE][+-]?\d+$")
+
+
+class IncrementalResultParser:
+    """
+    Base class for incremental (push-style) SPARQL result parsers.
+
+    Attributes:
+        variables: Result variables, available once the header has been parsed
+        boolean: Result of an ASK query, or None for SELECT results
+    """
+
+    def __init__(self, encoding: str = "utf-8"):
+        """
+        Initialize parser.
+
+        Args:
+            encoding: Character encoding of the incoming bytes
+        """
+        self.variables: List[str] = []
+        self.boolean: Optional[bool] = None
+        self._decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+        self._closed = False
+
+    def feed(self, data: Union[bytes, str]) -> List[RawRow]:
+        """
+        Feed the next chunk of the response body.
+
+        Args:
+            data: Raw bytes or already decoded text
+
+        Returns:
+            Rows completed by this chunk (possibly empty)
+
+        Raises:
+            QueryResultError: If the parser is closed or the document is malformed
+        """
+        if self._closed:
+            raise QueryResultError("Cannot feed data to a closed result parser")
+        text = self._decoder.decode(data) if isinstance(data, bytes) else data
+        return self._feed_text(text)
+
+    def close(self) -> List[RawRow]:
+        """
+        Signal end of input and flush any remaining rows.
+
+        Returns:
+            Rows that were still buffered
+
+        Raises:
+            QueryResultError: If the document ended prematurely
+        """
+        if self._closed:
+            return []
+        rows = self._feed_text(self._decoder.decode(b"", final=True))
+        rows.extend(self._finish())
+        self._closed = True
+        return rows
+
+    def _feed_text(self, text: str) -> List[RawRow]:
+        """Consume decoded text and return completed rows."""
+        raise NotImplementedError
+
+    def _finish(self) -> List[RawRow]:
+        """Handle end of input and return any trailing rows."""
+        return []
+
+
+class IncrementalJSONParser(IncrementalResultParser):
+    """
+    Incremental parser for SPARQL 1.1 Query Results JSON.
+
+    The document skeleton (``head``, ``results``, ``boolean``) is walked with a
+    small resumable scanner. Each element of ``results.bindings`` is decoded
+    with the C JSON decoder as soon as its closing brace arrives.
+    """
+
+    def __init__(self, encoding: str = "utf-8"):
+        """Initialize parser."""
+        super().__init__(encoding)
+        self._buffer = ""
+        self._pos = 0
+        # Open containers as [kind, current key] frames
+        self._stack: List[List[Optional[str]]] = []
+        self._expect_key = False
+
+    def _feed_text(self, text: str) -> List[RawRow]:
+        """Append text to the unconsumed tail and scan it."""
+        self._buffer = self._buffer[self._pos:] + text
+        self._pos = 0
+        rows: List[RawRow] = []
+        self._scan(rows, final=False)
+        return rows
+
+    def _finish(self) -> List[RawRow]:
+        """Scan the remaining tail and verify the document is complete."""
+        rows: List[RawRow] = []
+        self._scan(rows, final=True)
+        if self._stack or self._buffer[self._pos:].strip():
+            raise QueryResultError("Truncated SPARQL JSON results document")
+        return rows
+
+    def _in_bindings(self) -> bool:
+        """Check whether the next value is an element of results.bindings."""
+        stack = self._stack
+        return (
+            len(stack) == 3
+            and stack[2][0] == "["
+            and stack[1][1] == "bindings"
+            and stack[0][1] == "results"
+        )
+
+    def _at_head_vars(self) -> bool:
+        """Check whether the next value is head.vars."""
+        stack = self._stack
+        return len(stack) == 2 and stack[1][1] == "vars" and stack[0][1] == "head"
+
+    def _scan(self, rows: List[RawRow], final: bool) -> None:
+        """Advance through the buffer until input runs out or a token is incomplete."""
+        buf = self._buffer
+        pos = self._pos
+        size = len(buf)
+        stack = self._stack
+
+        while True:
+            pos = _WHITESPACE.match(buf, pos).end()
+            if pos >= size:
+                break
+            char = buf[pos]
+
+            if char == '"':
+                match = _STRING_TAIL.match(buf, pos + 1)
+                if match is None:
+                    break
+                if self._expect_key:
+                    stack[-1][1] = _decode_json(buf[pos:match.end()])
+                    self._expect_key = False
+                pos = match.end()
+            elif char == ":":
+                pos += 1
+            elif char == ",":
+                if stack and stack[-1][0] == "{":
+                    self._expect_key = True
+                pos += 1
+            elif char == "{":
+                if self._in_bindings():
+                    try:
+                        row, pos = _JSON_DECODER.raw_decode(buf, pos)
+                    except json.JSONDecodeError as e:
+                        # Either the row has not fully arrived or it is malformed
+                        if _find_container_end(buf, pos, _OBJECT_TOKENS, "{") < 0:
+                            break
+                        raise QueryResultError(f"Malformed SPARQL JSON results: {e}") from e
+                    rows.append(row)
+                else:
+                    stack.append(["{", None])
+                    self._expect_key = True
+                    pos += 1
+            elif char == "[":
+                if self._at_head_vars():
+                    end = _find_container_end(buf, pos, _ARRAY_TOKENS, "[")
+                    if end < 0:
+                        break
+                    self.variables = _decode_json(buf[pos:end])
+                    pos = end
+                else:
+                    stack.append(["[", None])
+                    pos += 1
+            elif char in "}]":
+                if not stack:
+                    raise QueryResultError(
+                        "Malformed SPARQL JSON results: unbalanced brackets",
+                        details={"offset": pos},
+                    )
+                stack.pop()
+                self._expect_key = False
+                pos += 1
+            else:
+                match = _SCALAR.match(buf, pos)
+                if match is None:
+                    raise QueryResultError(
+                        "Malformed SPARQL JSON results: unexpected character",
+                        details={"offset": pos, "character": char},
+                    )
+                if match.end() >= size and not final:
+                    # The literal may continue in the next chunk
+                    break
+                if len(stack) == 1 and stack[0][1] == "boolean":
+                    self.boolean = _decode_json(match.group()) is True
+                pos = match.end()
+
+        self._pos = pos
+
+
+class IncrementalXMLParser(IncrementalResultParser):
+    """
+    Incremental parser for SPARQL Query Results XML.
+
+    Built on ``xml.etree.ElementTree.XMLPullParser``; processed ``<result>``
+    elements are cleared so the partial tree never grows with result size.
+    """
+
+    def __init__(self, encoding: str = "utf-8"):
+        """Initialize parser."""
+        super().__init__(encoding)
+        self._parser = ET.XMLPullParser(events=("start", "end"))
+        self._results_element: Optional[ET.Element] = None
+
+    def feed(self, data: Union[bytes, str]) -> List[RawRow]:
+        """Feed raw bytes directly to the XML parser (it handles decoding)."""
+        if self._closed:
+            raise QueryResultError("Cannot feed data to a closed result parser")
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        try:
+            self._parser.feed(data)
+        except ET.ParseError as e:
+            raise QueryResultError(f"Malformed SPARQL XML results: {e}") from e
+        return self._drain()
+
+    def close(self) -> List[RawRow]:
+        """Signal end of input and flush any remaining rows."""
+        if self._closed:
+            return []
+        try:
+            self._parser.close()
+        except ET.ParseError as e:
+            raise QueryResultError(f"Truncated SPARQL XML results document: {e}") from e
+        rows = self._drain()
+        self._closed = True
+        return rows
+
+    def _drain(self) -> List[RawRow]:
+        """Convert pending pull-parser events into rows."""
+        rows: List[RawRow] = []
+        for event, element in self._parser.read_events():
+            tag = element.tag
+            if event == "start":
+                if tag == SPARQL_RESULTS_NS + "results":
+                    self._results_element = element
+                elif tag == SPARQL_RESULTS_NS + "variable":
+                    self.variables.append(element.get("name"))
+                continue
+
+            if tag == SPARQL_RESULTS_NS + "result":
+                rows.append(self._convert_result(element))
+                element.clear()
+                if self._results_element is not None:
+                    self._results_element.clear()
+            elif tag == SPARQL_RESULTS_NS + "boolean":
+                self.boolean = (element.text or "").strip() == "true"
+        return rows
+
+    @staticmethod
+    def _convert_result(element: ET.Element) -> RawRow:
+        """Convert a <result> element into a row of term dicts."""
+        row: RawRow = {}
+        for binding in element:
+            name = binding.get("name")
+            for term in binding:
+                kind = term.tag[len(SPARQL_RESULTS_NS):]
+                if kind == "literal":
+                    value: TermDict = {"type": "literal", "value": term.text or ""}
+                    datatype = term.get("datatype")
+                    if datatype:
+                        value["datatype"] = datatype
+                    language = term.get(XML_LANG_ATTR)
+                    if language:
+                        value["xml:lang"] = language
+                    row[name] = value
+                elif kind in ("uri", "bnode"):
+                    row[name] = {"type": kind, "value": term.text or ""}
+                break
+        return row
+
+
+class IncrementalCSVParser(IncrementalResultParser):
+    """
+    Incremental parser for SPARQL 1.1 Query Results CSV.
+
+    CSV carries no term types, so every value is reported as a plain literal
+    and empty cells are treated as unbound, matching ``ResultParser.parse_csv``.
+    """
+
+    def __init__(self, encoding: str = "utf-8"):
+        """Initialize parser."""
+        super().__init__(encoding)
+        self._pending = ""
+
+    def _feed_text(self, text: str) -> List[RawRow]:
+        """Split off complete records and parse them."""
+        records, self._pending = _split_csv_records(self._pending + text)
+        return self._convert_records(records)
+
+    def _finish(self) -> List[RawRow]:
+        """Parse a final record that has no trailing newline."""
+        if not self._pending.strip():
+            return []
+        records, self._pending = [self._pending], ""
+        return self._convert_records(records)
+
+    def _convert_records(self, records: List[str]) -> List[RawRow]:
+        """Convert complete CSV records into rows."""
+        rows: List[RawRow] = []
+        for fields in csv.reader(records):
+            if not self.variables:
+                self.variables = fields
+                continue
+            row = {
+                var: {"type": "literal", "value": value}
+                for var, value in zip(self.variables, fields)
+                if value
+            }
+            if row:
+                rows.append(row)
+        return rows
+
+
+class IncrementalTSVParser(IncrementalResultParser):
+    """
+    Incremental parser for SPARQL 1.1 Query Results TSV.
+
+    TSV cells use Turtle term syntax, so URIs, blank nodes, language tags and
+    datatypes are preserved.
+    """
+
+    def __init__(self, encoding: str = "utf-8"):
+        """Initialize parser."""
+        super().__init__(encoding)
+        self._pending = ""
+
+    def _feed_text(self, text: str) -> List[RawRow]:
+        """Split off complete lines and parse them."""
+        data = self._pending + text
+        cut = data.rfind("\n") + 1
+        self._pending = data[cut:]
+        return self._convert_lines(data[:cut].split("\n")[:-1])
+
+    def _finish(self) -> List[RawRow]:
+        """Parse a final line that has no trailing newline."""
+        if not self._pending:
+            return []
+        lines, self._pending = [self._pending], ""
+        return self._convert_lines(lines)
+
+    def _convert_lines(self, lines: List[str]) -> List[RawRow]:
+        """Convert complete TSV lines into rows."""
+        rows: List[RawRow] = []
+        for line in lines:
+            line = line.rstrip("\r")
+            if not self.variables:
+                if line:
+                    self.variables = [var.lstrip("?$") for var in line.split("\t")]
+                continue
+            if not line and len(self.variables) > 1:
+                continue
+            row: RawRow = {}
+            for var, cell in zip(self.variables, line.split("\t")):
+                term = parse_turtle_term(cell)
+                if term is not None:
+                    row[var] = term
+            rows.append(row)
+        return rows
+
+
+def create_incremental_parser(format_name: str) -> IncrementalResultParser:
+    """
+    Create an incremental parser for a result format.
+
+    Args:
+        format_name: Result format value ("json", "xml", "csv" or "tsv")
+
+    Returns:
+        A fresh parser instance
+
+    Raises:
+        NotImplementedError: If the format is not a tabular result format
+    """
+    parsers = {
+        "json": IncrementalJSONParser,
+        "xml": IncrementalXMLParser,
+        "csv": IncrementalCSVParser,
+        "tsv": IncrementalTSVParser,
+    }
+    parser_class = parsers.get(format_name)
+    if parser_class is None:
+        raise NotImplementedError(f"Streaming not implemented for {format_name}")
+    return parser_class()
+
+
+def parse_turtle_term(token: str) -> Optional[TermDict]:
+    """
+    Parse a single RDF term written in Turtle syntax (as used by SPARQL TSV).
+
+    Args:
+        token: Term text, e.g. ``<http://x>``, ``"chat"@fr``, ``_:b0`` or ``42``
+
+    Returns:
+        Term dict in SPARQL JSON form, or None for an empty (unbound) cell
+    """
+    token = token.strip()
+    if not token:
+        return None
+    first = token[0]
+
+    if first == "<" and token.endswith(">"):
+        return {"type": "uri", "value": token[1:-1]}
+    if token.startswith("_:"):
+        return {"type": "bnode", "value": token[2:]}
+    if first in "\"'":
+        quote = first * 3 if token.startswith(first * 3) and len(token) >= 6 else first
+        end = token.rfind(quote)
+        if end < len(quote):
+            return {"type": "literal", "value": token}
+        term: TermDict = {
+            "type": "literal",
+            "value": _unescape_turtle(token[len(quote):end]),
+        }
+        suffix = token[end + len(quote):]
+        if suffix.startswith("@"):
+            term["xml:lang"] = suffix[1:]
+        elif suffix.startswith("^^"):
+            datatype = suffix[2:]
+            if datatype.startswith("<") and datatype.endswith(">"):
+                datatype = datatype[1:-1]
+            term["datatype"] = datatype
+        return term
+
+    if token in ("true", "false"):
+        return {"type": "literal", "value": token, "datatype": XSD_NS + "boolean"}
+    if _INTEGER.match(token):
+        return {"type": "literal", "value": token, "datatype": XSD_NS + "integer"}
+    if _DECIMAL.match(token):
+        return {"type": "literal", "value": token, "datatype": XSD_NS + "decimal"}
+    if _DOUBLE.match(token):
+        return {"type": "literal", "value": token, "datatype": XSD_NS + "double"}
+    return {"type": "literal", "value": token}
+
+
+def _unescape_turtle(text: str) -> str:
+    """Resolve Turtle string escape sequences."""
+    if "\\" not in text:
+        return text
+
+    def replace(match: "re.Match[str]") -> str:
+        code = match.group(1) or match.group(2)
+        if code:
+            return chr(int(code, 16))
+        return _TURTLE_ESCAPES.get(match.group(3), match.group(3))
+
+    return _TURTLE_ESCAPE.sub(replace, text)
+
+
+def _decode_json(text: str):
+    """Decode a JSON fragment, converting errors to QueryResultError."""
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError as e:
+        raise QueryResultError(f"Malformed SPARQL JSON results: {e}") from e
+
+
+def _find_container_end(buf: str, pos: int, tokens: Pattern[str], open_char: str) -> int:
+    """
+    Find the end of the JSON object or array starting at ``pos``.
+
+    Returns:
+        Index just past the closing bracket, or -1 if it has not arrived yet
+    """
+    depth = 0
+    index = pos
+    while True:
+        match = tokens.search(buf, index)
+        if match is None:
+            return -1
+        char = match.group()
+        if char == '"':
+            tail = _STRING_TAIL.match(buf, match.end())
+            if tail is None:
+                return -1
+            index = tail.end()
+        elif char == open_char:
+            depth += 1
+            index = match.end()
+        else:
+            depth -= 1
+            index = match.end()
+            if depth == 0:
+                return index
+
+
+def _split_csv_records(data: str) -> Tuple[List[str], str]:
+    """
+    Split text into complete CSV records and an unfinished remainder.
+
+    A newline ends a record only when it falls outside a quoted field, i.e.
+    when an even number of quote characters precedes it within the record.
+    """
+    records: List[str] = []
+    start = 0
+    index = 0
+    quotes = 0
+    while True:
+        newline = data.find("\n", index)
+        if newline < 0:
+            break
+        quotes += data.count('"', index, newline)
+        index = newline + 1
+        if quotes % 2 == 0:
+            records.append(data[start:index])
+            start = index
+            quotes = 0
+    return records, data[start:]
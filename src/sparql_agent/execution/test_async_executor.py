@@ -0,0 +1,201 @@
+"""
+Unit tests for the AsyncQueryExecutor module.
+
+Tests cover:
+- Non-blocking query execution
+- Retry of retryable HTTP statuses
+- Error conversion
+- Lazy async iteration and cancellation
+- Concurrent federation
+"""
+
+import asyncio
+import json
+import unittest
+
+import httpx
+
+from ..core.types import EndpointInfo, QueryStatus
+from ..core.exceptions import EndpointConnectionError
+from .async_executor import AsyncQueryExecutor
+from .executor import FederatedQuery, ResultFormat
+from .scheduler import is_overload_outcome
+
+
+def sparql_json(rows: int, offset: int = 0) -> bytes:
+    """Build a SPARQL JSON results document."""
+    return json.dumps({
+        "head": {"vars": ["s"]},
+        "results": {"bindings": [
+            {"s": {"type": "uri", "value": f"http://example.org/{i}"}}
+            for i in range(offset, offset + rows)
+        ]},
+    }).encode("utf-8")
+
+
+class TestAsyncQueryExecutor(unittest.TestCase):
+    """Test AsyncQueryExecutor against a mocked HTTP transport."""
+
+    ROWS = 25
+
+    def setUp(self):
+        """Set up an endpoint and a request log."""
+        self.endpoint = EndpointInfo(url="https://test.example.org/sparql")
+        self.query = "SELECT ?s WHERE { ?s ?p ?o }"
+        self.requests = []
+
+    def make_executor(self, handler) -> AsyncQueryExecutor:
+        """Create an executor whose requests are answered by ``handler``."""
+        def record(request: httpx.Request) -> httpx.Response:
+            self.requests.append(request)
+            return handler(request)
+
+        executor = AsyncQueryExecutor(timeout=30, transport=httpx.MockTransport(record))
+        executor.pool.backoff_factor = 0
+        return executor
+
+    def run_with(self, handler, coro_factory):
+        """Run a coroutine against a fresh executor and close it afterwards."""
+        executor = self.make_executor(handler)
+
+        async def run():
+            async with executor:
+                return await coro_factory(executor)
+
+        return asyncio.run(run()), executor
+
+    def test_execute_json(self):
+        """Results and metrics match the synchronous executor contract."""
+        result, executor = self.run_with(
+            lambda request: httpx.Response(200, content=sparql_json(self.ROWS)),
+            lambda ex: ex.execute(self.query, self.endpoint),
+        )
+
+        self.assertEqual(result.status, QueryStatus.SUCCESS)
+        self.assertEqual(result.row_count, self.ROWS)
+        self.assertEqual(result.variables, ["s"])
+        self.assertEqual(result.bindings[0], {"s": "http://example.org/0"})
+        self.assertEqual(result.metadata["format"], "json")
+        self.assertEqual(result.metadata["metrics"]["result_count"], self.ROWS)
+
+        request = self.requests[0]
+        self.assertEqual(request.method, "POST")
+        self.assertEqual(request.headers["Accept"], "application/sparql-results+json")
+        self.assertIn(b"query=SELECT", request.read())
+
+        stats = executor.get_statistics()
+        self.assertEqual(stats["successful_queries"], 1)
+        self.assertEqual(stats["active_executions"], 0)
+
+    def test_execute_csv(self):
+        """CSV responses are parsed into plain values."""
+        result, _ = self.run_with(
+            lambda request: httpx.Response(200, content=b"s,label\r\nhttp://x/1,One\r\n"),
+            lambda ex: ex.execute(self.query, self.endpoint, format=ResultFormat.CSV),
+        )
+
+        self.assertEqual(result.bindings, [{"s": "http://x/1", "label": "One"}])
+
+    def test_retry_on_unavailable(self):
+        """Retryable statuses are retried and counted in the metrics."""
+        statuses = iter([503, 503, 200])
+
+        def handler(request):
+            status = next(statuses)
+            return httpx.Response(status, content=sparql_json(1) if status == 200 else b"")
+
+        result, _ = self.run_with(handler, lambda ex: ex.execute(self.query, self.endpoint))
+
+        self.assertTrue(result.is_success)
+        self.assertEqual(len(self.requests), 3)
+        self.assertEqual(result.metadata["metrics"]["retry_count"], 2)
+
+    def test_http_error_returns_failed_result(self):
+        """HTTP errors produce a failed result with a converted error."""
+        result, executor = self.run_with(
+            lambda request: httpx.Response(401, content=b"denied"),
+            lambda ex: ex.execute(self.query, self.endpoint),
+        )
+
+        self.assertEqual(result.status, QueryStatus.FAILED)
+        self.assertIn("Authentication failed", result.error_message)
+        self.assertEqual(executor.get_statistics()["failed_queries"], 1)
+        self.assertEqual(result.metadata["error_type"], "EndpointAuthenticationError")
+
+    def test_overload_is_recognized(self):
+        """Rate-limited results carry the error type the scheduler backs off on."""
+        result, _ = self.run_with(
+            lambda request: httpx.Response(429, content=b"slow down"),
+            lambda ex: ex.execute(self.query, self.endpoint),
+        )
+
+        self.assertFalse(result.is_success)
+        self.assertEqual(result.metadata["error_type"], "EndpointRateLimitError")
+        self.assertTrue(is_overload_outcome(result))
+
+    def test_connection_error(self):
+        """Connection failures surface as EndpointConnectionError from execute_iter()."""
+        def handler(request):
+            raise httpx.ConnectError("Connection refused", request=request)
+
+        with self.assertRaises(EndpointConnectionError):
+            self.run_with(handler, lambda ex: ex.execute_iter(self.query, self.endpoint))
+
+    def test_execute_iter_batches(self):
+        """execute_iter() yields row batches with a short final batch."""
+        async def collect(ex):
+            stream = await ex.execute_iter(self.query, self.endpoint, batch_size=10)
+            async with stream:
+                return [batch async for batch in stream], stream
+
+        (batches, stream), executor = self.run_with(
+            lambda request: httpx.Response(200, content=sparql_json(self.ROWS)),
+            collect,
+        )
+
+        self.assertEqual([len(b) for b in batches], [10, 10, 5])
+        self.assertTrue(stream.closed)
+        self.assertFalse(stream.metrics.cancelled)
+        self.assertIsNotNone(stream.metrics.time_to_first_row)
+        self.assertEqual(executor.get_statistics()["successful_queries"], 1)
+
+    def test_execute_iter_cancellation(self):
+        """Closing the stream early counts the query as cancelled."""
+        async def first_row(ex):
+            stream = await ex.execute_iter(self.query, self.endpoint)
+            async with stream:
+                row = await stream.__anext__()
+            return row, stream
+
+        (row, stream), executor = self.run_with(
+            lambda request: httpx.Response(200, content=sparql_json(self.ROWS)),
+            first_row,
+        )
+
+        self.assertEqual(row, {"s": "http://example.org/0"})
+        self.assertTrue(stream.metrics.cancelled)
+        self.assertEqual(executor.get_statistics()["cancelled_queries"], 1)
+
+    def test_federated_parallel_union(self):
+        """Federated queries run concurrently and merge with union semantics."""
+        def handler(request):
+            offset = 0 if "one" in str(request.url) else 100
+            return httpx.Response(200, content=sparql_json(3, offset))
+
+        config = FederatedQuery(
+            endpoints=[
+                EndpointInfo(url="https://one.example.org/sparql"),
+                EndpointInfo(url="https://two.example.org/sparql"),
+            ],
+            merge_strategy="union",
+        )
+
+        result, _ = self.run_with(handler, lambda ex: ex.execute_federated(self.query, config))
+
+        self.assertTrue(result.is_success)
+        self.assertEqual(result.row_count, 6)
+        self.assertEqual(result.metadata["endpoints_count"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,199 @@
+"""
+Unit tests for the result cache module.
+
+Tests cover:
+- Query normalization and content-addressed keys
+- Memory LRU eviction by count and size
+- Per-endpoint TTLs
+- SQLite disk tier persistence and size limits
+- Executor integration and statistics
+"""
+
+import os
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+
+from ..core.types import EndpointInfo, QueryResult, QueryStatus
+from .cache import ResultCache, make_cache_key, normalize_query
+from .columnar import ColumnarBindings
+from .executor import QueryExecutor, ResultFormat
+
+
+class TestNormalization(unittest.TestCase):
+    """Test query normalization and key construction."""
+
+    def test_whitespace_and_comments_ignored(self):
+        """Formatting differences do not change the key."""
+        a = "SELECT ?s\nWHERE {\n  ?s ?p ?o  # all triples\n}"
+        b = "SELECT ?s WHERE { ?s ?p ?o }"
+        self.assertEqual(normalize_query(a), normalize_query(b))
+        self.assertEqual(
+            make_cache_key(a, "http://example.org/sparql"),
+            make_cache_key(b, "http://example.org/sparql/"),
+        )
+
+    def test_literals_and_iris_preserved(self):
+        """Whitespace and '#' inside literals and IRIs are significant."""
+        query = 'SELECT * WHERE { ?s <http://x.org/a#b> "two  spaces # here" }'
+        normalized = normalize_query(query)
+        self.assertIn("<http://x.org/a#b>", normalized)
+        self.assertIn('"two  spaces # here"', normalized)
+        self.assertNotEqual(
+            make_cache_key('SELECT * WHERE { ?s ?p "a b" }', "e"),
+            make_cache_key('SELECT * WHERE { ?s ?p "a  b" }', "e"),
+        )
+
+    def test_endpoint_and_format_in_key(self):
+        """Endpoint and format are part of the key."""
+        query = "ASK { ?s ?p ?o }"
+        keys = {
+            make_cache_key(query, "http://a.org/sparql", "json"),
+            make_cache_key(query, "http://b.org/sparql", "json"),
+            make_cache_key(query, "http://a.org/sparql", "xml"),
+        }
+        self.assertEqual(len(keys), 3)
+
+
+class TestResultCache(unittest.TestCase):
+    """Test the two-tier result cache."""
+
+    def setUp(self):
+        """Create a temporary directory for disk tiers."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmpdir.name, "results.db")
+
+    def tearDown(self):
+        """Remove the temporary directory."""
+        self.tmpdir.cleanup()
+
+    def test_lru_eviction_by_count(self):
+        """The least recently used entry is evicted first."""
+        cache = ResultCache(max_entries=2)
+        cache["a"] = 1
+        cache["b"] = 2
+        cache.get("a")
+        cache["c"] = 3
+
+        self.assertEqual(cache.keys(), ["a", "c"])
+        self.assertEqual(cache.get_statistics()["evictions"], 1)
+
+    def test_eviction_by_size(self):
+        """The memory tier stays under its byte budget."""
+        cache = ResultCache(max_memory_bytes=2000)
+        for i in range(10):
+            cache[f"k{i}"] = "x" * 500
+
+        stats = cache.get_statistics()
+        self.assertLessEqual(stats["memory_bytes"], 2000)
+        self.assertLess(len(cache), 10)
+
+    def test_endpoint_ttl(self):
+        """Endpoint-specific TTLs override the default."""
+        cache = ResultCache(default_ttl=3600, endpoint_ttls={"http://fast.org/sparql": 10})
+        cache.put_result("ASK {}", "http://fast.org/sparql", "fast")
+        cache.put_result("ASK {}", "http://slow.org/sparql", "slow")
+
+        with patch("sparql_agent.execution.cache.time.time", return_value=time.time() + 60):
+            self.assertIsNone(cache.get_result("ASK {}", "http://fast.org/sparql"))
+            self.assertEqual(cache.get_result("ASK {}", "http://slow.org/sparql"), "slow")
+
+        self.assertEqual(cache.get_statistics()["expirations"], 1)
+
+    def test_disk_tier_survives_restart(self):
+        """Entries written to disk are served by a new cache instance."""
+        cache = ResultCache(disk_path=self.db_path)
+        cache.put_result("SELECT * {}", "http://e.org/sparql", {"rows": [1, 2]})
+        cache.close()
+
+        reopened = ResultCache(disk_path=self.db_path)
+        self.assertEqual(reopened.get_result("SELECT * {}", "http://e.org/sparql"), {"rows": [1, 2]})
+        stats = reopened.get_statistics()
+        self.assertEqual(stats["disk_hits"], 1)
+        self.assertEqual(stats["memory_entries"], 1)
+        reopened.close()
+
+    def test_disk_size_limit(self):
+        """The disk tier evicts least recently used entries past its budget."""
+        cache = ResultCache(max_entries=1, disk_path=self.db_path, max_disk_bytes=3000)
+        for i in range(10):
+            cache[f"k{i}"] = "x" * 1000
+
+        stats = cache.get_statistics()
+        self.assertLessEqual(stats["disk_bytes"], 3000)
+        self.assertGreater(stats["disk_evictions"], 0)
+        self.assertIsNotNone(cache.get("k9"))
+        cache.close()
+
+    def test_invalidate_endpoint(self):
+        """Invalidation can target a single endpoint."""
+        cache = ResultCache(disk_path=self.db_path)
+        cache.put_result("ASK {}", "http://a.org/sparql", True)
+        cache.put_result("ASK {}", "http://b.org/sparql", False)
+
+        cache.invalidate("http://a.org/sparql")
+
+        self.assertIsNone(cache.get_result("ASK {}", "http://a.org/sparql"))
+        self.assertFalse(cache.get_result("ASK {}", "http://b.org/sparql"))
+        cache.close()
+
+
+class TestExecutorCache(unittest.TestCase):
+    """Test QueryExecutor integration with the result cache."""
+
+    def test_second_execution_is_served_from_cache(self):
+        """Repeated queries skip the endpoint and report hits in statistics."""
+        executor = QueryExecutor(cache=ResultCache())
+        endpoint = EndpointInfo(url="https://test.example.org/sparql")
+        fresh = QueryResult(
+            status=QueryStatus.SUCCESS,
+            bindings=[{"s": "http://example.org/1"}],
+            row_count=1,
+            variables=["s"],
+        )
+
+        with patch.object(executor, "_execute_standard", return_value=fresh) as send:
+            first = executor.execute("SELECT ?s WHERE { ?s ?p ?o }", endpoint)
+            second = executor.execute("SELECT ?s\nWHERE { ?s ?p ?o }", endpoint)
+
+        self.assertEqual(send.call_count, 1)
+        self.assertEqual(second.bindings, first.bindings)
+        self.assertTrue(second.metadata["cache_hit"])
+        self.assertTrue(second.metadata["metrics"]["cache_hit"])
+
+        stats = executor.get_statistics()
+        self.assertEqual(stats["successful_queries"], 2)
+        self.assertEqual(stats["cache"]["hits"], 1)
+        self.assertEqual(stats["cache"]["misses"], 1)
+
+    def test_cache_hits_keep_columnar_bindings(self):
+        """Columnar results are served from the cache without converting to rows."""
+        executor = QueryExecutor(cache=ResultCache())
+        endpoint = EndpointInfo(url="https://test.example.org/sparql")
+        bindings = ColumnarBindings.from_rows([{"s": "http://example.org/1"}])
+        fresh = QueryResult(
+            status=QueryStatus.SUCCESS, bindings=bindings, row_count=1, variables=["s"]
+        )
+
+        with patch.object(executor, "_execute_standard", return_value=fresh):
+            executor.execute("SELECT ?s WHERE { ?s ?p ?o }", endpoint)
+            cached = executor.execute("SELECT ?s WHERE { ?s ?p ?o }", endpoint)
+
+        self.assertTrue(cached.metadata["cache_hit"])
+        self.assertIsInstance(cached.bindings, ColumnarBindings)
+        self.assertEqual(list(cached.bindings), [{"s": "http://example.org/1"}])
+
+    def test_failures_are_not_cached(self):
+        """Failed executions are never stored."""
+        executor = QueryExecutor(cache=ResultCache())
+        endpoint = EndpointInfo(url="https://test.example.org/sparql")
+
+        with patch.object(executor, "_execute_standard", side_effect=Exception("boom")):
+            executor.execute("ASK {}", endpoint, format=ResultFormat.JSON)
+
+        self.assertEqual(executor.get_statistics()["cache"]["writes"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,192 @@
+"""
+Unit tests for request coalescing.
+
+Tests cover:
+- Thread-based single flight (results and errors are shared)
+- Async single flight and cancellation of a waiting caller
+- QueryExecutor and AsyncQueryExecutor integration
+"""
+
+import asyncio
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import httpx
+
+from ..core.types import EndpointInfo, QueryResult, QueryStatus
+from .async_executor import AsyncQueryExecutor
+from .coalescing import AsyncSingleFlight, SingleFlight
+from .executor import QueryExecutor, ResultFormat
+
+
+class TestSingleFlight(unittest.TestCase):
+    """Test the thread-based single-flight group."""
+
+    def test_concurrent_calls_share_one_execution(self):
+        """Only the leader runs the function; followers get its result."""
+        flight = SingleFlight()
+        calls = []
+        release = threading.Event()
+
+        def work():
+            calls.append(1)
+            release.wait(timeout=5)
+            return "result"
+
+        with ThreadPoolExecutor(max_workers=5) as pool:
+            futures = [pool.submit(flight.do, "key", work) for _ in range(5)]
+            while flight.stats["coalesced"] < 4:
+                time.sleep(0.01)
+            release.set()
+            outcomes = [f.result() for f in futures]
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual({r for r, _ in outcomes}, {"result"})
+        self.assertEqual(sum(shared for _, shared in outcomes), 4)
+        self.assertEqual(flight.in_flight(), 0)
+
+    def test_errors_are_shared(self):
+        """Followers see the leader's exception."""
+        flight = SingleFlight()
+        release = threading.Event()
+
+        def work():
+            release.wait(timeout=5)
+            raise ValueError("boom")
+
+        with ThreadPoolExecutor(max_workers=3) as pool:
+            futures = [pool.submit(flight.do, "key", work) for _ in range(3)]
+            while flight.stats["coalesced"] < 2:
+                time.sleep(0.01)
+            release.set()
+            for future in futures:
+                with self.assertRaises(ValueError):
+                    future.result()
+
+    def test_sequential_calls_are_not_coalesced(self):
+        """A finished call releases its key."""
+        flight = SingleFlight()
+        self.assertEqual(flight.do("key", lambda: 1), (1, False))
+        self.assertEqual(flight.do("key", lambda: 2), (2, False))
+
+
+class TestAsyncSingleFlight(unittest.TestCase):
+    """Test the coroutine single-flight group."""
+
+    def test_concurrent_coroutines_share_one_execution(self):
+        """Concurrent awaits of the same key run the coroutine once."""
+        flight = AsyncSingleFlight()
+        calls = []
+
+        async def work():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return "result"
+
+        async def run():
+            return await asyncio.gather(*[flight.do("key", work) for _ in range(10)])
+
+        outcomes = asyncio.run(run())
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(sum(shared for _, shared in outcomes), 9)
+        self.assertEqual(flight.in_flight(), 0)
+
+    def test_cancelling_leader_does_not_cancel_followers(self):
+        """The shared request survives cancellation of the caller that started it."""
+        flight = AsyncSingleFlight()
+
+        async def work():
+            await asyncio.sleep(0.02)
+            return "result"
+
+        async def run():
+            leader = asyncio.ensure_future(flight.do("key", work))
+            await asyncio.sleep(0)
+            follower = asyncio.ensure_future(flight.do("key", work))
+            await asyncio.sleep(0)
+            leader.cancel()
+            return await follower
+
+        self.assertEqual(asyncio.run(run()), ("result", True))
+
+
+class TestExecutorCoalescing(unittest.TestCase):
+    """Test coalescing in the executors."""
+
+    def setUp(self):
+        """Set up an endpoint and query."""
+        self.endpoint = EndpointInfo(url="https://test.example.org/sparql")
+        self.query = "SELECT ?s WHERE { ?s ?p ?o }"
+
+    def test_threaded_duplicates_send_one_request(self):
+        """Concurrent identical execute() calls share one HTTP request."""
+        executor = QueryExecutor()
+        release = threading.Event()
+
+        def slow_execute(*args):
+            release.wait(timeout=5)
+            return QueryResult(
+                status=QueryStatus.SUCCESS,
+                bindings=[{"s": "http://example.org/1"}],
+                row_count=1,
+                variables=["s"],
+            )
+
+        with patch.object(executor, "_execute_standard", side_effect=slow_execute) as send:
+            with ThreadPoolExecutor(max_workers=4) as pool:
+                futures = [
+                    pool.submit(executor.execute, self.query, self.endpoint) for _ in range(4)
+                ]
+                while executor._flight.stats["coalesced"] < 3:
+                    time.sleep(0.01)
+                release.set()
+                results = [f.result() for f in futures]
+
+        self.assertEqual(send.call_count, 1)
+        self.assertTrue(all(r.is_success for r in results))
+        self.assertEqual(sum(bool(r.metadata.get("coalesced")) for r in results), 3)
+
+        stats = executor.get_statistics()
+        self.assertEqual(stats["coalesced_queries"], 3)
+        self.assertEqual(stats["successful_queries"], 4)
+
+    def test_requests_with_credentials_are_not_coalesced(self):
+        """Per-caller credentials bypass coalescing."""
+        executor = QueryExecutor()
+        key = executor._coalesce_key(
+            self.query, self.endpoint, ResultFormat.JSON, {"username": "u"}, None
+        )
+        self.assertIsNone(key)
+
+    def test_async_duplicates_send_one_request(self):
+        """Concurrent identical awaits on AsyncQueryExecutor share one request."""
+        requests = []
+
+        async def handler(request):
+            requests.append(request)
+            await asyncio.sleep(0.01)
+            return httpx.Response(
+                200,
+                json={"head": {"vars": ["s"]}, "results": {"bindings": []}},
+            )
+
+        async def run():
+            async with AsyncQueryExecutor(transport=httpx.MockTransport(handler)) as executor:
+                results = await asyncio.gather(*[
+                    executor.execute(self.query, self.endpoint) for _ in range(5)
+                ])
+                return results, executor.get_statistics()
+
+        results, stats = asyncio.run(run())
+
+        self.assertEqual(len(requests), 1)
+        self.assertTrue(all(r.is_success for r in results))
+        self.assertEqual(stats["coalesced_queries"], 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
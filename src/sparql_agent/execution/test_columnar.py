@@ -0,0 +1,172 @@
+"""
+Unit tests for columnar result storage.
+
+Tests cover:
+- Building columns from SPARQL JSON terms, Binding objects and plain rows
+- The lazy row view (indexing, slicing, iteration, equality)
+- Interned term kinds and shared IRI strings
+- Executor integration
+"""
+
+import pickle
+import unittest
+from unittest.mock import MagicMock, patch
+
+from ..core.types import EndpointInfo
+from .columnar import ColumnarBindings, ColumnarResultBuilder
+from .executor import QueryExecutor, ResultFormat, ResultParser
+
+
+SPARQL_JSON = {
+    "head": {"vars": ["s", "label", "count"]},
+    "results": {
+        "bindings": [
+            {
+                "s": {"type": "uri", "value": "http://example.org/1"},
+                "label": {"type": "literal", "value": "One", "xml:lang": "en"},
+                "count": {
+                    "type": "literal",
+                    "value": "1",
+                    "datatype": "http://www.w3.org/2001/XMLSchema#integer",
+                },
+            },
+            {
+                "s": {"type": "uri", "value": "http://example.org/2"},
+                "count": {
+                    "type": "literal",
+                    "value": "2",
+                    "datatype": "http://www.w3.org/2001/XMLSchema#integer",
+                },
+            },
+            {
+                "s": {"type": "bnode", "value": "b0"},
+                "label": {"type": "literal", "value": "Three", "xml:lang": "en"},
+            },
+        ]
+    },
+}
+
+
+class TestColumnarBindings(unittest.TestCase):
+    """Test the columnar container and its row view."""
+
+    def setUp(self):
+        """Parse the sample results both ways."""
+        self.columnar = ResultParser.parse_json_columnar(SPARQL_JSON)
+        self.rows = [
+            {var: b.value for var, b in row.items()}
+            for row in ResultParser.parse_json(SPARQL_JSON)
+        ]
+
+    def test_row_view_matches_row_parser(self):
+        """Rows are the same dicts the row-oriented parser produces."""
+        self.assertEqual(len(self.columnar), 3)
+        self.assertEqual(self.columnar.variables, ["s", "label", "count"])
+        self.assertEqual(list(self.columnar), self.rows)
+        self.assertEqual(self.columnar[1], {"s": "http://example.org/2", "count": "2"})
+        self.assertEqual(self.columnar[-1], self.rows[-1])
+        self.assertEqual(self.columnar[1:], self.rows[1:])
+        self.assertEqual(self.columnar, self.rows)
+        with self.assertRaises(IndexError):
+            self.columnar[3]
+
+    def test_columns_are_shared(self):
+        """Column access returns the stored lists without copying."""
+        self.assertEqual(self.columnar.column("label"), ["One", None, "Three"])
+        self.assertIs(self.columnar.columns["s"], self.columnar.column("s"))
+
+    def test_term_kinds_are_preserved(self):
+        """Types, datatypes and languages round-trip as SPARQL JSON terms."""
+        self.assertEqual(
+            self.columnar.term(0, "label"),
+            {"type": "literal", "value": "One", "xml:lang": "en"},
+        )
+        self.assertEqual(self.columnar.term(2, "s"), {"type": "bnode", "value": "b0"})
+        self.assertIsNone(self.columnar.term(1, "label"))
+        self.assertEqual(
+            list(self.columnar.iter_terms()), SPARQL_JSON["results"]["bindings"]
+        )
+
+    def test_kinds_and_iris_are_interned(self):
+        """Each distinct kind is stored once, and repeated IRIs share a string."""
+        builder = ColumnarResultBuilder(["s"])
+        for i in range(1000):
+            builder.add_term_row({"s": {"type": "uri", "value": "http://example.org/" + str(i % 2)}})
+        bindings = builder.build()
+
+        self.assertEqual(len(bindings._kind_table), 2)
+        self.assertEqual(bindings._kinds["s"].itemsize, 2)
+        self.assertIs(bindings.column("s")[0], bindings.column("s")[2])
+
+    def test_new_variables_are_backfilled(self):
+        """A variable first seen in a later row is unbound in earlier rows."""
+        bindings = ColumnarBindings.from_rows([{"a": "1"}, {"a": "2", "b": "x"}])
+        self.assertEqual(bindings.variables, ["a", "b"])
+        self.assertEqual(bindings.column("b"), [None, "x"])
+        self.assertEqual(bindings.term(1, "b"), {"type": "literal", "value": "x"})
+
+    def test_batched_rows_match_single_rows(self):
+        """add_term_rows() builds the same columns as add_term_row() per row."""
+        rows = SPARQL_JSON["results"]["bindings"] + [{"extra": {"type": "literal", "value": "x"}}]
+        single = ColumnarResultBuilder(["s"])
+        for row in rows:
+            single.add_term_row(row)
+        batched = ColumnarResultBuilder(["s"])
+        batched.add_term_rows(rows[:2])
+        batched.add_term_rows(iter(rows[2:]))
+
+        single, batched = single.build(), batched.build()
+        self.assertEqual(batched.variables, single.variables)
+        self.assertEqual(list(batched.iter_terms()), list(single.iter_terms()))
+
+    def test_binding_rows(self):
+        """Rows of Binding objects keep their term kinds."""
+        builder = ColumnarResultBuilder()
+        for row in ResultParser.parse_json(SPARQL_JSON):
+            builder.add_binding_row(row)
+        self.assertEqual(
+            list(builder.build().iter_terms()), SPARQL_JSON["results"]["bindings"]
+        )
+
+    def test_concat_and_pickle(self):
+        """Concatenation keeps term kinds; pickling round-trips."""
+        merged = ColumnarBindings.concat([self.columnar, [{"s": "http://example.org/9"}]])
+        self.assertEqual(len(merged), 4)
+        self.assertEqual(merged.term(0, "label")["xml:lang"], "en")
+        self.assertEqual(merged.term(3, "s")["type"], "uri")
+
+        restored = pickle.loads(pickle.dumps(merged))
+        self.assertEqual(restored, merged)
+        self.assertEqual(restored.term(0, "count"), merged.term(0, "count"))
+
+    def test_ask_result(self):
+        """ASK results become a single 'result' column."""
+        bindings = ResultParser.parse_json_columnar({"head": {}, "boolean": True})
+        self.assertEqual(list(bindings), [{"result": True}])
+
+
+class TestExecutorColumnar(unittest.TestCase):
+    """Test QueryExecutor with columnar results enabled."""
+
+    def test_standard_execution_returns_columnar_bindings(self):
+        """JSON results are parsed straight into columns."""
+        executor = QueryExecutor(columnar_results=True)
+        wrapper = MagicMock()
+        wrapper.query.return_value.convert.return_value = SPARQL_JSON
+
+        with patch.object(executor.pool, "get_sparql_wrapper", return_value=wrapper):
+            result = executor.execute(
+                "SELECT * WHERE { ?s ?p ?o }",
+                EndpointInfo(url="https://test.example.org/sparql"),
+                format=ResultFormat.JSON,
+            )
+
+        self.assertTrue(result.is_success)
+        self.assertIsInstance(result.bindings, ColumnarBindings)
+        self.assertEqual(result.row_count, 3)
+        self.assertEqual(result.variables, ["s", "label", "count"])
+        self.assertEqual(result.bindings[0]["label"], "One")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -90,6 +90,41 @@ class TestResultParser(unittest.TestCase):
         self.assertIn("result", results[0])
         self.assertTrue(results[0]["result"].value)
 
+    def test_parse_json_values_fast_path(self):
+        """The fast path returns the same rows as converting Binding objects."""
+        json_data = {
+            "head": {"vars": ["s", "o"]},
+            "results": {
+                "bindings": [
+                    {
+                        "s": {"type": "uri", "value": "http://example.org/subject"},
+                        "o": {"type": "literal", "value": "Object", "xml:lang": "en"}
+                    },
+                    {"s": {"type": "bnode", "value": "b0"}}
+                ]
+            }
+        }
+
+        variables, rows = ResultParser.parse_json_values(json.dumps(json_data).encode())
+
+        self.assertEqual(variables, ["s", "o"])
+        self.assertEqual(rows, [
+            {var: b.value for var, b in row.items()}
+            for row in ResultParser.parse_json(json_data)
+        ])
+        self.assertEqual(
+            ResultParser.parse_json_values({"head": {}, "boolean": False}),
+            (["result"], [{"result": False}]),
+        )
+
+    def test_load_json_without_accelerated_decoder(self):
+        """Decoding falls back to the standard library decoder."""
+        with patch("sparql_agent.execution.executor.ORJSON_AVAILABLE", False):
+            variables, rows = ResultParser.parse_json_values(
+                '{"head": {"vars": ["x"]}, "results": {"bindings": [{"x": {"type": "literal", "value": "1"}}]}}'
+            )
+        self.assertEqual(rows, [{"x": "1"}])
+
     def test_parse_csv(self):
         """Test parsing CSV results."""
         csv_data = """s,p,o
@@ -340,6 +375,82 @@ class TestQueryExecutor(unittest.TestCase):
         self.assertIsInstance(converted, EndpointConnectionError)
 
 
+class TestExecuteIter(unittest.TestCase):
+    """Test lazy row iteration with execute_iter()."""
+
+    ROWS = 25
+
+    def setUp(self):
+        """Set up an executor whose session returns a chunked response."""
+        self.executor = QueryExecutor(timeout=30, enable_metrics=True)
+        self.endpoint = EndpointInfo(url="https://test.example.org/sparql")
+        self.query = "SELECT ?s WHERE { ?s ?p ?o }"
+
+        document = json.dumps({
+            "head": {"vars": ["s"]},
+            "results": {"bindings": [
+                {"s": {"type": "uri", "value": f"http://example.org/{i}"}}
+                for i in range(self.ROWS)
+            ]},
+        }).encode("utf-8")
+
+        self.response = MagicMock()
+        self.response.iter_content.side_effect = lambda chunk_size: (
+            document[i:i + 32] for i in range(0, len(document), 32)
+        )
+        session = MagicMock()
+        session.post.return_value = self.response
+        self.executor.pool.get_session = MagicMock(return_value=session)
+
+    def tearDown(self):
+        """Clean up after tests."""
+        self.executor.close()
+
+    def test_rows_are_yielded_lazily(self):
+        """Rows come back as plain dicts with time-to-first-row recorded."""
+        stream = self.executor.execute_iter(self.query, self.endpoint)
+        rows = list(stream)
+
+        self.assertEqual(len(rows), self.ROWS)
+        self.assertEqual(rows[0], {"s": "http://example.org/0"})
+        self.assertEqual(stream.variables, ["s"])
+        self.assertTrue(stream.closed)
+        self.assertIsNotNone(stream.metrics.time_to_first_row)
+        self.assertLessEqual(stream.metrics.time_to_first_row, stream.metrics.execution_time)
+
+        stats = self.executor.get_statistics()
+        self.assertEqual(stats["successful_queries"], 1)
+        self.assertEqual(stats["total_results"], self.ROWS)
+        self.assertEqual(stats["active_executions"], 0)
+
+    def test_batches(self):
+        """batch_size groups rows into lists, with a short final batch."""
+        batches = list(self.executor.execute_iter(self.query, self.endpoint, batch_size=10))
+        self.assertEqual([len(b) for b in batches], [10, 10, 5])
+
+    def test_early_cancellation_closes_response(self):
+        """Closing the stream early closes the HTTP response."""
+        with self.executor.execute_iter(self.query, self.endpoint) as stream:
+            next(stream)
+
+        self.response.close.assert_called()
+        self.assertTrue(stream.metrics.cancelled)
+        self.assertEqual(self.executor.get_statistics()["cancelled_queries"], 1)
+        self.assertEqual(list(stream), [])
+
+    def test_async_iteration(self):
+        """aexecute_iter() yields the same rows without blocking the loop."""
+        import asyncio
+
+        async def collect():
+            stream = await self.executor.aexecute_iter(self.query, self.endpoint)
+            async with stream:
+                return [row async for row in stream]
+
+        rows = asyncio.run(collect())
+        self.assertEqual(len(rows), self.ROWS)
+
+
 class TestFederatedQuery(unittest.TestCase):
     """Test federated query functionality."""
 
@@ -0,0 +1,213 @@
+"""
+Unit tests for streaming union merging.
+
+Tests cover:
+- Row hashing and ORDER BY parsing
+- Arrival-order streaming, k-way ordered merge and deduplication
+- Bloom filter deduplication
+- Federated execution through QueryExecutor
+"""
+
+import threading
+import unittest
+from unittest.mock import patch
+
+from ..core.types import EndpointInfo, QueryResult, QueryStatus
+from .executor import FederatedQuery, QueryExecutor
+from .merging import BloomFilter, UnionMerger, merge_union, parse_order_by, row_hash
+from .scheduler import FederationScheduler
+
+
+class TestRowHash(unittest.TestCase):
+    """Test row hashing."""
+
+    def test_hash_ignores_key_order(self):
+        """Rows with the same bindings hash equally."""
+        self.assertEqual(row_hash({"a": "1", "b": "2"}), row_hash({"b": "2", "a": "1"}))
+        self.assertNotEqual(row_hash({"a": "1"}), row_hash({"a": "2"}))
+
+    def test_unhashable_values(self):
+        """Raw SPARQL JSON term dicts can be hashed."""
+        term = {"type": "uri", "value": "http://example.org/1"}
+        self.assertEqual(row_hash({"s": term}), row_hash({"s": dict(term)}))
+
+
+class TestParseOrderBy(unittest.TestCase):
+    """Test ORDER BY extraction."""
+
+    def test_variables_and_directions(self):
+        """Plain, ASC and DESC variables are recognised."""
+        query = "SELECT * WHERE { ?s ?p ?o } ORDER BY ?s DESC(?o) asc(?p) LIMIT 10"
+        self.assertEqual(parse_order_by(query), [("s", False), ("o", True), ("p", False)])
+
+    def test_no_order_or_expression(self):
+        """Missing clauses, subquery clauses and expressions give None."""
+        self.assertIsNone(parse_order_by("SELECT * WHERE { ?s ?p ?o }"))
+        self.assertIsNone(parse_order_by(
+            "SELECT * WHERE { { SELECT ?s WHERE { ?s ?p ?o } ORDER BY ?s } }"
+        ))
+        self.assertIsNone(parse_order_by("SELECT * WHERE { ?s ?p ?o } ORDER BY STRLEN(?o)"))
+
+
+class TestUnionMerger(unittest.TestCase):
+    """Test the streaming union merge."""
+
+    def test_rows_stream_before_later_sources_arrive(self):
+        """Rows of the first source are yielded before the next is produced."""
+        produced = []
+
+        def sources():
+            produced.append("first")
+            yield [{"s": "1"}, {"s": "2"}]
+            produced.append("second")
+            yield [{"s": "3"}]
+
+        rows = UnionMerger(deduplicate=False).merge(sources())
+        self.assertEqual(next(rows), {"s": "1"})
+        self.assertEqual(produced, ["first"])
+        self.assertEqual(list(rows), [{"s": "2"}, {"s": "3"}])
+
+    def test_deduplication(self):
+        """Duplicate rows across sources are dropped."""
+        merger = UnionMerger()
+        rows = list(merger.merge([
+            [{"s": "1", "o": "a"}, {"s": "2"}],
+            [{"o": "a", "s": "1"}, {"s": "3"}],
+        ]))
+        self.assertEqual(rows, [{"s": "1", "o": "a"}, {"s": "2"}, {"s": "3"}])
+        self.assertEqual(merger.stats["duplicates"], 1)
+
+    def test_hash_collisions_keep_distinct_rows(self):
+        """Exact deduplication compares rows, not just their hashes."""
+        with patch("sparql_agent.execution.merging.row_hash", return_value=0):
+            rows = list(UnionMerger().merge([[{"s": "1"}, {"s": "2"}], [{"s": "1"}]]))
+        self.assertEqual(rows, [{"s": "1"}, {"s": "2"}])
+
+    def test_ordered_merge(self):
+        """Sorted sources are merged into one sorted stream."""
+        rows = merge_union(
+            [
+                [{"n": "1"}, {"n": "5"}, {"n": "10"}],
+                [{"n": "2"}, {"n": "3"}, {"n": "20"}],
+                [{"n": None}],
+            ],
+            deduplicate=False,
+            order_by=[("n", False)],
+        )
+        self.assertEqual([r["n"] for r in rows], [None, "1", "2", "3", "5", "10", "20"])
+
+    def test_ordered_merge_mixed_directions(self):
+        """DESC keys are merged in descending order."""
+        rows = merge_union(
+            [
+                [{"g": "a", "n": "9"}, {"g": "a", "n": "1"}, {"g": "b", "n": "7"}],
+                [{"g": "a", "n": "4"}, {"g": "b", "n": "8"}],
+            ],
+            order_by=[("g", False), ("n", True)],
+        )
+        self.assertEqual(
+            [(r["g"], r["n"]) for r in rows],
+            [("a", "9"), ("a", "4"), ("a", "1"), ("b", "8"), ("b", "7")],
+        )
+
+    def test_bloom_filter_deduplication(self):
+        """A Bloom filter removes duplicates within a fixed memory budget."""
+        sources = [[{"s": str(i)} for i in range(1000)] for _ in range(2)]
+        merger = UnionMerger(bloom_capacity=1000, bloom_error_rate=0.001)
+        rows = list(merger.merge(sources))
+
+        self.assertLessEqual(len(rows), 1000)
+        self.assertGreater(len(rows), 990)
+        self.assertEqual(merger.stats["rows_in"], 2000)
+
+
+class TestBloomFilter(unittest.TestCase):
+    """Test the Bloom filter."""
+
+    def test_membership(self):
+        """Added hashes are always found; the size follows the error rate."""
+        bloom = BloomFilter(capacity=10000, error_rate=0.01)
+        for i in range(10000):
+            bloom.add(hash(("row", i)))
+
+        self.assertTrue(all(hash(("row", i)) in bloom for i in range(10000)))
+        false_positives = sum(hash(("other", i)) in bloom for i in range(10000))
+        self.assertLess(false_positives, 300)
+        self.assertLess(bloom.size_bytes, 13000)
+        self.assertFalse(bloom.add(hash(("row", 0))))
+
+    def test_invalid_parameters(self):
+        """Capacity and error rate are validated."""
+        with self.assertRaises(ValueError):
+            BloomFilter(capacity=0)
+        with self.assertRaises(ValueError):
+            BloomFilter(capacity=10, error_rate=1.5)
+
+
+class TestFederatedMerging(unittest.TestCase):
+    """Test union merging in QueryExecutor."""
+
+    def setUp(self):
+        """Create an executor with two endpoints."""
+        self.scheduler = FederationScheduler(max_workers=2)
+        self.executor = QueryExecutor(scheduler=self.scheduler)
+        self.fast = EndpointInfo(url="https://fast.example.org/sparql")
+        self.slow = EndpointInfo(url="https://slow.example.org/sparql")
+        self.release_slow = threading.Event()
+        self.rows = {
+            self.fast.url: [{"n": "1"}, {"n": "4"}],
+            self.slow.url: [{"n": "2"}, {"n": "4"}],
+        }
+
+    def tearDown(self):
+        """Release blocked requests and close the executor."""
+        self.release_slow.set()
+        self.executor.close()
+        self.scheduler.shutdown()
+
+    def fake_execute(self, query, endpoint, timeout=None):
+        """Return canned rows; the slow endpoint waits to be released."""
+        if endpoint.url == self.slow.url:
+            self.release_slow.wait(timeout=5)
+        rows = self.rows[endpoint.url]
+        return QueryResult(
+            status=QueryStatus.SUCCESS,
+            bindings=rows,
+            row_count=len(rows),
+            variables=["n"],
+            execution_time=0.1,
+        )
+
+    def test_first_rows_before_slow_endpoint(self):
+        """execute_federated_iter() yields the fast endpoint's rows first."""
+        config = FederatedQuery(endpoints=[self.slow, self.fast])
+
+        with patch.object(self.executor, "execute", side_effect=self.fake_execute):
+            rows = self.executor.execute_federated_iter("SELECT ?n WHERE { ?s ?p ?n }", config)
+            self.assertEqual(next(rows), {"n": "1"})
+            self.release_slow.set()
+            self.assertEqual(list(rows), [{"n": "4"}, {"n": "2"}, {"n": "4"}])
+
+    def test_ordered_deduplicated_union(self):
+        """ORDER BY queries are k-way merged and duplicates removed."""
+        self.release_slow.set()
+        config = FederatedQuery(endpoints=[self.slow, self.fast], deduplicate=True)
+
+        with patch.object(self.executor, "execute", side_effect=self.fake_execute):
+            result = self.executor.execute_federated(
+                "SELECT ?n WHERE { ?s ?p ?n } ORDER BY ?n", config
+            )
+
+        self.assertEqual(result.bindings, [{"n": "1"}, {"n": "2"}, {"n": "4"}])
+        self.assertTrue(result.metadata["ordered"])
+        self.assertEqual(result.metadata["duplicates_removed"], 1)
+
+    def test_streaming_requires_union(self):
+        """Only union federation can be streamed."""
+        config = FederatedQuery(endpoints=[self.fast], merge_strategy="intersection")
+        with self.assertRaises(ValueError):
+            next(self.executor.execute_federated_iter("SELECT * WHERE { ?s ?p ?o }", config))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+"""
+Unit tests for circuit breaking and latency tracking.
+
+Tests cover:
+- Circuit breaker state transitions and the half-open trial slot
+- Latency percentiles over a sliding window
+"""
+
+import time
+import unittest
+
+from .resilience import CircuitBreaker, CircuitState, LatencyTracker
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    """Test the circuit breaker."""
+
+    def test_opens_after_consecutive_failures(self):
+        """The circuit opens at the threshold; a success resets the count."""
+        breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=60)
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+        self.assertEqual(breaker.state, CircuitState.CLOSED)
+
+        breaker.record_failure()
+        self.assertEqual(breaker.state, CircuitState.OPEN)
+        self.assertFalse(breaker.allow())
+        self.assertEqual(breaker.get_statistics()["rejected"], 1)
+
+    def test_half_open_allows_one_trial(self):
+        """After the recovery timeout a single trial request is admitted."""
+        breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=0.01)
+        breaker.record_failure()
+        time.sleep(0.02)
+
+        self.assertEqual(breaker.state, CircuitState.HALF_OPEN)
+        self.assertTrue(breaker.allow())
+        self.assertFalse(breaker.allow())
+
+        breaker.release()
+        self.assertTrue(breaker.allow())
+        breaker.record_success()
+        self.assertEqual(breaker.state, CircuitState.CLOSED)
+
+    def test_failed_trial_reopens(self):
+        """A failed trial opens the circuit again."""
+        breaker = CircuitBreaker(failure_threshold=3, recovery_timeout=0.01)
+        for _ in range(3):
+            breaker.record_failure()
+        time.sleep(0.02)
+        self.assertTrue(breaker.allow())
+        breaker.record_failure()
+
+        self.assertEqual(breaker.state, CircuitState.OPEN)
+        self.assertEqual(breaker.get_statistics()["times_opened"], 2)
+
+
+class TestLatencyTracker(unittest.TestCase):
+    """Test latency percentiles."""
+
+    def test_percentiles(self):
+        """Nearest-rank percentiles over the recorded samples."""
+        tracker = LatencyTracker()
+        self.assertIsNone(tracker.percentile("http://a", 0.95))
+        for i in range(1, 101):
+            tracker.record("http://a", i / 100)
+
+        self.assertEqual(tracker.percentile("http://a", 0.95), 0.95)
+        self.assertEqual(tracker.percentile("http://a", 0.5), 0.5)
+        self.assertEqual(tracker.get_statistics()["http://a"]["samples"], 100)
+
+    def test_window_keeps_recent_samples(self):
+        """Old samples fall out of the window."""
+        tracker = LatencyTracker(window=10)
+        for _ in range(10):
+            tracker.record("http://a", 5.0)
+        for _ in range(10):
+            tracker.record("http://a", 0.1)
+
+        self.assertEqual(tracker.sample_count("http://a"), 10)
+        self.assertEqual(tracker.percentile("http://a", 0.95), 0.1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,268 @@
+"""
+Unit tests for adaptive federation scheduling.
+
+Tests cover:
+- AIMD limit increase, decrease and one decrease per window
+- Per-endpoint limits, the global worker cap and fair queuing
+- Overload classification of exceptions and failed results
+- QueryExecutor integration
+"""
+
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+from ..core.exceptions import EndpointRateLimitError, QueryExecutionError, QueryTimeoutError
+from ..core.types import EndpointInfo, QueryResult, QueryStatus
+from .executor import FederatedQuery, QueryExecutor
+from .scheduler import AIMDLimit, FederationScheduler, is_overload_outcome
+
+
+class TestAIMDLimit(unittest.TestCase):
+    """Test the AIMD concurrency limit."""
+
+    def test_additive_increase(self):
+        """A window of fast responses raises the limit by about one."""
+        limit = AIMDLimit(initial=4, max_limit=10)
+        for _ in range(4):
+            limit.on_success(time.monotonic(), 0.1)
+        self.assertEqual(limit.value, 4)
+        limit.on_success(time.monotonic(), 0.1)
+        self.assertEqual(limit.value, 5)
+
+    def test_overload_halves_limit_once_per_window(self):
+        """Responses to requests sent before a decrease do not cut again."""
+        limit = AIMDLimit(initial=16)
+        sent = time.monotonic()
+        limit.on_overload(sent)
+        limit.on_overload(sent)
+        self.assertEqual(limit.value, 8)
+        limit.on_overload(time.monotonic())
+        self.assertEqual(limit.value, 4)
+        self.assertEqual(limit.decreases, 2)
+
+    def test_latency_above_baseline_decreases(self):
+        """Latency well above the baseline counts as congestion."""
+        limit = AIMDLimit(initial=8, latency_tolerance=2.0)
+        limit.on_success(time.monotonic(), 0.1)
+        limit.on_success(time.monotonic(), 0.5)
+        self.assertEqual(limit.value, 4)
+        self.assertLess(limit.baseline, 0.2)
+
+    def test_limit_bounds(self):
+        """The limit stays within min_limit and max_limit."""
+        limit = AIMDLimit(initial=2, min_limit=1, max_limit=3)
+        for _ in range(20):
+            limit.on_success(time.monotonic(), 0.1)
+        self.assertEqual(limit.value, 3)
+        for _ in range(5):
+            limit.on_overload(time.monotonic())
+        self.assertEqual(limit.value, 1)
+
+
+class TestFederationScheduler(unittest.TestCase):
+    """Test queuing and dispatch in the scheduler."""
+
+    def setUp(self):
+        """Create a scheduler."""
+        self.scheduler = FederationScheduler(max_workers=4, initial_limit=2)
+
+    def tearDown(self):
+        """Shut the scheduler down."""
+        self.scheduler.shutdown()
+
+    def test_endpoint_limit_is_respected(self):
+        """No more than the endpoint limit runs at once."""
+        release = threading.Event()
+        running = []
+        peak = []
+        lock = threading.Lock()
+
+        def work():
+            with lock:
+                running.append(1)
+                peak.append(len(running))
+            release.wait(timeout=5)
+            with lock:
+                running.pop()
+            return "ok"
+
+        futures = [self.scheduler.submit("http://a", work) for _ in range(5)]
+        while len(peak) < 2:
+            time.sleep(0.01)
+
+        stats = self.scheduler.get_statistics()
+        self.assertEqual(stats["endpoints"]["http://a"]["in_flight"], 2)
+        self.assertEqual(stats["queue_depth"], 3)
+
+        release.set()
+        self.assertEqual([f.result(timeout=5) for f in futures], ["ok"] * 5)
+        self.assertEqual(max(peak), 2)
+
+    def test_global_worker_cap(self):
+        """Endpoints together never exceed max_workers."""
+        release = threading.Event()
+        futures = [
+            self.scheduler.submit(url, lambda: release.wait(timeout=5))
+            for url in ("http://a", "http://b", "http://c")
+            for _ in range(2)
+        ]
+        while self.scheduler.get_statistics()["running"] < 4:
+            time.sleep(0.01)
+
+        self.assertEqual(self.scheduler.queue_depth(), 2)
+        release.set()
+        for future in futures:
+            future.result(timeout=5)
+
+    def test_callers_are_served_round_robin(self):
+        """A caller with a long queue does not delay others' requests."""
+        scheduler = FederationScheduler(max_workers=1, initial_limit=1)
+        release = threading.Event()
+        order = []
+
+        blocker = scheduler.submit("http://a", lambda: release.wait(timeout=5))
+        futures = [
+            scheduler.submit("http://a", lambda i=i: order.append(("big", i)), caller="big")
+            for i in range(3)
+        ]
+        futures.append(scheduler.submit("http://a", lambda: order.append(("small", 0)), caller="small"))
+
+        release.set()
+        for future in [blocker] + futures:
+            future.result(timeout=5)
+        scheduler.shutdown()
+
+        self.assertEqual(order[:2], [("big", 0), ("small", 0)])
+
+    def test_overload_lowers_limit(self):
+        """429 errors and failed results with overload errors cut the limit."""
+        def rate_limited():
+            raise EndpointRateLimitError("429 Too Many Requests")
+
+        with self.assertRaises(EndpointRateLimitError):
+            self.scheduler.submit("http://a", rate_limited).result(timeout=5)
+
+        stats = self.scheduler.get_statistics()["endpoints"]["http://a"]
+        self.assertEqual(stats["limit"], 1)
+        self.assertEqual(stats["overloads"], 1)
+
+    def test_failed_results_do_not_raise_limit(self):
+        """Failed results leave the limit alone; timeouts cut it."""
+        failed = QueryResult(status=QueryStatus.FAILED, metadata={"error_type": "QueryExecutionError"})
+        for _ in range(5):
+            self.scheduler.submit("http://a", lambda: failed).result(timeout=5)
+
+        stats = self.scheduler.get_statistics()["endpoints"]["http://a"]
+        self.assertEqual(stats["limit"], 2)
+        self.assertEqual(stats["limit_increases"], 0)
+
+        timed_out = QueryResult(status=QueryStatus.FAILED, metadata={"error_type": "QueryTimeoutError"})
+        self.scheduler.submit("http://a", lambda: timed_out).result(timeout=5)
+        self.assertEqual(self.scheduler.current_limit("http://a"), 1)
+
+    def test_local_results_are_not_latency_samples(self):
+        """Cache hits and coalesced results leave the limit and baseline alone."""
+        for flag in ("cache_hit", "coalesced"):
+            result = QueryResult(status=QueryStatus.SUCCESS, metadata={flag: True})
+            self.scheduler.submit("http://a", lambda: result).result(timeout=5)
+
+        stats = self.scheduler.get_statistics()["endpoints"]["http://a"]
+        self.assertEqual(stats["limit_increases"], 0)
+        self.assertIsNone(self.scheduler._endpoints["http://a"].limit.baseline)
+
+    def test_cancelled_tasks_are_skipped(self):
+        """Cancelling a queued future removes it from the queue."""
+        scheduler = FederationScheduler(max_workers=1, initial_limit=1)
+        release = threading.Event()
+        ran = []
+
+        first = scheduler.submit("http://a", lambda: release.wait(timeout=5))
+        second = scheduler.submit("http://a", lambda: ran.append(1))
+        self.assertTrue(second.cancel())
+        release.set()
+        first.result(timeout=5)
+        scheduler.shutdown()
+
+        self.assertEqual(ran, [])
+        self.assertEqual(scheduler.get_statistics()["cancelled"], 1)
+
+    def test_shutdown_rejects_new_work(self):
+        """Submitting after shutdown raises."""
+        self.scheduler.shutdown()
+        with self.assertRaises(RuntimeError):
+            self.scheduler.submit("http://a", lambda: None)
+
+
+class TestOverloadClassification(unittest.TestCase):
+    """Test which outcomes count as overload."""
+
+    def test_outcomes(self):
+        """Overload errors and failed results naming them are overloads."""
+        self.assertTrue(is_overload_outcome(EndpointRateLimitError("429")))
+        self.assertFalse(is_overload_outcome(QueryExecutionError("syntax")))
+        self.assertTrue(is_overload_outcome(QueryResult(
+            status=QueryStatus.FAILED,
+            metadata={"error_type": "EndpointUnavailableError"},
+        )))
+        self.assertFalse(is_overload_outcome(QueryResult(status=QueryStatus.SUCCESS)))
+        self.assertTrue(is_overload_outcome(QueryTimeoutError("timed out")))
+        self.assertTrue(is_overload_outcome(QueryResult(status=QueryStatus.TIMEOUT)))
+
+
+class TestExecutorScheduling(unittest.TestCase):
+    """Test federated execution through the scheduler."""
+
+    def test_federated_queries_use_shared_scheduler(self):
+        """Parallel federation runs on the scheduler and reports its statistics."""
+        scheduler = FederationScheduler(max_workers=2)
+        executor = QueryExecutor(scheduler=scheduler)
+        endpoints = [
+            EndpointInfo(url="https://a.example.org/sparql"),
+            EndpointInfo(url="https://b.example.org/sparql"),
+        ]
+
+        def fake_execute(query, endpoint, timeout=None):
+            return QueryResult(
+                status=QueryStatus.SUCCESS,
+                bindings=[{"s": endpoint.url}],
+                row_count=1,
+                variables=["s"],
+                execution_time=0.1,
+            )
+
+        with patch.object(executor, "execute", side_effect=fake_execute):
+            result = executor.execute_federated(
+                "SELECT ?s WHERE { ?s ?p ?o }",
+                FederatedQuery(endpoints=endpoints, merge_strategy="union"),
+            )
+
+        self.assertEqual(result.row_count, 2)
+        stats = executor.get_statistics()["scheduler"]
+        self.assertEqual(stats["completed"], 2)
+        self.assertEqual(set(stats["endpoints"]), {e.url for e in endpoints})
+
+        executor.close()
+        scheduler.submit("https://a.example.org/sparql", lambda: None).result(timeout=5)
+        scheduler.shutdown()
+
+    def test_failed_results_carry_error_type(self):
+        """Failed results name the error so the scheduler can back off."""
+        executor = QueryExecutor(coalesce_requests=False)
+        with patch.object(
+            executor, "_execute_standard", side_effect=Exception("HTTP Error 429: Too Many Requests")
+        ):
+            result = executor.execute(
+                "SELECT ?s WHERE { ?s ?p ?o }",
+                EndpointInfo(url="https://a.example.org/sparql"),
+            )
+        executor.close()
+
+        self.assertFalse(result.is_success)
+        self.assertEqual(result.metadata["error_type"], "EndpointRateLimitError")
+        self.assertTrue(is_overload_outcome(result))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,242 @@
+"""
+Unit tests for the incremental result parsers.
+
+Tests cover:
+- JSON, XML, CSV and TSV parsing across arbitrary chunk boundaries
+- ASK results
+- Rows becoming available before the document is complete
+- Malformed and truncated input
+- StreamingResultIterator integration
+"""
+
+import json
+import unittest
+from unittest.mock import Mock
+
+from ..core.exceptions import QueryResultError
+from .executor import BindingType, ResultFormat, StreamingResultIterator
+from .streaming import (
+    IncrementalCSVParser,
+    IncrementalJSONParser,
+    IncrementalTSVParser,
+    IncrementalXMLParser,
+    create_incremental_parser,
+    parse_turtle_term,
+)
+
+
+JSON_DOCUMENT = json.dumps({
+    "head": {"vars": ["s", "label"]},
+    "results": {
+        "distinct": False,
+        "bindings": [
+            {
+                "s": {"type": "uri", "value": "http://example.org/a"},
+                "label": {"type": "literal", "value": "brace } and \"quote\"", "xml:lang": "en"},
+            },
+            {
+                "s": {"type": "bnode", "value": "b0"},
+                "label": {
+                    "type": "literal",
+                    "value": "42",
+                    "datatype": "http://www.w3.org/2001/XMLSchema#integer",
+                },
+            },
+            {"s": {"type": "uri", "value": "http://example.org/c"}},
+        ],
+    },
+}).encode("utf-8")
+
+XML_DOCUMENT = b"""<?xml version="1.0"?>
+<sparql xmlns="http://www.w3.org/2005/sparql-results#">
+  <head><variable name="s"/><variable name="label"/></head>
+  <results>
+    <result>
+      <binding name="s"><uri>http://example.org/a</uri></binding>
+      <binding name="label"><literal xml:lang="en">Alpha</literal></binding>
+    </result>
+    <result>
+      <binding name="s"><bnode>b0</bnode></binding>
+      <binding name="label"><literal datatype="http://www.w3.org/2001/XMLSchema#integer">42</literal></binding>
+    </result>
+  </results>
+</sparql>"""
+
+
+def feed_in_chunks(parser, data, size):
+    """Feed data to a parser in fixed-size chunks and collect all rows."""
+    rows = []
+    for i in range(0, len(data), size):
+        rows.extend(parser.feed(data[i:i + size]))
+    rows.extend(parser.close())
+    return rows
+
+
+class TestIncrementalJSONParser(unittest.TestCase):
+    """Test incremental JSON parsing."""
+
+    def test_chunk_boundaries(self):
+        """Every chunk size yields the same rows as a full parse."""
+        expected = json.loads(JSON_DOCUMENT)["results"]["bindings"]
+        for size in (1, 3, 7, 64, len(JSON_DOCUMENT)):
+            parser = IncrementalJSONParser()
+            rows = feed_in_chunks(parser, JSON_DOCUMENT, size)
+            self.assertEqual(rows, expected, f"chunk size {size}")
+            self.assertEqual(parser.variables, ["s", "label"])
+            self.assertIsNone(parser.boolean)
+
+    def test_rows_yielded_before_document_complete(self):
+        """A row is returned as soon as its closing brace arrives."""
+        parser = IncrementalJSONParser()
+        first_row_end = JSON_DOCUMENT.index(b"}}, {") + 2
+        rows = parser.feed(JSON_DOCUMENT[:first_row_end])
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]["s"]["value"], "http://example.org/a")
+
+    def test_multibyte_characters_split_across_chunks(self):
+        """UTF-8 sequences split between chunks are decoded correctly."""
+        document = json.dumps(
+            {"head": {"vars": ["x"]},
+             "results": {"bindings": [{"x": {"type": "literal", "value": "Zürich"}}]}},
+            ensure_ascii=False,
+        ).encode("utf-8")
+        rows = feed_in_chunks(IncrementalJSONParser(), document, 1)
+        self.assertEqual(rows[0]["x"]["value"], "Zürich")
+
+    def test_ask_result(self):
+        """ASK documents set the boolean attribute."""
+        parser = IncrementalJSONParser()
+        rows = feed_in_chunks(parser, b'{"head": {}, "boolean": true}', 2)
+        self.assertEqual(rows, [])
+        self.assertTrue(parser.boolean)
+
+    def test_truncated_document(self):
+        """A document cut off mid-row raises on close."""
+        parser = IncrementalJSONParser()
+        parser.feed(JSON_DOCUMENT[:len(JSON_DOCUMENT) // 2])
+        with self.assertRaises(QueryResultError):
+            parser.close()
+
+
+class TestIncrementalXMLParser(unittest.TestCase):
+    """Test incremental XML parsing."""
+
+    def test_chunk_boundaries(self):
+        """Rows and variables are recovered for any chunk size."""
+        for size in (5, 100, len(XML_DOCUMENT)):
+            parser = IncrementalXMLParser()
+            rows = feed_in_chunks(parser, XML_DOCUMENT, size)
+            self.assertEqual(parser.variables, ["s", "label"])
+            self.assertEqual(len(rows), 2)
+            self.assertEqual(rows[0]["label"], {"type": "literal", "value": "Alpha", "xml:lang": "en"})
+            self.assertEqual(rows[1]["s"], {"type": "bnode", "value": "b0"})
+            self.assertEqual(
+                rows[1]["label"]["datatype"], "http://www.w3.org/2001/XMLSchema#integer"
+            )
+
+    def test_ask_result(self):
+        """ASK documents set the boolean attribute."""
+        parser = IncrementalXMLParser()
+        feed_in_chunks(
+            parser,
+            b'<sparql xmlns="http://www.w3.org/2005/sparql-results#"><head/>'
+            b'<boolean>true</boolean></sparql>',
+            4,
+        )
+        self.assertTrue(parser.boolean)
+
+
+class TestIncrementalCSVParser(unittest.TestCase):
+    """Test incremental CSV parsing."""
+
+    def test_quoted_newlines_across_chunks(self):
+        """Quoted fields containing newlines are not split into records."""
+        data = b's,comment\r\nhttp://example.org/a,"line one\r\nline two, ""quoted"""\r\nhttp://example.org/b,\r\n'
+        rows = feed_in_chunks(IncrementalCSVParser(), data, 3)
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(rows[0]["comment"]["value"], 'line one\r\nline two, "quoted"')
+        self.assertNotIn("comment", rows[1])
+
+
+class TestIncrementalTSVParser(unittest.TestCase):
+    """Test incremental TSV parsing."""
+
+    def test_terms_are_typed(self):
+        """TSV cells keep URI, language and datatype information."""
+        data = (
+            '?s\t?label\t?n\n'
+            '<http://example.org/a>\t"caf\\u00e9"@fr\t42\n'
+            '_:b0\t"x"^^<http://www.w3.org/2001/XMLSchema#string>\t\n'
+        ).encode("utf-8")
+        parser = IncrementalTSVParser()
+        rows = feed_in_chunks(parser, data, 4)
+        self.assertEqual(parser.variables, ["s", "label", "n"])
+        self.assertEqual(rows[0]["s"], {"type": "uri", "value": "http://example.org/a"})
+        self.assertEqual(rows[0]["label"], {"type": "literal", "value": "café", "xml:lang": "fr"})
+        self.assertEqual(rows[0]["n"]["datatype"], "http://www.w3.org/2001/XMLSchema#integer")
+        self.assertEqual(rows[1]["s"], {"type": "bnode", "value": "b0"})
+        self.assertNotIn("n", rows[1])
+
+    def test_parse_turtle_term(self):
+        """Individual Turtle terms are parsed."""
+        self.assertIsNone(parse_turtle_term(""))
+        self.assertEqual(parse_turtle_term('"a\\tb"')["value"], "a\tb")
+        self.assertEqual(
+            parse_turtle_term("1.5e3")["datatype"], "http://www.w3.org/2001/XMLSchema#double"
+        )
+
+
+class TestStreamingResultIterator(unittest.TestCase):
+    """Test StreamingResultIterator over a chunked response."""
+
+    def _response(self, data, chunk_size=16):
+        """Create a mock response that records how many chunks were read."""
+        response = Mock()
+        response.chunks_read = 0
+
+        def iter_content(chunk_size=chunk_size):
+            for i in range(0, len(data), chunk_size):
+                response.chunks_read += 1
+                yield data[i:i + chunk_size]
+
+        response.iter_content.side_effect = iter_content
+        return response
+
+    def test_iterates_lazily(self):
+        """The first row is produced before the whole body has been read."""
+        response = self._response(JSON_DOCUMENT)
+        iterator = StreamingResultIterator(response, ResultFormat.JSON, chunk_size=16)
+
+        first = next(iterator)
+        self.assertEqual(first["s"].binding_type, BindingType.URI)
+        self.assertLess(response.chunks_read, len(JSON_DOCUMENT) // 16)
+
+        remaining = list(iterator)
+        self.assertEqual(len(remaining), 2)
+        self.assertEqual(remaining[0]["label"].binding_type, BindingType.TYPED_LITERAL)
+        self.assertEqual(iterator.variables, ["s", "label"])
+        response.close.assert_called_once()
+
+    def test_xml_format(self):
+        """XML responses stream through the same iterator."""
+        iterator = StreamingResultIterator(self._response(XML_DOCUMENT), ResultFormat.XML)
+        rows = list(iterator)
+        self.assertEqual(rows[0]["label"].language, "en")
+
+    def test_ask_result(self):
+        """ASK responses produce a single boolean row."""
+        iterator = StreamingResultIterator(
+            self._response(b'{"head": {}, "boolean": false}'), ResultFormat.JSON
+        )
+        rows = list(iterator)
+        self.assertEqual(len(rows), 1)
+        self.assertIs(rows[0]["result"].value, False)
+
+    def test_rdf_formats_not_supported(self):
+        """Graph formats cannot be streamed as rows."""
+        with self.assertRaises(NotImplementedError):
+            create_incremental_parser("turtle")
+
+
+if __name__ == "__main__":
+    unittest.main()
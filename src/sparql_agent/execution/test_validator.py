@@ -5,7 +5,9 @@ Tests for SPARQL query validator.
 import pytest
 
 from ..core.exceptions import QuerySyntaxError
+from ..core.sparql_lexer import analyze_sparql
 from .validator import (
+    ParseCache,
     QueryValidator,
     ValidationSeverity,
     validate_and_raise,
@@ -504,5 +506,75 @@ class TestValidatorEdgeCases:
         assert result.is_valid
 
 
+class TestParseCacheAndPrecheck:
+    """Test the parse cache and the pre-parse lexer check."""
+
+    QUERY = "SELECT ?s WHERE { ?s ?p ?o }"
+
+    def test_repeated_query_hits_cache(self):
+        """Repeated validations reuse the parse result."""
+        validator = QueryValidator(parse_cache=ParseCache())
+        first = validator.validate(self.QUERY)
+        second = validator.validate(self.QUERY)
+
+        assert first.is_valid and second.is_valid
+        assert second.parsed_query is first.parsed_query
+        stats = validator.get_statistics()
+        assert stats["validations"] == 2
+        assert stats["parse_cache"]["hits"] == 1
+        assert stats["parse_cache"]["hit_rate"] == 0.5
+        assert stats["average_time_ms"] > 0
+
+    def test_parse_errors_are_cached(self):
+        """Queries the parser rejects are cached with their error."""
+        cache = ParseCache()
+        validator = QueryValidator(parse_cache=cache)
+        query = "SELECT ?s WHERE { ?s ?p }"
+
+        first = validator.validate(query)
+        second = validator.validate(query)
+
+        assert not first.is_valid
+        assert [i.rule for i in second.errors] == [i.rule for i in first.errors]
+        assert cache.get_statistics()["hits"] == 1
+
+    def test_cache_is_bounded(self):
+        """The least recently used entry is evicted."""
+        cache = ParseCache(max_entries=2)
+        for i in range(3):
+            cache.parse(f"SELECT ?s WHERE {{ ?s ?p {i} }}")
+
+        stats = cache.get_statistics()
+        assert stats["size"] == 2
+        assert stats["evictions"] == 1
+
+    @pytest.mark.parametrize("query, message", [
+        ("SELECT ?s WHERE { ?s ?p ?o ", "Unclosed '{'"),
+        ("SELECT ?s WHERE { ?s ?p ?o ) }", "Unexpected ')'"),
+        ('SELECT ?s WHERE { ?s ?p "open }', "Unterminated string literal"),
+        ("PREFIX ex: <http://example.org/> ex:a ex:b ex:c", "No query form found"),
+    ])
+    def test_precheck_rejects_without_parsing(self, query, message):
+        """Obviously malformed queries are rejected before the parser."""
+        cache = ParseCache()
+        validator = QueryValidator(parse_cache=cache)
+        result = validator.validate(query)
+
+        assert not result.is_valid
+        assert any(i.rule == "parse_error" and i.message == message for i in result.errors)
+        assert cache.get_statistics()["misses"] == 0
+        assert validator.get_statistics()["fast_rejections"] == 1
+
+    def test_precheck_ignores_brackets_in_strings_iris_and_comments(self):
+        """Brackets and quotes inside literals, IRIs and comments are skipped."""
+        query = """
+        SELECT ?s WHERE {
+            ?s <http://example.org/a#b> "text with } and (" .  # it's a comment {
+            FILTER(?s != 'x')
+        }
+        """
+        assert QueryValidator()._precheck(query, analyze_sparql(query)) is None
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -8,12 +8,21 @@ This module provides comprehensive validation for SPARQL queries, including:
 - Detailed error reporting with suggestions
 - Variable consistency checks
 - URI and literal validation
+
+Parsing with rdflib (pyparsing) dominates validation time, so parse results
+are kept in a bounded LRU ``ParseCache`` shared by validators, and a cheap
+lexer pass rejects obviously malformed queries (unbalanced brackets,
+unterminated strings, no query form) without invoking the parser.
 """
 
+import hashlib
 import re
+import threading
+import time
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Dict, List, Optional, Set, Tuple
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 from rdflib import Graph
 from rdflib.plugins.sparql import prepareQuery
@@ -21,6 +30,7 @@ from rdflib.plugins.sparql.parser import parseQuery
 from rdflib.plugins.sparql.sparql import Query
 
 from ..core.exceptions import QuerySyntaxError, QueryValidationError
+from ..core.sparql_lexer import PUNCT, QUOTE, QueryAnalysis, analyze_sparql
 
 
 class ValidationSeverity(Enum):
@@ -145,6 +155,84 @@ class ValidationResult:
         return "\n".join(lines)
 
 
+class ParseCache:
+    """
+    Bounded LRU cache of rdflib parse results keyed on the query hash.
+
+    Both outcomes are cached: the prepared ``Query`` of a valid query and the
+    error message of one the parser rejected. Thread-safe.
+    """
+
+    def __init__(self, max_entries: int = 512):
+        """
+        Initialize parse cache.
+
+        Args:
+            max_entries: Maximum number of cached parse results
+        """
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[Optional[Query], Optional[str]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+    @staticmethod
+    def key(query: str) -> str:
+        """Cache key of a query."""
+        return hashlib.sha256(query.encode("utf-8")).hexdigest()
+
+    def parse(self, query: str) -> Tuple[Optional[Query], Optional[str]]:
+        """
+        Parse a query, serving repeated queries from cache.
+
+        Args:
+            query: SPARQL query string
+
+        Returns:
+            ``(parsed_query, None)`` on success or ``(None, error_message)``
+        """
+        key = self.key(query)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.stats["hits"] += 1
+                return entry
+            self.stats["misses"] += 1
+
+        try:
+            entry = (prepareQuery(query), None)
+        except Exception as e:
+            entry = (None, str(e))
+
+        with self._lock:
+            self._entries[key] = entry
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats["evictions"] += 1
+        return entry
+
+    def clear(self):
+        """Drop all cached parse results."""
+        with self._lock:
+            self._entries.clear()
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get hit/miss counts, hit rate and size."""
+        with self._lock:
+            stats: Dict[str, Any] = dict(self.stats)
+            stats["size"] = len(self._entries)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        stats["max_entries"] = self.max_entries
+        return stats
+
+
+# Parse cache shared by validators created without their own
+_shared_parse_cache = ParseCache()
+
+_CLOSING_BRACKETS = {')': '(', '}': '{', ']': '['}
+
+
 class QueryValidator:
     """
     Validates SPARQL queries against SPARQL 1.1 specification.
@@ -183,14 +271,24 @@ class QueryValidator:
         'schema': 'http://schema.org/',
     }
 
-    def __init__(self, strict: bool = False):
+    def __init__(self, strict: bool = False, parse_cache: Optional[ParseCache] = None):
         """
         Initialize the validator.
 
         Args:
             strict: If True, enable strict validation mode with more checks
+            parse_cache: Cache of parse results (defaults to a process-wide cache)
         """
         self.strict = strict
+        self.parse_cache = parse_cache or _shared_parse_cache
+
+        # Statistics
+        self._lock = threading.Lock()
+        self.stats = {
+            'validations': 0,
+            'fast_rejections': 0,
+            'total_time_ms': 0.0,
+        }
 
     def validate(self, query: str) -> ValidationResult:
         """
@@ -202,6 +300,32 @@ class QueryValidator:
         Returns:
             ValidationResult containing validation status and any issues found
         """
+        start = time.perf_counter()
+        try:
+            return self._validate(query)
+        finally:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            with self._lock:
+                self.stats['validations'] += 1
+                self.stats['total_time_ms'] += elapsed_ms
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """
+        Get validation counts, latency and parse cache statistics.
+
+        Returns:
+            Dictionary of statistics
+        """
+        with self._lock:
+            stats: Dict[str, Any] = dict(self.stats)
+        stats['average_time_ms'] = (
+            stats['total_time_ms'] / stats['validations'] if stats['validations'] else 0.0
+        )
+        stats['parse_cache'] = self.parse_cache.get_statistics()
+        return stats
+
+    def _validate(self, query: str) -> ValidationResult:
+        """Run all validation checks on a query."""
         issues: List[ValidationIssue] = []
         warnings: List[str] = []
         parsed_query = None
@@ -223,17 +347,28 @@ class QueryValidator:
         common_issues = self._check_common_errors(query)
         issues.extend(common_issues)
 
-        # Try to parse with rdflib
-        try:
-            parsed_query = prepareQuery(query)
+        # Tokenize once; the remaining checks work on the analysis
+        analysis = analyze_sparql(query)
 
+        # Reject obviously malformed queries before the (slow) parser
+        precheck_issue = self._precheck(query, analysis)
+        if precheck_issue:
+            issues.append(precheck_issue)
+            with self._lock:
+                self.stats['fast_rejections'] += 1
+            parse_error = None
+        else:
+            # Try to parse with rdflib
+            parsed_query, parse_error = self.parse_cache.parse(query)
+
+        if parsed_query is not None:
             # If parsing succeeded, do deeper validation
             deeper_issues = self._validate_parsed_query(query, parsed_query)
             issues.extend(deeper_issues)
 
-        except Exception as e:
+        elif parse_error is not None:
             # Parse failed - extract useful information from error
-            error_info = self._parse_error_message(str(e), query)
+            error_info = self._parse_error_message(parse_error, query)
             issues.append(ValidationIssue(
                 severity=ValidationSeverity.ERROR,
                 message=error_info['message'],
@@ -245,13 +380,13 @@ class QueryValidator:
             ))
 
         # Additional validation checks
-        issues.extend(self._check_prefixes(query))
-        issues.extend(self._check_variables(query))
-        issues.extend(self._check_uris(query))
-        issues.extend(self._check_literals(query))
+        issues.extend(self._check_prefixes(analysis))
+        issues.extend(self._check_variables(analysis))
+        issues.extend(self._check_uris(analysis))
+        issues.extend(self._check_literals(query, analysis))
 
         if self.strict:
-            issues.extend(self._check_best_practices(query))
+            issues.extend(self._check_best_practices(query, analysis))
 
         # Determine if query is valid (no errors)
         has_errors = any(i.severity == ValidationSeverity.ERROR for i in issues)
@@ -270,6 +405,55 @@ class QueryValidator:
             }
         )
 
+    def _precheck(self, query: str, analysis: QueryAnalysis) -> Optional[ValidationIssue]:
+        """
+        Report a problem in a query's tokens the parser would certainly reject.
+
+        Comments, strings and IRIs are single tokens, so brackets or quotes
+        inside them do not count.
+
+        Returns:
+            A parse error issue, or None if the query should be parsed
+        """
+        stack: List[Tuple[str, int]] = []
+
+        for kind, value, position in analysis.tokens:
+            if kind == QUOTE:
+                return self._precheck_issue(query, position, "Unterminated string literal",
+                                            "Close the string with a matching quote")
+            if kind != PUNCT:
+                continue
+            if value in '({[':
+                stack.append((value, position))
+            elif value in _CLOSING_BRACKETS:
+                if not stack or stack[-1][0] != _CLOSING_BRACKETS[value]:
+                    return self._precheck_issue(query, position, f"Unexpected '{value}'",
+                                                "Check that brackets are balanced and nested")
+                stack.pop()
+
+        if stack:
+            char, position = stack[-1]
+            return self._precheck_issue(query, position, f"Unclosed '{char}'",
+                                        "Check that brackets are balanced and nested")
+        if not analysis.query_forms:
+            return self._precheck_issue(query, 0, "No query form found",
+                                        "Start the query with SELECT, CONSTRUCT, ASK or DESCRIBE")
+        return None
+
+    def _precheck_issue(self, query: str, position: int, message: str, suggestion: str) -> ValidationIssue:
+        """Build the parse error issue of a failed pre-check."""
+        line = query.count('\n', 0, position) + 1
+        column = position - (query.rfind('\n', 0, position) + 1) + 1
+        return ValidationIssue(
+            severity=ValidationSeverity.ERROR,
+            message=message,
+            line=line,
+            column=column,
+            query_fragment=self._get_context(query, position),
+            suggestion=suggestion,
+            rule="parse_error"
+        )
+
     def _check_balanced_brackets(self, query: str) -> List[ValidationIssue]:
         """Check for balanced parentheses, braces, and brackets."""
         issues = []
@@ -364,26 +548,11 @@ class QueryValidator:
 
         return issues
 
-    def _check_prefixes(self, query: str) -> List[ValidationIssue]:
+    def _check_prefixes(self, analysis: QueryAnalysis) -> List[ValidationIssue]:
         """Validate prefix declarations and usage."""
         issues = []
-
-        # Extract declared prefixes
-        declared_prefixes = {}
-        prefix_pattern = r'PREFIX\s+(\w+):\s*<([^>]+)>'
-        for match in re.finditer(prefix_pattern, query, re.IGNORECASE):
-            prefix_name = match.group(1)
-            prefix_uri = match.group(2)
-            declared_prefixes[prefix_name] = prefix_uri
-
-        # Find used prefixes (e.g., rdf:type, foaf:name)
-        used_prefixes = set()
-        usage_pattern = r'\b(\w+):(\w+)'
-        for match in re.finditer(usage_pattern, query):
-            prefix = match.group(1)
-            # Skip if it looks like a URL scheme
-            if prefix.lower() not in ['http', 'https', 'ftp', 'mailto', 'file']:
-                used_prefixes.add(prefix)
+        declared_prefixes = analysis.prefixes
+        used_prefixes = analysis.used_prefixes
 
         # Check for undeclared prefixes
         for prefix in used_prefixes:
@@ -410,63 +579,36 @@ class QueryValidator:
                 ))
 
         # Check for duplicate prefix declarations
-        prefix_positions = {}
-        for match in re.finditer(prefix_pattern, query, re.IGNORECASE):
-            prefix_name = match.group(1)
-            if prefix_name in prefix_positions:
-                issues.append(ValidationIssue(
-                    severity=ValidationSeverity.ERROR,
-                    message=f"Duplicate PREFIX declaration for '{prefix_name}'",
-                    suggestion=f"Remove duplicate PREFIX declaration",
-                    rule="duplicate_prefix"
-                ))
-            prefix_positions[prefix_name] = match.start()
+        for prefix_name in analysis.duplicate_prefixes:
+            issues.append(ValidationIssue(
+                severity=ValidationSeverity.ERROR,
+                message=f"Duplicate PREFIX declaration for '{prefix_name}'",
+                suggestion=f"Remove duplicate PREFIX declaration",
+                rule="duplicate_prefix"
+            ))
 
         return issues
 
-    def _check_variables(self, query: str) -> List[ValidationIssue]:
+    def _check_variables(self, analysis: QueryAnalysis) -> List[ValidationIssue]:
         """Check variable consistency and usage."""
         issues = []
 
-        # Extract variables from SELECT clause
-        select_pattern = r'SELECT\s+(DISTINCT\s+|REDUCED\s+)?(.*?)(?:WHERE|{)'
-        select_match = re.search(select_pattern, query, re.IGNORECASE | re.DOTALL)
-
-        if select_match:
-            select_clause = select_match.group(2)
+        # Don't validate if SELECT *
+        if analysis.select_star:
+            return issues
 
-            # Don't validate if SELECT *
-            if '*' in select_clause:
-                return issues
-
-            # Extract selected variables
-            selected_vars = set(re.findall(r'\?(\w+)', select_clause))
-
-            # Extract variables used in WHERE clause
-            where_pattern = r'WHERE\s*{(.*?)}'
-            where_match = re.search(where_pattern, query, re.IGNORECASE | re.DOTALL)
-
-            if where_match:
-                where_clause = where_match.group(1)
-                used_vars = set(re.findall(r'\?(\w+)', where_clause))
-
-                # Check for selected variables not used in WHERE
-                for var in selected_vars:
-                    if var not in used_vars:
-                        issues.append(ValidationIssue(
-                            severity=ValidationSeverity.WARNING,
-                            message=f"Variable ?{var} selected but not used in WHERE clause",
-                            suggestion=f"Remove ?{var} from SELECT or use it in WHERE clause",
-                            rule="unused_select_variable"
-                        ))
+        # Check for selected variables not used in WHERE
+        for var in analysis.select_variables:
+            if var not in analysis.where_variables:
+                issues.append(ValidationIssue(
+                    severity=ValidationSeverity.WARNING,
+                    message=f"Variable ?{var} selected but not used in WHERE clause",
+                    suggestion=f"Remove ?{var} from SELECT or use it in WHERE clause",
+                    rule="unused_select_variable"
+                ))
 
         # Check for variables that appear only once (might be typos)
-        all_vars = re.findall(r'\?(\w+)', query)
-        var_counts = {}
-        for var in all_vars:
-            var_counts[var] = var_counts.get(var, 0) + 1
-
-        for var, count in var_counts.items():
+        for var, count in analysis.variables.items():
             if count == 1:
                 issues.append(ValidationIssue(
                     severity=ValidationSeverity.INFO,
@@ -477,22 +619,22 @@ class QueryValidator:
 
         return issues
 
-    def _check_uris(self, query: str) -> List[ValidationIssue]:
+    def _check_uris(self, analysis: QueryAnalysis) -> List[ValidationIssue]:
         """Validate URIs in the query."""
         issues = []
 
-        # Find URIs enclosed in angle brackets
-        uri_pattern = r'<([^>]+)>'
-
-        for match in re.finditer(uri_pattern, query):
-            uri = match.group(1)
+        for token in analysis.iris:
+            uri = token.value[1:-1]
+            if not uri:
+                # <> is the base IRI
+                continue
 
             # Check for common URI issues
             if ' ' in uri:
                 issues.append(ValidationIssue(
                     severity=ValidationSeverity.ERROR,
                     message=f"URI contains spaces: {uri}",
-                    query_fragment=f"<{uri}>",
+                    query_fragment=token.value,
                     suggestion="Remove spaces from URI or encode them as %20",
                     rule="invalid_uri_spaces"
                 ))
@@ -502,7 +644,7 @@ class QueryValidator:
                 issues.append(ValidationIssue(
                     severity=ValidationSeverity.WARNING,
                     message=f"URI may be malformed: {uri}",
-                    query_fragment=f"<{uri}>",
+                    query_fragment=token.value,
                     suggestion="Ensure URI starts with http://, https://, or urn:",
                     rule="malformed_uri"
                 ))
@@ -514,68 +656,53 @@ class QueryValidator:
                     issues.append(ValidationIssue(
                         severity=ValidationSeverity.ERROR,
                         message=f"URI contains invalid character '{char}': {uri}",
-                        query_fragment=f"<{uri}>",
+                        query_fragment=token.value,
                         suggestion=f"Escape or remove '{char}' from URI",
                         rule="invalid_uri_character"
                     ))
 
         return issues
 
-    def _check_literals(self, query: str) -> List[ValidationIssue]:
+    def _check_literals(self, query: str, analysis: QueryAnalysis) -> List[ValidationIssue]:
         """Validate literals in the query."""
         issues = []
 
-        # Check for unescaped quotes in literals
-        # String literals: "..." or '...'
-        string_patterns = [
-            (r'"([^"\\]|\\.)*"', 'double'),  # Double quoted
-            (r"'([^'\\]|\\.)*'", 'single'),  # Single quoted
-        ]
-
-        for pattern, quote_type in string_patterns:
-            matches = list(re.finditer(pattern, query))
-
-            # Check for potential unterminated strings
-            # (This is a heuristic check)
-            lines = query.split('\n')
-            for line_num, line in enumerate(lines, 1):
-                quote_char = '"' if quote_type == 'double' else "'"
-                count = line.count(quote_char)
-                # Count escaped quotes
-                escaped_count = line.count(f'\\{quote_char}')
-                # Odd number of unescaped quotes suggests unterminated string
-                if (count - escaped_count) % 2 != 0:
-                    issues.append(ValidationIssue(
-                        severity=ValidationSeverity.WARNING,
-                        message=f"Possible unterminated {quote_type}-quoted string",
-                        line=line_num,
-                        query_fragment=line.strip()[:50],
-                        suggestion=f"Check for missing {quote_type} quote",
-                        rule="unterminated_string"
-                    ))
+        # Quotes that start no terminated string
+        for position in analysis.unterminated_quotes:
+            quote_type = 'double' if query[position] == '"' else 'single'
+            line_start = query.rfind('\n', 0, position) + 1
+            line_end = query.find('\n', position)
+            line = query[line_start:line_end if line_end != -1 else len(query)]
+            issues.append(ValidationIssue(
+                severity=ValidationSeverity.WARNING,
+                message=f"Possible unterminated {quote_type}-quoted string",
+                line=query.count('\n', 0, position) + 1,
+                query_fragment=line.strip()[:50],
+                suggestion=f"Check for missing {quote_type} quote",
+                rule="unterminated_string"
+            ))
 
         # Check for literals with language tags
-        lang_pattern = r'"([^"]*)"@(\w+)'
-        for match in re.finditer(lang_pattern, query):
-            lang_tag = match.group(2)
+        for literal in analysis.literals:
+            lang_tag = literal.lang
             # Basic check for valid language tag format (ISO 639)
-            if not re.match(r'^[a-z]{2,3}(-[A-Z]{2})?$', lang_tag):
+            if lang_tag is not None and not re.match(r'^[a-z]{2,3}(-[A-Z]{2})?$', lang_tag):
                 issues.append(ValidationIssue(
                     severity=ValidationSeverity.WARNING,
                     message=f"Potentially invalid language tag: @{lang_tag}",
-                    query_fragment=match.group(0),
+                    query_fragment=f"{literal.value}@{lang_tag}",
                     suggestion="Use ISO 639 language codes (e.g., @en, @en-US)",
                     rule="invalid_language_tag"
                 ))
 
         return issues
 
-    def _check_best_practices(self, query: str) -> List[ValidationIssue]:
+    def _check_best_practices(self, query: str, analysis: QueryAnalysis) -> List[ValidationIssue]:
         """Check for best practices and style guidelines."""
         issues = []
 
         # Check for SELECT * (discouraged in production)
-        if re.search(r'SELECT\s+\*', query, re.IGNORECASE):
+        if analysis.select_star:
             issues.append(ValidationIssue(
                 severity=ValidationSeverity.INFO,
                 message="Using SELECT * is discouraged in production",
@@ -584,8 +711,7 @@ class QueryValidator:
             ))
 
         # Check for missing LIMIT (can cause performance issues)
-        query_upper = query.upper()
-        if 'SELECT' in query_upper and 'LIMIT' not in query_upper:
+        if 'SELECT' in analysis.query_forms and analysis.limit is None:
             issues.append(ValidationIssue(
                 severity=ValidationSeverity.INFO,
                 message="Query has no LIMIT clause",
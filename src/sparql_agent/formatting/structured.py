@@ -38,11 +38,13 @@ from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
-from typing import Any, Dict, List, Optional, Set, Union
+from itertools import repeat
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Union
 from urllib.parse import urlparse
 
 from ..core.types import QueryResult, QueryStatus
 from ..core.exceptions import FormattingError, SerializationError, InvalidFormatError
+from ..execution.columnar import ColumnarBindings
 
 
 logger = logging.getLogger(__name__)
@@ -144,6 +146,22 @@ class BaseFormatter(ABC):
                 details={"status": result.status.value}
             )
 
+    def _column_values(self, bindings: ColumnarBindings, columns: List[str]) -> List[Iterable[Any]]:
+        """
+        Get the value list of each column from a columnar result without copying.
+
+        Args:
+            bindings: Columnar bindings
+            columns: Column names (columns missing from the result are all null)
+
+        Returns:
+            One value iterable per column
+        """
+        return [
+            bindings.column(col) if col in bindings.variables else repeat(None, len(bindings))
+            for col in columns
+        ]
+
     def _extract_value(self, binding: Any, include_type: bool = False) -> Union[str, Dict[str, Any]]:
         """
         Extract value from a binding.
@@ -308,18 +326,22 @@ class JSONFormatter(BaseFormatter):
             }
         }
 
-        # Add bindings
-        for binding_row in result.bindings:
-            binding_dict = {}
-            for var, value in binding_row.items():
-                if self.config.include_types and isinstance(value, dict):
-                    binding_dict[var] = value
-                else:
-                    binding_dict[var] = {
-                        "type": self._detect_type(value),
-                        "value": self._extract_value(value, include_type=False)
-                    }
-            structure["results"]["bindings"].append(binding_dict)
+        if isinstance(result.bindings, ColumnarBindings):
+            # Columnar results carry the real term types, datatypes and languages
+            structure["results"]["bindings"] = list(result.bindings.iter_terms())
+        else:
+            # Add bindings
+            for binding_row in result.bindings:
+                binding_dict = {}
+                for var, value in binding_row.items():
+                    if self.config.include_types and isinstance(value, dict):
+                        binding_dict[var] = value
+                    else:
+                        binding_dict[var] = {
+                            "type": self._detect_type(value),
+                            "value": self._extract_value(value, include_type=False)
+                        }
+                structure["results"]["bindings"].append(binding_dict)
 
         # Add metadata if requested
         if self.config.include_metadata:
@@ -455,6 +477,13 @@ class CSVFormatter(BaseFormatter):
 
             writer_kwargs.update(kwargs)
 
+            if isinstance(result.bindings, ColumnarBindings):
+                writer = csv.writer(output, **writer_kwargs)
+                if self.include_header:
+                    writer.writerow(columns)
+                writer.writerows(self._iter_columnar_rows(result.bindings, columns))
+                return output.getvalue()
+
             writer = csv.DictWriter(
                 output,
                 fieldnames=columns,
@@ -515,6 +544,28 @@ class CSVFormatter(BaseFormatter):
 
         return sorted(list(columns))
 
+    def _iter_columnar_rows(
+        self, bindings: ColumnarBindings, columns: List[str]
+    ) -> Iterator[List[str]]:
+        """
+        Produce CSV rows straight from the columns of a columnar result.
+
+        Args:
+            bindings: Columnar bindings
+            columns: Column names
+
+        Yields:
+            Row values as strings, in column order
+        """
+        null_value = self.config.null_value
+        max_width = self.config.max_column_width
+
+        for values in zip(*self._column_values(bindings, columns)):
+            row = [null_value if value is None else str(value) for value in values]
+            if max_width:
+                row = [v[:max_width] + "..." if len(v) > max_width else v for v in row]
+            yield row
+
     def _process_row(self, binding_row: Dict[str, Any], columns: List[str]) -> Dict[str, str]:
         """
         Process a single row for CSV output.
@@ -718,6 +769,13 @@ class DataFrameFormatter(BaseFormatter):
         Returns:
             Dictionary mapping column names to value lists
         """
+        if isinstance(result.bindings, ColumnarBindings):
+            # Hand the column lists to pandas as they are
+            variables = result.variables or result.bindings.variables
+            columns = self._column_values(result.bindings, variables)
+            return {var: list(values) if not isinstance(values, list) else values
+                    for var, values in zip(variables, columns)}
+
         # Initialize columns
         data = {var: [] for var in result.variables}
 
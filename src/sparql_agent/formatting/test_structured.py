@@ -12,6 +12,8 @@ from typing import Dict, List
 
 from ..core.types import QueryResult, QueryStatus
 from ..core.exceptions import FormattingError, SerializationError
+from ..execution.columnar import ColumnarBindings
+from ..execution.executor import ResultParser
 from .structured import (
     BaseFormatter,
     CSVFormatter,
@@ -440,6 +442,67 @@ class TestDataFrameFormatter:
             DataFrameFormatter()
 
 
+# Columnar result tests
+
+@pytest.fixture
+def columnar_result(simple_result):
+    """The simple result with columnar bindings."""
+    return QueryResult(
+        status=QueryStatus.SUCCESS,
+        bindings=ColumnarBindings.from_rows(simple_result.bindings, simple_result.variables),
+        variables=simple_result.variables,
+        row_count=simple_result.row_count,
+    )
+
+
+class TestColumnarFormatting:
+    """Formatters read columnar results column by column."""
+
+    def test_csv_matches_row_output(self, simple_result, columnar_result):
+        """CSV output is identical for row and columnar results."""
+        formatter = CSVFormatter()
+        assert formatter.format(columnar_result) == formatter.format(simple_result)
+
+    def test_csv_missing_values_and_width(self):
+        """Unbound cells use the null value and long values are truncated."""
+        result = QueryResult(
+            status=QueryStatus.SUCCESS,
+            bindings=ColumnarBindings.from_rows([{"a": "x" * 20}, {"b": "y"}]),
+            variables=["a", "b"],
+            row_count=2,
+        )
+        config = FormatterConfig(null_value="NA", max_column_width=5)
+        lines = CSVFormatter(config=config).format(result).splitlines()
+
+        assert lines == ["a,b", "xxxxx...,NA", "NA,y"]
+
+    def test_json_uses_stored_term_kinds(self):
+        """JSON output carries datatypes and languages from the columns."""
+        data = {
+            "head": {"vars": ["label"]},
+            "results": {"bindings": [
+                {"label": {"type": "literal", "value": "Hund", "xml:lang": "de"}},
+            ]},
+        }
+        result = QueryResult(
+            status=QueryStatus.SUCCESS,
+            bindings=ResultParser.parse_json_columnar(data),
+            variables=["label"],
+            row_count=1,
+        )
+        output = json.loads(JSONFormatter().format(result))
+        assert output["results"]["bindings"] == data["results"]["bindings"]
+
+    def test_dataframe_uses_columns(self, columnar_result):
+        """DataFrame data is built from the column lists directly."""
+        pytest.importorskip("pandas")
+
+        df = DataFrameFormatter(infer_types=False).format(columnar_result)
+
+        assert list(df.columns) == ["name", "age", "city"]
+        assert df.iloc[1]["name"] == "Bob"
+
+
 # FormatDetector Tests
 
 class TestFormatDetector:
@@ -9,6 +9,8 @@ Provides:
 - ProviderManager: Manages multiple providers with load balancing and fallback
 - Provider implementations: OpenAI, Anthropic, Local models, etc.
 - Unified interfaces for generation, streaming, token counting, and cost tracking
+- LLMResponseCache: Exact and near-duplicate response caching
+- LLMRateLimiter: Request and token rate limits shared per API key
 """
 
 from .client import (
@@ -36,6 +38,18 @@ from .client import (
     reset_provider_manager,
 )
 
+from .response_cache import (
+    LLMResponseCache,
+    normalize_question,
+    request_fingerprint,
+)
+
+from .rate_limiter import (
+    LLMRateLimiter,
+    get_rate_limiter,
+    reset_rate_limiters,
+)
+
 # Optional provider imports - only available if dependencies are installed
 _OPENAI_AVAILABLE = False
 _ANTHROPIC_AVAILABLE = False
@@ -86,6 +100,16 @@ __all__ = [
     # Global functions
     "get_provider_manager",
     "reset_provider_manager",
+
+    # Response caching
+    "LLMResponseCache",
+    "normalize_question",
+    "request_fingerprint",
+
+    # Rate limiting
+    "LLMRateLimiter",
+    "get_rate_limiter",
+    "reset_rate_limiters",
 ]
 
 # Add optional providers to exports if available
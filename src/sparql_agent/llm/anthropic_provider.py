@@ -14,6 +14,7 @@ Features:
 - Comprehensive error handling
 """
 
+import asyncio
 import json
 import os
 import time
@@ -48,6 +49,7 @@ from .client import (
     ModelCapabilities,
     RetryConfig,
 )
+from .rate_limiter import LLMRateLimiter, get_rate_limiter
 from ..core.exceptions import (
     LLMAuthenticationError,
     LLMConnectionError,
@@ -150,6 +152,9 @@ class AnthropicProvider(LLMClient):
         timeout: float = 60.0,
         retry_config: Optional[RetryConfig] = None,
         default_max_tokens: int = 4096,
+        requests_per_minute: Optional[float] = 1200,
+        tokens_per_minute: Optional[float] = None,
+        rate_limiter: Optional[LLMRateLimiter] = None,
         **kwargs
     ):
         """
@@ -162,6 +167,12 @@ class AnthropicProvider(LLMClient):
             timeout: Request timeout in seconds (default: 60.0)
             retry_config: Retry configuration
             default_max_tokens: Default maximum tokens to generate (default: 4096)
+            requests_per_minute: Request limit of the API key (default: 1200;
+                None for no limit)
+            tokens_per_minute: Token limit of the API key (default: no limit)
+            rate_limiter: Rate limiter to use instead of the one shared by
+                all providers with the same API key; the shared limiter keeps
+                the strictest limits of its providers
             **kwargs: Additional arguments
 
         Raises:
@@ -215,10 +226,14 @@ class AnthropicProvider(LLMClient):
             client_kwargs["base_url"] = api_base
 
         self.client = Anthropic(**client_kwargs)
+        self.async_client = AsyncAnthropic(**client_kwargs)
 
-        # Rate limiting tracking
-        self._last_request_time = 0.0
-        self._min_request_interval = 0.05  # 50ms minimum between requests
+        # Rate limiting, shared by all providers using the same API key
+        self.rate_limiter = rate_limiter or get_rate_limiter(
+            self.api_key,
+            requests_per_minute=requests_per_minute,
+            tokens_per_minute=tokens_per_minute,
+        )
 
     def get_provider(self) -> LLMProvider:
         """Return the provider type."""
@@ -254,8 +269,88 @@ class AnthropicProvider(LLMClient):
             LLMError: On generation failure
         """
         # Enforce rate limiting
-        self._enforce_rate_limit()
+        estimated_tokens = self._estimate_request_tokens(request)
+        queue_wait = self._enforce_rate_limit(estimated_tokens)
+
+        request_params = self._build_request_params(request)
+
+        try:
+            start_time = time.time()
+
+            # Make API request
+            response = self.client.messages.create(**request_params)
+
+            latency_ms = (time.time() - start_time) * 1000
+            result = self._convert_response(response, request, request_params, latency_ms)
+            result.metrics.queue_wait_ms = queue_wait * 1000
+            self.rate_limiter.record_usage(estimated_tokens, result.usage.total_tokens)
+            return result
+
+        except Exception as e:
+            raise self._translate_error(e) from e
+
+    async def _agenerate_impl(
+        self,
+        request: LLMRequest,
+        first_token: Optional[asyncio.Event] = None
+    ) -> ClientLLMResponse:
+        """
+        Provider-specific implementation of async text generation.
+
+        Uses the async Anthropic client, so cancelling the task aborts the
+        request. When ``first_token`` is given the response is streamed to
+        detect the first token, and the complete message is converted as usual.
+
+        Args:
+            request: Generation request
+            first_token: Event to set once the first output token arrives
+
+        Returns:
+            LLM response
+
+        Raises:
+            LLMError: On generation failure
+        """
+        estimated_tokens = self._estimate_request_tokens(request)
+        queue_wait = await self._async_enforce_rate_limit(estimated_tokens)
 
+        request_params = self._build_request_params(request)
+
+        try:
+            start_time = time.time()
+            time_to_first_token_ms = None
+
+            if first_token is None:
+                response = await self.async_client.messages.create(**request_params)
+            else:
+                async with self.async_client.messages.stream(**request_params) as stream:
+                    async for _ in stream.text_stream:
+                        if time_to_first_token_ms is None:
+                            time_to_first_token_ms = (time.time() - start_time) * 1000
+                            first_token.set()
+                    response = await stream.get_final_message()
+                first_token.set()
+
+            latency_ms = (time.time() - start_time) * 1000
+            result = self._convert_response(response, request, request_params, latency_ms)
+            result.metrics.time_to_first_token_ms = time_to_first_token_ms
+            result.metrics.queue_wait_ms = queue_wait * 1000
+            self.rate_limiter.record_usage(estimated_tokens, result.usage.total_tokens)
+            return result
+
+        except Exception as e:
+            raise self._translate_error(e) from e
+
+    def _build_request_params(self, request: LLMRequest) -> Dict[str, Any]:
+        """
+        Build Messages API parameters for a request.
+
+        Args:
+            request: Generation request
+
+        Returns:
+            Keyword arguments for ``messages.create``
+        """
         # Set default max_tokens
         max_tokens = request.max_tokens or self.default_max_tokens
         max_tokens = min(max_tokens, CLAUDE_MODELS[self.model]["max_output"])
@@ -277,7 +372,7 @@ class AnthropicProvider(LLMClient):
         }
 
         if request.system_prompt:
-            request_params["system"] = request.system_prompt
+            request_params["system"] = self._build_system_param(request)
 
         if request.stop_sequences:
             request_params["stop_sequences"] = request.stop_sequences
@@ -292,108 +387,153 @@ class AnthropicProvider(LLMClient):
         if request.tools:
             request_params["tools"] = self._convert_tools_to_anthropic_format(request.tools)
 
-        try:
-            start_time = time.time()
+        return request_params
 
-            # Make API request
-            response = self.client.messages.create(**request_params)
+    def _build_system_param(self, request: LLMRequest) -> Union[str, List[Dict[str, Any]]]:
+        """
+        Build the system parameter, marking it cacheable if requested.
 
-            latency_ms = (time.time() - start_time) * 1000
+        Args:
+            request: Generation request with a system prompt
+
+        Returns:
+            System prompt text, or a text block with cache control
+        """
+        if not request.cache_system_prompt:
+            return request.system_prompt
+        return [{
+            "type": "text",
+            "text": request.system_prompt,
+            "cache_control": {"type": "ephemeral"},
+        }]
+
+    def _convert_response(
+        self,
+        response: Message,
+        request: LLMRequest,
+        request_params: Dict[str, Any],
+        latency_ms: float
+    ) -> ClientLLMResponse:
+        """
+        Convert a Claude message into the unified response format.
+
+        Args:
+            response: Claude message
+            request: Generation request
+            request_params: Parameters the message was requested with
+            latency_ms: Request latency in milliseconds
 
-            # Extract content
-            content = self._extract_content(response)
+        Returns:
+            LLM response
+        """
+        # Extract content
+        content = self._extract_content(response)
+
+        # Extract tool calls if present
+        tool_calls = self._extract_tool_calls(response)
+
+        # Calculate metrics
+        prompt_tokens = response.usage.input_tokens
+        completion_tokens = response.usage.output_tokens
+        total_tokens = prompt_tokens + completion_tokens
+
+        tokens_per_second = completion_tokens / (latency_ms / 1000) if latency_ms > 0 else 0
+
+        return ClientLLMResponse(
+            content=content,
+            model=response.model,
+            provider=self.get_provider().value,
+            finish_reason=response.stop_reason or "stop",
+            usage=TokenUsage(
+                prompt_tokens=prompt_tokens,
+                completion_tokens=completion_tokens,
+                total_tokens=total_tokens,
+            ),
+            metrics=GenerationMetrics(
+                latency_ms=latency_ms,
+                tokens_per_second=tokens_per_second,
+                provider=self.get_provider().value,
+                model=response.model,
+            ),
+            tool_calls=tool_calls if tool_calls else None,
+            raw_response=response,
+            metadata={
+                "stop_reason": response.stop_reason,
+                "system_prompt": request.system_prompt,
+                "temperature": request.temperature,
+                "max_tokens": request_params["max_tokens"],
+                "message_id": response.id,
+                "cache_creation_input_tokens": getattr(response.usage, "cache_creation_input_tokens", None),
+                "cache_read_input_tokens": getattr(response.usage, "cache_read_input_tokens", None),
+            }
+        )
 
-            # Extract tool calls if present
-            tool_calls = self._extract_tool_calls(response)
+    def _translate_error(self, error: Exception) -> LLMError:
+        """
+        Map an Anthropic SDK exception to the LLM error hierarchy.
 
-            # Calculate metrics
-            prompt_tokens = response.usage.input_tokens
-            completion_tokens = response.usage.output_tokens
-            total_tokens = prompt_tokens + completion_tokens
+        Args:
+            error: Exception raised while generating
 
-            tokens_per_second = completion_tokens / (latency_ms / 1000) if latency_ms > 0 else 0
+        Returns:
+            Corresponding LLMError
+        """
+        if isinstance(error, LLMError):
+            return error
 
-            return ClientLLMResponse(
-                content=content,
-                model=response.model,
-                provider=self.get_provider().value,
-                finish_reason=response.stop_reason or "stop",
-                usage=TokenUsage(
-                    prompt_tokens=prompt_tokens,
-                    completion_tokens=completion_tokens,
-                    total_tokens=total_tokens,
-                ),
-                metrics=GenerationMetrics(
-                    latency_ms=latency_ms,
-                    tokens_per_second=tokens_per_second,
-                    provider=self.get_provider().value,
-                    model=response.model,
-                ),
-                tool_calls=tool_calls if tool_calls else None,
-                raw_response=response,
-                metadata={
-                    "stop_reason": response.stop_reason,
-                    "system_prompt": request.system_prompt,
-                    "temperature": request.temperature,
-                    "max_tokens": max_tokens,
-                    "message_id": response.id,
-                }
+        if isinstance(error, anthropic.AuthenticationError):
+            return LLMAuthenticationError(
+                f"Anthropic authentication failed: {str(error)}",
+                details={"error": str(error)}
             )
 
-        except anthropic.AuthenticationError as e:
-            raise LLMAuthenticationError(
-                f"Anthropic authentication failed: {str(e)}",
-                details={"error": str(e)}
-            ) from e
-
-        except anthropic.RateLimitError as e:
-            raise LLMRateLimitError(
-                f"Anthropic rate limit exceeded: {str(e)}",
-                details={"error": str(e)}
-            ) from e
+        if isinstance(error, anthropic.RateLimitError):
+            return LLMRateLimitError(
+                f"Anthropic rate limit exceeded: {str(error)}",
+                details={"error": str(error)}
+            )
 
-        except anthropic.APITimeoutError as e:
-            raise LLMTimeoutError(
-                f"Anthropic request timed out: {str(e)}",
+        if isinstance(error, anthropic.APITimeoutError):
+            return LLMTimeoutError(
+                f"Anthropic request timed out: {str(error)}",
                 details={"timeout": self.timeout}
-            ) from e
+            )
 
-        except anthropic.APIConnectionError as e:
-            raise LLMConnectionError(
-                f"Failed to connect to Anthropic API: {str(e)}",
-                details={"error": str(e)}
-            ) from e
+        if isinstance(error, anthropic.APIConnectionError):
+            return LLMConnectionError(
+                f"Failed to connect to Anthropic API: {str(error)}",
+                details={"error": str(error)}
+            )
 
-        except anthropic.BadRequestError as e:
+        if isinstance(error, anthropic.BadRequestError):
             # Check for specific error types
-            error_message = str(e)
+            error_message = str(error)
             if "quota" in error_message.lower() or "billing" in error_message.lower():
-                raise LLMQuotaExceededError(
+                return LLMQuotaExceededError(
                     f"Anthropic quota exceeded: {error_message}",
                     details={"error": error_message}
-                ) from e
+                )
             elif "content" in error_message.lower() or "policy" in error_message.lower():
-                raise LLMContentFilterError(
+                return LLMContentFilterError(
                     f"Content filtered by Anthropic: {error_message}",
                     details={"error": error_message}
-                ) from e
+                )
             else:
-                raise LLMError(
+                return LLMError(
                     f"Anthropic API error: {error_message}",
                     details={"error": error_message}
-                ) from e
+                )
 
-        except anthropic.APIError as e:
-            raise LLMError(
-                f"Anthropic API error: {str(e)}",
-                details={"error": str(e)}
-            ) from e
+        if isinstance(error, anthropic.APIError):
+            return LLMError(
+                f"Anthropic API error: {str(error)}",
+                details={"error": str(error)}
+            )
 
-        except Exception as e:
-            raise LLMError(
-                f"Unexpected error during Anthropic generation: {str(e)}",
-                details={"error": str(e), "type": type(e).__name__}
-            ) from e
+        return LLMError(
+            f"Unexpected error during Anthropic generation: {str(error)}",
+            details={"error": str(error), "type": type(error).__name__}
+        )
 
     def _generate_streaming_impl(
         self,
@@ -411,7 +551,7 @@ class AnthropicProvider(LLMClient):
         Raises:
             LLMError: On generation failure
         """
-        self._enforce_rate_limit()
+        queue_wait = self._enforce_rate_limit(self._estimate_request_tokens(request))
 
         max_tokens = request.max_tokens or self.default_max_tokens
         max_tokens = min(max_tokens, CLAUDE_MODELS[self.model]["max_output"])
@@ -427,7 +567,7 @@ class AnthropicProvider(LLMClient):
         }
 
         if request.system_prompt:
-            request_params["system"] = request.system_prompt
+            request_params["system"] = self._build_system_param(request)
 
         if request.stop_sequences:
             request_params["stop_sequences"] = request.stop_sequences
@@ -464,7 +604,8 @@ class AnthropicProvider(LLMClient):
                 type=StreamChunkType.DONE,
                 content="",
                 metadata={
-                    "total_time_ms": (time.time() - start_time) * 1000
+                    "total_time_ms": (time.time() - start_time) * 1000,
+                    "queue_wait_ms": queue_wait * 1000,
                 }
             )
 
@@ -574,21 +715,35 @@ class AnthropicProvider(LLMClient):
 
         return anthropic_tools
 
-    def _enforce_rate_limit(self) -> None:
+    def _estimate_request_tokens(self, request: LLMRequest) -> int:
         """
-        Enforce rate limiting by waiting if necessary.
+        Estimate the tokens of a request for the token rate limit.
+
+        Output tokens are counted at ``max_tokens``, since the limiter is
+        corrected with the total usage once the response arrives.
+        """
+        text = request.prompt
+        if request.system_prompt:
+            text = request.system_prompt + "\n" + text
+        max_tokens = request.max_tokens or self.default_max_tokens
+        max_tokens = min(max_tokens, CLAUDE_MODELS[self.model]["max_output"])
+        return self.count_tokens(text) + max_tokens
 
-        This ensures we don't exceed Anthropic's rate limits by spacing
-        out requests appropriately.
+    def _enforce_rate_limit(self, tokens: int = 0) -> float:
         """
-        current_time = time.time()
-        time_since_last_request = current_time - self._last_request_time
+        Wait for the shared rate limiter to admit a request.
+
+        Args:
+            tokens: Estimated tokens of the request
 
-        if time_since_last_request < self._min_request_interval:
-            sleep_time = self._min_request_interval - time_since_last_request
-            time.sleep(sleep_time)
+        Returns:
+            Seconds waited
+        """
+        return self.rate_limiter.acquire(tokens)
 
-        self._last_request_time = time.time()
+    async def _async_enforce_rate_limit(self, tokens: int = 0) -> float:
+        """Wait for the shared rate limiter without blocking the event loop."""
+        return await self.rate_limiter.aacquire(tokens)
 
     @staticmethod
     def list_available_models() -> List[str]:
@@ -31,6 +31,7 @@ from ..core.exceptions import (
     LLMQuotaExceededError,
     LLMContentFilterError,
 )
+from .response_cache import LLMResponseCache
 
 
 logger = logging.getLogger(__name__)
@@ -91,6 +92,7 @@ class GenerationMetrics:
     latency_ms: float
     tokens_per_second: float
     time_to_first_token_ms: Optional[float] = None
+    queue_wait_ms: Optional[float] = None  # time spent waiting for a rate limiter
     provider: Optional[str] = None
     model: Optional[str] = None
     timestamp: datetime = field(default_factory=datetime.now)
@@ -104,6 +106,8 @@ class LLMRequest:
     Attributes:
         prompt: The input prompt/message
         system_prompt: Optional system message
+        cache_system_prompt: Whether the system message is a stable prefix
+            that providers supporting prompt caching should cache
         max_tokens: Maximum tokens to generate
         temperature: Sampling temperature (0.0-2.0)
         top_p: Nucleus sampling parameter
@@ -119,6 +123,7 @@ class LLMRequest:
     """
     prompt: str
     system_prompt: Optional[str] = None
+    cache_system_prompt: bool = False
     max_tokens: int = 2000
     temperature: float = 0.7
     top_p: float = 1.0
@@ -209,6 +214,7 @@ class LLMClient(ABC):
         api_base: Optional[str] = None,
         timeout: float = 60.0,
         retry_config: Optional[RetryConfig] = None,
+        response_cache: Optional[LLMResponseCache] = None,
         **kwargs
     ):
         """
@@ -220,6 +226,7 @@ class LLMClient(ABC):
             api_base: Base URL for API
             timeout: Request timeout in seconds
             retry_config: Retry configuration
+            response_cache: Cache consulted by ``generate()`` before calling the provider
             **kwargs: Additional provider-specific parameters
         """
         self.model = model
@@ -227,6 +234,7 @@ class LLMClient(ABC):
         self.api_base = api_base
         self.timeout = timeout
         self.retry_config = retry_config or RetryConfig()
+        self.response_cache = response_cache
         self.extra_params = kwargs
 
         # Metrics tracking
@@ -281,6 +289,35 @@ class LLMClient(ABC):
         """
         pass
 
+    async def _agenerate_impl(
+        self,
+        request: LLMRequest,
+        first_token: Optional[asyncio.Event] = None
+    ) -> LLMResponse:
+        """
+        Provider-specific implementation of async text generation.
+
+        The default runs ``_generate_impl`` in a worker thread. Providers with
+        an async SDK override this so that cancelling the task aborts the HTTP
+        request.
+
+        Args:
+            request: Generation request
+            first_token: Event to set once the first output token arrives
+                (providers that do not stream set it when the response is complete)
+
+        Returns:
+            LLM response
+
+        Raises:
+            LLMError: On generation failure
+        """
+        loop = asyncio.get_running_loop()
+        response = await loop.run_in_executor(None, self._generate_impl, request)
+        if first_token is not None:
+            first_token.set()
+        return response
+
     @abstractmethod
     def count_tokens(self, text: str) -> int:
         """
@@ -325,6 +362,9 @@ class LLMClient(ABC):
         """
         Generate response with retry logic and error handling.
 
+        If a response cache is configured, cached responses are returned
+        without calling the provider and successful responses are stored.
+
         Args:
             request: Generation request
 
@@ -334,23 +374,76 @@ class LLMClient(ABC):
         Raises:
             LLMError: On generation failure after retries
         """
+        cached = self._lookup_cache(request)
+        if cached is not None:
+            return cached
+
         last_error = None
         retry_count = 0
 
         while retry_count <= self.retry_config.max_retries:
             try:
-                start_time = time.time()
                 response = self._generate_impl(request)
+                self._record_response(request, response)
+                return response
+
+            except (LLMTimeoutError, LLMRateLimitError, LLMConnectionError) as e:
+                last_error = e
+                self._error_count += 1
 
-                # Update metrics
-                self._request_count += 1
-                self._total_tokens += response.usage.total_tokens
-                cost = self.estimate_cost(
-                    response.usage.prompt_tokens,
-                    response.usage.completion_tokens
+                if not self._should_retry(e, retry_count):
+                    raise
+
+                delay = self._calculate_retry_delay(retry_count)
+                logger.warning(
+                    f"Request failed (attempt {retry_count + 1}/{self.retry_config.max_retries + 1}), "
+                    f"retrying in {delay:.2f}s: {e}"
                 )
-                self._total_cost += cost
+                time.sleep(delay)
+                retry_count += 1
+
+            except LLMError:
+                self._error_count += 1
+                raise
+
+        # All retries exhausted
+        raise last_error
+
+    async def agenerate(
+        self,
+        request: LLMRequest,
+        first_token: Optional[asyncio.Event] = None
+    ) -> LLMResponse:
+        """
+        Generate response asynchronously with retry logic and error handling.
+
+        Behaves like ``generate()`` but waits between retries without blocking
+        the event loop. The task can be cancelled, e.g. when a hedged request
+        to another provider wins.
 
+        Args:
+            request: Generation request
+            first_token: Event set once the first output token arrives
+
+        Returns:
+            LLM response
+
+        Raises:
+            LLMError: On generation failure after retries
+        """
+        cached = self._lookup_cache(request)
+        if cached is not None:
+            if first_token is not None:
+                first_token.set()
+            return cached
+
+        last_error = None
+        retry_count = 0
+
+        while retry_count <= self.retry_config.max_retries:
+            try:
+                response = await self._agenerate_impl(request, first_token)
+                self._record_response(request, response)
                 return response
 
             except (LLMTimeoutError, LLMRateLimitError, LLMConnectionError) as e:
@@ -365,7 +458,7 @@ class LLMClient(ABC):
                     f"Request failed (attempt {retry_count + 1}/{self.retry_config.max_retries + 1}), "
                     f"retrying in {delay:.2f}s: {e}"
                 )
-                time.sleep(delay)
+                await asyncio.sleep(delay)
                 retry_count += 1
 
             except LLMError:
@@ -375,6 +468,27 @@ class LLMClient(ABC):
         # All retries exhausted
         raise last_error
 
+    def _lookup_cache(self, request: LLMRequest) -> Optional[LLMResponse]:
+        """Return a cached response for the request, if any."""
+        if self.response_cache is None:
+            return None
+        cached = self.response_cache.lookup(request, self.model)
+        if cached is not None:
+            self._cache_hits += 1
+        return cached
+
+    def _record_response(self, request: LLMRequest, response: LLMResponse) -> None:
+        """Update usage metrics and cache a successful response."""
+        self._request_count += 1
+        self._total_tokens += response.usage.total_tokens
+        self._total_cost += self.estimate_cost(
+            response.usage.prompt_tokens,
+            response.usage.completion_tokens
+        )
+
+        if self.response_cache is not None:
+            self.response_cache.put(request, self.model, response)
+
     def generate_streaming(
         self,
         request: LLMRequest,
@@ -445,6 +559,7 @@ class LLMClient(ABC):
             "total_cost_usd": self._total_cost,
             "error_count": self._error_count,
             "cache_hits": self._cache_hits,
+            "cache_hit_rate": self._cache_hits / max(self._cache_hits + self._request_count, 1),
             "error_rate": self._error_count / max(self._request_count, 1),
             "avg_tokens_per_request": self._total_tokens / max(self._request_count, 1),
             "avg_cost_per_request": self._total_cost / max(self._request_count, 1),
@@ -503,15 +618,29 @@ class ProviderManager:
     - Load balancing across providers
     - Provider health tracking
     - Cost optimization
+    - Shared response cache
     """
 
-    def __init__(self):
-        """Initialize provider manager."""
+    def __init__(self, response_cache: Optional[LLMResponseCache] = None):
+        """
+        Initialize provider manager.
+
+        Args:
+            response_cache: Cache shared by registered providers that have none
+        """
         self._providers: Dict[str, LLMClient] = {}
         self._provider_priorities: Dict[str, int] = {}
         self._provider_health: Dict[str, float] = {}
         self._provider_registry: Dict[LLMProvider, type] = {}
         self._default_provider: Optional[str] = None
+        self.response_cache = response_cache
+
+        # Hedging statistics
+        self.hedge_stats = {
+            "hedged_requests": 0,
+            "hedge_wins": 0,
+            "cancelled_requests": 0,
+        }
 
     def register_provider_class(
         self,
@@ -547,6 +676,9 @@ class ProviderManager:
             priority: Priority level (higher = preferred)
             set_as_default: Set as default provider
         """
+        if self.response_cache is not None and client.response_cache is None:
+            client.response_cache = self.response_cache
+
         self._providers[name] = client
         self._provider_priorities[name] = priority
         self._provider_health[name] = 1.0  # Initial health score
@@ -559,6 +691,17 @@ class ProviderManager:
             f"({client.get_provider().value}, model: {client.model})"
         )
 
+    def set_response_cache(self, cache: Optional[LLMResponseCache]) -> None:
+        """
+        Share a response cache with all registered and future providers.
+
+        Args:
+            cache: Response cache (None disables caching)
+        """
+        self.response_cache = cache
+        for client in self._providers.values():
+            client.response_cache = cache
+
     def unregister_provider(self, name: str) -> None:
         """
         Unregister a provider.
@@ -680,6 +823,132 @@ class ProviderManager:
             }
         )
 
+    async def agenerate_with_fallback(
+        self,
+        request: LLMRequest,
+        provider_names: Optional[List[str]] = None,
+        fallback_on_error: bool = True,
+        hedge_delay: Optional[float] = None,
+        max_hedges: int = 1
+    ) -> LLMResponse:
+        """
+        Generate asynchronously with fallback and optional hedging.
+
+        Without ``hedge_delay`` providers are tried one after another, as in
+        ``generate_with_fallback()``. With it, the same request is also sent to
+        the next provider if the current one has not produced a first token
+        within ``hedge_delay`` seconds. The first successful response wins and
+        the other requests are cancelled.
+
+        Args:
+            request: Generation request
+            provider_names: Ordered list of providers to try (None = all by priority)
+            fallback_on_error: Enable fallback on errors
+            hedge_delay: Latency budget for the first token before hedging (None = no hedging)
+            max_hedges: Maximum number of hedged requests
+
+        Returns:
+            LLM response
+
+        Raises:
+            LLMError: If all providers fail
+        """
+        if provider_names is None:
+            provider_names = self._get_sorted_providers()
+
+        if not provider_names:
+            raise LLMError("No providers available")
+
+        remaining = list(provider_names)
+        in_flight: Dict["asyncio.Task[LLMResponse]", str] = {}
+        hedges = 0
+        hedged = False
+        last_error: Optional[Exception] = None
+
+        def launch() -> asyncio.Event:
+            name = remaining.pop(0)
+            first_token = asyncio.Event()
+            task = asyncio.ensure_future(
+                self.get_provider(name).agenerate(request, first_token=first_token)
+            )
+            in_flight[task] = name
+            return first_token
+
+        first_token = launch()
+
+        try:
+            while in_flight:
+                waiters: Set["asyncio.Future[Any]"] = set(in_flight)
+                token_waiter = None
+                can_hedge = (
+                    hedge_delay is not None and remaining and hedges < max_hedges
+                    and not first_token.is_set()
+                )
+                if can_hedge:
+                    token_waiter = asyncio.ensure_future(first_token.wait())
+                    waiters.add(token_waiter)
+
+                done, _ = await asyncio.wait(
+                    waiters,
+                    timeout=hedge_delay if can_hedge else None,
+                    return_when=asyncio.FIRST_COMPLETED
+                )
+                if token_waiter is not None and token_waiter not in done:
+                    token_waiter.cancel()
+
+                if not done:
+                    # No first token within the budget: hedge to the next provider
+                    hedges += 1
+                    hedged = True
+                    self.hedge_stats["hedged_requests"] += 1
+                    logger.info(
+                        f"No first token from '{list(in_flight.values())[-1]}' "
+                        f"within {hedge_delay:.2f}s, hedging to '{remaining[0]}'"
+                    )
+                    first_token = launch()
+                    continue
+
+                for task in done:
+                    if task is token_waiter:
+                        continue
+                    provider_name = in_flight.pop(task)
+                    error = task.exception()
+
+                    if error is None:
+                        self._update_health(provider_name, success=True)
+                        if hedged and provider_name != provider_names[0]:
+                            self.hedge_stats["hedge_wins"] += 1
+                        return task.result()
+
+                    last_error = error
+                    if isinstance(error, LLMError):
+                        self._update_health(provider_name, success=False)
+                    logger.warning(
+                        f"Provider '{provider_name}' failed: {error}. "
+                        f"{'Trying fallback...' if fallback_on_error else 'No fallback.'}"
+                    )
+                    if not fallback_on_error or not isinstance(error, LLMError):
+                        raise error
+
+                if not in_flight and remaining:
+                    first_token = launch()
+
+        finally:
+            for task in in_flight:
+                task.cancel()
+            if in_flight:
+                self.hedge_stats["cancelled_requests"] += len(in_flight)
+                await asyncio.gather(*in_flight, return_exceptions=True)
+
+        # All providers failed
+        raise LLMError(
+            "All providers failed",
+            details={
+                "providers_tried": provider_names,
+                "last_error": str(last_error)
+            }
+        )
+
     def generate_with_load_balancing(
         self,
         request: LLMRequest,
@@ -764,13 +1033,16 @@ class ProviderManager:
         total_tokens = sum(c._total_tokens for c in self._providers.values())
         total_cost = sum(c._total_cost for c in self._providers.values())
         total_errors = sum(c._error_count for c in self._providers.values())
+        total_cache_hits = sum(c._cache_hits for c in self._providers.values())
 
-        return {
+        metrics = {
             "total_providers": len(self._providers),
             "total_requests": total_requests,
             "total_tokens": total_tokens,
             "total_cost_usd": total_cost,
             "total_errors": total_errors,
+            "total_cache_hits": total_cache_hits,
+            "cache_hit_rate": total_cache_hits / max(total_cache_hits + total_requests, 1),
             "avg_tokens_per_request": total_tokens / max(total_requests, 1),
             "avg_cost_per_request": total_cost / max(total_requests, 1),
             "error_rate": total_errors / max(total_requests, 1),
@@ -779,11 +1051,17 @@ class ProviderManager:
                 for name, client in self._providers.items()
             }
         }
+        metrics["hedging"] = dict(self.hedge_stats)
+        if self.response_cache is not None:
+            metrics["response_cache"] = self.response_cache.get_statistics()
+        return metrics
 
     def reset_all_metrics(self) -> None:
         """Reset metrics for all providers."""
         for client in self._providers.values():
             client.reset_metrics()
+        for key in self.hedge_stats:
+            self.hedge_stats[key] = 0
 
 
 # ============================================================================
@@ -9,13 +9,14 @@ This module provides LLM provider implementations for:
 Supports function calling, streaming, and flexible configuration.
 """
 
+import asyncio
 import json
 import time
 from typing import Any, Dict, List, Optional, Union
 import logging
 
 try:
-    from openai import OpenAI, OpenAIError, APIError, APIConnectionError, RateLimitError
+    from openai import AsyncOpenAI, OpenAI, OpenAIError, APIError, APIConnectionError, RateLimitError
 except ImportError:
     raise ImportError(
         "OpenAI library is required. Install with: pip install openai>=1.0.0"
@@ -28,11 +29,33 @@ from ..core.exceptions import (
     LLMAuthenticationError,
     LLMRateLimitError,
 )
+from .client import LLMRequest
 
 
 logger = logging.getLogger(__name__)
 
 
+def _request_arguments(request: LLMRequest) -> Dict[str, Any]:
+    """Map an ``LLMRequest`` onto the keyword arguments of ``generate()``."""
+    arguments: Dict[str, Any] = {
+        "prompt": request.prompt,
+        "system_prompt": request.system_prompt,
+        "temperature": request.temperature,
+        "max_tokens": request.max_tokens,
+    }
+    if request.stop_sequences:
+        arguments["stop"] = request.stop_sequences
+    if request.seed is not None:
+        arguments["seed"] = request.seed
+    if request.top_p != 1.0:
+        arguments["top_p"] = request.top_p
+    if request.tools:
+        arguments["tools"] = request.tools
+    if request.response_format == "json":
+        arguments["response_format"] = {"type": "json_object"}
+    return arguments
+
+
 class OpenAIProvider(LLMProvider):
     """
     OpenAI API provider for GPT models with function calling support.
@@ -133,6 +156,7 @@ class OpenAIProvider(LLMProvider):
 
         try:
             self.client = OpenAI(**client_kwargs)
+            self.async_client = AsyncOpenAI(**client_kwargs)
         except Exception as e:
             raise LLMError(f"Failed to initialize OpenAI client: {e}")
 
@@ -169,7 +193,78 @@ class OpenAIProvider(LLMProvider):
             LLMRateLimitError: If rate limit is exceeded
         """
         start_time = time.time()
+        api_params = self._build_api_params(
+            prompt, system_prompt, temperature, max_tokens, functions, function_call, **kwargs
+        )
+
+        try:
+            # Make API call
+            response = self.client.chat.completions.create(**api_params)
+            return self._build_response(response, prompt, system_prompt, api_params, start_time)
+        except Exception as e:
+            raise self._translate_error(e) from e
+
+    async def agenerate(
+        self,
+        prompt: Union[str, LLMRequest],
+        system_prompt: Optional[str] = None,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        functions: Optional[List[Dict[str, Any]]] = None,
+        function_call: Optional[Union[str, Dict[str, str]]] = None,
+        first_token: Optional[asyncio.Event] = None,
+        **kwargs
+    ) -> LLMResponse:
+        """
+        Generate a response from OpenAI without blocking the event loop.
+
+        Takes the same arguments as ``generate()``, or an ``LLMRequest`` as
+        ``prompt`` so the provider can be used by
+        ``ProviderManager.agenerate_with_fallback()``. ``first_token`` is set
+        once the completion arrives. Cancelling the task aborts the HTTP
+        request.
 
+        Returns:
+            LLMResponse with generated content and metadata
+
+        Raises:
+            LLMError: If generation fails
+            LLMAuthenticationError: If authentication fails
+            LLMRateLimitError: If rate limit is exceeded
+        """
+        if isinstance(prompt, LLMRequest):
+            return await self.agenerate(
+                **_request_arguments(prompt),
+                functions=functions,
+                function_call=function_call,
+                first_token=first_token,
+                **kwargs
+            )
+
+        start_time = time.time()
+        api_params = self._build_api_params(
+            prompt, system_prompt, temperature, max_tokens, functions, function_call, **kwargs
+        )
+
+        try:
+            response = await self.async_client.chat.completions.create(**api_params)
+            if first_token is not None:
+                first_token.set()
+            return self._build_response(response, prompt, system_prompt, api_params, start_time)
+        except Exception as e:
+            raise self._translate_error(e) from e
+
+    def _build_api_params(
+        self,
+        prompt: str,
+        system_prompt: Optional[str],
+        temperature: Optional[float],
+        max_tokens: Optional[int],
+        functions: Optional[List[Dict[str, Any]]],
+        function_call: Optional[Union[str, Dict[str, str]]],
+        **kwargs
+    ) -> Dict[str, Any]:
+        """Build chat completion parameters from generation arguments."""
         # Build messages
         messages = []
         if system_prompt:
@@ -196,73 +291,80 @@ class OpenAIProvider(LLMProvider):
 
         # Add any additional kwargs
         api_params.update(kwargs)
+        return api_params
 
-        try:
-            # Make API call
-            response = self.client.chat.completions.create(**api_params)
+    def _build_response(
+        self,
+        response: Any,
+        prompt: str,
+        system_prompt: Optional[str],
+        api_params: Dict[str, Any],
+        start_time: float
+    ) -> LLMResponse:
+        """Convert a chat completion into an LLMResponse."""
+        # Extract response data
+        choice = response.choices[0]
+        message = choice.message
+
+        # Handle function calling response
+        if hasattr(message, 'function_call') and message.function_call:
+            content = json.dumps({
+                "function_call": {
+                    "name": message.function_call.name,
+                    "arguments": message.function_call.arguments
+                }
+            })
+        else:
+            content = message.content or ""
 
-            # Extract response data
-            choice = response.choices[0]
-            message = choice.message
-
-            # Handle function calling response
-            if hasattr(message, 'function_call') and message.function_call:
-                content = json.dumps({
-                    "function_call": {
-                        "name": message.function_call.name,
-                        "arguments": message.function_call.arguments
-                    }
-                })
-            else:
-                content = message.content or ""
-
-            # Calculate latency
-            latency = time.time() - start_time
-
-            # Extract token usage
-            usage = response.usage
-            prompt_tokens = usage.prompt_tokens if usage else None
-            completion_tokens = usage.completion_tokens if usage else None
-            total_tokens = usage.total_tokens if usage else None
-
-            # Estimate cost
-            cost = self.estimate_cost(
-                prompt_tokens or 0,
-                completion_tokens or 0
-            )
+        # Calculate latency
+        latency = time.time() - start_time
 
-            return LLMResponse(
-                content=content,
-                model=self.model,
-                prompt=prompt,
-                tokens_used=total_tokens,
-                prompt_tokens=prompt_tokens,
-                completion_tokens=completion_tokens,
-                finish_reason=choice.finish_reason,
-                cost=cost,
-                latency=latency,
-                metadata={
-                    "system_prompt": system_prompt,
-                    "temperature": api_params["temperature"],
-                    "response_id": response.id,
-                    "has_function_call": hasattr(message, 'function_call') and message.function_call is not None,
-                }
-            )
+        # Extract token usage
+        usage = response.usage
+        prompt_tokens = usage.prompt_tokens if usage else None
+        completion_tokens = usage.completion_tokens if usage else None
+        total_tokens = usage.total_tokens if usage else None
 
-        except RateLimitError as e:
-            logger.error(f"OpenAI rate limit exceeded: {e}")
-            raise LLMRateLimitError(f"Rate limit exceeded: {e}")
-        except APIConnectionError as e:
-            logger.error(f"OpenAI connection error: {e}")
-            raise LLMError(f"Connection error: {e}")
-        except APIError as e:
-            if e.status_code == 401:
-                raise LLMAuthenticationError(f"Authentication failed: {e}")
-            logger.error(f"OpenAI API error: {e}")
-            raise LLMError(f"API error: {e}")
-        except Exception as e:
-            logger.error(f"Unexpected error in OpenAI generation: {e}")
-            raise LLMError(f"Generation failed: {e}")
+        # Estimate cost
+        cost = self.estimate_cost(
+            prompt_tokens or 0,
+            completion_tokens or 0
+        )
+
+        return LLMResponse(
+            content=content,
+            model=self.model,
+            prompt=prompt,
+            tokens_used=total_tokens,
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            finish_reason=choice.finish_reason,
+            cost=cost,
+            latency=latency,
+            metadata={
+                "system_prompt": system_prompt,
+                "temperature": api_params["temperature"],
+                "response_id": response.id,
+                "has_function_call": hasattr(message, 'function_call') and message.function_call is not None,
+            }
+        )
+
+    def _translate_error(self, error: Exception) -> LLMError:
+        """Map an OpenAI client exception to the LLM error hierarchy."""
+        if isinstance(error, RateLimitError):
+            logger.error(f"OpenAI rate limit exceeded: {error}")
+            return LLMRateLimitError(f"Rate limit exceeded: {error}")
+        if isinstance(error, APIConnectionError):
+            logger.error(f"OpenAI connection error: {error}")
+            return LLMError(f"Connection error: {error}")
+        if isinstance(error, APIError):
+            if getattr(error, "status_code", None) == 401:
+                return LLMAuthenticationError(f"Authentication failed: {error}")
+            logger.error(f"OpenAI API error: {error}")
+            return LLMError(f"API error: {error}")
+        logger.error(f"Unexpected error in OpenAI generation: {error}")
+        return LLMError(f"Generation failed: {error}")
 
     def generate_with_json_schema(
         self,
@@ -506,6 +608,7 @@ class LocalProvider(LLMProvider):
 
         try:
             self.client = OpenAI(**client_kwargs)
+            self.async_client = AsyncOpenAI(**client_kwargs)
             logger.info(f"Initialized local provider: {api_base} (model: {model})")
         except Exception as e:
             raise LLMError(f"Failed to initialize local provider: {e}")
@@ -539,7 +642,67 @@ class LocalProvider(LLMProvider):
             LLMError: If generation fails
         """
         start_time = time.time()
+        api_params = self._build_api_params(prompt, system_prompt, temperature, max_tokens, functions, **kwargs)
+
+        try:
+            # Make API call
+            response = self.client.chat.completions.create(**api_params)
+            return self._build_response(response, prompt, system_prompt, api_params, start_time)
+        except Exception as e:
+            raise self._translate_error(e) from e
+
+    async def agenerate(
+        self,
+        prompt: Union[str, LLMRequest],
+        system_prompt: Optional[str] = None,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        functions: Optional[List[Dict[str, Any]]] = None,
+        first_token: Optional[asyncio.Event] = None,
+        **kwargs
+    ) -> LLMResponse:
+        """
+        Generate a response from the local model without blocking the event loop.
+
+        Takes the same arguments as ``generate()``, or an ``LLMRequest`` as
+        ``prompt``. ``first_token`` is set once the completion arrives.
+        Cancelling the task aborts the HTTP request.
+
+        Returns:
+            LLMResponse with generated content
+
+        Raises:
+            LLMError: If generation fails
+        """
+        if isinstance(prompt, LLMRequest):
+            return await self.agenerate(
+                **_request_arguments(prompt),
+                functions=functions,
+                first_token=first_token,
+                **kwargs
+            )
+
+        start_time = time.time()
+        api_params = self._build_api_params(prompt, system_prompt, temperature, max_tokens, functions, **kwargs)
 
+        try:
+            response = await self.async_client.chat.completions.create(**api_params)
+            if first_token is not None:
+                first_token.set()
+            return self._build_response(response, prompt, system_prompt, api_params, start_time)
+        except Exception as e:
+            raise self._translate_error(e) from e
+
+    def _build_api_params(
+        self,
+        prompt: str,
+        system_prompt: Optional[str],
+        temperature: Optional[float],
+        max_tokens: Optional[int],
+        functions: Optional[List[Dict[str, Any]]],
+        **kwargs
+    ) -> Dict[str, Any]:
+        """Build chat completion parameters from generation arguments."""
         # Build messages
         messages = []
         if system_prompt:
@@ -563,58 +726,65 @@ class LocalProvider(LLMProvider):
 
         # Add additional kwargs
         api_params.update(kwargs)
+        return api_params
 
-        try:
-            # Make API call
-            response = self.client.chat.completions.create(**api_params)
-
-            # Extract response
-            choice = response.choices[0]
-            message = choice.message
-            content = message.content or ""
-
-            # Calculate latency
-            latency = time.time() - start_time
-
-            # Extract token usage (may not be available from all endpoints)
-            usage = getattr(response, 'usage', None)
-            prompt_tokens = getattr(usage, 'prompt_tokens', None) if usage else None
-            completion_tokens = getattr(usage, 'completion_tokens', None) if usage else None
-            total_tokens = getattr(usage, 'total_tokens', None) if usage else None
-
-            # Local models have no cost
-            cost = 0.0
-
-            return LLMResponse(
-                content=content,
-                model=self.model,
-                prompt=prompt,
-                tokens_used=total_tokens,
-                prompt_tokens=prompt_tokens,
-                completion_tokens=completion_tokens,
-                finish_reason=choice.finish_reason,
-                cost=cost,
-                latency=latency,
-                metadata={
-                    "system_prompt": system_prompt,
-                    "temperature": api_params["temperature"],
-                    "api_base": self.api_base,
-                    "provider": "local",
-                }
-            )
+    def _build_response(
+        self,
+        response: Any,
+        prompt: str,
+        system_prompt: Optional[str],
+        api_params: Dict[str, Any],
+        start_time: float
+    ) -> LLMResponse:
+        """Convert a chat completion into an LLMResponse."""
+        # Extract response
+        choice = response.choices[0]
+        message = choice.message
+        content = message.content or ""
+
+        # Calculate latency
+        latency = time.time() - start_time
+
+        # Extract token usage (may not be available from all endpoints)
+        usage = getattr(response, 'usage', None)
+        prompt_tokens = getattr(usage, 'prompt_tokens', None) if usage else None
+        completion_tokens = getattr(usage, 'completion_tokens', None) if usage else None
+        total_tokens = getattr(usage, 'total_tokens', None) if usage else None
+
+        # Local models have no cost
+        cost = 0.0
+
+        return LLMResponse(
+            content=content,
+            model=self.model,
+            prompt=prompt,
+            tokens_used=total_tokens,
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            finish_reason=choice.finish_reason,
+            cost=cost,
+            latency=latency,
+            metadata={
+                "system_prompt": system_prompt,
+                "temperature": api_params["temperature"],
+                "api_base": self.api_base,
+                "provider": "local",
+            }
+        )
 
-        except APIConnectionError as e:
-            logger.error(f"Local model connection error: {e}")
-            raise LLMError(
+    def _translate_error(self, error: Exception) -> LLMError:
+        """Map an OpenAI-compatible client exception to the LLM error hierarchy."""
+        if isinstance(error, APIConnectionError):
+            logger.error(f"Local model connection error: {error}")
+            return LLMError(
                 f"Failed to connect to {self.api_base}. "
-                f"Make sure your local model server is running. Error: {e}"
+                f"Make sure your local model server is running. Error: {error}"
             )
-        except APIError as e:
-            logger.error(f"Local model API error: {e}")
-            raise LLMError(f"Local model API error: {e}")
-        except Exception as e:
-            logger.error(f"Unexpected error in local model generation: {e}")
-            raise LLMError(f"Generation failed: {e}")
+        if isinstance(error, APIError):
+            logger.error(f"Local model API error: {error}")
+            return LLMError(f"Local model API error: {error}")
+        logger.error(f"Unexpected error in local model generation: {error}")
+        return LLMError(f"Generation failed: {error}")
 
     def generate_with_json_schema(
         self,
@@ -0,0 +1,290 @@
+"""
+Token-bucket rate limiting for LLM API calls.
+
+Providers used to space requests with a per-instance "last request time"
+that was read and written without a lock, so concurrent threads raced past
+it while a single thread was throttled by sleeping after every call.
+
+``LLMRateLimiter`` keeps two token buckets, one for requests per minute and
+one for tokens per minute, refilled continuously up to their per-minute
+limit. Acquiring reserves capacity under a lock and returns how long the
+caller must wait for it, so waiters are served first come, first served and
+the wait happens outside the lock: with ``time.sleep`` in threads or
+``asyncio.sleep`` on an event loop. Token costs are estimated before the
+request and corrected with the actual usage afterwards.
+
+Limiters are shared per API key, so every provider instance using a key
+draws from the same budget. A shared limiter keeps the strictest limits any
+of its users asked for.
+
+Example:
+    >>> limiter = get_rate_limiter(api_key, requests_per_minute=50, tokens_per_minute=40000)
+    >>> waited = limiter.acquire(tokens=1200)
+    >>> # ... call the API ...
+    >>> limiter.record_usage(estimated=1200, actual=1450)
+"""
+
+import asyncio
+import hashlib
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+
+class TokenBucket:
+    """
+    A token bucket refilled continuously up to its capacity.
+
+    The level may go negative: capacity reserved ahead of time is paid back
+    by the refill. Not thread-safe; ``LLMRateLimiter`` guards its buckets.
+    """
+
+    def __init__(self, per_minute: float, now: float):
+        """
+        Initialize a full bucket.
+
+        Args:
+            per_minute: Capacity and refill per minute
+            now: Current clock reading
+        """
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.level = self.capacity
+        self.updated = now
+
+    def refill(self, now: float):
+        """Add the tokens accrued since the last update."""
+        if now > self.updated:
+            self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+            self.updated = now
+
+    def reserve(self, amount: float) -> float:
+        """
+        Take tokens, possibly ahead of the refill.
+
+        Args:
+            amount: Tokens to take; capped at the capacity so a request
+                larger than the bucket still gets through
+
+        Returns:
+            Seconds until the reservation is covered
+        """
+        self.level -= min(amount, self.capacity)
+        return max(0.0, -self.level / self.rate)
+
+
+class LLMRateLimiter:
+    """
+    Thread-safe, asyncio-aware limiter on requests and tokens per minute.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Initialize the limiter.
+
+        Args:
+            requests_per_minute: Request limit (unlimited if None)
+            tokens_per_minute: Token limit (unlimited if None)
+            clock: Monotonic clock in seconds
+        """
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._requests: Optional[TokenBucket] = None
+        self._tokens: Optional[TokenBucket] = None
+        self.set_limits(requests_per_minute, tokens_per_minute)
+
+        # Statistics
+        self.acquired = 0
+        self.throttled = 0
+        self.total_wait = 0.0
+
+    @property
+    def requests_per_minute(self) -> Optional[float]:
+        """Request limit, or None if unlimited."""
+        return self._requests.capacity if self._requests else None
+
+    @property
+    def tokens_per_minute(self) -> Optional[float]:
+        """Token limit, or None if unlimited."""
+        return self._tokens.capacity if self._tokens else None
+
+    def set_limits(
+        self,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None
+    ):
+        """
+        Change the limits, keeping capacity already used.
+
+        Args:
+            requests_per_minute: Request limit (unlimited if None)
+            tokens_per_minute: Token limit (unlimited if None)
+        """
+        with self._lock:
+            now = self._clock()
+            self._requests = self._resize(self._requests, requests_per_minute, now)
+            self._tokens = self._resize(self._tokens, tokens_per_minute, now)
+
+    @staticmethod
+    def _resize(bucket: Optional[TokenBucket], per_minute: Optional[float], now: float) -> Optional[TokenBucket]:
+        """Create a bucket with a new limit and the used capacity of an old one."""
+        if not per_minute:
+            return None
+        resized = TokenBucket(per_minute, now)
+        if bucket is not None:
+            bucket.refill(now)
+            resized.level = min(resized.capacity, bucket.level)
+        return resized
+
+    def reserve(self, tokens: int = 0) -> float:
+        """
+        Reserve capacity for one request without waiting.
+
+        Args:
+            tokens: Estimated tokens of the request
+
+        Returns:
+            Seconds the caller must wait before sending the request
+        """
+        with self._lock:
+            now = self._clock()
+            wait = 0.0
+            if self._requests is not None:
+                self._requests.refill(now)
+                wait = max(wait, self._requests.reserve(1))
+            if self._tokens is not None and tokens > 0:
+                self._tokens.refill(now)
+                wait = max(wait, self._tokens.reserve(tokens))
+
+            self.acquired += 1
+            if wait > 0:
+                self.throttled += 1
+                self.total_wait += wait
+            return wait
+
+    def acquire(self, tokens: int = 0) -> float:
+        """
+        Wait until a request may be sent, blocking the calling thread.
+
+        Args:
+            tokens: Estimated tokens of the request
+
+        Returns:
+            Seconds waited
+        """
+        wait = self.reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def aacquire(self, tokens: int = 0) -> float:
+        """
+        Wait until a request may be sent, without blocking the event loop.
+
+        Args:
+            tokens: Estimated tokens of the request
+
+        Returns:
+            Seconds waited
+        """
+        wait = self.reserve(tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def record_usage(self, estimated: int, actual: int):
+        """
+        Correct the token bucket with the tokens a request actually used.
+
+        Args:
+            estimated: Tokens reserved for the request
+            actual: Tokens reported by the API
+        """
+        if self._tokens is None or actual == estimated:
+            return
+        with self._lock:
+            self._tokens.refill(self._clock())
+            self._tokens.level = min(self._tokens.capacity, self._tokens.level - (actual - estimated))
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get limiter statistics."""
+        with self._lock:
+            now = self._clock()
+            if self._requests is not None:
+                self._requests.refill(now)
+            if self._tokens is not None:
+                self._tokens.refill(now)
+            return {
+                "requests_per_minute": self.requests_per_minute,
+                "tokens_per_minute": self.tokens_per_minute,
+                "available_requests": self._requests.level if self._requests else None,
+                "available_tokens": self._tokens.level if self._tokens else None,
+                "acquired": self.acquired,
+                "throttled": self.throttled,
+                "average_wait_ms": self.total_wait / self.acquired * 1000 if self.acquired else 0.0,
+            }
+
+
+# Limiters shared per (provider, API key)
+_limiters: Dict[str, LLMRateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(
+    api_key: str,
+    requests_per_minute: Optional[float] = None,
+    tokens_per_minute: Optional[float] = None,
+    provider: str = "anthropic"
+) -> LLMRateLimiter:
+    """
+    Get the limiter shared by all clients of an API key.
+
+    The limiter is created on first use. Later calls only tighten its
+    limits: a lower limit replaces the shared one, while a higher limit or
+    None keeps it, so one client cannot lift the limits another relies on.
+    Use ``set_limits()`` on the limiter to raise them.
+
+    Args:
+        api_key: API key
+        requests_per_minute: Request limit (None for no limit of this caller)
+        tokens_per_minute: Token limit (None for no limit of this caller)
+        provider: Provider name, so keys of different providers never share
+
+    Returns:
+        Shared rate limiter
+    """
+    key = provider + ":" + hashlib.sha256(api_key.encode("utf-8")).hexdigest()
+    with _limiters_lock:
+        limiter = _limiters.get(key)
+        if limiter is None:
+            limiter = LLMRateLimiter(requests_per_minute, tokens_per_minute)
+            _limiters[key] = limiter
+            return limiter
+
+    limits = (
+        _stricter(limiter.requests_per_minute, requests_per_minute),
+        _stricter(limiter.tokens_per_minute, tokens_per_minute),
+    )
+    if limits != (limiter.requests_per_minute, limiter.tokens_per_minute):
+        limiter.set_limits(*limits)
+    return limiter
+
+
+def _stricter(current: Optional[float], requested: Optional[float]) -> Optional[float]:
+    """Get the lower of two per-minute limits, where None means no limit."""
+    if not requested:
+        return current
+    if current is None:
+        return float(requested)
+    return min(current, float(requested))
+
+
+def reset_rate_limiters():
+    """Forget all shared limiters."""
+    with _limiters_lock:
+        _limiters.clear()
@@ -0,0 +1,286 @@
+"""
+Response cache for LLM generation.
+
+Repeated natural-language questions are common (retries, dashboards, tests),
+and every provider call costs latency and money. ``LLMResponseCache`` serves
+them from two tiers:
+
+- an exact tier keyed on a canonical form of the ``LLMRequest`` (prompt,
+  system prompt, model, sampling parameters and tools)
+- a near-duplicate tier keyed on the normalized question text, the target
+  endpoint and the request's generation context (model, system prompt, the
+  rest of the prompt with the question taken out, sampling parameters, tools
+  and ``metadata["schema_version"]``), used when
+  the request carries ``metadata["question"]``. Questions that differ only in
+  case, punctuation, whitespace or filler phrases such as "please" or "show
+  me" share an entry, as long as they are asked of the same model with the same
+  schema context.
+
+Entries are stored in a ``ResultCache``: an in-memory LRU tier, plus an
+optional SQLite tier that survives restarts, with a TTL on every entry.
+
+Example:
+    >>> cache = LLMResponseCache(disk_path="~/.cache/sparql_agent/llm.db", ttl=86400)
+    >>> client = AnthropicProvider(response_cache=cache)
+    >>> client.generate(LLMRequest(prompt=p, metadata={"question": q, "endpoint_url": url}))
+"""
+
+import hashlib
+import json
+import logging
+import re
+import threading
+import unicodedata
+from dataclasses import replace
+from typing import TYPE_CHECKING, Any, Dict, Optional
+
+from ..execution.cache import ResultCache
+
+if TYPE_CHECKING:
+    from .client import LLMRequest, LLMResponse
+
+
+logger = logging.getLogger(__name__)
+
+# Phrases that do not change what a question asks for. Single words such as
+# "a", "i" or "to" are left alone: in "hepatitis A", "vitamin A" or
+# "type I diabetes" they name a different entity.
+FILLER_PHRASES = tuple(sorted(
+    (tuple(phrase.split()) for phrase in (
+        "please", "kindly",
+        "can you", "could you", "would you",
+        "show me", "give me", "tell me", "list me",
+        "i want to know", "i need to know", "i would like to know",
+    )),
+    key=len,
+    reverse=True,
+))
+
+
+def normalize_question(question: str) -> str:
+    """
+    Normalize a natural-language question for near-duplicate matching.
+
+    Args:
+        question: Question text
+
+    Returns:
+        Case-folded words without punctuation and filler phrases
+    """
+    text = unicodedata.normalize("NFKC", question).casefold()
+    words = re.findall(r"\w+", text)
+    kept = []
+    position = 0
+    while position < len(words):
+        for phrase in FILLER_PHRASES:
+            if tuple(words[position:position + len(phrase)]) == phrase:
+                position += len(phrase)
+                break
+        else:
+            kept.append(words[position])
+            position += 1
+    return " ".join(kept)
+
+
+def _digest(text: str) -> str:
+    """Hash text, ignoring surrounding whitespace."""
+    return hashlib.sha256(text.strip().encode("utf-8")).hexdigest()
+
+
+def request_fingerprint(request: "LLMRequest", model: str) -> str:
+    """
+    Hash the fields of a request that determine the response.
+
+    Args:
+        request: Generation request
+        model: Model that will answer the request
+
+    Returns:
+        Hex digest identifying the request
+    """
+    canonical = {
+        "model": model,
+        "prompt": request.prompt.strip(),
+        "system_prompt": (request.system_prompt or "").strip(),
+        "temperature": round(request.temperature, 4),
+        "max_tokens": request.max_tokens,
+        "top_p": request.top_p,
+        "top_k": request.top_k,
+        "stop_sequences": list(request.stop_sequences),
+        "seed": request.seed,
+        "response_format": request.response_format,
+        "tools": request.tools or [],
+    }
+    material = json.dumps(canonical, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+class LLMResponseCache:
+    """
+    Exact and near-duplicate cache of LLM responses.
+
+    Only successful, non-streaming responses are stored. Hits are returned as
+    copies with ``cached=True`` and ``metadata["cache_tier"]`` set to
+    ``"exact"`` or ``"semantic"``. Thread-safe.
+    """
+
+    def __init__(
+        self,
+        store: Optional[ResultCache] = None,
+        disk_path: Optional[str] = None,
+        max_entries: int = 1024,
+        ttl: Optional[float] = 24 * 3600,
+        semantic: bool = True,
+        max_temperature: Optional[float] = None,
+    ):
+        """
+        Initialize response cache.
+
+        Args:
+            store: Backing cache (a ``ResultCache`` is created if None)
+            disk_path: SQLite file for a created store (None for memory only)
+            max_entries: Memory tier size of a created store
+            ttl: Entry TTL in seconds for a created store (None = no expiry)
+            semantic: Enable the near-duplicate question tier
+            max_temperature: Do not cache requests sampled above this temperature
+        """
+        self.store = store or ResultCache(
+            max_entries=max_entries,
+            disk_path=disk_path,
+            default_ttl=ttl,
+        )
+        self.semantic = semantic
+        self.max_temperature = max_temperature
+
+        self._lock = threading.Lock()
+
+        # Statistics
+        self.stats = {
+            "lookups": 0,
+            "exact_hits": 0,
+            "semantic_hits": 0,
+            "misses": 0,
+            "stores": 0,
+            "skipped": 0,
+        }
+
+    def is_cacheable(self, request: "LLMRequest") -> bool:
+        """Check whether responses to a request may be cached."""
+        if request.stream:
+            return False
+        return self.max_temperature is None or request.temperature <= self.max_temperature
+
+    def lookup(self, request: "LLMRequest", model: str) -> Optional["LLMResponse"]:
+        """
+        Find a cached response for a request.
+
+        Args:
+            request: Generation request
+            model: Model that would answer the request
+
+        Returns:
+            Cached response, or None on a miss
+        """
+        if not self.is_cacheable(request):
+            self._count("skipped")
+            return None
+        self._count("lookups")
+
+        response = self.store.get(self._exact_key(request, model))
+        if response is not None:
+            self._count("exact_hits")
+            return self._as_hit(response, "exact")
+
+        semantic_key = self._semantic_key(request, model)
+        if semantic_key is not None:
+            response = self.store.get(semantic_key)
+            if response is not None:
+                self._count("semantic_hits")
+                return self._as_hit(response, "semantic")
+
+        self._count("misses")
+        return None
+
+    def put(self, request: "LLMRequest", model: str, response: "LLMResponse"):
+        """
+        Cache a response in both tiers.
+
+        Args:
+            request: Request that produced the response
+            model: Model that answered
+            response: Provider response
+        """
+        if not self.is_cacheable(request) or response.cached:
+            return
+
+        # Provider response objects are often not picklable
+        stored = replace(response, raw_response=None)
+        endpoint_url = request.metadata.get("endpoint_url")
+        self.store.set(self._exact_key(request, model), stored, endpoint_url=endpoint_url)
+
+        semantic_key = self._semantic_key(request, model)
+        if semantic_key is not None:
+            self.store.set(semantic_key, stored, endpoint_url=endpoint_url)
+        self._count("stores")
+
+    def invalidate(self, endpoint_url: Optional[str] = None):
+        """
+        Drop cached responses, e.g. after an endpoint's schema changed.
+
+        Args:
+            endpoint_url: Endpoint whose responses to drop (None for all)
+        """
+        self.store.invalidate(endpoint_url)
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get hit counts per tier and the hit rate."""
+        with self._lock:
+            stats: Dict[str, Any] = dict(self.stats)
+        hits = stats["exact_hits"] + stats["semantic_hits"]
+        stats["hits"] = hits
+        stats["hit_rate"] = hits / stats["lookups"] if stats["lookups"] else 0.0
+        return stats
+
+    def close(self):
+        """Close the backing store."""
+        self.store.close()
+
+    def _exact_key(self, request: "LLMRequest", model: str) -> str:
+        """Cache key of the exact tier."""
+        return "llm:exact:" + request_fingerprint(request, model)
+
+    def _semantic_key(self, request: "LLMRequest", model: str) -> Optional[str]:
+        """Cache key of the near-duplicate tier (None if not applicable)."""
+        question = request.metadata.get("question")
+        if not self.semantic or not question:
+            return None
+        # The prompt embeds the question itself; everything else that shapes
+        # the answer (instructions, constraints, scenario) must match
+        context = {
+            "model": model,
+            "system_prompt": _digest(request.system_prompt or ""),
+            "prompt": _digest(request.prompt.replace(question, "")),
+            "schema_version": request.metadata.get("schema_version"),
+            "temperature": round(request.temperature, 4),
+            "response_format": request.response_format,
+            "tools": request.tools or [],
+        }
+        material = json.dumps(
+            [normalize_question(question), request.metadata.get("endpoint_url") or "", context],
+            sort_keys=True,
+            default=str,
+        )
+        return "llm:semantic:" + hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def _as_hit(self, response: "LLMResponse", tier: str) -> "LLMResponse":
+        """Copy a cached response and mark it as served from cache."""
+        return replace(
+            response,
+            cached=True,
+            metadata={**response.metadata, "cache_tier": tier},
+        )
+
+    def _count(self, name: str):
+        """Increment a statistics counter."""
+        with self._lock:
+            self.stats[name] += 1
@@ -0,0 +1,354 @@
+"""
+Unit tests for async generation and provider hedging.
+
+Tests cover:
+- LLMClient.agenerate retries and the thread fallback for sync providers
+- ProviderManager.agenerate_with_fallback sequential fallback
+- Hedging after the first-token budget, cancellation of the losing request
+- LLMRequest and first-token support in the OpenAI and local providers
+"""
+
+import asyncio
+import unittest
+from types import SimpleNamespace
+from typing import Iterator, List, Optional
+
+from ..core.exceptions import LLMError, LLMRateLimitError
+from .client import (
+    GenerationMetrics,
+    LLMClient,
+    LLMProvider,
+    LLMRequest,
+    LLMResponse,
+    ModelCapabilities,
+    ProviderManager,
+    RetryConfig,
+    StreamChunk,
+    TokenUsage,
+)
+
+
+def make_response(content: str) -> LLMResponse:
+    """Build a minimal response."""
+    return LLMResponse(
+        content=content,
+        model="fake",
+        provider="custom",
+        finish_reason="stop",
+        usage=TokenUsage(prompt_tokens=1, completion_tokens=1, total_tokens=2),
+        metrics=GenerationMetrics(latency_ms=1.0, tokens_per_second=1.0),
+    )
+
+
+class FakeClient(LLMClient):
+    """Sync-only client used to test the default async implementation."""
+
+    def __init__(self, failures: Optional[List[Exception]] = None, **kwargs):
+        super().__init__(model="fake", retry_config=RetryConfig(initial_delay=0.0, jitter=False), **kwargs)
+        self.failures = list(failures or [])
+        self.calls = 0
+
+    def get_provider(self) -> LLMProvider:
+        return LLMProvider.CUSTOM
+
+    def get_capabilities(self) -> ModelCapabilities:
+        return ModelCapabilities()
+
+    def _generate_impl(self, request: LLMRequest) -> LLMResponse:
+        self.calls += 1
+        if self.failures:
+            raise self.failures.pop(0)
+        return make_response(f"sync:{request.prompt}")
+
+    def _generate_streaming_impl(self, request: LLMRequest) -> Iterator[StreamChunk]:
+        return iter([])
+
+    def count_tokens(self, text: str) -> int:
+        return len(text.split())
+
+
+class AsyncFakeClient(FakeClient):
+    """Async client with a configurable first-token and completion delay."""
+
+    def __init__(self, name: str, first_token_delay: float, total_delay: float,
+                 error: Optional[Exception] = None):
+        super().__init__()
+        self.name = name
+        self.first_token_delay = first_token_delay
+        self.total_delay = total_delay
+        self.error = error
+        self.cancelled = False
+
+    async def _agenerate_impl(self, request, first_token=None):
+        self.calls += 1
+        try:
+            await asyncio.sleep(self.first_token_delay)
+            if self.error is not None:
+                raise self.error
+            if first_token is not None:
+                first_token.set()
+            await asyncio.sleep(self.total_delay - self.first_token_delay)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        return make_response(self.name)
+
+
+class TestAgenerate(unittest.TestCase):
+    """Test LLMClient.agenerate()."""
+
+    def test_runs_sync_impl_in_thread(self):
+        """Providers without an async SDK are run in a worker thread."""
+        client = FakeClient()
+        response = asyncio.run(client.agenerate(LLMRequest(prompt="q")))
+
+        self.assertEqual(response.content, "sync:q")
+        self.assertEqual(client.get_metrics()["request_count"], 1)
+
+    def test_retries_retryable_errors(self):
+        """Rate limit errors are retried with an async sleep."""
+        client = FakeClient(failures=[LLMRateLimitError("slow down")])
+        response = asyncio.run(client.agenerate(LLMRequest(prompt="q")))
+
+        self.assertEqual(response.content, "sync:q")
+        self.assertEqual(client.calls, 2)
+        self.assertEqual(client.get_metrics()["error_count"], 1)
+
+    def test_sets_first_token_event(self):
+        """The first-token event is set for non-streaming providers too."""
+        client = FakeClient()
+
+        async def run():
+            event = asyncio.Event()
+            await client.agenerate(LLMRequest(prompt="q"), first_token=event)
+            return event.is_set()
+
+        self.assertTrue(asyncio.run(run()))
+
+
+class TestHedging(unittest.TestCase):
+    """Test ProviderManager.agenerate_with_fallback()."""
+
+    def make_manager(self, *clients: AsyncFakeClient) -> ProviderManager:
+        manager = ProviderManager()
+        for priority, client in enumerate(reversed(clients)):
+            manager.register_provider(client.name, client, priority=priority)
+        return manager
+
+    def test_sequential_fallback_without_hedging(self):
+        """Without a hedge delay the next provider runs only after a failure."""
+        primary = AsyncFakeClient("primary", 0.01, 0.01, error=LLMError("down"))
+        secondary = AsyncFakeClient("secondary", 0.01, 0.01)
+        manager = self.make_manager(primary, secondary)
+
+        response = asyncio.run(manager.agenerate_with_fallback(LLMRequest(prompt="q")))
+
+        self.assertEqual(response.content, "secondary")
+        self.assertEqual(manager.hedge_stats["hedged_requests"], 0)
+
+    def test_hedge_wins_and_cancels_slow_primary(self):
+        """A slow primary is hedged and cancelled when the hedge finishes first."""
+        primary = AsyncFakeClient("primary", 1.0, 2.0)
+        secondary = AsyncFakeClient("secondary", 0.01, 0.02)
+        manager = self.make_manager(primary, secondary)
+
+        response = asyncio.run(manager.agenerate_with_fallback(
+            LLMRequest(prompt="q"), hedge_delay=0.05
+        ))
+
+        self.assertEqual(response.content, "secondary")
+        self.assertTrue(primary.cancelled)
+        self.assertEqual(manager.hedge_stats["hedged_requests"], 1)
+        self.assertEqual(manager.hedge_stats["hedge_wins"], 1)
+        self.assertEqual(manager.get_aggregated_metrics()["hedging"]["cancelled_requests"], 1)
+
+    def test_no_hedge_after_first_token(self):
+        """A primary that streams its first token within budget is not hedged."""
+        primary = AsyncFakeClient("primary", 0.01, 0.1)
+        secondary = AsyncFakeClient("secondary", 0.01, 0.01)
+        manager = self.make_manager(primary, secondary)
+
+        response = asyncio.run(manager.agenerate_with_fallback(
+            LLMRequest(prompt="q"), hedge_delay=0.05
+        ))
+
+        self.assertEqual(response.content, "primary")
+        self.assertEqual(secondary.calls, 0)
+
+    def test_all_providers_fail(self):
+        """An LLMError is raised when every provider fails."""
+        manager = self.make_manager(
+            AsyncFakeClient("a", 0.01, 0.01, error=LLMError("a down")),
+            AsyncFakeClient("b", 0.01, 0.01, error=LLMError("b down")),
+        )
+
+        with self.assertRaises(LLMError) as ctx:
+            asyncio.run(manager.agenerate_with_fallback(LLMRequest(prompt="q"), hedge_delay=0.05))
+        self.assertIn("All providers failed", str(ctx.exception))
+
+
+class FakeAnthropicStream:
+    """Async context manager mimicking ``AsyncAnthropic.messages.stream``."""
+
+    def __init__(self, message):
+        self.message = message
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    @property
+    def text_stream(self):
+        async def texts():
+            for block in self.message.content:
+                yield block.text
+        return texts()
+
+    async def get_final_message(self):
+        return self.message
+
+
+class TestAnthropicAsync(unittest.TestCase):
+    """Test the native async path of AnthropicProvider."""
+
+    def setUp(self):
+        try:
+            from .anthropic_provider import ANTHROPIC_AVAILABLE, AnthropicProvider
+        except ImportError:
+            self.skipTest("anthropic not installed")
+        if not ANTHROPIC_AVAILABLE:
+            self.skipTest("anthropic not installed")
+
+        self.message = SimpleNamespace(
+            id="msg_1",
+            model="claude-3-haiku-20240307",
+            stop_reason="end_turn",
+            content=[SimpleNamespace(text="SELECT "), SimpleNamespace(text="?s")],
+            usage=SimpleNamespace(input_tokens=10, output_tokens=2),
+        )
+
+        async def create(**params):
+            return self.message
+
+        self.provider = AnthropicProvider(model="claude-3-haiku-20240307", api_key="test")
+        self.provider.async_client = SimpleNamespace(messages=SimpleNamespace(
+            create=create,
+            stream=lambda **params: FakeAnthropicStream(self.message),
+        ))
+
+    def test_agenerate(self):
+        """agenerate() uses the async client and converts the message."""
+        response = asyncio.run(self.provider.agenerate(LLMRequest(prompt="q")))
+        self.assertEqual(response.content, "SELECT ?s")
+        self.assertEqual(response.usage.total_tokens, 12)
+
+    def test_agenerate_streams_for_first_token(self):
+        """With a first-token event the message is streamed and timed."""
+        async def run():
+            event = asyncio.Event()
+            response = await self.provider.agenerate(LLMRequest(prompt="q"), first_token=event)
+            return event.is_set(), response
+
+        first_token_seen, response = asyncio.run(run())
+        self.assertTrue(first_token_seen)
+        self.assertEqual(response.content, "SELECT ?s")
+        self.assertIsNotNone(response.metrics.time_to_first_token_ms)
+
+    def test_cacheable_system_prompt(self):
+        """A cacheable system prompt is sent as a text block with cache control."""
+        params = self.provider._build_request_params(
+            LLMRequest(prompt="q", system_prompt="context", cache_system_prompt=True)
+        )
+        self.assertEqual(params["system"], [{
+            "type": "text",
+            "text": "context",
+            "cache_control": {"type": "ephemeral"},
+        }])
+
+        params = self.provider._build_request_params(LLMRequest(prompt="q", system_prompt="context"))
+        self.assertEqual(params["system"], "context")
+
+
+class TestOpenAIAsync(unittest.TestCase):
+    """Test that the OpenAI-style providers accept manager requests."""
+
+    def setUp(self):
+        try:
+            from .openai_provider import LocalProvider, OpenAIProvider
+        except ImportError:
+            self.skipTest("openai not installed")
+
+        self.params = []
+        completion = SimpleNamespace(
+            id="chatcmpl-1",
+            choices=[SimpleNamespace(
+                message=SimpleNamespace(content="SELECT ?s", function_call=None),
+                finish_reason="stop",
+            )],
+            usage=SimpleNamespace(prompt_tokens=10, completion_tokens=2, total_tokens=12),
+        )
+
+        async def create(**params):
+            self.params.append(params)
+            return completion
+
+        async_client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+        self.providers = [
+            OpenAIProvider(model="gpt-4", api_key="test"),
+            LocalProvider(model="llama2"),
+        ]
+        for provider in self.providers:
+            provider.async_client = async_client
+
+    def test_agenerate_accepts_request_and_first_token(self):
+        """An LLMRequest is unpacked and the first-token event is set."""
+        request = LLMRequest(prompt="q", system_prompt="context", max_tokens=50, temperature=0.0)
+
+        async def run(provider):
+            event = asyncio.Event()
+            response = await provider.agenerate(request, first_token=event)
+            return event.is_set(), response
+
+        for provider in self.providers:
+            first_token_seen, response = asyncio.run(run(provider))
+            self.assertTrue(first_token_seen)
+            self.assertEqual(response.content, "SELECT ?s")
+            self.assertEqual(self.params[-1]["messages"], [
+                {"role": "system", "content": "context"},
+                {"role": "user", "content": "q"},
+            ])
+            self.assertEqual(self.params[-1]["max_tokens"], 50)
+            self.assertEqual(self.params[-1]["temperature"], 0.0)
+            self.assertNotIn("first_token", self.params[-1])
+
+    def test_agenerate_passes_request_options(self):
+        """Tools, top_p and a JSON response format reach the API call."""
+        tools = [{"type": "function", "function": {"name": "run_query", "parameters": {}}}]
+        request = LLMRequest(prompt="q", top_p=0.5, tools=tools, response_format="json")
+
+        for provider in self.providers:
+            asyncio.run(provider.agenerate(request))
+            self.assertEqual(self.params[-1]["top_p"], 0.5)
+            self.assertEqual(self.params[-1]["tools"], tools)
+            self.assertEqual(self.params[-1]["response_format"], {"type": "json_object"})
+
+    def test_agenerate_chains_translated_errors(self):
+        """Translated provider errors keep the original exception as their cause."""
+        error = RuntimeError("boom")
+
+        async def create(**params):
+            raise error
+
+        for provider in self.providers:
+            provider.async_client = SimpleNamespace(
+                chat=SimpleNamespace(completions=SimpleNamespace(create=create))
+            )
+            with self.assertRaises(Exception) as context:
+                asyncio.run(provider.agenerate("q"))
+            self.assertIs(context.exception.__cause__, error)
+
+
+if __name__ == "__main__":
+    unittest.main()
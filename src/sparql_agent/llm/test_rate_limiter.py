@@ -0,0 +1,208 @@
+"""
+Unit tests for the LLM rate limiter.
+
+Tests cover:
+- Request and token buckets with a fake clock
+- Usage corrections and limit changes
+- Concurrent acquisition from threads and tasks
+- Sharing per API key and queue wait reporting in AnthropicProvider
+"""
+
+import asyncio
+import threading
+import unittest
+from types import SimpleNamespace
+
+from .client import LLMRequest
+from .rate_limiter import LLMRateLimiter, get_rate_limiter, reset_rate_limiters
+
+
+class FakeClock:
+    """Manually advanced clock."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestLLMRateLimiter(unittest.TestCase):
+    """Test the token buckets."""
+
+    def test_unlimited(self):
+        limiter = LLMRateLimiter()
+        self.assertEqual(limiter.reserve(10 ** 6), 0.0)
+
+    def test_request_bucket(self):
+        clock = FakeClock()
+        limiter = LLMRateLimiter(requests_per_minute=60, clock=clock)
+
+        waits = [limiter.reserve() for _ in range(62)]
+        self.assertEqual(waits[:60], [0.0] * 60)
+        # Reservations queue one second apart at one request per second
+        self.assertAlmostEqual(waits[60], 1.0)
+        self.assertAlmostEqual(waits[61], 2.0)
+
+        clock.now = 10.0
+        self.assertAlmostEqual(limiter.reserve(), 0.0)
+
+    def test_token_bucket(self):
+        clock = FakeClock()
+        limiter = LLMRateLimiter(tokens_per_minute=600, clock=clock)
+
+        self.assertEqual(limiter.reserve(500), 0.0)
+        # 400 tokens short at 10 tokens per second
+        self.assertAlmostEqual(limiter.reserve(500), 40.0)
+
+    def test_oversized_request_is_capped(self):
+        limiter = LLMRateLimiter(tokens_per_minute=600, clock=FakeClock())
+        self.assertEqual(limiter.reserve(10 ** 6), 0.0)
+
+    def test_record_usage(self):
+        clock = FakeClock()
+        limiter = LLMRateLimiter(tokens_per_minute=600, clock=clock)
+
+        limiter.reserve(100)
+        limiter.record_usage(estimated=100, actual=700)
+        self.assertAlmostEqual(limiter.get_statistics()["available_tokens"], -100)
+
+        # Refunds never overfill the bucket
+        limiter.record_usage(estimated=1000, actual=0)
+        self.assertAlmostEqual(limiter.get_statistics()["available_tokens"], 600)
+
+    def test_set_limits_keeps_used_capacity(self):
+        clock = FakeClock()
+        limiter = LLMRateLimiter(requests_per_minute=60, clock=clock)
+        for _ in range(60):
+            limiter.reserve()
+
+        limiter.set_limits(requests_per_minute=120)
+        self.assertEqual(limiter.requests_per_minute, 120)
+        self.assertAlmostEqual(limiter.reserve(), 0.5)
+
+    def test_threads_share_bucket(self):
+        limiter = LLMRateLimiter(requests_per_minute=600, clock=FakeClock())
+        waits = []
+        lock = threading.Lock()
+
+        def worker():
+            waited = limiter.acquire()
+            with lock:
+                waits.append(waited)
+
+        threads = [threading.Thread(target=worker) for _ in range(605)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(waits), 605)
+        # Each reservation is granted exactly once, whatever the interleaving
+        self.assertEqual(sorted(waits)[-5:], [0.1, 0.2, 0.3, 0.4, 0.5])
+        self.assertEqual(limiter.get_statistics()["throttled"], 5)
+
+    def test_async_acquire(self):
+        limiter = LLMRateLimiter(requests_per_minute=1200)
+
+        async def run():
+            return await asyncio.gather(*(limiter.aacquire() for _ in range(1202)))
+
+        waits = asyncio.run(run())
+        self.assertEqual(sum(1 for wait in waits if wait > 0), 2)
+        self.assertLessEqual(max(waits), 0.1)
+
+
+class TestSharedLimiters(unittest.TestCase):
+    """Test sharing limiters per API key."""
+
+    def tearDown(self):
+        reset_rate_limiters()
+
+    def test_shared_per_key(self):
+        first = get_rate_limiter("key-a", requests_per_minute=50)
+        self.assertIs(get_rate_limiter("key-a", requests_per_minute=50), first)
+        self.assertIsNot(get_rate_limiter("key-b", requests_per_minute=50), first)
+        self.assertIsNot(get_rate_limiter("key-a", requests_per_minute=50, provider="openai"), first)
+
+    def test_new_limits_tighten_shared_limiter(self):
+        first = get_rate_limiter("key-a", requests_per_minute=50)
+        second = get_rate_limiter("key-a", requests_per_minute=100, tokens_per_minute=1000)
+        self.assertIs(first, second)
+        self.assertEqual(first.requests_per_minute, 50)
+        self.assertEqual(first.tokens_per_minute, 1000)
+
+        get_rate_limiter("key-a", requests_per_minute=20, tokens_per_minute=2000)
+        self.assertEqual(first.requests_per_minute, 20)
+        self.assertEqual(first.tokens_per_minute, 1000)
+
+    def test_defaults_keep_shared_limits(self):
+        first = get_rate_limiter("key-a", requests_per_minute=50, tokens_per_minute=40000)
+        get_rate_limiter("key-a", requests_per_minute=1200)
+        get_rate_limiter("key-a")
+        self.assertEqual(first.requests_per_minute, 50)
+        self.assertEqual(first.tokens_per_minute, 40000)
+
+
+class TestAnthropicRateLimiting(unittest.TestCase):
+    """Test rate limiting in AnthropicProvider."""
+
+    def setUp(self):
+        try:
+            from .anthropic_provider import ANTHROPIC_AVAILABLE, AnthropicProvider
+        except ImportError:
+            self.skipTest("anthropic not installed")
+        if not ANTHROPIC_AVAILABLE:
+            self.skipTest("anthropic not installed")
+        self.provider_class = AnthropicProvider
+
+        self.message = SimpleNamespace(
+            id="msg_1",
+            model="claude-3-haiku-20240307",
+            stop_reason="end_turn",
+            content=[SimpleNamespace(type="text", text="SELECT ?s")],
+            usage=SimpleNamespace(input_tokens=10, output_tokens=2),
+        )
+
+    def tearDown(self):
+        reset_rate_limiters()
+
+    def make_provider(self, **kwargs):
+        provider = self.provider_class(model="claude-3-haiku-20240307", api_key="test", **kwargs)
+        provider.client = SimpleNamespace(messages=SimpleNamespace(create=lambda **params: self.message))
+        return provider
+
+    def test_providers_share_limiter(self):
+        first = self.make_provider(requests_per_minute=50)
+        second = self.make_provider(requests_per_minute=50)
+        self.assertIs(first.rate_limiter, second.rate_limiter)
+
+    def test_default_provider_keeps_token_limit(self):
+        first = self.make_provider(requests_per_minute=50, tokens_per_minute=40000)
+        self.make_provider()
+        self.assertEqual(first.rate_limiter.requests_per_minute, 50)
+        self.assertEqual(first.rate_limiter.tokens_per_minute, 40000)
+
+    def test_reservation_includes_output_tokens(self):
+        limiter = LLMRateLimiter(tokens_per_minute=10000)
+        provider = self.make_provider(rate_limiter=limiter)
+
+        provider.generate(LLMRequest(prompt="q", max_tokens=500))
+        self.assertEqual(provider._estimate_request_tokens(LLMRequest(prompt="q", max_tokens=500)),
+                         provider.count_tokens("q") + 500)
+        # Corrected to the 12 tokens the response reports
+        self.assertAlmostEqual(limiter.get_statistics()["available_tokens"], 10000 - 12, delta=1)
+
+    def test_queue_wait_reported(self):
+        limiter = LLMRateLimiter(requests_per_minute=600)
+        provider = self.make_provider(rate_limiter=limiter)
+        for _ in range(600):
+            limiter.reserve()
+
+        response = provider.generate(LLMRequest(prompt="q"))
+        self.assertGreater(response.metrics.queue_wait_ms, 50)
+        self.assertEqual(limiter.get_statistics()["acquired"], 601)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,259 @@
+"""
+Unit tests for the LLM response cache.
+
+Tests cover:
+- Request fingerprints and question normalization
+- Exact and near-duplicate cache tiers
+- Disk persistence
+- Cache metrics of LLMClient and ProviderManager
+"""
+
+import unittest
+from typing import Iterator
+
+from .client import (
+    GenerationMetrics,
+    LLMClient,
+    LLMProvider,
+    LLMRequest,
+    LLMResponse,
+    ModelCapabilities,
+    ProviderManager,
+    StreamChunk,
+    TokenUsage,
+)
+from .response_cache import LLMResponseCache, normalize_question, request_fingerprint
+
+
+class CountingClient(LLMClient):
+    """Client that answers with a counter and records calls."""
+
+    def __init__(self, **kwargs):
+        super().__init__(model="test-model", **kwargs)
+        self.calls = 0
+
+    def get_provider(self) -> LLMProvider:
+        return LLMProvider.CUSTOM
+
+    def get_capabilities(self) -> ModelCapabilities:
+        return ModelCapabilities()
+
+    def _generate_impl(self, request: LLMRequest) -> LLMResponse:
+        self.calls += 1
+        return LLMResponse(
+            content=f"SELECT * WHERE {{ ?s ?p ?o }} # {self.calls}",
+            model=self.model,
+            provider="custom",
+            finish_reason="stop",
+            usage=TokenUsage(prompt_tokens=10, completion_tokens=5, total_tokens=15),
+            metrics=GenerationMetrics(latency_ms=100.0, tokens_per_second=50.0),
+            raw_response=object(),
+        )
+
+    def _generate_streaming_impl(self, request: LLMRequest) -> Iterator[StreamChunk]:
+        return iter([])
+
+    def count_tokens(self, text: str) -> int:
+        return len(text.split())
+
+
+def question_request(question: str, endpoint: str = "https://sparql.uniprot.org/sparql") -> LLMRequest:
+    """Request whose prompt embeds the question and endpoint, as the generator builds it."""
+    return LLMRequest(
+        prompt=f"Translate to SPARQL for {endpoint}: {question}",
+        temperature=0.3,
+        metadata={"question": question, "endpoint_url": endpoint},
+    )
+
+
+class TestKeys(unittest.TestCase):
+    """Test request fingerprints and question normalization."""
+
+    def test_fingerprint_ignores_surrounding_whitespace(self):
+        """Prompts differing only in surrounding whitespace share a fingerprint."""
+        a = request_fingerprint(LLMRequest(prompt="Find proteins"), "m")
+        b = request_fingerprint(LLMRequest(prompt="  Find proteins\n"), "m")
+        self.assertEqual(a, b)
+
+    def test_fingerprint_covers_sampling_and_model(self):
+        """Model, temperature and tools change the fingerprint."""
+        base = request_fingerprint(LLMRequest(prompt="p"), "m")
+        self.assertNotEqual(base, request_fingerprint(LLMRequest(prompt="p"), "other"))
+        self.assertNotEqual(base, request_fingerprint(LLMRequest(prompt="p", temperature=0.0), "m"))
+        self.assertNotEqual(
+            base, request_fingerprint(LLMRequest(prompt="p", tools=[{"name": "t"}]), "m")
+        )
+
+    def test_normalize_question(self):
+        """Case, punctuation and filler phrases are dropped."""
+        self.assertEqual(
+            normalize_question("Please, could you show me human proteins?"),
+            normalize_question("human  PROTEINS"),
+        )
+        self.assertNotEqual(
+            normalize_question("human proteins"),
+            normalize_question("mouse proteins"),
+        )
+
+    def test_normalize_question_keeps_meaningful_words(self):
+        """Single letters and short words that name entities are kept."""
+        for question, other in [
+            ("hepatitis A", "hepatitis"),
+            ("vitamin A", "vitamin"),
+            ("type I diabetes", "type diabetes"),
+            ("genes linked to asthma", "genes linked asthma"),
+        ]:
+            self.assertNotEqual(normalize_question(question), normalize_question(other), question)
+
+
+class TestLLMResponseCache(unittest.TestCase):
+    """Test cache tiers through LLMClient.generate()."""
+
+    def setUp(self):
+        self.cache = LLMResponseCache()
+        self.client = CountingClient(response_cache=self.cache)
+
+    def test_exact_hit(self):
+        """An identical request is served from cache."""
+        first = self.client.generate(LLMRequest(prompt="p", temperature=0.0))
+        second = self.client.generate(LLMRequest(prompt="p", temperature=0.0))
+
+        self.assertEqual(self.client.calls, 1)
+        self.assertFalse(first.cached)
+        self.assertTrue(second.cached)
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(second.metadata["cache_tier"], "exact")
+        self.assertIsNone(second.raw_response)
+
+    def test_near_duplicate_hit(self):
+        """A rephrased question for the same endpoint hits the semantic tier."""
+        self.client.generate(question_request("Show me all human proteins"))
+        hit = self.client.generate(question_request("all human proteins?"))
+
+        self.assertEqual(self.client.calls, 1)
+        self.assertEqual(hit.metadata["cache_tier"], "semantic")
+
+    def test_near_duplicate_respects_endpoint(self):
+        """The same question against another endpoint is a miss."""
+        self.client.generate(question_request("human proteins"))
+        self.client.generate(question_request("human proteins", "https://query.wikidata.org/sparql"))
+
+        self.assertEqual(self.client.calls, 2)
+
+    def test_near_duplicate_respects_model_and_context(self):
+        """Other models, system prompts or schema versions do not share entries."""
+        self.client.generate(question_request("human proteins"))
+
+        other_model = CountingClient(response_cache=self.cache)
+        other_model.model = "other-model"
+        other_model.generate(question_request("Human proteins!"))
+        self.assertEqual(other_model.calls, 1)
+
+        changed_schema = question_request("Human proteins!")
+        changed_schema.system_prompt = "Schema: up:Protein, up:organism"
+        self.client.generate(changed_schema)
+        versioned = question_request("Human proteins!")
+        versioned.metadata["schema_version"] = "2026-10"
+        self.client.generate(versioned)
+        self.assertEqual(self.client.calls, 3)
+
+    def test_near_duplicate_respects_rest_of_prompt(self):
+        """Constraints or instructions around the question must match too."""
+        self.client.generate(question_request("human proteins"))
+
+        constrained = question_request("Human proteins!")
+        constrained.prompt += "\n## Constraints\n- limit: 10"
+        self.client.generate(constrained)
+        self.assertEqual(self.client.calls, 2)
+
+        again = question_request("human proteins?")
+        again.prompt += "\n## Constraints\n- limit: 10"
+        hit = self.client.generate(again)
+        self.assertEqual(self.client.calls, 2)
+        self.assertEqual(hit.metadata["cache_tier"], "semantic")
+
+    def test_semantic_tier_can_be_disabled(self):
+        """Without the semantic tier only exact matches hit."""
+        client = CountingClient(response_cache=LLMResponseCache(semantic=False))
+        client.generate(question_request("human proteins"))
+        client.generate(question_request("Human proteins!"))
+
+        self.assertEqual(client.calls, 2)
+
+    def test_high_temperature_not_cached(self):
+        """Requests above max_temperature bypass the cache."""
+        client = CountingClient(response_cache=LLMResponseCache(max_temperature=0.5))
+        client.generate(LLMRequest(prompt="p", temperature=0.9))
+        client.generate(LLMRequest(prompt="p", temperature=0.9))
+
+        self.assertEqual(client.calls, 2)
+        self.assertEqual(client.response_cache.get_statistics()["skipped"], 2)
+
+    def test_invalidate_endpoint(self):
+        """Invalidating an endpoint drops its responses."""
+        self.client.generate(question_request("human proteins"))
+        self.cache.invalidate("https://sparql.uniprot.org/sparql")
+        self.client.generate(question_request("human proteins"))
+
+        self.assertEqual(self.client.calls, 2)
+
+    def test_metrics(self):
+        """Client metrics report cache hits and hit rate."""
+        for _ in range(4):
+            self.client.generate(LLMRequest(prompt="p"))
+
+        metrics = self.client.get_metrics()
+        self.assertEqual(metrics["request_count"], 1)
+        self.assertEqual(metrics["cache_hits"], 3)
+        self.assertAlmostEqual(metrics["cache_hit_rate"], 0.75)
+        self.assertAlmostEqual(self.cache.get_statistics()["hit_rate"], 0.75)
+
+    def test_disk_tier_survives_restart(self):
+        """Responses written to disk are served by a new cache instance."""
+        import os
+        import tempfile
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "llm.db")
+            cache = LLMResponseCache(disk_path=path)
+            CountingClient(response_cache=cache).generate(LLMRequest(prompt="p"))
+            cache.close()
+
+            reopened = LLMResponseCache(disk_path=path)
+            client = CountingClient(response_cache=reopened)
+            self.assertTrue(client.generate(LLMRequest(prompt="p")).cached)
+            self.assertEqual(client.calls, 0)
+            reopened.close()
+
+
+class TestProviderManagerCache(unittest.TestCase):
+    """Test the shared cache of ProviderManager."""
+
+    def test_shared_cache_and_aggregated_metrics(self):
+        """Providers share the manager's cache and hits are aggregated."""
+        manager = ProviderManager(response_cache=LLMResponseCache())
+        client = CountingClient()
+        manager.register_provider("test", client)
+
+        manager.generate_with_fallback(LLMRequest(prompt="p"))
+        manager.generate_with_fallback(LLMRequest(prompt="p"))
+
+        metrics = manager.get_aggregated_metrics()
+        self.assertEqual(client.calls, 1)
+        self.assertEqual(metrics["total_cache_hits"], 1)
+        self.assertAlmostEqual(metrics["cache_hit_rate"], 0.5)
+        self.assertEqual(metrics["response_cache"]["exact_hits"], 1)
+
+    def test_set_response_cache(self):
+        """set_response_cache() attaches the cache to registered providers."""
+        manager = ProviderManager()
+        client = CountingClient()
+        manager.register_provider("test", client)
+
+        cache = LLMResponseCache()
+        manager.set_response_cache(cache)
+        self.assertIs(client.response_cache, cache)
+
+
+if __name__ == "__main__":
+    unittest.main()
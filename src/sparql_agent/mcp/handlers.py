@@ -48,7 +48,7 @@ from ..core.exceptions import (
     InputValidationError,
     ResourceExhaustedError,
 )
-from ..execution.executor import QueryExecutor
+from ..execution.async_executor import AsyncQueryExecutor
 from ..execution.validator import QueryValidator, validate_query
 from ..query.generator import SPARQLGenerator
 from ..discovery.capabilities import CapabilitiesDetector
@@ -451,15 +451,15 @@ class QueryHandler(BaseHandler):
     Handler for executing SPARQL queries.
     """
 
-    def __init__(self, executor: Optional[QueryExecutor] = None):
+    def __init__(self, executor: Optional[AsyncQueryExecutor] = None):
         """
         Initialize query handler.
 
         Args:
-            executor: Query executor instance
+            executor: Async query executor instance
         """
         super().__init__("QueryHandler")
-        self.executor = executor or QueryExecutor()
+        self.executor = executor or AsyncQueryExecutor()
 
     async def handle(self, request: MCPRequest) -> MCPResponse:
         """Execute SPARQL query."""
@@ -484,7 +484,7 @@ class QueryHandler(BaseHandler):
 
             # Execute query
             self.logger.info(f"Executing query on {endpoint_url}")
-            result = self.executor.execute(
+            result = await self.executor.execute(
                 query=query,
                 endpoint=endpoint
             )
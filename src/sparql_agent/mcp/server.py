@@ -104,7 +104,8 @@ from ..core.exceptions import (
     QueryValidationError,
     EndpointConnectionError,
 )
-from ..execution.executor import QueryExecutor, ResultFormat
+from ..execution.executor import ResultFormat
+from ..execution.async_executor import AsyncQueryExecutor
 from ..execution.validator import QueryValidator, validate_query
 from ..query.generator import SPARQLGenerator, GenerationStrategy
 from ..discovery.capabilities import CapabilitiesDetector, PrefixExtractor
@@ -202,7 +203,7 @@ class MCPServer:
         self.mcp = Server(self.config.name)
 
         # Initialize components
-        self.query_executor = QueryExecutor()
+        self.query_executor = AsyncQueryExecutor()
         self.query_validator = QueryValidator()
         self.query_generator: Optional[SPARQLGenerator] = None
         self.ols_client = OLSClient()
@@ -654,8 +655,7 @@ class MCPServer:
         )
 
         # Execute query
-        result = await asyncio.to_thread(
-            self.query_executor.execute,
+        result = await self.query_executor.execute(
             query=query,
             endpoint=endpoint,
             timeout=timeout
@@ -1255,15 +1255,18 @@ Provide specific, actionable suggestions."""
         )
 
         # Run server with stdio transport
-        async with self.mcp.stdio_server() as (read_stream, write_stream):
-            await self.mcp.run(
-                read_stream,
-                write_stream,
-                InitializationOptions(
-                    server_name=self.config.name,
-                    server_version=self.config.version,
+        try:
+            async with self.mcp.stdio_server() as (read_stream, write_stream):
+                await self.mcp.run(
+                    read_stream,
+                    write_stream,
+                    InitializationOptions(
+                        server_name=self.config.name,
+                        server_version=self.config.version,
+                    )
                 )
-            )
+        finally:
+            await self.query_executor.aclose()
 
     def get_stats(self) -> Dict[str, Any]:
         """Get server statistics."""
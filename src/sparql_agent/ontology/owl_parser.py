@@ -13,6 +13,8 @@ import owlready2 as owl2
 from rdflib import Graph, Namespace, RDF, RDFS, OWL, URIRef
 from rdflib.namespace import SKOS
 
+from ..core.ontology_index import LabelIndex
+
 
 class OWLParser:
     """
@@ -47,6 +49,9 @@ class OWLParser:
         
         # Namespace cache
         self.namespaces: Dict[str, Namespace] = {}
+
+        # Class label index, built on first lookup
+        self._label_index: Optional[LabelIndex] = None
         
         if source:
             self.load(source)
@@ -60,6 +65,7 @@ class OWLParser:
             format: Optional format specification (e.g., 'rdfxml', 'turtle')
         """
         self.source = source
+        self._label_index = None
         
         # Load with owlready2 for reasoning
         try:
@@ -93,6 +99,9 @@ class OWLParser:
         if not self.ontology:
             raise ValueError("No ontology loaded")
         
+        # Inferred facts may add classes
+        self._label_index = None
+        
         try:
             if self.reasoner == "pellet":
                 owl2.sync_reasoner_pellet(
@@ -281,28 +290,33 @@ class OWLParser:
         if not self.ontology:
             raise ValueError("No ontology loaded")
         
-        matches = []
-        search_label = label if case_sensitive else label.lower()
+        index = self._get_label_index()
+        if fuzzy:
+            entries = index.labels_containing(label)
+        else:
+            entries = index.exact_entries(label)
         
-        for cls in self.ontology.classes():
-            cls_labels = cls.label
-            if not cls_labels:
-                continue
-            
-            for cls_label in cls_labels:
-                compare_label = cls_label if case_sensitive else cls_label.lower()
-                
-                if fuzzy:
-                    if search_label in compare_label:
-                        matches.append(cls.iri)
-                        break
-                else:
-                    if search_label == compare_label:
-                        matches.append(cls.iri)
-                        break
+        matches = []
+        for uri, cls_label in entries:
+            if case_sensitive:
+                if fuzzy and label not in cls_label:
+                    continue
+                if not fuzzy and label != cls_label:
+                    continue
+            if uri not in matches:
+                matches.append(uri)
         
         return matches
 
+    def _get_label_index(self) -> LabelIndex:
+        """Get the class label index, building it on first use."""
+        if self._label_index is None:
+            self._label_index = LabelIndex(
+                (cls.iri, [str(lbl) for lbl in cls.label])
+                for cls in self.ontology.classes()
+            )
+        return self._label_index
+
     def get_class_hierarchy(
         self, 
         class_uri: str, 
@@ -10,10 +10,16 @@ from .prompt_engine import (
     PromptContext,
     FewShotExample,
     QueryScenario,
+    PromptSection,
+    PromptSectionCache,
+    ContextAssembler,
+    StructuredPrompt,
     create_prompt_engine,
     quick_prompt
 )
 
+from .example_index import ExampleIndex
+
 from .intent_parser import (
     IntentParser,
     ParsedIntent,
@@ -59,8 +65,13 @@ __all__ = [
     "PromptContext",
     "FewShotExample",
     "QueryScenario",
+    "PromptSection",
+    "PromptSectionCache",
+    "ContextAssembler",
+    "StructuredPrompt",
     "create_prompt_engine",
     "quick_prompt",
+    "ExampleIndex",
     # Intent parser
     "IntentParser",
     "ParsedIntent",
@@ -0,0 +1,272 @@
+"""
+Lexical retrieval index for few-shot example selection.
+
+Few-shot examples used to be picked by slicing the first examples of a
+scenario, whatever the question. ``ExampleIndex`` is a BM25 inverted index
+over the example corpus, so each question gets the examples most similar to
+it, without an embedding service.
+
+Each example is indexed on three weighted fields:
+
+- the words of its question
+- its tags
+- features of its SPARQL query: keywords and aggregates (with the words a
+  question would use for them, e.g. COUNT -> "how many"), and the local
+  names of the classes and properties it uses (``up:organism`` -> "organism")
+
+Words are lowercased, split on camelCase and punctuation, stripped of common
+stop words and lightly stemmed. Scores are computed term-at-a-time over the
+postings of the question's words, so a lookup touches only the examples that
+share a word with the question.
+
+Example:
+    >>> index = ExampleIndex()
+    >>> index.add(FewShotExample(question="Count proteins per organism", sparql="..."))
+    0
+    >>> [example.question for example, score in index.search("how many proteins")]
+    ['Count proteins per organism']
+"""
+
+import heapq
+import math
+import re
+from collections import Counter
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from ..core.sparql_lexer import AGGREGATES, IRI, PNAME, analyze_sparql
+
+if TYPE_CHECKING:
+    from .prompt_engine import FewShotExample, QueryScenario
+
+
+# Field weights: how much one occurrence of a word counts in each field
+QUESTION_WEIGHT = 1.0
+TAG_WEIGHT = 2.0
+FEATURE_WEIGHT = 0.5
+
+_WORD = re.compile(r"[A-Z]+(?![a-z])|[A-Z]?[a-z]+|\d+")
+
+_STOP_WORDS = frozenset({
+    "a", "all", "an", "and", "are", "as", "at", "be", "by", "do", "does", "for",
+    "from", "get", "give", "has", "have", "in", "is", "it", "list", "me", "of",
+    "on", "or", "show", "that", "the", "their", "them", "there", "these", "this",
+    "to", "what", "which", "who", "with",
+})
+
+# Words a question would use for a SPARQL feature
+_FEATURE_WORDS = {
+    "COUNT": "count how many number total",
+    "SUM": "sum total",
+    "AVG": "average mean",
+    "MIN": "minimum lowest smallest",
+    "MAX": "maximum highest largest",
+    "GROUP_CONCAT": "concatenate",
+    "GROUP": "per each group",
+    "ORDER": "top most sorted ranked",
+    "OPTIONAL": "optional available",
+    "FILTER": "filter",
+    "REGEX": "search matching pattern",
+    "CONTAINS": "search contains containing",
+    "STRSTARTS": "starts beginning",
+    "SERVICE": "federated remote",
+    "UNION": "either or",
+    "MINUS": "without except excluding",
+    "NOT EXISTS": "without except excluding",
+}
+
+
+def _stem(word: str) -> str:
+    """Strip common English suffixes."""
+    for suffix in ("ies", "ing", "ed", "es", "s"):
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            if suffix == "s" and word.endswith("ss"):
+                return word
+            if suffix == "ies":
+                return word[:-3] + "y"
+            return word[:-len(suffix)]
+    return word
+
+
+def tokenize_text(text: str) -> List[str]:
+    """
+    Split text into normalized index terms.
+
+    Args:
+        text: Question, tag or local name
+
+    Returns:
+        Lowercased, stemmed words without stop words
+    """
+    terms = []
+    for word in _WORD.findall(text):
+        word = word.lower()
+        if word not in _STOP_WORDS:
+            terms.append(_stem(word))
+    return terms
+
+
+def sparql_features(sparql: str) -> List[str]:
+    """
+    Extract index terms describing a SPARQL query.
+
+    Args:
+        sparql: SPARQL query text
+
+    Returns:
+        Terms for the keywords, aggregates and vocabulary the query uses
+    """
+    analysis = analyze_sparql(sparql)
+    terms: List[str] = []
+
+    for keyword, words in _FEATURE_WORDS.items():
+        if analysis.count(keyword):
+            terms.extend(tokenize_text(words))
+    for aggregate in AGGREGATES:
+        if analysis.count(aggregate) and aggregate not in _FEATURE_WORDS:
+            terms.extend(tokenize_text(aggregate))
+
+    for token in analysis.tokens:
+        if token.kind == PNAME:
+            local_name = token.value.split(":", 1)[1]
+        elif token.kind == IRI:
+            local_name = re.split(r"[/#]", token.value[1:-1].rstrip("/#"))[-1]
+        else:
+            continue
+        terms.extend(tokenize_text(local_name))
+
+    return terms
+
+
+class ExampleIndex:
+    """
+    BM25 index over few-shot examples.
+
+    Examples can be added at any time; document frequencies and lengths are
+    kept up to date as they are.
+    """
+
+    def __init__(
+        self,
+        examples: Iterable["FewShotExample"] = (),
+        k1: float = 1.2,
+        b: float = 0.75
+    ):
+        """
+        Build the index.
+
+        Args:
+            examples: Examples to index
+            k1: BM25 term frequency saturation
+            b: BM25 length normalization
+        """
+        self.k1 = k1
+        self.b = b
+        self._examples: List["FewShotExample"] = []
+        self._scenarios: List["QueryScenario"] = []
+        self._lengths: List[float] = []
+        self._total_length = 0.0
+        # term -> [(example id, weighted term frequency)]
+        self._postings: Dict[str, List[Tuple[int, float]]] = {}
+
+        for example in examples:
+            self.add(example)
+
+    def __len__(self) -> int:
+        return len(self._examples)
+
+    @property
+    def examples(self) -> List["FewShotExample"]:
+        """Indexed examples in insertion order."""
+        return list(self._examples)
+
+    def add(self, example: "FewShotExample", scenario: Optional["QueryScenario"] = None) -> int:
+        """
+        Index an example.
+
+        Args:
+            example: Few-shot example
+            scenario: Scenario the example is filed under (its own if not given)
+
+        Returns:
+            Example id
+        """
+        frequencies: Counter = Counter()
+        for term in tokenize_text(example.question):
+            frequencies[term] += QUESTION_WEIGHT
+        for tag in example.tags:
+            for term in tokenize_text(tag):
+                frequencies[term] += TAG_WEIGHT
+        for term in sparql_features(example.sparql):
+            frequencies[term] += FEATURE_WEIGHT
+
+        example_id = len(self._examples)
+        self._examples.append(example)
+        self._scenarios.append(scenario if scenario is not None else example.scenario)
+        length = sum(frequencies.values())
+        self._lengths.append(length)
+        self._total_length += length
+
+        for term, frequency in frequencies.items():
+            self._postings.setdefault(term, []).append((example_id, frequency))
+
+        return example_id
+
+    def search(
+        self,
+        query: str,
+        k: int = 5,
+        scenario: Optional["QueryScenario"] = None,
+        min_difficulty: int = 1,
+        max_difficulty: int = 5,
+        tags: Optional[Sequence[str]] = None
+    ) -> List[Tuple["FewShotExample", float]]:
+        """
+        Find the examples most relevant to a question.
+
+        Args:
+            query: Natural language question
+            k: Maximum number of examples
+            scenario: Only return examples of this scenario
+            min_difficulty: Minimum difficulty level
+            max_difficulty: Maximum difficulty level
+            tags: Only return examples with one of these tags
+
+        Returns:
+            ``(example, score)`` pairs, best first; examples sharing no term
+            with the question are not returned
+        """
+        if not self._examples or k <= 0:
+            return []
+
+        count = len(self._examples)
+        average_length = self._total_length / count or 1.0
+        scores: Dict[int, float] = {}
+
+        for term in set(tokenize_text(query)):
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+            for example_id, frequency in postings:
+                norm = self.k1 * (1 - self.b + self.b * self._lengths[example_id] / average_length)
+                scores[example_id] = scores.get(example_id, 0.0) + (
+                    idf * frequency * (self.k1 + 1) / (frequency + norm)
+                )
+
+        tag_filter = set(tags) if tags else None
+
+        def accepted(example_id: int) -> bool:
+            example = self._examples[example_id]
+            if scenario is not None and self._scenarios[example_id] != scenario:
+                return False
+            if not min_difficulty <= example.difficulty <= max_difficulty:
+                return False
+            return tag_filter is None or any(tag in tag_filter for tag in example.tags)
+
+        # Ties keep insertion order
+        best = heapq.nsmallest(
+            k,
+            (example_id for example_id in scores if accepted(example_id)),
+            key=lambda example_id: (-scores[example_id], example_id),
+        )
+        return [(self._examples[example_id], scores[example_id]) for example_id in best]
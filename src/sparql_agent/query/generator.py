@@ -479,6 +479,7 @@ class SPARQLGenerator:
         template_dir: Optional[Path] = None,
         enable_validation: bool = True,
         enable_optimization: bool = True,
+        context_token_budget: Optional[int] = None,
     ):
         """
         Initialize SPARQL generator.
@@ -491,6 +492,8 @@ class SPARQLGenerator:
             template_dir: Directory containing custom templates
             enable_validation: Enable automatic validation
             enable_optimization: Enable automatic optimization
+            context_token_budget: Maximum tokens of schema, ontology, prefix
+                and example context in LLM prompts (no limit if not given)
         """
         self.llm_client = llm_client
         self.provider_manager = provider_manager
@@ -502,6 +505,7 @@ class SPARQLGenerator:
         self.validator = SPARQLValidator(self.ontology_mapper)
         self.enable_validation = enable_validation
         self.enable_optimization = enable_optimization
+        self.context_token_budget = context_token_budget
 
         # Initialize templates
         self.templates: List[QueryTemplate] = []
@@ -736,7 +740,8 @@ LIMIT {limit}""",
         if schema_info or ontology_info:
             prompt_examples = self.prompt_engine.get_examples(
                 scenario=scenario,
-                limit=3
+                limit=3,
+                query=natural_language
             )
             examples = [
                 {"question": ex.question, "sparql": ex.sparql}
@@ -902,30 +907,47 @@ LIMIT {limit}""",
             constraints=context.constraints
         )
 
-        # Generate prompt
-        prompt = self.prompt_engine.generate_prompt(
+        # Generate prompt; the endpoint context is a stable, cacheable system prompt
+        structured_prompt = self.prompt_engine.generate_structured_prompt(
             user_query=context.natural_language,
             schema_info=context.schema_info,
             ontology_info=context.ontology_info,
             scenario=context.scenario,
+            token_budget=self.context_token_budget,
             constraints=context.constraints
         )
 
+        # Question, endpoint and schema version let a response cache match
+        # near-duplicate questions asked against the same schema
+        request_metadata = {
+            "question": context.natural_language,
+            "endpoint_url": context.endpoint_info.url if context.endpoint_info else None,
+            "schema_version": (
+                context.schema_info.discovered_at.isoformat() if context.schema_info else None
+            ),
+        }
+
         # Generate with LLM
         try:
             if self.provider_manager:
                 llm_response = self.provider_manager.generate_with_fallback(
                     LLMRequest(
-                        prompt=prompt,
+                        prompt=structured_prompt.prompt,
+                        system_prompt=structured_prompt.system or None,
+                        cache_system_prompt=True,
                         max_tokens=1500,
-                        temperature=0.3  # Lower temperature for more consistent queries
+                        temperature=0.3,  # Lower temperature for more consistent queries
+                        metadata=request_metadata
                     )
                 )
             else:
                 llm_response = self.llm_client.generate_text(
-                    prompt=prompt,
+                    prompt=structured_prompt.prompt,
+                    system_prompt=structured_prompt.system or None,
+                    cache_system_prompt=True,
                     max_tokens=1500,
-                    temperature=0.3
+                    temperature=0.3,
+                    metadata=request_metadata
                 )
 
             query_text = self._extract_sparql_from_llm_response(llm_response.content)
@@ -948,7 +970,8 @@ LIMIT {limit}""",
             metadata={
                 "strategy": "llm",
                 "model": llm_response.model,
-                "tokens_used": llm_response.usage.total_tokens
+                "tokens_used": llm_response.usage.total_tokens,
+                "cached": llm_response.cached
             }
         )
 
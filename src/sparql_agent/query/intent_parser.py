@@ -474,11 +474,9 @@ class IntentParser:
                 entity.confidence = 0.9
                 continue
 
-            # Fuzzy matching for partial matches
-            for class_uri, owl_class in self.ontology_info.classes.items():
-                for label in owl_class.label:
-                    if self._fuzzy_match(entity.text, label):
-                        entity.alternatives.append(class_uri)
+            # Fuzzy matching for partial matches (same rules as _fuzzy_match)
+            for class_uri, _ in self.ontology_info.class_label_index().fuzzy(entity.text):
+                entity.alternatives.append(class_uri)
 
         return entities
 
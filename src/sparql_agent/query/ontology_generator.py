@@ -19,7 +19,7 @@ from enum import Enum
 from typing import Any, Dict, List, Optional, Set, Tuple, Union
 from pathlib import Path
 import logging
-from collections import defaultdict
+from collections import OrderedDict, defaultdict
 from functools import lru_cache
 
 from rdflib import Graph, Namespace, RDF, RDFS, OWL, URIRef, Literal
@@ -176,6 +176,8 @@ class OntologyGuidedGenerator:
         ontology_info: Optional[OntologyInfo] = None,
         ols_client: Optional[OLSClient] = None,
         enable_caching: bool = True,
+        max_paths_per_pair: int = 10,
+        path_cache_size: int = 1024,
     ):
         """
         Initialize the ontology-guided generator.
@@ -184,14 +186,19 @@ class OntologyGuidedGenerator:
             ontology_info: Pre-loaded ontology information
             ols_client: OLS client for real-time ontology lookup
             enable_caching: Enable caching for ontology operations
+            max_paths_per_pair: Shortest property paths kept per class pair
+            path_cache_size: Maximum class pairs in the property path cache
         """
         self.ontology_info = ontology_info
         self.ols_client = ols_client or OLSClient()
         self.enable_caching = enable_caching
+        self.max_paths_per_pair = max_paths_per_pair
+        self.path_cache_size = path_cache_size
 
         # Cache for ontology lookups
         self._class_hierarchy_cache: Dict[str, Dict[str, Any]] = {}
-        self._property_path_cache: Dict[Tuple[str, str], List[PropertyPath]] = {}
+        self._property_path_cache: "OrderedDict[Tuple[str, str, int], List[PropertyPath]]" = OrderedDict()
+        self._property_path_graph = None
         self._constraint_cache: Dict[str, List[QueryConstraint]] = {}
 
     def generate_query(
@@ -296,35 +303,24 @@ class OntologyGuidedGenerator:
 
         # Normalize query
         query_lower = user_query.lower()
-        words = query_lower.split()
-
-        # Match class labels
-        for class_uri, owl_class in ontology_info.classes.items():
-            for label in owl_class.label:
-                label_lower = label.lower()
-                if label_lower in query_lower or any(
-                    word in label_lower.split() for word in words
-                ):
-                    concepts["classes"].append({
-                        "uri": class_uri,
-                        "label": label,
-                        "matched_text": label_lower,
-                        "confidence": 0.8,
-                    })
+
+        # Match class labels that occur in the query or share a word with it
+        for class_uri, label in ontology_info.class_label_index().mentions(query_lower):
+            concepts["classes"].append({
+                "uri": class_uri,
+                "label": label,
+                "matched_text": label.lower(),
+                "confidence": 0.8,
+            })
 
         # Match property labels
-        for prop_uri, owl_prop in ontology_info.properties.items():
-            for label in owl_prop.label:
-                label_lower = label.lower()
-                if label_lower in query_lower or any(
-                    word in label_lower.split() for word in words
-                ):
-                    concepts["properties"].append({
-                        "uri": prop_uri,
-                        "label": label,
-                        "matched_text": label_lower,
-                        "confidence": 0.8,
-                    })
+        for prop_uri, label in ontology_info.property_label_index().mentions(query_lower):
+            concepts["properties"].append({
+                "uri": prop_uri,
+                "label": label,
+                "matched_text": label.lower(),
+                "confidence": 0.8,
+            })
 
         # Extract filter keywords
         filter_keywords = {
@@ -413,13 +409,10 @@ class OntologyGuidedGenerator:
                 uri = class_info["uri"]
                 if uri in ontology_info.classes:
                     expanded[uri] = ontology_info.classes[uri]
-                    owl_class = ontology_info.classes[uri]
                     # Get siblings through parents
-                    for parent_uri in owl_class.subclass_of:
-                        siblings = ontology_info.get_subclasses(parent_uri, recursive=False)
-                        for sib_uri in siblings:
-                            if sib_uri != uri and sib_uri in ontology_info.classes:
-                                expanded[sib_uri] = ontology_info.classes[sib_uri]
+                    for sib_uri in ontology_info.get_siblings(uri):
+                        if sib_uri in ontology_info.classes:
+                            expanded[sib_uri] = ontology_info.classes[sib_uri]
 
         elif strategy == ExpansionStrategy.RELATED:
             # Include related classes via properties
@@ -441,19 +434,7 @@ class OntologyGuidedGenerator:
         ontology_info: OntologyInfo,
     ) -> Set[str]:
         """Find classes related via properties."""
-        related: Set[str] = set()
-
-        for prop_uri, owl_prop in ontology_info.properties.items():
-            # Check if class is in domain
-            if class_uri in owl_prop.domain:
-                # Add range classes
-                related.update(owl_prop.range)
-            # Check if class is in range
-            if class_uri in owl_prop.range:
-                # Add domain classes
-                related.update(owl_prop.domain)
-
-        return related
+        return ontology_info.property_graph().related(class_uri)
 
     def _find_property_paths(
         self,
@@ -516,55 +497,36 @@ class OntologyGuidedGenerator:
         ontology_info: OntologyInfo,
         max_hops: int,
     ) -> List[PropertyPath]:
-        """Find property paths between two classes using BFS."""
-        # Check cache
-        cache_key = (source_uri, target_uri)
-        if self.enable_caching and cache_key in self._property_path_cache:
-            return self._property_path_cache[cache_key]
-
-        paths: List[PropertyPath] = []
+        """Find the shortest property paths between two classes."""
+        graph = ontology_info.property_graph()
 
-        # BFS to find paths
-        queue: List[Tuple[str, List[str], int]] = [(source_uri, [], 0)]
-        visited: Set[Tuple[str, int]] = set()
+        # Cached paths are only valid for the graph they were found in
+        if graph is not self._property_path_graph:
+            self._property_path_cache.clear()
+            self._property_path_graph = graph
 
-        while queue:
-            current_class, path_props, hops = queue.pop(0)
+        cache_key = (source_uri, target_uri, max_hops)
+        if self.enable_caching and cache_key in self._property_path_cache:
+            self._property_path_cache.move_to_end(cache_key)
+            return self._property_path_cache[cache_key]
 
-            if hops > max_hops:
-                continue
+        paths = [
+            PropertyPath(
+                properties=props,
+                path_type=PropertyPathType.SEQUENCE if len(props) > 1 else PropertyPathType.DIRECT,
+                confidence=1.0 / (len(props) + 1),  # Decrease confidence with hops
+                hops=len(props),
+            )
+            for props in graph.shortest_paths(
+                source_uri, target_uri, max_hops, k=self.max_paths_per_pair
+            )
+        ]
 
-            # Check if we reached target
-            if current_class == target_uri and path_props:
-                # Create property path
-                paths.append(
-                    PropertyPath(
-                        properties=path_props,
-                        path_type=PropertyPathType.SEQUENCE if len(path_props) > 1 else PropertyPathType.DIRECT,
-                        confidence=1.0 / (hops + 1),  # Decrease confidence with hops
-                        hops=hops,
-                    )
-                )
-                continue
-
-            # Avoid revisiting
-            state = (current_class, hops)
-            if state in visited:
-                continue
-            visited.add(state)
-
-            # Explore properties
-            for prop_uri, owl_prop in ontology_info.properties.items():
-                # Check if property can be used from current class
-                if current_class in owl_prop.domain:
-                    # Follow property to range classes
-                    for range_class in owl_prop.range:
-                        new_path = path_props + [prop_uri]
-                        queue.append((range_class, new_path, hops + 1))
-
-        # Cache results
+        # Cache results, evicting the least recently used pair
         if self.enable_caching:
             self._property_path_cache[cache_key] = paths
+            if len(self._property_path_cache) > self.path_cache_size:
+                self._property_path_cache.popitem(last=False)
 
         return paths
 
@@ -962,9 +924,13 @@ class OntologyGuidedGenerator:
                 )
             else:
                 owl_prop = ontology_info.properties[prop_uri]
-                # Check domain/range consistency
+                # Check domain/range consistency (subclasses of the domain match)
                 if owl_prop.domain and used_classes:
-                    domain_match = any(c in owl_prop.domain for c in used_classes)
+                    domain_match = any(
+                        ontology_info.is_subclass_of(c, domain)
+                        for c in used_classes
+                        for domain in owl_prop.domain
+                    )
                     if not domain_match:
                         validation["warnings"].append(
                             f"Property {prop_uri} domain mismatch"
@@ -7,17 +7,26 @@ that guide LLMs to generate SPARQL queries. It includes:
 - Few-shot examples for different query patterns
 - Schema-aware prompts with ontology integration
 - Support for various query scenarios (basic, complex joins, aggregation, full-text)
+- Cached schema and ontology sections and token-budgeted context assembly
+- Structured prompts with a stable, cacheable context prefix
+- Few-shot examples ranked by lexical relevance to the question
 """
 
+import json
+import threading
+import weakref
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from enum import Enum
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Set, Union
+from typing import Any, Callable, Dict, Hashable, List, Optional, Sequence, Set, Tuple, Union
 
+import yaml
 from jinja2 import Environment, FileSystemLoader, Template, select_autoescape
 
 from ..core.types import OntologyInfo, SchemaInfo, OWLClass, OWLProperty
 from ..schema.ontology_mapper import OntologyMapper, VocabularyInfo
+from .example_index import ExampleIndex
 
 
 class QueryScenario(Enum):
@@ -34,6 +43,306 @@ class QueryScenario(Enum):
     SUBQUERY = "subquery"
 
 
+def estimate_tokens(text: str) -> int:
+    """Estimate the number of tokens in text (about four characters per token)."""
+    return (len(text) + 3) // 4
+
+
+class PromptSectionCache:
+    """
+    Bounded, thread-safe LRU cache of rendered prompt sections.
+
+    Schema and ontology sections are keyed on their source's version: the
+    endpoint URL and discovery time of a schema, or the URI, version and
+    modification date of an ontology, together with the sizes of the
+    collections rendered. A schema without an endpoint or an ontology
+    without a version is keyed on the object itself, and its entries die
+    with it.
+
+    Sections are rendered from the source when first requested; call
+    ``clear()`` after editing a schema or ontology in place without
+    changing its size.
+    """
+
+    def __init__(self, max_size: int = 256):
+        """
+        Initialize the cache.
+
+        Args:
+            max_size: Maximum number of rendered sections to keep
+        """
+        self.max_size = max_size
+        self._entries: "OrderedDict[Hashable, Tuple[Any, Tuple[str, ...]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_render(
+        self,
+        key: Hashable,
+        source: Any,
+        render: Callable[[], Sequence[str]],
+        by_identity: bool = False
+    ) -> Tuple[str, ...]:
+        """
+        Get a rendered section, rendering it on a miss.
+
+        Args:
+            key: Section kind and source version
+            source: Object the section is rendered from
+            render: Renders the section items
+            by_identity: Whether the key identifies the source object rather
+                than a version of it
+
+        Returns:
+            Section items
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and (entry[0] is None or entry[0]() is source):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        items = tuple(render())
+        reference = weakref.ref(source) if by_identity else None
+
+        with self._lock:
+            self._entries[key] = (reference, items)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+        return items
+
+    def clear(self):
+        """Drop all rendered sections."""
+        with self._lock:
+            self._entries.clear()
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get cache statistics."""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+            }
+
+
+# Section cache shared by prompt contexts created without their own
+_shared_section_cache = PromptSectionCache()
+
+
+def _schema_section_key(schema_info: SchemaInfo) -> Tuple[Tuple[Hashable, ...], bool]:
+    """Key of a schema's rendered sections, and whether it identifies the object."""
+    sizes = (
+        len(schema_info.class_counts),
+        len(schema_info.property_counts),
+        len(schema_info.property_domains),
+        len(schema_info.property_ranges),
+    )
+    if schema_info.endpoint_info is not None:
+        return ("schema", schema_info.endpoint_info.url, schema_info.discovered_at) + sizes, False
+    return ("schema", id(schema_info)) + sizes, True
+
+
+def _ontology_section_key(ontology_info: OntologyInfo) -> Tuple[Tuple[Hashable, ...], bool]:
+    """Key of an ontology's rendered sections, and whether it identifies the object."""
+    sizes = (len(ontology_info.classes), len(ontology_info.properties))
+    if ontology_info.version or ontology_info.modified:
+        return ("ontology", ontology_info.uri, ontology_info.version, ontology_info.modified) + sizes, False
+    return ("ontology", id(ontology_info)) + sizes, True
+
+
+def _render_ontology_context(ontology_info: OntologyInfo) -> List[str]:
+    """Render the ontology summary, most important lines first."""
+    lines = []
+    lines.append(f"Ontology: {ontology_info.title or ontology_info.uri}")
+
+    if ontology_info.description:
+        lines.append(f"Description: {ontology_info.description}")
+
+    # Top classes
+    if ontology_info.classes:
+        top_classes = list(ontology_info.classes.values())[:10]
+        lines.append("\nKey Classes:")
+        for owl_class in top_classes:
+            label = owl_class.get_primary_label()
+            comment = owl_class.get_primary_comment()
+            if comment:
+                lines.append(f"  - {label}: {comment[:100]}...")
+            else:
+                lines.append(f"  - {label}")
+
+    # Top properties
+    if ontology_info.properties:
+        top_props = list(ontology_info.properties.values())[:10]
+        lines.append("\nKey Properties:")
+        for owl_prop in top_props:
+            label = owl_prop.get_primary_label()
+            comment = owl_prop.get_primary_comment()
+            if comment:
+                lines.append(f"  - {label}: {comment[:100]}...")
+            else:
+                lines.append(f"  - {label}")
+
+    return lines
+
+
+def _render_schema_summary(schema_info: SchemaInfo) -> List[str]:
+    """Render the schema summary; a property's domain and range stay in one item."""
+    lines = []
+
+    # Top classes
+    top_classes = schema_info.get_most_common_classes(10)
+    if top_classes:
+        lines.append("Most Common Classes:")
+        for class_uri, count in top_classes:
+            lines.append(f"  - {class_uri} ({count:,} instances)")
+
+    # Top properties
+    top_properties = schema_info.get_most_common_properties(10)
+    if top_properties:
+        lines.append("\nMost Common Properties:")
+        for prop_uri, count in top_properties:
+            lines.append(f"  - {prop_uri} ({count:,} uses)")
+
+    # Property domains and ranges
+    if schema_info.property_domains:
+        lines.append("\nProperty Domains and Ranges (sample):")
+        sample_props = list(schema_info.property_domains.items())[:5]
+        for prop, domains in sample_props:
+            ranges = schema_info.property_ranges.get(prop, set())
+            entry = [f"  - {prop}"]
+            if domains:
+                entry.append(f"    Domain: {', '.join(list(domains)[:3])}")
+            if ranges:
+                entry.append(f"    Range: {', '.join(list(ranges)[:3])}")
+            lines.append("\n".join(entry))
+
+    return lines
+
+
+@dataclass
+class PromptSection:
+    """
+    A section of prompt context.
+
+    Attributes:
+        name: Section name (ontology, schema, prefixes, examples)
+        title: Heading the section is rendered under
+        items: Section items, most important first; trimming drops from the end
+        priority: Higher priority sections get the token budget first
+        trimmed: Whether items were dropped to fit a token budget
+    """
+    name: str
+    title: str
+    items: List[str]
+    priority: int = 0
+    trimmed: bool = False
+
+    @property
+    def text(self) -> str:
+        """Section body."""
+        return "\n".join(self.items)
+
+
+class ContextAssembler:
+    """
+    Fit prompt context sections into a token budget.
+
+    Sections are granted budget in order of priority. A section that does not
+    fit is trimmed to its leading items, and sections left without budget are
+    dropped. The surviving sections keep their original order, so prompts for
+    the same endpoint share a stable prefix.
+    """
+
+    def __init__(
+        self,
+        token_budget: int,
+        count_tokens: Callable[[str], int] = estimate_tokens
+    ):
+        """
+        Initialize the assembler.
+
+        Args:
+            token_budget: Maximum tokens of context
+            count_tokens: Token counter
+        """
+        self.token_budget = token_budget
+        self.count_tokens = count_tokens
+
+    def fit(self, sections: Sequence[PromptSection]) -> List[PromptSection]:
+        """
+        Select and trim sections to fit the budget.
+
+        Args:
+            sections: Sections in prompt order
+
+        Returns:
+            Sections that fit, in prompt order
+        """
+        remaining = self.token_budget
+        kept: Dict[int, PromptSection] = {}
+
+        for index in sorted(range(len(sections)), key=lambda i: -sections[i].priority):
+            section = sections[index]
+            cost = self.count_tokens(section.title) + 1
+            items = []
+            for item in section.items:
+                item_cost = self.count_tokens(item) + 1
+                if cost + item_cost > remaining:
+                    break
+                cost += item_cost
+                items.append(item)
+
+            if items:
+                remaining -= cost
+                kept[index] = PromptSection(
+                    name=section.name,
+                    title=section.title,
+                    items=items,
+                    priority=section.priority,
+                    trimmed=section.trimmed or len(items) < len(section.items),
+                )
+
+        return [kept[index] for index in sorted(kept)]
+
+
+# Context sections that depend on the question rather than the endpoint
+_QUESTION_SECTIONS = frozenset({"examples"})
+
+
+@dataclass
+class StructuredPrompt:
+    """
+    A prompt split into a stable context prefix and a request-specific part.
+
+    The system part holds the endpoint's ontology, schema and prefixes and
+    is identical for every question against the same endpoint and schema
+    version, so providers can cache it. Examples are ranked per question and
+    therefore go in the prompt part.
+
+    Attributes:
+        system: Stable context, sent as the system prompt
+        prompt: Question, examples, instructions and constraints
+        sections: Names of the context sections included
+        trimmed_sections: Names of sections trimmed or dropped to fit the budget
+    """
+    system: str
+    prompt: str
+    sections: List[str] = field(default_factory=list)
+    trimmed_sections: List[str] = field(default_factory=list)
+
+    def to_text(self) -> str:
+        """Join both parts into a single prompt."""
+        return f"{self.system}\n\n{self.prompt}" if self.system else self.prompt
+
+
 @dataclass
 class PromptContext:
     """
@@ -49,6 +358,8 @@ class PromptContext:
         scenario: Query scenario type
         constraints: Additional constraints (limit, timeout, etc.)
         metadata: Additional metadata for context
+        section_cache: Cache of rendered schema and ontology sections
+            (a process-wide cache if not given)
     """
     user_query: str
     schema_info: Optional[SchemaInfo] = None
@@ -59,78 +370,45 @@ class PromptContext:
     scenario: QueryScenario = QueryScenario.BASIC
     constraints: Dict[str, Any] = field(default_factory=dict)
     metadata: Dict[str, Any] = field(default_factory=dict)
+    section_cache: Optional[PromptSectionCache] = None
 
     def get_ontology_context(self) -> str:
         """Generate ontology context summary for the prompt."""
         if not self.ontology_info:
             return "No ontology information available."
+        return "\n".join(self.get_ontology_items())
 
-        lines = []
-        lines.append(f"Ontology: {self.ontology_info.title or self.ontology_info.uri}")
-
-        if self.ontology_info.description:
-            lines.append(f"Description: {self.ontology_info.description}")
-
-        # Top classes
-        if self.ontology_info.classes:
-            top_classes = list(self.ontology_info.classes.values())[:10]
-            lines.append("\nKey Classes:")
-            for owl_class in top_classes:
-                label = owl_class.get_primary_label()
-                comment = owl_class.get_primary_comment()
-                if comment:
-                    lines.append(f"  - {label}: {comment[:100]}...")
-                else:
-                    lines.append(f"  - {label}")
-
-        # Top properties
-        if self.ontology_info.properties:
-            top_props = list(self.ontology_info.properties.values())[:10]
-            lines.append("\nKey Properties:")
-            for owl_prop in top_props:
-                label = owl_prop.get_primary_label()
-                comment = owl_prop.get_primary_comment()
-                if comment:
-                    lines.append(f"  - {label}: {comment[:100]}...")
-                else:
-                    lines.append(f"  - {label}")
-
-        return "\n".join(lines)
+    def get_ontology_items(self) -> Tuple[str, ...]:
+        """Get the lines of the ontology summary, rendered once per ontology version."""
+        if not self.ontology_info:
+            return ()
+        key, by_identity = _ontology_section_key(self.ontology_info)
+        return self._section_cache().get_or_render(
+            key, self.ontology_info,
+            lambda: _render_ontology_context(self.ontology_info),
+            by_identity=by_identity,
+        )
 
     def get_schema_summary(self) -> str:
         """Generate schema summary for the prompt."""
         if not self.schema_info:
             return "No schema information available."
+        return "\n".join(self.get_schema_items())
 
-        lines = []
-
-        # Top classes
-        top_classes = self.schema_info.get_most_common_classes(10)
-        if top_classes:
-            lines.append("Most Common Classes:")
-            for class_uri, count in top_classes:
-                lines.append(f"  - {class_uri} ({count:,} instances)")
-
-        # Top properties
-        top_properties = self.schema_info.get_most_common_properties(10)
-        if top_properties:
-            lines.append("\nMost Common Properties:")
-            for prop_uri, count in top_properties:
-                lines.append(f"  - {prop_uri} ({count:,} uses)")
-
-        # Property domains and ranges
-        if self.schema_info.property_domains:
-            lines.append("\nProperty Domains and Ranges (sample):")
-            sample_props = list(self.schema_info.property_domains.items())[:5]
-            for prop, domains in sample_props:
-                ranges = self.schema_info.property_ranges.get(prop, set())
-                lines.append(f"  - {prop}")
-                if domains:
-                    lines.append(f"    Domain: {', '.join(list(domains)[:3])}")
-                if ranges:
-                    lines.append(f"    Range: {', '.join(list(ranges)[:3])}")
+    def get_schema_items(self) -> Tuple[str, ...]:
+        """Get the entries of the schema summary, rendered once per endpoint and discovery."""
+        if not self.schema_info:
+            return ()
+        key, by_identity = _schema_section_key(self.schema_info)
+        return self._section_cache().get_or_render(
+            key, self.schema_info,
+            lambda: _render_schema_summary(self.schema_info),
+            by_identity=by_identity,
+        )
 
-        return "\n".join(lines)
+    def _section_cache(self) -> PromptSectionCache:
+        """Get the cache of rendered sections."""
+        return self.section_cache if self.section_cache is not None else _shared_section_cache
 
     def get_prefix_declarations(self) -> str:
         """Generate PREFIX declarations for SPARQL."""
@@ -147,16 +425,36 @@ class PromptContext:
         """Format example queries for the prompt."""
         if not self.example_queries:
             return "No examples available."
+        return "\n".join(self.get_example_items())
+
+    def get_example_items(self) -> List[str]:
+        """Format each example query as one item."""
+        return [
+            f"Example {i}:\n"
+            f"Question: {example.get('question', 'N/A')}\n"
+            f"SPARQL:\n"
+            f"{example.get('sparql', 'N/A')}\n"
+            for i, example in enumerate(self.example_queries, 1)
+        ]
 
-        lines = []
-        for i, example in enumerate(self.example_queries, 1):
-            lines.append(f"Example {i}:")
-            lines.append(f"Question: {example.get('question', 'N/A')}")
-            lines.append(f"SPARQL:")
-            lines.append(example.get('sparql', 'N/A'))
-            lines.append("")
+    def get_sections(self) -> List[PromptSection]:
+        """
+        Get the context sections in prompt order.
 
-        return "\n".join(lines)
+        Prefixes are kept first under a token budget, then the schema, the
+        ontology and the examples.
+        """
+        sections = [
+            PromptSection("ontology", "## Available Ontologies", list(self.get_ontology_items()), priority=2),
+            PromptSection("schema", "## Schema Information", list(self.get_schema_items()), priority=3),
+            PromptSection(
+                "prefixes", "## Available Prefixes",
+                [line for line in self.get_prefix_declarations().split("\n") if line],
+                priority=4,
+            ),
+            PromptSection("examples", "## Examples", self.get_example_items(), priority=1),
+        ]
+        return [section for section in sections if section.items]
 
 
 @dataclass
@@ -263,15 +561,21 @@ class PromptTemplate:
 ## Question
 {{ user_query }}
 
+{% if ontology_context %}
 ## Available Ontologies
 {{ ontology_context }}
 
+{% endif %}
+{% if schema_summary %}
 ## Schema Information
 {{ schema_summary }}
 
+{% endif %}
+{% if prefix_declarations %}
 ## Available Prefixes
 {{ prefix_declarations }}
 
+{% endif %}
 {% if examples %}
 ## Examples
 {{ examples }}
@@ -303,15 +607,21 @@ Please provide the SPARQL query below:
 ## Question
 {{ user_query }}
 
+{% if ontology_context %}
 ## Available Ontologies
 {{ ontology_context }}
 
+{% endif %}
+{% if schema_summary %}
 ## Schema Information
 {{ schema_summary }}
 
+{% endif %}
+{% if prefix_declarations %}
 ## Available Prefixes
 {{ prefix_declarations }}
 
+{% endif %}
 {% if examples %}
 ## Examples of Complex Joins
 {{ examples }}
@@ -350,15 +660,21 @@ Please provide the SPARQL query with complex joins:
 ## Question
 {{ user_query }}
 
+{% if ontology_context %}
 ## Available Ontologies
 {{ ontology_context }}
 
+{% endif %}
+{% if schema_summary %}
 ## Schema Information
 {{ schema_summary }}
 
+{% endif %}
+{% if prefix_declarations %}
 ## Available Prefixes
 {{ prefix_declarations }}
 
+{% endif %}
 {% if examples %}
 ## Examples of Aggregation Queries
 {{ examples }}
@@ -396,15 +712,21 @@ Please provide the SPARQL query with aggregation:
 ## Question
 {{ user_query }}
 
+{% if ontology_context %}
 ## Available Ontologies
 {{ ontology_context }}
 
+{% endif %}
+{% if schema_summary %}
 ## Schema Information
 {{ schema_summary }}
 
+{% endif %}
+{% if prefix_declarations %}
 ## Available Prefixes
 {{ prefix_declarations }}
 
+{% endif %}
 {% if examples %}
 ## Examples of Full-Text Search Queries
 {{ examples }}
@@ -439,22 +761,42 @@ Please provide the SPARQL query with aggregation:
 Please provide the SPARQL query with full-text search:
 """
 
-    def render(self, context: PromptContext) -> str:
+    def render(
+        self,
+        context: PromptContext,
+        sections: Optional[Sequence[PromptSection]] = None
+    ) -> str:
         """
         Render the template with the given context.
 
         Args:
             context: Prompt context with all necessary information
+            sections: Context sections to render instead of the full context,
+                e.g. sections fitted to a token budget; sections not given
+                are left out
 
         Returns:
             Rendered prompt string
         """
+        if sections is None:
+            context_vars = {
+                "ontology_context": context.get_ontology_context(),
+                "schema_summary": context.get_schema_summary(),
+                "prefix_declarations": context.get_prefix_declarations(),
+                "examples": context.get_examples_formatted() if context.example_queries else None,
+            }
+        else:
+            texts = {section.name: section.text for section in sections}
+            context_vars = {
+                "ontology_context": texts.get("ontology"),
+                "schema_summary": texts.get("schema"),
+                "prefix_declarations": texts.get("prefixes"),
+                "examples": texts.get("examples"),
+            }
+
         template_vars = {
             "user_query": context.user_query,
-            "ontology_context": context.get_ontology_context(),
-            "schema_summary": context.get_schema_summary(),
-            "prefix_declarations": context.get_prefix_declarations(),
-            "examples": context.get_examples_formatted() if context.example_queries else None,
+            **context_vars,
             "constraints": context.constraints,
             "metadata": context.metadata,
             "scenario": self.scenario.value
@@ -474,7 +816,9 @@ class PromptEngine:
     def __init__(
         self,
         template_dir: Optional[Path] = None,
-        ontology_mapper: Optional[OntologyMapper] = None
+        ontology_mapper: Optional[OntologyMapper] = None,
+        section_cache: Optional[PromptSectionCache] = None,
+        count_tokens: Callable[[str], int] = estimate_tokens
     ):
         """
         Initialize the prompt engine.
@@ -482,12 +826,18 @@ class PromptEngine:
         Args:
             template_dir: Directory containing template files
             ontology_mapper: Ontology mapper for vocabulary resolution
+            section_cache: Cache of rendered schema and ontology sections
+                (a process-wide cache if not given)
+            count_tokens: Token counter used for context budgets
         """
         self.template_dir = template_dir
         self.ontology_mapper = ontology_mapper or OntologyMapper()
+        self.section_cache = section_cache if section_cache is not None else _shared_section_cache
+        self.count_tokens = count_tokens
         self.examples_db: Dict[QueryScenario, List[FewShotExample]] = {
             scenario: [] for scenario in QueryScenario
         }
+        self._example_index: Optional[Tuple[Tuple[int, ...], ExampleIndex]] = None
         self._load_default_examples()
 
     def _load_default_examples(self):
@@ -630,13 +980,116 @@ LIMIT 50""",
         """Add a few-shot example to the database."""
         self.examples_db[example.scenario].append(example)
 
+    def load_examples(self, path: Union[str, Path]) -> int:
+        """
+        Load few-shot examples from a file.
+
+        JSON files hold a list of examples, JSON Lines files one example per
+        line, and YAML files a list of examples. Each example is an object
+        with ``question`` and ``sparql`` and optionally ``explanation``,
+        ``scenario`` (a QueryScenario value), ``difficulty`` and ``tags``.
+
+        Args:
+            path: Path to a .json, .jsonl or .yaml/.yml file
+
+        Returns:
+            Number of examples loaded
+
+        Raises:
+            ValueError: If the file format is unsupported or an example is invalid
+        """
+        path = Path(path)
+        suffix = path.suffix.lower()
+
+        with open(path, encoding="utf-8") as f:
+            if suffix == ".jsonl":
+                records = [json.loads(line) for line in f if line.strip()]
+            elif suffix == ".json":
+                records = json.load(f)
+            elif suffix in (".yaml", ".yml"):
+                records = yaml.safe_load(f) or []
+            else:
+                raise ValueError(f"Unsupported example file format: {path.suffix}")
+
+        if isinstance(records, dict):
+            records = records.get("examples", [])
+
+        examples = []
+        for record in records:
+            try:
+                examples.append(FewShotExample(
+                    question=record["question"],
+                    sparql=record["sparql"],
+                    explanation=record.get("explanation"),
+                    scenario=QueryScenario(record.get("scenario", QueryScenario.BASIC.value)),
+                    difficulty=int(record.get("difficulty", 1)),
+                    tags=list(record.get("tags", [])),
+                ))
+            except (KeyError, TypeError, ValueError) as e:
+                raise ValueError(f"Invalid example in {path}: {e}") from e
+
+        for example in examples:
+            self.add_example(example)
+        return len(examples)
+
+    def example_index(self) -> ExampleIndex:
+        """
+        Get the retrieval index of the examples, building it on first use.
+
+        The index is rebuilt when examples are added to or removed from
+        ``examples_db``.
+        """
+        signature = tuple(len(self.examples_db[scenario]) for scenario in QueryScenario)
+        if self._example_index is None or self._example_index[0] != signature:
+            index = ExampleIndex()
+            for scenario in QueryScenario:
+                for example in self.examples_db[scenario]:
+                    index.add(example, scenario=scenario)
+            self._example_index = (signature, index)
+        return self._example_index[1]
+
+    def search_examples(
+        self,
+        query: str,
+        limit: int = 5,
+        scenario: Optional[QueryScenario] = None,
+        min_difficulty: int = 1,
+        max_difficulty: int = 5,
+        tags: Optional[List[str]] = None
+    ) -> List[FewShotExample]:
+        """
+        Find the examples most relevant to a question.
+
+        Args:
+            query: Natural language question
+            limit: Maximum number of examples to return
+            scenario: Only return examples of this scenario (any if not given)
+            min_difficulty: Minimum difficulty level
+            max_difficulty: Maximum difficulty level
+            tags: Filter by tags
+
+        Returns:
+            Examples sharing words with the question, most relevant first
+        """
+        return [
+            example for example, _ in self.example_index().search(
+                query,
+                k=limit,
+                scenario=scenario,
+                min_difficulty=min_difficulty,
+                max_difficulty=max_difficulty,
+                tags=tags,
+            )
+        ]
+
     def get_examples(
         self,
         scenario: QueryScenario,
         limit: int = 5,
         min_difficulty: int = 1,
         max_difficulty: int = 5,
-        tags: Optional[List[str]] = None
+        tags: Optional[List[str]] = None,
+        query: Optional[str] = None
     ) -> List[FewShotExample]:
         """
         Get relevant examples for a scenario.
@@ -647,6 +1100,8 @@ LIMIT 50""",
             min_difficulty: Minimum difficulty level
             max_difficulty: Maximum difficulty level
             tags: Filter by tags
+            query: Natural language question; examples most relevant to it
+                come first
 
         Returns:
             List of relevant examples
@@ -666,6 +1121,19 @@ LIMIT 50""",
                 if any(tag in ex.tags for tag in tags)
             ]
 
+        # Rank by relevance to the question, then keep the scenario's order
+        if query:
+            ranked = self.search_examples(
+                query,
+                limit=limit,
+                scenario=scenario,
+                min_difficulty=min_difficulty,
+                max_difficulty=max_difficulty,
+                tags=tags,
+            )
+            ranked_ids = {id(ex) for ex in ranked}
+            examples = ranked + [ex for ex in examples if id(ex) not in ranked_ids]
+
         return examples[:limit]
 
     def detect_scenario(self, query: str) -> QueryScenario:
@@ -756,7 +1224,7 @@ LIMIT 50""",
         # Get examples
         example_queries = []
         if use_examples:
-            examples = self.get_examples(scenario, limit=max_examples)
+            examples = self.get_examples(scenario, limit=max_examples, query=user_query)
             example_queries = [
                 {"question": ex.question, "sparql": ex.sparql}
                 for ex in examples
@@ -771,9 +1239,30 @@ LIMIT 50""",
             ontology_mapper=self.ontology_mapper,
             scenario=scenario,
             constraints=kwargs.get("constraints", {}),
-            metadata=kwargs.get("metadata", {})
+            metadata=kwargs.get("metadata", {}),
+            section_cache=self.section_cache
         )
 
+    def fit_context(
+        self,
+        context: PromptContext,
+        token_budget: Optional[int] = None
+    ) -> List[PromptSection]:
+        """
+        Get a context's sections, trimmed to a token budget.
+
+        Args:
+            context: Prompt context
+            token_budget: Maximum tokens of context (no limit if not given)
+
+        Returns:
+            Sections in prompt order
+        """
+        sections = context.get_sections()
+        if token_budget is None:
+            return sections
+        return ContextAssembler(token_budget, self.count_tokens).fit(sections)
+
     def generate_prompt(
         self,
         user_query: str,
@@ -783,6 +1272,7 @@ LIMIT 50""",
         template: Optional[PromptTemplate] = None,
         use_examples: bool = True,
         max_examples: int = 5,
+        token_budget: Optional[int] = None,
         **kwargs
     ) -> str:
         """
@@ -796,6 +1286,8 @@ LIMIT 50""",
             template: Custom template (uses default if not provided)
             use_examples: Whether to include examples
             max_examples: Maximum number of examples
+            token_budget: Maximum tokens of ontology, schema, prefix and
+                example context (no limit if not given)
             **kwargs: Additional parameters
 
         Returns:
@@ -820,7 +1312,85 @@ LIMIT 50""",
             )
 
         # Render prompt
-        return template.render(context)
+        if token_budget is None:
+            return template.render(context)
+        return template.render(context, sections=self.fit_context(context, token_budget))
+
+    def generate_structured_prompt(
+        self,
+        user_query: str,
+        schema_info: Optional[SchemaInfo] = None,
+        ontology_info: Optional[OntologyInfo] = None,
+        scenario: Optional[QueryScenario] = None,
+        template: Optional[PromptTemplate] = None,
+        use_examples: bool = True,
+        max_examples: int = 5,
+        token_budget: Optional[int] = None,
+        **kwargs
+    ) -> StructuredPrompt:
+        """
+        Generate a prompt split into a stable context prefix and the question.
+
+        The ontology, schema and prefix sections are rendered in a fixed
+        order into the system part, which stays byte-identical across
+        questions for the same endpoint and schema version. The question,
+        the examples ranked for it, the instructions and the constraints
+        follow in the prompt part.
+
+        Args:
+            user_query: Natural language query
+            schema_info: Schema information
+            ontology_info: Ontology information
+            scenario: Query scenario (auto-detected if not provided)
+            template: Custom template for the question part
+            use_examples: Whether to include examples
+            max_examples: Maximum number of examples
+            token_budget: Maximum tokens of context (no limit if not given)
+            **kwargs: Additional parameters
+
+        Returns:
+            Structured prompt
+        """
+        context = self.build_context(
+            user_query=user_query,
+            schema_info=schema_info,
+            ontology_info=ontology_info,
+            scenario=scenario,
+            use_examples=use_examples,
+            max_examples=max_examples,
+            **kwargs
+        )
+
+        if template is None:
+            template = PromptTemplate(
+                template_dir=self.template_dir,
+                scenario=context.scenario
+            )
+
+        all_sections = context.get_sections()
+        sections = self.fit_context(context, token_budget)
+        included = {section.name for section in sections}
+
+        # Examples depend on the question, so keep them out of the cached prefix
+        stable = [section for section in sections if section.name not in _QUESTION_SECTIONS]
+        system = "\n\n".join(
+            f"{section.title}\n{section.text}" for section in stable
+        )
+        if system:
+            system = "Use the following context about the SPARQL endpoint.\n\n" + system
+
+        return StructuredPrompt(
+            system=system,
+            prompt=template.render(
+                context,
+                sections=[section for section in sections if section.name in _QUESTION_SECTIONS],
+            ),
+            sections=[section.name for section in sections],
+            trimmed_sections=[
+                section.name for section in all_sections
+                if section.name not in included
+            ] + [section.name for section in sections if section.trimmed],
+        )
 
     def generate_multi_scenario_prompts(
         self,
@@ -21,6 +21,7 @@ from rdflib.namespace import RDF, RDFS, OWL
 from ..schema.void_parser import VoIDDataset, VoIDExtractor
 from ..schema.shex_parser import ShExParser, ShExSchema
 from ..discovery.capabilities import CapabilitiesDetector
+from ..discovery.snapshots import SnapshotStore
 
 
 @dataclass
@@ -61,9 +62,15 @@ class SchemaQueryTools:
     4. Build queries incrementally with validation
     """
 
-    def __init__(self, endpoint_url: str, skip_discovery: bool = False):
+    def __init__(
+        self,
+        endpoint_url: str,
+        skip_discovery: bool = False,
+        snapshot_store: Optional[SnapshotStore] = None
+    ):
         self.endpoint_url = endpoint_url
         self._skip_discovery = skip_discovery
+        self.snapshot_store = snapshot_store
         self.void_data: List[VoIDDataset] = []
         self.shex_schemas: Dict[str, ShExSchema] = {}
         self.discovered_patterns: List[QueryPattern] = []
@@ -93,7 +100,7 @@ class SchemaQueryTools:
     def discover_endpoint_capabilities(self) -> Dict[str, Any]:
         """Discover endpoint capabilities using the discovery system."""
         try:
-            detector = CapabilitiesDetector(self.endpoint_url)
+            detector = CapabilitiesDetector(self.endpoint_url, snapshot_store=self.snapshot_store)
             # Use a shorter timeout to avoid hanging on problematic endpoints
             capabilities = detector.detect_all_capabilities()
 
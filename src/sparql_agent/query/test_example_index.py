@@ -0,0 +1,133 @@
+"""
+Tests for the few-shot example retrieval index.
+
+Tests cover:
+- Tokenization and SPARQL feature extraction
+- BM25 ranking, filters and tie order
+- Ranked example selection and loading examples from disk in PromptEngine
+"""
+
+import json
+import time
+
+import pytest
+
+from .example_index import ExampleIndex, sparql_features, tokenize_text
+from .prompt_engine import FewShotExample, PromptEngine, QueryScenario
+
+
+COUNT_QUERY = """PREFIX up: <http://purl.uniprot.org/core/>
+SELECT ?organism (COUNT(?protein) AS ?count)
+WHERE { ?protein a up:Protein ; up:organism ?organism }
+GROUP BY ?organism"""
+
+EXAMPLES = [
+    FewShotExample(
+        question="List all diseases in the dataset",
+        sparql="SELECT ?d WHERE { ?d a <http://purl.obolibrary.org/obo/MONDO_0000001> }",
+        tags=["disease"],
+    ),
+    FewShotExample(
+        question="Count the number of proteins per organism",
+        sparql=COUNT_QUERY,
+        scenario=QueryScenario.AGGREGATION,
+        difficulty=2,
+        tags=["protein", "aggregation"],
+    ),
+    FewShotExample(
+        question="Search for genes related to cancer",
+        sparql='SELECT ?g WHERE { ?g rdfs:label ?l FILTER(CONTAINS(?l, "cancer")) }',
+        scenario=QueryScenario.FULL_TEXT,
+        tags=["gene", "search"],
+    ),
+]
+
+
+class TestTokenization:
+    def test_tokenize_text(self):
+        assert tokenize_text("Find the proteinKinases of Humans") == ["find", "protein", "kinas", "human"]
+
+    def test_sparql_features(self):
+        features = sparql_features(COUNT_QUERY)
+        assert "count" in features
+        assert "many" in features
+        assert "organism" in features
+        assert "protein" in features
+
+
+class TestExampleIndex:
+    def test_ranks_relevant_example_first(self):
+        index = ExampleIndex(EXAMPLES)
+        results = index.search("How many proteins does each organism have?")
+        assert results[0][0] is EXAMPLES[1]
+        assert results[0][1] > 0
+
+    def test_no_shared_terms(self):
+        index = ExampleIndex(EXAMPLES)
+        assert index.search("zebra") == []
+
+    def test_filters(self):
+        index = ExampleIndex(EXAMPLES)
+        query = "proteins genes diseases"
+        assert [ex for ex, _ in index.search(query, scenario=QueryScenario.FULL_TEXT)] == [EXAMPLES[2]]
+        assert {id(ex) for ex, _ in index.search(query, max_difficulty=1)} == {id(EXAMPLES[0]), id(EXAMPLES[2])}
+        assert [ex for ex, _ in index.search(query, tags=["gene"])] == [EXAMPLES[2]]
+
+    def test_scenario_override(self):
+        index = ExampleIndex()
+        index.add(EXAMPLES[0], scenario=QueryScenario.COMPLEX_JOIN)
+        assert index.search("diseases", scenario=QueryScenario.COMPLEX_JOIN)
+        assert not index.search("diseases", scenario=QueryScenario.BASIC)
+
+    def test_large_corpus_lookup(self):
+        index = ExampleIndex(
+            FewShotExample(
+                question=f"Find entity{i} linked to topic{i % 97} and area{i % 13}",
+                sparql=f"SELECT ?s WHERE {{ ?s ex:prop{i % 50} ?o }}",
+                tags=[f"tag{i % 31}"],
+            )
+            for i in range(5000)
+        )
+        start = time.perf_counter()
+        results = index.search("entity42 linked to topic42", k=5)
+        elapsed = time.perf_counter() - start
+
+        assert results[0][0].question.startswith("Find entity42 ")
+        assert elapsed < 0.05
+
+
+class TestPromptEngineExamples:
+    def test_get_examples_ranked_by_query(self):
+        engine = PromptEngine()
+        engine.add_example(FewShotExample(
+            question="Find proteins expressed in the liver",
+            sparql="SELECT ?p WHERE { ?p up:tissue ?t }",
+            tags=["protein", "tissue"],
+        ))
+
+        unranked = engine.get_examples(QueryScenario.BASIC, limit=5)
+        ranked = engine.get_examples(QueryScenario.BASIC, limit=5, query="liver proteins")
+
+        assert ranked[0].question == "Find proteins expressed in the liver"
+        assert {ex.question for ex in ranked} == {ex.question for ex in unranked}
+
+    def test_load_examples(self, tmp_path):
+        records = [
+            {"question": f"Question {i} about kinases", "sparql": "SELECT ?s WHERE { ?s ?p ?o }",
+             "scenario": "aggregation", "tags": ["kinase"]}
+            for i in range(3)
+        ]
+        path = tmp_path / "examples.jsonl"
+        path.write_text("\n".join(json.dumps(record) for record in records))
+
+        engine = PromptEngine()
+        assert engine.load_examples(path) == 3
+        results = engine.search_examples("kinases", scenario=QueryScenario.AGGREGATION)
+        assert len(results) == 3
+
+    def test_load_examples_invalid(self, tmp_path):
+        path = tmp_path / "examples.json"
+        path.write_text(json.dumps([{"question": "no query"}]))
+
+        with pytest.raises(ValueError):
+            PromptEngine().load_examples(path)
@@ -5,7 +5,7 @@ Unit tests for the Prompt Engineering and Template System.
 import pytest
 from pathlib import Path
 
-from ..core.types import SchemaInfo, OntologyInfo, OWLClass, OWLProperty, OWLPropertyType
+from ..core.types import EndpointInfo, SchemaInfo, OntologyInfo, OWLClass, OWLProperty, OWLPropertyType
 from ..schema.ontology_mapper import OntologyMapper
 from .prompt_engine import (
     PromptEngine,
@@ -13,6 +13,9 @@ from .prompt_engine import (
     PromptContext,
     FewShotExample,
     QueryScenario,
+    PromptSection,
+    PromptSectionCache,
+    ContextAssembler,
     create_prompt_engine,
     quick_prompt
 )
@@ -542,5 +545,166 @@ class TestIntegration:
         assert "Protein" in prompt
 
 
+def make_schema(endpoint_url=None):
+    """Create a schema with a few classes and properties."""
+    schema_info = SchemaInfo(
+        endpoint_info=EndpointInfo(url=endpoint_url) if endpoint_url else None
+    )
+    schema_info.class_counts = {
+        f"http://example.org/Class{i}": 1000 - i for i in range(20)
+    }
+    schema_info.property_counts = {
+        f"http://example.org/prop{i}": 500 - i for i in range(20)
+    }
+    schema_info.property_domains = {"http://example.org/prop0": {"http://example.org/Class0"}}
+    return schema_info
+
+
+class TestPromptSectionCache:
+    """Tests for cached schema and ontology sections."""
+
+    def test_schema_rendered_once_per_version(self):
+        """The schema summary is rendered once per endpoint and discovery."""
+        cache = PromptSectionCache()
+        schema_info = make_schema("https://example.org/sparql")
+
+        first = PromptContext(user_query="a", schema_info=schema_info, section_cache=cache)
+        second = PromptContext(user_query="b", schema_info=schema_info, section_cache=cache)
+
+        assert first.get_schema_summary() == second.get_schema_summary()
+        assert cache.get_statistics()["misses"] == 1
+        assert cache.get_statistics()["hits"] == 1
+
+    def test_schema_change_rerenders(self):
+        """Adding classes to a schema invalidates its rendered summary."""
+        cache = PromptSectionCache()
+        schema_info = make_schema()
+        context = PromptContext(user_query="a", schema_info=schema_info, section_cache=cache)
+        before = context.get_schema_summary()
+
+        schema_info.class_counts["http://example.org/Popular"] = 10 ** 6
+        after = context.get_schema_summary()
+
+        assert before != after
+        assert "http://example.org/Popular" in after
+
+    def test_objects_without_version_are_not_shared(self):
+        """Schemas without an endpoint are cached per object."""
+        cache = PromptSectionCache()
+        first = make_schema()
+        second = make_schema()
+        second.class_counts = {f"http://other.org/C{i}": i for i in range(20)}
+
+        summary = PromptContext(user_query="a", schema_info=first, section_cache=cache).get_schema_summary()
+        other = PromptContext(user_query="a", schema_info=second, section_cache=cache).get_schema_summary()
+
+        assert "http://other.org/" not in summary
+        assert "http://other.org/" in other
+
+    def test_lru_eviction(self):
+        """The cache keeps at most max_size sections."""
+        cache = PromptSectionCache(max_size=2)
+        for i in range(3):
+            context = PromptContext(
+                user_query="a",
+                schema_info=make_schema(f"https://example.org/{i}"),
+                section_cache=cache,
+            )
+            context.get_schema_summary()
+
+        assert cache.get_statistics()["size"] == 2
+
+
+class TestContextAssembler:
+    """Tests for token-budgeted context assembly."""
+
+    def test_everything_fits(self):
+        """Sections are kept unchanged when the budget allows."""
+        sections = [
+            PromptSection("schema", "## Schema", ["a", "b"], priority=2),
+            PromptSection("examples", "## Examples", ["c"], priority=1),
+        ]
+        fitted = ContextAssembler(1000).fit(sections)
+
+        assert [section.name for section in fitted] == ["schema", "examples"]
+        assert not any(section.trimmed for section in fitted)
+
+    def test_low_priority_trimmed_first(self):
+        """Lower priority sections lose items first and order is preserved."""
+        sections = [
+            PromptSection("examples", "title", ["x" * 40] * 5, priority=1),
+            PromptSection("prefixes", "title", ["y" * 40] * 5, priority=4),
+        ]
+        fitted = ContextAssembler(80, count_tokens=len).fit(sections)
+
+        assert [section.name for section in fitted] == ["prefixes"]
+        assert len(fitted[0].items) == 1
+        assert fitted[0].trimmed
+
+    def test_budgeted_prompt_is_smaller(self):
+        """A token budget shrinks the rendered context."""
+        engine = create_prompt_engine()
+        schema_info = make_schema("https://example.org/sparql")
+
+        full = engine.generate_prompt("Find all proteins", schema_info=schema_info)
+        budgeted = engine.generate_prompt("Find all proteins", schema_info=schema_info, token_budget=150)
+
+        assert len(budgeted) < len(full)
+        assert "Find all proteins" in budgeted
+
+
+class TestStructuredPrompt:
+    """Tests for prompts with a stable context prefix."""
+
+    def test_context_prefix_is_stable(self):
+        """Different questions share a byte-identical system part."""
+        engine = create_prompt_engine()
+        schema_info = make_schema("https://example.org/sparql")
+
+        first = engine.generate_structured_prompt(
+            "List all proteins", schema_info=schema_info, scenario=QueryScenario.BASIC
+        )
+        second = engine.generate_structured_prompt(
+            "Show me genes", schema_info=schema_info, scenario=QueryScenario.BASIC
+        )
+
+        assert first.system == second.system
+        assert "http://example.org/Class0" in first.system
+        assert "List all proteins" in first.prompt
+        assert "http://example.org/Class0" not in first.prompt
+        assert first.sections == ["schema", "prefixes", "examples"]
+
+    def test_ranked_examples_stay_out_of_prefix(self):
+        """Examples ranked for the question are sent with the question."""
+        engine = create_prompt_engine()
+        engine.add_example(FewShotExample(
+            question="Which genes are on chromosome 7?",
+            sparql="SELECT ?gene WHERE { ?gene ex:chromosome 7 }",
+            scenario=QueryScenario.BASIC,
+        ))
+        schema_info = make_schema("https://example.org/sparql")
+
+        structured = engine.generate_structured_prompt(
+            "Which genes are on chromosome 7?", schema_info=schema_info,
+            scenario=QueryScenario.BASIC, max_examples=1,
+        )
+
+        assert "## Examples" not in structured.system
+        assert "ex:chromosome 7" in structured.prompt
+        assert structured.prompt.index("Which genes") < structured.prompt.index("## Examples")
+
+    def test_budget_reports_trimmed_sections(self):
+        """Sections dropped or trimmed to fit are reported."""
+        engine = create_prompt_engine()
+        structured = engine.generate_structured_prompt(
+            "List all proteins",
+            schema_info=make_schema("https://example.org/sparql"),
+            token_budget=100,
+        )
+
+        assert "examples" in structured.trimmed_sections
+        assert structured.to_text().endswith(structured.prompt)
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
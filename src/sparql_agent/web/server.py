@@ -26,6 +26,7 @@ API Documentation:
 
 import asyncio
 import hashlib
+import json
 import logging
 import time
 from contextlib import asynccontextmanager
@@ -71,7 +72,8 @@ from ..core.exceptions import (
     QueryTimeoutError,
 )
 from ..query.generator import SPARQLGenerator, GenerationStrategy, QueryScenario
-from ..execution.executor import QueryExecutor, ResultFormat, FederatedQuery
+from ..execution.executor import ResultFormat, FederatedQuery
+from ..execution.async_executor import AsyncQueryExecutor
 from ..execution.validator import QueryValidator, ValidationResult
 from ..ontology.ols_client import OLSClient
 from ..llm.client import LLMClient
@@ -98,7 +100,7 @@ class AppState:
     def __init__(self):
         self.settings: Optional[SPARQLAgentSettings] = None
         self.generator: Optional[SPARQLGenerator] = None
-        self.executor: Optional[QueryExecutor] = None
+        self.executor: Optional[AsyncQueryExecutor] = None
         self.validator: Optional[QueryValidator] = None
         self.ols_client: Optional[OLSClient] = None
         self.llm_client: Optional[LLMClient] = None
@@ -152,7 +154,7 @@ async def lifespan(app: FastAPI):
         enable_optimization=True,
     )
 
-    app_state.executor = QueryExecutor(
+    app_state.executor = AsyncQueryExecutor(
         timeout=app_state.settings.endpoint.default_timeout,
         max_retries=app_state.settings.endpoint.max_retries,
         enable_metrics=True,
@@ -173,7 +175,7 @@ async def lifespan(app: FastAPI):
 
     # Close connections
     if app_state.executor:
-        app_state.executor.close()
+        await app_state.executor.aclose()
 
     # Close active WebSocket connections
     for ws in app_state.active_websockets:
@@ -628,7 +630,7 @@ async def generate_and_execute_query(
 
             timeout = query_request.timeout or app_state.settings.endpoint.default_timeout
 
-            result = app_state.executor.execute(
+            result = await app_state.executor.execute(
                 query=generated.query,
                 endpoint=endpoint,
                 timeout=timeout,
@@ -741,7 +743,7 @@ async def execute_sparql_query(
         # Execute query
         logger.info(f"Executing query on {endpoint.url}")
 
-        result = app_state.executor.execute(
+        result = await app_state.executor.execute(
             query=execute_request.query,
             endpoint=endpoint,
             format=result_format,
@@ -780,6 +782,66 @@ async def execute_sparql_query(
         )
 
 
+@app.post("/execute/stream", tags=["Execute"])
+@limiter.limit("30/minute")
+async def stream_sparql_query(
+    request: Any,
+    execute_request: ExecuteRequest,
+    api_key: Optional[str] = Depends(verify_api_key),
+):
+    """
+    Execute a SPARQL query and stream the results as NDJSON.
+
+    The first line holds the result variables, each following line is one
+    row, and the last line carries execution metrics. Rows are forwarded as
+    they are parsed from the endpoint response, so result size does not
+    affect server memory. Disconnecting cancels the upstream request.
+    """
+    app_state.metrics["total_requests"] += 1
+
+    format_map = {
+        "json": ResultFormat.JSON,
+        "xml": ResultFormat.XML,
+        "csv": ResultFormat.CSV,
+        "tsv": ResultFormat.TSV,
+    }
+    result_format = format_map.get(execute_request.format.lower(), ResultFormat.JSON)
+
+    endpoint = EndpointInfo(
+        url=execute_request.endpoint_url,
+        timeout=execute_request.timeout or app_state.settings.endpoint.default_timeout,
+    )
+
+    try:
+        stream = await app_state.executor.execute_iter(
+            query=execute_request.query,
+            endpoint=endpoint,
+            format=result_format,
+            batch_size=500,
+        )
+    except Exception as e:
+        app_state.metrics["failed_requests"] += 1
+        logger.error(f"Streaming query execution failed: {e}")
+        raise HTTPException(status_code=502, detail=str(e))
+
+    async def generate_lines():
+        try:
+            yield json.dumps({"variables": stream.variables}) + "\n"
+            async for batch in stream:
+                yield "".join(json.dumps(row) + "\n" for row in batch)
+            app_state.metrics["total_queries_executed"] += 1
+            app_state.metrics["successful_requests"] += 1
+            yield json.dumps({"metrics": stream.metrics.to_dict()}) + "\n"
+        except Exception as e:
+            app_state.metrics["failed_requests"] += 1
+            logger.error(f"Streaming query execution failed: {e}")
+            yield json.dumps({"error": str(e), "error_type": type(e).__name__}) + "\n"
+        finally:
+            await stream.aclose()
+
+    return StreamingResponse(generate_lines(), media_type="application/x-ndjson")
+
+
 @app.post("/validate", response_model=ValidationResponse, tags=["Validate"])
 @limiter.limit("60/minute")
 async def validate_sparql_query(
@@ -1034,7 +1096,7 @@ async def execute_federated_query(
         )
 
         # Execute federated query
-        result = app_state.executor.execute_federated(
+        result = await app_state.executor.execute_federated(
             query=federated_request.query,
             config=config,
         )
@@ -1088,7 +1150,6 @@ async def upload_batch_queries(
         # Parse based on file type
         queries = []
         if file.filename.endswith('.json'):
-            import json
             data = json.loads(content.decode('utf-8'))
             if isinstance(data, list):
                 queries = data
@@ -1189,7 +1250,7 @@ async def websocket_query_endpoint(websocket: WebSocket):
                     # Execute if endpoint provided
                     if endpoint_url:
                         endpoint = EndpointInfo(url=endpoint_url)
-                        result = app_state.executor.execute(
+                        result = await app_state.executor.execute(
                             query=generated.query,
                             endpoint=endpoint,
                         )
@@ -1245,6 +1306,10 @@ async def get_metrics(request: Any):
     if app_state.generator:
         metrics["generator"] = app_state.generator.get_statistics()
 
+    # Add validation latency and parse cache statistics
+    if app_state.validator:
+        metrics["validator"] = app_state.validator.get_statistics()
+
     # Calculate rates
     uptime = (datetime.now() - metrics["start_time"]).total_seconds()
     if uptime > 0:
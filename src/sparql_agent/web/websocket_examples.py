@@ -67,10 +67,10 @@ def create_websocket_app() -> FastAPI:
 
     # Initialize components (mock for example)
     # In production, these would be your actual components
-    from unittest.mock import Mock
+    from unittest.mock import AsyncMock, Mock
 
     generator = Mock()
-    executor = Mock()
+    executor = AsyncMock()
     ols_client = Mock()
 
     # Create and include WebSocket routes
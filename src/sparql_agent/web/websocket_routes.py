@@ -44,7 +44,7 @@ def create_websocket_routes(
     Args:
         manager: WebSocket manager instance
         generator: SPARQL generator instance
-        executor: Query executor instance
+        executor: Async query executor instance (e.g. AsyncQueryExecutor)
         ols_client: OLS client instance
 
     Returns:
@@ -410,7 +410,7 @@ def _register_query_handlers(
                     timeout=timeout or 60,
                 )
 
-                result = executor.execute(
+                result = await executor.execute(
                     query=generated.query,
                     endpoint=endpoint,
                 )
@@ -0,0 +1,118 @@
+"""
+Federated result join performance benchmarks.
+
+Compares the hash join in ResultMerger.merge_with_join against the nested-loop
+join it replaced, and measures the spill-to-disk mode.
+"""
+
+import pytest
+from typing import Any, Dict, List
+
+from sparql_agent.core.types import QueryResult, QueryStatus
+from sparql_agent.endpoints.federated import ResultMerger
+
+
+def nested_loop_join(
+    results: List[QueryResult],
+    join_keys: List[str],
+    join_type: str = "inner"
+) -> List[Dict[str, Any]]:
+    """Reference copy of the previous nested-loop merge_with_join."""
+    merged_bindings = results[0].bindings
+
+    for result in results[1:]:
+        new_bindings = []
+
+        for left_binding in merged_bindings:
+            matched = False
+            for right_binding in result.bindings:
+                if all(left_binding.get(key) == right_binding.get(key) for key in join_keys):
+                    new_bindings.append({**left_binding, **right_binding})
+                    matched = True
+            if not matched and join_type in ("left", "full"):
+                new_bindings.append(left_binding)
+
+        if join_type == "full":
+            for right_binding in result.bindings:
+                if not any(
+                    all(left_binding.get(key) == right_binding.get(key) for key in join_keys)
+                    for left_binding in merged_bindings
+                ):
+                    new_bindings.append(right_binding)
+
+        merged_bindings = new_bindings
+
+    return merged_bindings
+
+
+def make_results(rows: int, overlap: float = 0.5) -> List[QueryResult]:
+    """Build two federated results sharing ``overlap`` of their protein keys."""
+    offset = int(rows * (1 - overlap))
+    left = QueryResult(
+        status=QueryStatus.SUCCESS,
+        bindings=[
+            {
+                "protein": {"type": "uri", "value": f"http://purl.uniprot.org/uniprot/P{i}"},
+                "name": {"type": "literal", "value": f"Protein {i}"},
+            }
+            for i in range(rows)
+        ],
+        variables=["protein", "name"],
+        row_count=rows
+    )
+    right = QueryResult(
+        status=QueryStatus.SUCCESS,
+        bindings=[
+            {
+                "protein": {"type": "uri", "value": f"http://purl.uniprot.org/uniprot/P{i}"},
+                "pdbId": {"type": "literal", "value": f"{i}ABC"},
+            }
+            for i in range(offset, offset + rows)
+        ],
+        variables=["protein", "pdbId"],
+        row_count=rows
+    )
+    return [left, right]
+
+
+class TestJoinPerformanceBenchmarks:
+    """Benchmark tests for federated result joins."""
+
+    @pytest.mark.parametrize("join_type", ["inner", "left", "full"])
+    def test_nested_loop_join_baseline(self, benchmark, join_type):
+        """Benchmark the previous nested-loop join (small input, it is quadratic)."""
+        results = make_results(1000)
+
+        merged = benchmark(nested_loop_join, results, ["protein"], join_type)
+        assert len(merged) > 0
+
+    @pytest.mark.parametrize("join_type", ["inner", "left", "full"])
+    def test_hash_join_same_input(self, benchmark, join_type):
+        """Benchmark the hash join on the nested-loop baseline input."""
+        results = make_results(1000)
+
+        merged = benchmark(ResultMerger.merge_with_join, results, ["protein"], join_type)
+        assert merged.row_count == len(nested_loop_join(results, ["protein"], join_type))
+
+    @pytest.mark.parametrize("rows", [10000, 100000])
+    def test_hash_join_scaling(self, benchmark, rows):
+        """Benchmark the hash join on large federated results."""
+        results = make_results(rows)
+
+        merged = benchmark(ResultMerger.merge_with_join, results, ["protein"], "full")
+        assert merged.row_count == int(rows * 1.5)
+
+    @pytest.mark.slow
+    def test_hash_join_spill_to_disk(self, benchmark, tmp_path):
+        """Benchmark the partitioned join with a memory budget below the input size."""
+        results = make_results(100000)
+
+        merged = benchmark(
+            ResultMerger.merge_with_join,
+            results,
+            ["protein"],
+            "full",
+            memory_budget=10000,
+            spill_dir=str(tmp_path)
+        )
+        assert merged.row_count == 150000
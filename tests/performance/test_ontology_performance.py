@@ -0,0 +1,173 @@
+"""
+Ontology-guided generation performance benchmarks.
+
+Measures property path search between classes on a synthetic 20k-class
+ontology, comparing the domain/range adjacency index used by
+OntologyGuidedGenerator._find_paths_between_classes with the BFS over all
+properties it replaced.
+"""
+
+import random
+import time
+from typing import List, Set, Tuple
+
+import pytest
+
+from sparql_agent.core.types import OntologyInfo, OWLClass, OWLProperty
+from sparql_agent.query.ontology_generator import (
+    OntologyGuidedGenerator,
+    PropertyPath,
+    PropertyPathType,
+)
+
+
+def make_ontology(num_classes: int, properties_per_class: int = 2, seed: int = 42) -> OntologyInfo:
+    """
+    Build a random ontology with a class tree and object properties.
+
+    Like real ontologies, half of the property domains and ranges are drawn
+    from a small set of upper-level hub classes, so many class pairs are
+    connected within a few hops.
+    """
+    rng = random.Random(seed)
+    uris = [f"http://example.org/onto#C{i}" for i in range(num_classes)]
+    hubs = uris[:max(10, num_classes // 100)]
+
+    def pick() -> str:
+        return rng.choice(hubs) if rng.random() < 0.5 else rng.choice(uris)
+
+    classes = {
+        uri: OWLClass(
+            uri=uri,
+            label=[f"class {i}"],
+            subclass_of=[uris[rng.randrange(i)]] if i else [],
+        )
+        for i, uri in enumerate(uris)
+    }
+    properties = {}
+    for i in range(num_classes * properties_per_class):
+        uri = f"http://example.org/onto#p{i}"
+        properties[uri] = OWLProperty(
+            uri=uri,
+            label=[f"property {i}"],
+            domain=[pick()],
+            range=[pick()],
+        )
+
+    return OntologyInfo(uri="http://example.org/onto", classes=classes, properties=properties)
+
+
+def scan_bfs_paths(
+    source_uri: str,
+    target_uri: str,
+    ontology_info: OntologyInfo,
+    max_hops: int,
+) -> List[PropertyPath]:
+    """Reference copy of the previous BFS over every property per class."""
+    paths: List[PropertyPath] = []
+    queue: List[Tuple[str, List[str], int]] = [(source_uri, [], 0)]
+    visited: Set[Tuple[str, int]] = set()
+
+    while queue:
+        current_class, path_props, hops = queue.pop(0)
+        if hops > max_hops:
+            continue
+        if current_class == target_uri and path_props:
+            paths.append(PropertyPath(
+                properties=path_props,
+                path_type=PropertyPathType.SEQUENCE if len(path_props) > 1 else PropertyPathType.DIRECT,
+                confidence=1.0 / (hops + 1),
+                hops=hops,
+            ))
+            continue
+        state = (current_class, hops)
+        if state in visited:
+            continue
+        visited.add(state)
+        for prop_uri, owl_prop in ontology_info.properties.items():
+            if current_class in owl_prop.domain:
+                for range_class in owl_prop.range:
+                    queue.append((range_class, path_props + [prop_uri], hops + 1))
+
+    return paths
+
+
+def class_pairs(ontology_info: OntologyInfo, count: int, seed: int = 7) -> List[Tuple[str, str]]:
+    """Pick random source/target class pairs."""
+    rng = random.Random(seed)
+    uris = list(ontology_info.classes)
+    return [(rng.choice(uris), rng.choice(uris)) for _ in range(count)]
+
+
+class TestPropertyPathPerformance:
+    """Benchmark tests for property path search."""
+
+    @pytest.fixture(scope="class")
+    def large_ontology(self) -> OntologyInfo:
+        """20k-class ontology with 40k object properties."""
+        ontology = make_ontology(20000)
+        ontology.property_graph()
+        return ontology
+
+    def test_scan_bfs_baseline(self, benchmark):
+        """Benchmark the previous BFS (small ontology, it scans every property per class)."""
+        ontology = make_ontology(500)
+        pairs = class_pairs(ontology, 5)
+
+        def run():
+            return [scan_bfs_paths(s, t, ontology, 3) for s, t in pairs]
+
+        benchmark(run)
+
+    def test_indexed_search_same_input(self, benchmark):
+        """Benchmark the indexed search on the baseline input."""
+        ontology = make_ontology(500)
+        pairs = class_pairs(ontology, 5)
+        generator = OntologyGuidedGenerator(ontology_info=ontology, enable_caching=False)
+
+        def run():
+            return [generator._find_paths_between_classes(s, t, ontology, 3) for s, t in pairs]
+
+        benchmark(run)
+
+    def test_build_property_graph(self, benchmark):
+        """Benchmark building the adjacency index of a 20k-class ontology."""
+        ontology = make_ontology(20000)
+
+        def build():
+            ontology.invalidate_indexes()
+            return ontology.property_graph()
+
+        graph = benchmark(build)
+        assert len(graph) == 40000
+
+    @pytest.mark.parametrize("max_hops", [2, 3, 4])
+    def test_path_search_large_ontology(self, benchmark, large_ontology, max_hops):
+        """Benchmark uncached path search between random classes of a 20k-class ontology."""
+        generator = OntologyGuidedGenerator(ontology_info=large_ontology, enable_caching=False)
+        pairs = class_pairs(large_ontology, 20)
+
+        def run():
+            return [
+                generator._find_paths_between_classes(s, t, large_ontology, max_hops)
+                for s, t in pairs
+            ]
+
+        benchmark(run)
+
+    def test_path_search_under_50ms(self, large_ontology):
+        """Each class pair of a 20k-class ontology is searched in under 50 ms."""
+        generator = OntologyGuidedGenerator(ontology_info=large_ontology, enable_caching=False)
+
+        for source, target in class_pairs(large_ontology, 50):
+            start = time.perf_counter()
+            generator._find_paths_between_classes(source, target, large_ontology, 3)
+            duration_ms = (time.perf_counter() - start) * 1000
+            assert duration_ms < 50, f"{source} -> {target} took {duration_ms:.1f} ms"
+
+    def test_shortest_path_bidirectional(self, benchmark, large_ontology):
+        """Benchmark the bidirectional shortest-path search."""
+        graph = large_ontology.property_graph()
+        pairs = class_pairs(large_ontology, 20)
+
+        benchmark(lambda: [graph.shortest_path(s, t, 6) for s, t in pairs])
@@ -1,15 +1,20 @@
 """
-Schema and ontology parsing performance benchmarks.
+Schema, ontology and result parsing performance benchmarks.
 
-Tests parsing performance for various schema formats (OWL, ShEx, VoID, etc.).
+Tests parsing performance for various schema formats (OWL, ShEx, VoID, etc.)
+and for SPARQL JSON query results.
 """
 
 import pytest
 from typing import Dict, Any, List
 from unittest.mock import Mock, patch
+import json
 import tempfile
 import os
+import time
+import tracemalloc
 
+from sparql_agent.execution.executor import ResultParser
 from sparql_agent.ontology.owl_parser import OWLParser
 from sparql_agent.schema.shex_parser import ShExParser
 from sparql_agent.schema.void_parser import VoIDParser
@@ -451,3 +456,91 @@ class TestNamespaceResolutionPerformance:
 
         result = benchmark(resolve_all, uris, namespace_map)
         assert len(result) == len(uris)
+
+
+def make_sparql_json(rows: int) -> bytes:
+    """Build a SPARQL JSON results document with a URI, a tagged and a typed literal per row."""
+    return json.dumps({
+        "head": {"vars": ["protein", "name", "mass"]},
+        "results": {
+            "bindings": [
+                {
+                    "protein": {"type": "uri", "value": f"http://purl.uniprot.org/uniprot/P{i}"},
+                    "name": {"type": "literal", "value": f"Protein {i}", "xml:lang": "en"},
+                    "mass": {
+                        "type": "literal",
+                        "value": str(i * 10),
+                        "datatype": "http://www.w3.org/2001/XMLSchema#integer",
+                    },
+                }
+                for i in range(rows)
+            ]
+        },
+    }).encode("utf-8")
+
+
+def parse_with_bindings(data: bytes) -> List[Dict[str, Any]]:
+    """Previous executor path: Binding objects per cell, then plain values."""
+    return [
+        {var: binding.value for var, binding in row.items()}
+        for row in ResultParser.parse_json(json.loads(data))
+    ]
+
+
+RESULT_PARSERS = {
+    "bindings": parse_with_bindings,
+    "values": lambda data: ResultParser.parse_json_values(data)[1],
+    "columnar": ResultParser.parse_json_columnar,
+}
+
+
+class TestSPARQLResultParsingPerformance:
+    """Benchmark tests for SPARQL JSON result parsing (rows/sec and bytes allocated)."""
+
+    @pytest.fixture(scope="class", params=[
+        10_000,
+        100_000,
+        pytest.param(1_000_000, marks=pytest.mark.slow),
+    ])
+    def results_document(self, request) -> tuple:
+        """SPARQL JSON document and its row count."""
+        return make_sparql_json(request.param), request.param
+
+    @pytest.mark.parametrize("parser", list(RESULT_PARSERS))
+    def test_json_result_parsing(self, benchmark, results_document, parser):
+        """Benchmark parsing a full SPARQL JSON result document."""
+        data, rows = results_document
+        parse = RESULT_PARSERS[parser]
+
+        tracemalloc.start()
+        parsed = parse(data)
+        retained, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del parsed
+
+        result = benchmark.pedantic(parse, args=(data,), rounds=3, iterations=1)
+
+        benchmark.extra_info["rows"] = rows
+        benchmark.extra_info["document_bytes"] = len(data)
+        benchmark.extra_info["rows_per_sec"] = rows / benchmark.stats.stats.mean
+        benchmark.extra_info["retained_bytes"] = retained
+        benchmark.extra_info["peak_allocated_bytes"] = peak
+        assert len(result) == rows
+
+    def test_fast_paths_beat_binding_objects(self, results_document):
+        """The values and columnar paths are faster than building Binding objects."""
+        data, rows = results_document
+        if rows > 100_000:
+            pytest.skip("comparison uses the smaller fixtures")
+
+        def best_time(parse) -> float:
+            timings = []
+            for _ in range(3):
+                start = time.perf_counter()
+                parse(data)
+                timings.append(time.perf_counter() - start)
+            return min(timings)
+
+        baseline = best_time(RESULT_PARSERS["bindings"])
+        assert best_time(RESULT_PARSERS["values"]) < baseline
+        assert best_time(RESULT_PARSERS["columnar"]) < baseline